@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark: caller interruption rate with no cues, the deadline filler alone, and the backchannel scheduler
+
+Runs calls through ConversationProcessor on the simulation's virtual clock
+(loadtest.simulate), with a slow LLM (``--llm median,p95``). After each turn
+the simulated caller waits at most their patience (``--patience``) for
+something to hear, a cue or the answer; past it they talk over the silence
+("¿hola?"), which PerformanceMonitor records as an interruption. The same
+seeded turns run in three modes:
+
+- ``none``: no filler and no backchannels;
+- ``filler``: the language's filler at the ``llm_first_token`` deadline;
+- ``scheduler``: BackchannelScheduler, which also plays a backchannel early
+  in turns predicted to be slow and never over the caller.
+
+For each mode the benchmark reports interruptions per turn, cues played per
+turn and the answer's first-audio latency.
+
+Usage:
+    python benchmarks/bench_backchannel.py --calls 200 --llm 900,2500 --patience 1500,3000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+from pipecat.frames.frames import (  # noqa: E402
+    BotStoppedSpeakingFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.mock_providers import DEFAULT_RESPONSES, DEFAULT_TRANSCRIPTS, LatencyProfile  # noqa: E402
+from loadtest.simulate import VirtualClock, VirtualTimeEventLoop, virtual_time  # noqa: E402
+
+MODES = ("none", "filler", "scheduler")
+
+
+class HeardTTS:
+    """TTS whose first byte is a virtual-time sleep; tells each call's caller when they hear something."""
+
+    def __init__(self, latency: LatencyProfile):
+        """Initialize with a first-byte latency profile."""
+        self.latency = latency
+        self.heard: Dict[str, asyncio.Event] = {}
+        self.answered_at: Dict[str, float] = {}  # Loop time of each call's last answer's first byte
+
+    async def synthesize(self, text: str, **options) -> bytes:
+        """Return the text as audio after a sampled delay (none for cached phrases)."""
+        if "first_byte" in options:
+            await asyncio.sleep(self.latency.sample())
+            call_sid = agent_module.log_call_sid.get()
+            self.answered_at[call_sid] = asyncio.get_running_loop().time()
+            self.heard[call_sid].set()
+        return text.encode()
+
+    async def play(self, audio: bytes):
+        """Play a cached phrase."""
+        self.heard[agent_module.log_call_sid.get()].set()
+
+
+class SlowLLM:
+    """LLM whose latency is a virtual-time sleep."""
+
+    def __init__(self, latency: LatencyProfile):
+        """Initialize with a latency profile."""
+        self.latency = latency
+
+    async def complete(self, messages) -> SimpleNamespace:
+        """Answer after a sampled delay."""
+        await asyncio.sleep(self.latency.sample())
+        return SimpleNamespace(content=DEFAULT_RESPONSES[len(messages) % len(DEFAULT_RESPONSES)])
+
+
+async def run_call(agent, index: int, args, patience: LatencyProfile, tally: dict):
+    """Run one call's turns, with the caller talking over silences longer than their patience."""
+    loop = asyncio.get_running_loop()
+    call_sid = f"CABENCHBC{index:05d}"
+    agent_module.bind_call_context(call_sid)
+    tts = agent.tts_service
+    tts.heard[call_sid] = asyncio.Event()
+    agent.call_manager.start_call(call_sid, "+15550100", "inbound")
+    agent.performance_monitor.start_call_monitoring(call_sid)
+    processor = agent.create_call_processor(call_sid)
+    for turn in range(args.turns):
+        await processor.process(UserStartedSpeakingFrame())
+        await asyncio.sleep(1.5)
+        await processor.process(UserStoppedSpeakingFrame())
+        speech_end = loop.time()
+        await asyncio.sleep(0.3)  # STT final result
+        tts.heard[call_sid].clear()
+        text = DEFAULT_TRANSCRIPTS[(index + turn) % len(DEFAULT_TRANSCRIPTS)]
+        answer = asyncio.ensure_future(processor.process(TranscriptionFrame(text=text, user_id=call_sid, timestamp="")))
+
+        # The caller waits for something to hear, then talks over the silence
+        heard = asyncio.ensure_future(tts.heard[call_sid].wait())
+        done, _ = await asyncio.wait({heard}, timeout=max(0.0, speech_end + patience.sample() - loop.time()))
+        if not done:
+            heard.cancel()
+            tally["talked_over"] += 1
+            await processor.process(UserStartedSpeakingFrame())
+            await asyncio.sleep(0.6)
+            await processor.process(UserStoppedSpeakingFrame())
+        await answer
+        await processor.turn_taken()
+        tally["turns"] += 1
+        tally["latencies"].append((tts.answered_at[call_sid] - speech_end) * 1000)
+        await asyncio.sleep(2.0)  # The answer plays
+        await processor.process(BotStoppedSpeakingFrame())
+    agent.call_manager.end_call(call_sid, "completed")
+    agent.flight_recorder.end_call(call_sid)
+
+
+async def run_calls(agent, args) -> dict:
+    """Start calls every ``--interval`` seconds and tally turns, talk-overs and first-audio latencies."""
+    patience = LatencyProfile.parse(args.patience)
+    await agent.phrase_cache.warm(agent.tts_service)
+    tally = {"turns": 0, "talked_over": 0, "latencies": []}
+    calls = []
+    for index in range(args.calls):
+        calls.append(asyncio.ensure_future(run_call(agent, index, args, patience, tally)))
+        await asyncio.sleep(args.interval)
+    await asyncio.gather(*calls)
+    return tally
+
+
+def run_mode(mode: str, args) -> dict:
+    """Run the calls with a fresh agent in one mode."""
+    random.seed(args.seed)
+    clock = VirtualClock(datetime.now().timestamp())
+    loop = VirtualTimeEventLoop(clock)
+    with virtual_time(clock):
+        agent = agent_module.TwilioVoiceAgent()
+        agent.llm_service = SlowLLM(LatencyProfile.parse(args.llm))
+        agent.response_cache.enabled = False
+        agent.backchannels.enabled = mode == "scheduler"
+        if mode == "none":
+            for budgets in agent.deadlines.budgets.values():
+                budgets["llm_first_token"] = 0.0
+        try:
+            agent.tts_service = HeardTTS(LatencyProfile.parse(args.tts))
+            result = loop.run_until_complete(run_calls(agent, args))
+        finally:
+            loop.close()
+
+    latencies = sorted(result["latencies"])
+    stats = agent.backchannels.get_stats()
+    played = stats["predicted"]["played"] + stats["observed"]["played"]
+    interruptions = agent.performance_monitor.global_metrics["total_interruptions"]
+    return {
+        "mode": mode,
+        "turns": result["turns"],
+        "talked_over_per_turn": round(result["talked_over"] / result["turns"], 3),
+        "interruptions_per_turn": round(interruptions / result["turns"], 3),
+        "cues_per_turn": round(played / result["turns"], 3),
+        "suppressed": stats["predicted"]["suppressed"] + stats["observed"]["suppressed"],
+        "first_audio_p50_ms": round(latencies[len(latencies) // 2]) if latencies else 0,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="calls per mode")
+    parser.add_argument("--turns", type=int, default=4, help="turns per call")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between call starts")
+    parser.add_argument("--llm", default="900,2500", help="LLM latency median,p95 in ms")
+    parser.add_argument("--tts", default="150,350", help="TTS first-byte latency median,p95 in ms")
+    parser.add_argument("--patience", default="1500,3000", help="caller patience with silence median,p95 in ms")
+    parser.add_argument("--seed", type=int, default=7, help="random seed")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("ERROR")
+    results = [run_mode(mode, args) for mode in MODES]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 {args.calls} calls x {args.turns} turns: LLM {args.llm} ms, patience {args.patience} ms (median,p95)")
+    print(f"{'mode':<11}{'talked over':>13}{'interrupt/turn':>16}{'cues/turn':>11}{'suppressed':>12}{'p50 ms':>9}")
+    for r in results:
+        print(
+            f"{r['mode']:<11}{r['talked_over_per_turn']:>13}{r['interruptions_per_turn']:>16}"
+            f"{r['cues_per_turn']:>11}{r['suppressed']:>12}{r['first_audio_p50_ms']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: first-turn latency with cold versus pre-warmed provider connections
+
+Runs the loadtest mock providers with a set-up delay on every new connection
+(``--connect-ms``, standing in for DNS, TCP and TLS round trips) and plays a
+sequence of calls through the streaming clients. Each call opens a Deepgram
+stream, gets an OpenAI completion and waits for ElevenLabs' first audio
+byte. With ``cold`` connections the first call pays every handshake and later
+calls still open a new Deepgram stream. With ``warm`` connections,
+ConnectionManager has opened the HTTP pools and a ready stream before the
+first call, so the first turn should match the steady state.
+
+Usage:
+    python benchmarks/bench_connections.py --connect-ms 60 --calls 6 --trials 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.clients import DeepgramLiveClient, ElevenLabsStreamingClient, OpenAIStreamingClient  # noqa: E402
+from loadtest.mock_providers import LatencyProfile, MockProviders, start_mock_providers  # noqa: E402
+
+
+async def first_turn(connections, llm, tts) -> float:
+    """Open an STT stream, complete one LLM turn and wait for the first TTS byte; get the elapsed ms."""
+    first_audio = asyncio.get_running_loop().create_future()
+
+    async def sink(chunk):
+        if not first_audio.done():
+            first_audio.set_result(time.perf_counter())
+
+    tts.sinks["CABENCH"] = sink
+    start = time.perf_counter()
+    stream = await connections.acquire_websocket("deepgram")
+    response = await llm.complete([{"role": "user", "content": "hola, quiero revisar mi pedido"}])
+    await tts.synthesize(response.content)
+    elapsed = (await first_audio - start) * 1000
+    await stream.send_str(json.dumps({"type": "CloseStream"}))
+    await stream.close()
+    return elapsed
+
+
+async def run_trial(provider_url: str, warm: bool, calls: int, gap: float) -> list:
+    """Play ``calls`` calls through a fresh ConnectionManager and get each one's first-turn latency."""
+    connections = agent_module.ConnectionManager(enabled=warm, registry=agent_module.MetricsRegistry())
+    session = connections.get_session()
+    stt = DeepgramLiveClient(session, provider_url, "benchmark")
+    llm = OpenAIStreamingClient(session, provider_url, "benchmark")
+    tts = ElevenLabsStreamingClient(session, provider_url, "benchmark", call_sid_getter=lambda: "CABENCH")
+    for name in agent_module.ConnectionManager.PROVIDER_URLS:
+        connections.register_http(name, provider_url)
+    connections.register_websocket("deepgram", stt.connect, keepalive=DeepgramLiveClient.keepalive)
+    await connections.start()
+
+    latencies = []
+    try:
+        for _ in range(calls):
+            latencies.append(await first_turn(connections, llm, tts))
+            await asyncio.sleep(gap)  # Calls arrive apart, as in production
+    finally:
+        await connections.close()
+    return latencies
+
+
+async def run(args) -> list:
+    """Run every trial of both modes against one mock server."""
+    providers = MockProviders(
+        llm=LatencyProfile(args.llm_ms, args.llm_ms),
+        tts=LatencyProfile(args.tts_ms, args.tts_ms),
+        token_interval_ms=1.0,
+        connect_ms=args.connect_ms,
+    )
+    runner, provider_url = await start_mock_providers(providers)
+    results = []
+    try:
+        for mode in ("cold", "warm"):
+            trials = [await run_trial(provider_url, mode == "warm", args.calls, args.gap) for _ in range(args.trials)]
+            first = [latencies[0] for latencies in trials]
+            steady = [latency for latencies in trials for latency in latencies[1:]]
+            results.append(
+                {
+                    "mode": mode,
+                    "first_turn_ms": round(statistics.median(first), 1),
+                    "steady_turn_ms": round(statistics.median(steady), 1),
+                    "first_turn_penalty_ms": round(statistics.median(first) - statistics.median(steady), 1),
+                }
+            )
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connect-ms", type=float, default=60.0, help="set-up delay of each new connection")
+    parser.add_argument("--llm-ms", type=float, default=40.0, help="mock LLM first-token latency")
+    parser.add_argument("--tts-ms", type=float, default=20.0, help="mock TTS first-byte latency")
+    parser.add_argument("--calls", type=int, default=6, help="calls per trial")
+    parser.add_argument("--gap", type=float, default=0.2, help="seconds between calls")
+    parser.add_argument("--trials", type=int, default=5, help="fresh connection managers per mode")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 First-turn latency: {args.connect_ms:.0f} ms per new connection, median of {args.trials} trials")
+    print(f"{'connections':<14}{'first turn ms':>15}{'steady ms':>12}{'penalty ms':>12}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['first_turn_ms']:>15}{r['steady_turn_ms']:>12}{r['first_turn_penalty_ms']:>12}")
+
+
+if __name__ == "__main__":
+    main()
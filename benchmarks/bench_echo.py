@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark: false interruptions from the playback's echo, with and without echo suppression
+
+Plays answers to ConversationProcessor on the simulation's virtual clock
+(loadtest.simulate) and feeds it the synthetic inbound audio a phone line
+would send back: each answer's echo, delayed (``--delay``), attenuated by the
+echo return loss (``--erl``), smeared, noisy and μ-law coded. In a share of
+the turns (``--barge-in``) the caller also talks over the answer at a random
+point. An energy VAD, which cannot tell the echo from the caller, turns the
+inbound audio into speech start and stop frames. The same seeded turns run
+with EchoSuppressor off and on, and for each the benchmark reports:
+
+- false interruptions per echo-only turn;
+- the share of barge-ins that interrupted the answer, and how long after
+  the caller started;
+- the correlation checks run and their mean cost.
+
+Usage:
+    python benchmarks/bench_echo.py --turns 400 --erl 6,20 --delay 60,400 --barge-in 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+from pipecat.frames.frames import (  # noqa: E402
+    BotStoppedSpeakingFrame,
+    InputAudioRawFrame,
+    OutputAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.audio import FRAME_BYTES, SAMPLE_RATE, linear_to_ulaw, synthetic_utterance, ulaw_to_linear  # noqa: E402
+from loadtest.simulate import VirtualClock, VirtualTimeEventLoop, virtual_time  # noqa: E402
+
+MODES = ("off", "on")
+FRAME_SECONDS = FRAME_BYTES / SAMPLE_RATE
+LINE_RESPONSE = np.array([0.6, 0.3, -0.1])  # Hybrid smearing the echo
+
+
+class EnergyVAD:
+    """Speech starts after ``start`` loud frames in a row and stops after ``stop`` quiet ones."""
+
+    def __init__(self, level: float = 200.0, start: int = 3, stop: int = 15):
+        """Initialize with the RMS level of speech and the frame counts."""
+        self.level = level
+        self.start = start
+        self.stop = stop
+        self.speaking = False
+        self.run = 0
+
+    def hear(self, samples: np.ndarray):
+        """Get the frame a 20 ms frame sets off, if any."""
+        loud = float(np.sqrt(np.mean(samples * samples))) >= self.level
+        self.run = self.run + 1 if loud != self.speaking else 0
+        if not self.speaking and self.run >= self.start:
+            self.speaking, self.run = True, 0
+            return UserStartedSpeakingFrame()
+        if self.speaking and self.run >= self.stop:
+            self.speaking, self.run = False, 0
+            return UserStoppedSpeakingFrame()
+        return None
+
+
+def pcm_frame(frame_type, samples: np.ndarray):
+    """Wrap 8 kHz samples in an audio frame."""
+    return frame_type(audio=samples.astype("<i2").tobytes(), sample_rate=SAMPLE_RATE, num_channels=1)
+
+
+def make_turn(index: int, args) -> dict:
+    """Build one turn: the answer, what the line sends back and, maybe, the caller barging in."""
+    rng = np.random.default_rng(args.seed * 100003 + index)
+    answer = ulaw_to_linear(synthetic_utterance(args.answer, seed=index)).astype(np.float64)
+    low, high = (float(value) for value in args.erl.split(","))
+    gain = 10 ** (-rng.uniform(low, high) / 20)
+    low, high = (float(value) / 1000 for value in args.delay.split(","))
+    delay = int(rng.uniform(low, high) * SAMPLE_RATE)
+
+    length = len(answer) + int(args.tail * SAMPLE_RATE)
+    heard = np.zeros(length)
+    echo = np.convolve(answer, LINE_RESPONSE)[: len(answer)] * gain
+    heard[delay : delay + len(echo)] += echo[: length - delay]
+    barge_in = None
+    if rng.random() < args.barge_in:
+        barge_in = int(rng.uniform(0.3, args.answer - 0.8) * SAMPLE_RATE)
+        caller = ulaw_to_linear(synthetic_utterance(1.5, seed=10**6 + index)).astype(np.float64)
+        caller = caller[: length - barge_in]
+        heard[barge_in : barge_in + len(caller)] += caller
+    heard += rng.normal(0, 30, length)
+    heard = ulaw_to_linear(linear_to_ulaw(np.clip(heard, -32768, 32767))).astype(np.float64)
+    return {"answer": answer, "heard": heard, "barge_in": barge_in}
+
+
+async def run_turns(agent, turns: list) -> dict:
+    """Play each turn's answer while feeding the line's audio through the VAD, and tally interruptions."""
+    loop = asyncio.get_running_loop()
+    call_sid = "CABENCHECHO"
+    agent_module.bind_call_context(call_sid)
+    agent.call_manager.start_call(call_sid, "+15550100", "inbound")
+    agent.performance_monitor.start_call_monitoring(call_sid)
+    processor = agent.create_call_processor(call_sid)
+    metrics = agent.performance_monitor.call_metrics[call_sid]
+    noise = np.random.default_rng(0)
+    tally = {"echo_turns": 0, "false_interruptions": 0, "barge_ins": 0, "detected": 0, "delays": []}
+
+    for turn in turns:
+        vad = EnergyVAD()
+        processor.answering = processor.is_speaking = True
+        before = metrics["interruptions"]
+        start = loop.time()
+        for offset in range(0, len(turn["answer"]), 800):  # Sent ahead in 100 ms chunks, as streamed
+            await processor.process(pcm_frame(OutputAudioRawFrame, turn["answer"][offset : offset + 800]))
+        interrupted_at = None
+        for offset in range(0, len(turn["heard"]), FRAME_BYTES):
+            await asyncio.sleep(max(0.0, start + offset / SAMPLE_RATE - loop.time()))
+            samples = turn["heard"][offset : offset + FRAME_BYTES]
+            await processor.process(pcm_frame(InputAudioRawFrame, samples))
+            vad_frame = vad.hear(samples)
+            if vad_frame is not None:
+                await processor.process(vad_frame)
+            if metrics["interruptions"] > before:
+                interrupted_at = offset
+                break
+        if turn["barge_in"] is None:
+            tally["echo_turns"] += 1
+            tally["false_interruptions"] += interrupted_at is not None
+        else:
+            tally["barge_ins"] += 1
+            if interrupted_at is not None and interrupted_at >= turn["barge_in"]:
+                tally["detected"] += 1
+                tally["delays"].append((interrupted_at - turn["barge_in"]) / SAMPLE_RATE * 1000)
+
+        # The answer is over (or cut off) and the line carries only noise until the next one
+        await processor.process(BotStoppedSpeakingFrame())
+        for _ in range(int(1.0 / FRAME_SECONDS)):
+            await asyncio.sleep(FRAME_SECONDS)
+            samples = noise.normal(0, 30, FRAME_BYTES)
+            await processor.process(pcm_frame(InputAudioRawFrame, samples))
+            vad_frame = vad.hear(samples)
+            if vad_frame is not None:
+                await processor.process(vad_frame)
+    agent.call_manager.end_call(call_sid, "completed")
+    agent.flight_recorder.end_call(call_sid)
+    return tally
+
+
+def run_mode(mode: str, turns: list, args) -> dict:
+    """Run the turns with a fresh agent, echo suppression off or on."""
+    random.seed(args.seed)
+    clock = VirtualClock(datetime.now().timestamp())
+    loop = VirtualTimeEventLoop(clock)
+    with virtual_time(clock):
+        agent = agent_module.TwilioVoiceAgent()
+        suppressor = agent.echo_suppressor = agent_module.EchoSuppressor(threshold=args.threshold, enabled=mode == "on")
+        score, costs = suppressor.score, []
+
+        def timed_score(call, now):
+            started = time.perf_counter()
+            try:
+                return score(call, now)
+            finally:
+                costs.append(time.perf_counter() - started)
+
+        suppressor.score = timed_score
+        try:
+            tally = loop.run_until_complete(run_turns(agent, turns))
+        finally:
+            loop.close()
+
+    delays = sorted(tally["delays"])
+    return {
+        "mode": mode,
+        "echo_turns": tally["echo_turns"],
+        "false_interruption_rate": round(tally["false_interruptions"] / max(1, tally["echo_turns"]), 3),
+        "barge_ins": tally["barge_ins"],
+        "barge_in_detected": round(tally["detected"] / max(1, tally["barge_ins"]), 3),
+        "detection_p50_ms": round(delays[len(delays) // 2]) if delays else 0,
+        "checks": len(costs),
+        "check_mean_ms": round(1000 * sum(costs) / len(costs), 3) if costs else 0.0,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=400, help="answers played")
+    parser.add_argument("--answer", type=float, default=4.0, help="seconds per answer")
+    parser.add_argument("--tail", type=float, default=0.6, help="seconds of line audio after each answer")
+    parser.add_argument("--erl", default="6,20", help="echo return loss range in dB")
+    parser.add_argument("--delay", default="60,400", help="echo round trip range in ms")
+    parser.add_argument("--barge-in", type=float, default=0.3, help="share of turns where the caller talks over")
+    parser.add_argument("--threshold", type=float, default=0.6, help="correlation that marks a speech start as echo")
+    parser.add_argument("--seed", type=int, default=7, help="random seed")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("ERROR")
+    turns = [make_turn(index, args) for index in range(args.turns)]
+    results = [run_mode(mode, turns, args) for mode in MODES]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 {args.turns} answers of {args.answer} s: ERL {args.erl} dB, delay {args.delay} ms")
+    print(
+        f"{'echo':<6}{'false interrupt':>17}{'barge-ins':>11}{'detected':>10}{'p50 ms':>8}{'checks':>8}{'ms/check':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<6}{r['false_interruption_rate']:>17}{r['barge_ins']:>11}{r['barge_in_detected']:>10}"
+            f"{r['detection_p50_ms']:>8}{r['checks']:>8}{r['check_mean_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM turn latency with a single backend versus hedging across two
+
+Starts two loadtest mock LLM servers. The primary has a heavy tail (``--primary
+median,p95``) and the secondary is a bit slower at the median but steadier.
+The same turns go through LLMRouter with only the primary, then with both
+backends and hedging at the primary's rolling p90. The benchmark reports turn
+latency percentiles, how many turns were hedged, the estimated cost overhead
+of cancelled requests and the latency the router credits to hedges.
+
+Usage:
+    python benchmarks/bench_hedging.py --turns 400 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import aiohttp  # noqa: E402
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.clients import OpenAIStreamingClient  # noqa: E402
+from loadtest.mock_providers import LatencyProfile, MockProviders, start_mock_providers  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "hola, quiero revisar el estado de mi pedido por favor"}]
+
+
+def percentile(values: list, q: float) -> float:
+    """Get a percentile by nearest rank."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_mode(backends: list, args) -> dict:
+    """Send every turn through a router over ``backends``, ``concurrency`` at a time."""
+    router = agent_module.LLMRouter(backends, min_samples=20, registry=agent_module.MetricsRegistry())
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def turn():
+        async with semaphore:
+            start = time.perf_counter()
+            await router.complete(MESSAGES)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(turn() for _ in range(args.turns)))
+    stats = router.get_stats()
+    return {
+        "backends": len(backends),
+        "p50_ms": round(percentile(latencies, 0.5), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "hedged_pct": round(100 * stats["hedged"] / stats["turns"], 1),
+        "cost_overhead_pct": round(100 * stats["cost_overhead_ratio"], 1),
+        "latency_gained_s": stats["latency_gained_s"],
+    }
+
+
+async def run(args) -> list:
+    """Start both mock servers and run the single-backend and hedged modes."""
+    runners, clients = [], []
+    async with aiohttp.ClientSession() as session:
+        try:
+            for profile in (args.primary, args.secondary):
+                runner, url = await start_mock_providers(
+                    MockProviders(llm=LatencyProfile.parse(profile), token_interval_ms=1.0)
+                )
+                runners.append(runner)
+                clients.append(OpenAIStreamingClient(session, url, "benchmark"))
+            primary = agent_module.LLMBackend("primary", clients[0], args.cost_per_1k)
+            secondary = agent_module.LLMBackend("secondary", clients[1], args.cost_per_1k)
+            return [await run_mode([primary], args), await run_mode([primary, secondary], args)]
+        finally:
+            for runner in runners:
+                await runner.cleanup()
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--primary", default="300,1500", help="primary LLM latency median,p95 in ms")
+    parser.add_argument("--secondary", default="350,700", help="secondary LLM latency median,p95 in ms")
+    parser.add_argument("--turns", type=int, default=400, help="turns per mode")
+    parser.add_argument("--concurrency", type=int, default=8, help="turns in flight at once")
+    parser.add_argument("--cost-per-1k", type=float, default=0.0004, help="USD per 1K tokens for both backends")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 {args.turns} LLM turns: primary {args.primary} ms, secondary {args.secondary} ms (median,p95)")
+    print(f"{'backends':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'hedged %':>10}{'cost +%':>10}{'gained s':>10}")
+    for r in results:
+        print(
+            f"{r['backends']:<10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}"
+            f"{r['hedged_pct']:>10}{r['cost_overhead_pct']:>10}{r['latency_gained_s']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM turn latency under a provider concurrency cap, with and without the adaptive limiter
+
+Runs the loadtest mock OpenAI endpoint with ``--capacity`` concurrent requests
+allowed; any request over it gets an immediate 429. Waves of concurrent turns
+are sent through OpenAIStreamingClient. A turn that gets a 429 retries after
+an exponential backoff, as provider SDKs do. Every fourth turn is a call's
+first turn. With ``unlimited`` every turn goes straight to the provider. With
+``aimd`` turns pass through ConcurrencyLimiter, which learns the cap from the
+429s and queues the excess, first turns ahead. The benchmark reports turn
+latency, the 429s received and queue wait.
+
+Usage:
+    python benchmarks/bench_limiter.py --capacity 8 --turns 40 --waves 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import aiohttp  # noqa: E402
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.clients import OpenAIStreamingClient, ProviderError  # noqa: E402
+from loadtest.mock_providers import LatencyProfile, MockProviders, start_mock_providers  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "hola, quiero revisar mi pedido"}]
+
+
+async def turn(llm, limiter, priority: int, retry_ms: float, max_retries: int) -> dict:
+    """Complete one turn, retrying 429s with exponential backoff; get its latency and 429 count."""
+    start = time.perf_counter()
+    throttled = 0
+    for attempt in range(max_retries + 1):
+        try:
+            if limiter is None:
+                await llm.complete(MESSAGES)
+            else:
+                async with limiter.slot(priority):
+                    await llm.complete(MESSAGES)
+            break
+        except ProviderError as e:
+            if e.status != 429 or attempt == max_retries:
+                raise
+            throttled += 1
+            await asyncio.sleep(retry_ms / 1000 * 2**attempt)
+    return {"latency_ms": (time.perf_counter() - start) * 1000, "throttled": throttled, "priority": priority}
+
+
+def percentile(values: list, q: float) -> float:
+    """Get a percentile by nearest rank."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_mode(provider_url: str, mode: str, args) -> dict:
+    """Send every wave in one mode and summarize its turns."""
+    limiter = None
+    if mode == "aimd":
+        limiter = agent_module.ConcurrencyLimiter(
+            "openai", max_limit=args.max_limit, registry=agent_module.MetricsRegistry()
+        )
+    results = []
+    async with aiohttp.ClientSession() as session:
+        llm = OpenAIStreamingClient(session, provider_url, "benchmark")
+        for _ in range(args.waves):
+            priorities = [
+                agent_module.ConcurrencyLimiter.FIRST_TURN if i % 4 == 0 else agent_module.ConcurrencyLimiter.TURN
+                for i in range(args.turns)
+            ]
+            results += await asyncio.gather(
+                *(turn(llm, limiter, priority, args.retry_ms, args.max_retries) for priority in priorities)
+            )
+            await asyncio.sleep(args.gap)
+
+    latencies = [r["latency_ms"] for r in results]
+    first_turns = [r["latency_ms"] for r in results if r["priority"] == agent_module.ConcurrencyLimiter.FIRST_TURN]
+    return {
+        "mode": mode,
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "first_turn_p95_ms": round(percentile(first_turns, 0.95), 1),
+        "throttled": sum(r["throttled"] for r in results),
+        "queue_wait_p95_ms": limiter.get_stats()["queue_wait_p95_ms"] if limiter else None,
+        "final_limit": round(limiter.limit, 1) if limiter else None,
+    }
+
+
+async def run(args) -> list:
+    """Run both modes against one mock server."""
+    providers = MockProviders(
+        llm=LatencyProfile(args.llm_ms, args.llm_ms * 1.5), token_interval_ms=1.0, capacity={"llm": args.capacity}
+    )
+    runner, provider_url = await start_mock_providers(providers)
+    try:
+        return [await run_mode(provider_url, mode, args) for mode in ("unlimited", "aimd")]
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capacity", type=int, default=8, help="concurrent requests the mock LLM accepts")
+    parser.add_argument("--llm-ms", type=float, default=100.0, help="mock LLM median latency")
+    parser.add_argument("--turns", type=int, default=40, help="concurrent turns per wave")
+    parser.add_argument("--waves", type=int, default=5, help="waves of turns")
+    parser.add_argument("--gap", type=float, default=0.2, help="seconds between waves")
+    parser.add_argument("--retry-ms", type=float, default=100.0, help="first retry backoff after a 429")
+    parser.add_argument("--max-retries", type=int, default=8, help="retries before a turn fails")
+    parser.add_argument("--max-limit", type=int, default=32, help="upper bound of the adaptive limit")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 {args.waves} waves of {args.turns} turns against an LLM accepting {args.capacity} at a time")
+    print(f"{'mode':<12}{'p50 ms':>10}{'p95 ms':>10}{'1st turn p95':>14}{'429s':>8}{'queue p95':>12}{'limit':>8}")
+    for r in results:
+        queue = r["queue_wait_p95_ms"] if r["queue_wait_p95_ms"] is not None else "-"
+        limit = r["final_limit"] if r["final_limit"] is not None else "-"
+        print(
+            f"{r['mode']:<12}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['first_turn_p95_ms']:>14}"
+            f"{r['throttled']:>8}{queue:>12}{limit:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event-loop lag caused by logging on the hot path
+
+Runs N simulated calls on one asyncio loop. Each call emits the conversation
+processor's per-frame and per-turn log lines at audio frame pace (20 ms),
+while a probe task measures how late its 5 ms timer fires. Compares logging
+off, synchronous handlers (the old basicConfig setup) and the queue-based
+LogPipeline, with and without the per-frame rate limit.
+
+Usage:
+    python benchmarks/bench_logging_lag.py --calls 200 --duration 5
+    python benchmarks/bench_logging_lag.py --calls 200 --write-delay-us 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import twilio_voice_agent as agent_module  # noqa: E402
+
+FRAME_INTERVAL = 0.02  # 20 ms audio frames
+PROBE_INTERVAL = 0.005
+
+
+class SlowStream:
+    """Stream whose writes block for a fixed time, like stderr piped to a busy log collector."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def percentile(values, q):
+    """Get a percentile from a list of samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def simulated_call(index, stop):
+    """Log like ConversationProcessor does for one call."""
+    log = logging.getLogger("twilio_voice_agent")
+    frame = 0
+    while not stop.is_set():
+        log.info("🔇 User stopped speaking", extra={"category": "frame"})
+        if frame % 50 == 0:
+            log.info("🎯 User said: %s", f"hola, llamada {index}", extra={"category": "transcript"})
+            log.info("⚡ Response latency: %.3fs", 0.42, extra={"category": "latency"})
+        frame += 1
+        await asyncio.sleep(FRAME_INTERVAL)
+
+
+async def measure_lag(calls, duration):
+    """Run the calls and return timer overshoot samples in seconds."""
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(simulated_call(i, stop)) for i in range(calls)]
+    lags = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return lags
+
+
+def run_scenario(name, calls, duration, log_path, write_delay):
+    """Configure logging for a scenario and measure loop lag."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    stream = SlowStream(write_delay)
+    pipeline = None
+
+    if name == "off":
+        root.setLevel(logging.WARNING)
+    elif name == "sync":
+        root.setLevel(logging.INFO)
+        for handler in (logging.StreamHandler(stream), logging.FileHandler(log_path, encoding="utf-8")):
+            handler.setFormatter(agent_module.TextLogFormatter())
+            root.addHandler(handler)
+    else:
+        rate_limits = {"frame": 20} if name == "async + frame limit" else {}
+        pipeline = agent_module.LogPipeline(log_file=log_path, rate_limits=rate_limits, stream=stream)
+        pipeline.install(force=True)
+
+    lags = asyncio.run(measure_lag(calls, duration))
+
+    stats = pipeline.get_stats() if pipeline else {}
+    if pipeline:
+        pipeline.stop()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    return {
+        "scenario": name,
+        "lag_p50_ms": round(percentile(lags, 0.50) * 1000, 3),
+        "lag_p99_ms": round(percentile(lags, 0.99) * 1000, 3),
+        "lag_max_ms": round(max(lags) * 1000, 3) if lags else 0.0,
+        "suppressed": stats.get("rate_limited", 0) + stats.get("sampled", 0) + stats.get("dropped", 0),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="concurrent simulated calls")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--write-delay-us", type=float, default=0.0, help="blocking time per stderr write")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.log_pipeline.stop()
+    with tempfile.TemporaryDirectory() as directory:
+        results = [
+            run_scenario(
+                name, args.calls, args.duration, os.path.join(directory, "voice_agent.log"), args.write_delay_us / 1e6
+            )
+            for name in ("off", "sync", "async", "async + frame limit")
+        ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"\n📊 Event-loop lag with {args.calls} calls logging every {FRAME_INTERVAL * 1000:.0f} ms"
+        f" ({args.write_delay_us:.0f} µs per stderr write)"
+    )
+    print(f"{'scenario':<22}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'suppressed':>12}")
+    for r in results:
+        print(f"{r['scenario']:<22}{r['lag_p50_ms']:>9}{r['lag_p99_ms']:>9}{r['lag_max_ms']:>9}{r['suppressed']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /metrics scrape cost versus samples recorded per call
+
+Populates active calls, records latency samples through PerformanceMonitor and
+RealCallManager, and times one /metrics render against one
+RealCallManager.get_performance_metrics call (which recomputes from raw
+samples). The pre-aggregated histograms keep scrape cost flat as samples grow.
+
+Usage:
+    python benchmarks/bench_metrics_scrape.py --calls 1000 --samples 10 100 1000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import twilio_voice_agent as agent_module  # noqa: E402
+
+
+def time_call(function, repeat):
+    """Get the mean wall time of a function in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run_scenario(calls, samples, repeat):
+    """Populate calls with samples and time both ways of reading them."""
+    registry = agent_module.MetricsRegistry()
+    monitor = agent_module.PerformanceMonitor(registry)
+    call_manager = agent_module.RealCallManager()
+    registry.gauge("voice_agent_active_calls", "Calls in progress", callback=lambda: len(call_manager.active_calls))
+
+    for i in range(calls):
+        call_sid = f"CA{i:06d}"
+        call_manager.start_call(call_sid, f"+1555{i:07d}")
+        monitor.start_call_monitoring(call_sid)
+        for n in range(samples):
+            latency = 0.2 + (n % 10) * 0.05
+            for stage in ("stt", "llm", "tts"):
+                getattr(monitor, f"record_{stage}_latency")(call_sid, latency)
+                call_manager.record_performance_metric(call_sid, stage, latency * 1000)
+            monitor.record_roundtrip_latency(call_sid, latency * 2)
+            call_manager.record_performance_metric(call_sid, "total", latency * 2000)
+
+    return {
+        "calls": calls,
+        "samples_per_call": samples,
+        "scrape_ms": round(time_call(registry.render, repeat), 3),
+        "scrape_bytes": len(registry.render()),
+        "performance_ms": round(time_call(call_manager.get_performance_metrics, repeat), 3),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000, help="active calls to populate")
+    parser.add_argument("--samples", type=int, nargs="+", default=[10, 100, 1000], help="samples per call")
+    parser.add_argument("--repeat", type=int, default=20, help="timed reads per scenario")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    results = [run_scenario(args.calls, samples, args.repeat) for samples in args.samples]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Scrape cost with {args.calls} active calls ({args.repeat} reads each)")
+    print(f"{'samples/call':<14}{'/metrics ms':>13}{'bytes':>9}{'/performance ms':>17}")
+    for r in results:
+        print(f"{r['samples_per_call']:<14}{r['scrape_ms']:>13}{r['scrape_bytes']:>9}{r['performance_ms']:>17}")
+
+
+if __name__ == "__main__":
+    main()
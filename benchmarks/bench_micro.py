@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite for the per-utterance CPU path, with baseline regression checks
+
+Times the code every caller utterance runs through: language detection, slang
+and audio-quality checks, TwiML generation, call-manager recording and
+aggregation, μ-law codec work and a full ConversationProcessor turn with
+instant provider stubs. Transcript corpora come from the phrase lists in
+test_twilio_agent.py. Each result is the per-item cost in nanoseconds (the
+best and median of several repeats).
+
+Save a baseline, then compare later runs against it. A comparison exits with
+status 1 when any benchmark is slower than the baseline by more than the
+threshold. Comparisons use each benchmark's cost relative to a fixed
+reference workload timed in the same round, which cancels out most machine
+speed drift between the two runs.
+
+Usage:
+    python benchmarks/bench_micro.py --save benchmarks/baselines/main.json
+    python benchmarks/bench_micro.py --compare benchmarks/baselines/main.json --threshold 20
+    python benchmarks/bench_micro.py --only codec pipeline --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import numpy as np  # noqa: E402
+from loguru import logger  # noqa: E402
+from pipecat.frames.frames import BotStoppedSpeakingFrame, TranscriptionFrame, UserStoppedSpeakingFrame  # noqa: E402
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.audio import frame_energy, linear_to_ulaw, synthetic_utterance, ulaw_to_linear  # noqa: E402
+from test_twilio_agent import MultilingualCallSimulator  # noqa: E402
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark; the function returns (operation, items per operation)."""
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def corpus() -> Dict[str, List[str]]:
+    """Get the caller phrases from the test suite's call simulator."""
+    phrases = MultilingualCallSimulator(agent=None, metrics=None)
+    return {
+        "slang": phrases.mexican_slang,
+        "english": phrases.english_phrases,
+        "edge_cases": phrases.edge_cases,
+        "low_quality": phrases.low_quality_phrases,
+    }
+
+
+def all_phrases() -> List[str]:
+    """Get every corpus phrase in one list."""
+    return [phrase for phrases in corpus().values() for phrase in phrases]
+
+
+@benchmark("language.detect_language_from_text")
+def bench_detect_language(agent) -> Tuple[Callable, int]:
+    """Language detection over the whole corpus."""
+    phrases = all_phrases()
+    detect = agent.language_manager.detect_language_from_text
+    return (lambda: [detect(phrase) for phrase in phrases]), len(phrases)
+
+
+@benchmark("agent.detect_mexican_slang")
+def bench_detect_slang(agent) -> Tuple[Callable, int]:
+    """Slang pattern matching over the whole corpus."""
+    phrases = all_phrases()
+    return (lambda: [agent.detect_mexican_slang(phrase) for phrase in phrases]), len(phrases)
+
+
+@benchmark("agent.detect_audio_quality_issues")
+def bench_audio_quality(agent) -> Tuple[Callable, int]:
+    """Audio-quality heuristics over the whole corpus."""
+    phrases = all_phrases()
+    return (lambda: [agent.detect_audio_quality_issues(phrase) for phrase in phrases]), len(phrases)
+
+
+@benchmark("twiml.consent")
+def bench_consent_twiml(agent) -> Tuple[Callable, int]:
+    """Consent TwiML for an incoming call."""
+    return agent.generate_consent_twiml, 1
+
+
+@benchmark("twiml.greeting")
+def bench_greeting_twiml(agent) -> Tuple[Callable, int]:
+    """Greeting TwiML after consent."""
+    return agent.generate_greeting_twiml, 1
+
+
+@benchmark("calls.record_performance_metric")
+def bench_record_metric(agent) -> Tuple[Callable, int]:
+    """Recording one latency sample of each kind on an active call."""
+    manager = agent.call_manager
+    manager.start_call("CABENCH0000", "+15550100")
+    types = ("stt", "llm", "tts", "total")
+    return (lambda: [manager.record_performance_metric("CABENCH0000", kind, 120.0) for kind in types]), len(types)
+
+
+@benchmark("calls.get_performance_metrics")
+def bench_get_metrics(agent) -> Tuple[Callable, int]:
+    """Aggregating /performance over 50 active calls with 100 samples of each kind."""
+    manager = agent.call_manager
+    for i in range(50):
+        call_sid = f"CABENCH{i + 1:04d}"
+        manager.start_call(call_sid, "+15550100")
+        for kind in ("stt", "llm", "tts", "total"):
+            for j in range(100):
+                manager.record_performance_metric(call_sid, kind, 100.0 + j)
+    return manager.get_performance_metrics, 1
+
+
+@benchmark("codec.ulaw_encode_frame")
+def bench_ulaw_encode(agent) -> Tuple[Callable, int]:
+    """Encoding one 20 ms frame of PCM to μ-law."""
+    frame = (np.sin(np.linspace(0, 40, 160)) * 8000).astype(np.int16)
+    return (lambda: linear_to_ulaw(frame)), 1
+
+
+@benchmark("codec.ulaw_decode_frame")
+def bench_ulaw_decode(agent) -> Tuple[Callable, int]:
+    """Decoding one 20 ms μ-law frame."""
+    frame = synthetic_utterance(0.02)
+    return (lambda: ulaw_to_linear(frame)), 1
+
+
+@benchmark("codec.frame_energy")
+def bench_frame_energy(agent) -> Tuple[Callable, int]:
+    """RMS energy of one 20 ms μ-law frame."""
+    frame = synthetic_utterance(0.02)
+    return (lambda: frame_energy(frame)), 1
+
+
+@benchmark("pipeline.turn")
+def bench_pipeline_turn(agent) -> Tuple[Callable, int]:
+    """A full turn through ConversationProcessor with instant LLM and TTS."""
+
+    class InstantLLM:
+        async def complete(self, messages):
+            return SimpleNamespace(content="Claro, con gusto le ayudo con su reserva.")
+
+    class InstantTTS:
+        async def synthesize(self, text, **options):
+            return b""
+
+    agent.llm_service, agent.tts_service = InstantLLM(), InstantTTS()
+    agent.response_cache.enabled = False  # Every iteration asks the same questions: measure the LLM path
+    agent.turn_taking.enabled = False  # Measure the turn's CPU, not the endpointing hold
+    agent.call_manager.start_call("CABENCHTURN", "+15550100")
+    agent.performance_monitor.start_call_monitoring("CABENCHTURN")
+    processor = agent.create_call_processor("CABENCHTURN")
+    phrases = all_phrases()
+    loop = asyncio.new_event_loop()
+
+    async def turns():
+        for phrase in phrases:
+            await processor.process(UserStoppedSpeakingFrame())
+            await processor.process(TranscriptionFrame(text=phrase, user_id="CABENCHTURN", timestamp=""))
+            await processor.process(BotStoppedSpeakingFrame())
+        processor.conversation_history.clear()
+        processor.last_user_input = ""
+
+    return (lambda: loop.run_until_complete(turns())), len(phrases)
+
+
+@benchmark("pipeline.build")
+def bench_pipeline_build(agent) -> Tuple[Callable, int]:
+    """Building a call's processor and Pipeline at answer time (the pool's cold path)."""
+    logger.disable("pipecat")  # Pipeline linking logs at DEBUG
+    return (lambda: agent.build_call_pipeline("es-LA")), 1
+
+
+@benchmark("pipeline.acquire")
+def bench_pipeline_acquire(agent) -> Tuple[Callable, int]:
+    """Taking a pre-built pipeline from the pool, binding it to a call and releasing it."""
+
+    def acquire_release():
+        agent.release_call_processor(agent.acquire_call_processor("CABENCHPOOL", "es-LA"))
+
+    return acquire_release, 1
+
+
+def reference_workload():
+    """Fixed pure-Python work; results are also expressed relative to it to cancel out machine speed."""
+    return sorted(str(i * 7919 % 1000) for i in range(200))
+
+
+def time_batch(operation: Callable, loops: int) -> int:
+    """Run ``operation`` ``loops`` times and get the elapsed nanoseconds."""
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        operation()
+    return time.perf_counter_ns() - start
+
+
+def calibrate(operation: Callable, min_time: float) -> int:
+    """Get the number of loops that makes one timed batch last at least ``min_time`` seconds."""
+    loops = 1
+    while (elapsed := time_batch(operation, loops)) < min_time * 1e9:
+        loops = max(loops * 2, int(loops * min_time * 1e9 / max(elapsed, 1) * 1.2))
+    return loops
+
+
+def compare(baseline: Dict, current: Dict, threshold_pct: float) -> List[Dict]:
+    """Compare with a baseline; a benchmark regresses when slower by more than the threshold.
+
+    The machine-normalized ``relative`` cost is compared when both runs have
+    it, so a baseline from a quieter moment or a faster host does not fail
+    every benchmark.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        key = "relative" if "relative" in result and "relative" in base else "min_ns"
+        change = (result[key] / base[key] - 1) * 100
+        rows.append(
+            {
+                "name": name,
+                "baseline_ns": base["min_ns"],
+                "current_ns": result["min_ns"],
+                "change_pct": round(change, 1),
+                "regressed": change > threshold_pct,
+            }
+        )
+    return rows
+
+
+def run_suite(names: List[str], repeat: int, min_time: float) -> Dict:
+    """Run the selected benchmarks against a fresh agent.
+
+    Repeats are interleaved: each round times the reference workload and then
+    one batch of every benchmark, so the best batch of each is likely taken in
+    the same machine state. ``relative`` is the best time over the reference's
+    best time.
+    """
+    agent = agent_module.TwilioVoiceAgent()
+    operations = {}
+    for name in names:
+        operation, items = BENCHMARKS[name](agent)
+        operation()  # Warm up caches and lazy imports
+        operations[name] = (operation, items, calibrate(operation, min_time))
+    reference_loops = calibrate(reference_workload, min_time)
+
+    samples: Dict[str, List[float]] = {name: [] for name in names}
+    reference = []
+    for _ in range(repeat):
+        reference.append(time_batch(reference_workload, reference_loops) / reference_loops)
+        for name, (operation, items, loops) in operations.items():
+            samples[name].append(time_batch(operation, loops) / (loops * items))
+
+    results = {
+        name: {
+            "min_ns": round(min(samples[name]), 1),
+            "median_ns": round(statistics.median(samples[name]), 1),
+            "relative": round(min(samples[name]) / min(reference), 5),
+            "loops": operations[name][2],
+        }
+        for name in names
+    }
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "results": results,
+    }
+
+
+def main():
+    """Run the suite, then save or compare baselines."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", default=[], help="run benchmarks whose name contains any of these")
+    parser.add_argument("--repeat", type=int, default=7, help="timed batches per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per timed batch")
+    parser.add_argument("--save", help="write results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="compare against a JSON baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed slowdown in percent")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    names = [name for name in BENCHMARKS if not args.only or any(part in name for part in args.only)]
+    current = run_suite(names, args.repeat, args.min_time)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+
+    rows = []
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(json.load(f), current, args.threshold)
+
+    if args.json:
+        print(json.dumps({**current, "comparison": rows}, indent=2))
+    else:
+        print(f"\n📊 Micro-benchmarks (ns per item, best/median of {args.repeat})")
+        print(f"{'benchmark':<38}{'best':>12}{'median':>12}")
+        for name, result in current["results"].items():
+            print(f"{name:<38}{result['min_ns']:>12,.0f}{result['median_ns']:>12,.0f}")
+        if rows:
+            print(f"\n📊 Against {args.compare} (threshold {args.threshold:.0f}%)")
+            print(f"{'benchmark':<38}{'baseline':>12}{'current':>12}{'change':>9}")
+            for row in rows:
+                flag = "  ❌" if row["regressed"] else ""
+                print(
+                    f"{row['name']:<38}{row['baseline_ns']:>12,.0f}{row['current_ns']:>12,.0f}"
+                    f"{row['change_pct']:>+8.1f}%{flag}"
+                )
+
+    if any(row["regressed"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
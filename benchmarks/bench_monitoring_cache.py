@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recording-path lock contention under monitoring load
+
+Drives /health, /performance and /language at a fixed request rate while a
+recording thread calls RealCallManager.record_performance_metric, and reports
+how long the recording path waits on RealCallManager.lock with and without the
+single-flight response cache.
+
+Usage:
+    python benchmarks/bench_monitoring_cache.py --rate 1000 --duration 5 --calls 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import twilio_voice_agent as agent_module  # noqa: E402
+
+ENDPOINTS = ("/health", "/performance", "/language")
+
+
+class UncachedResponses:
+    """Drop-in for ResponseCache that recomputes every request (the old behaviour)."""
+
+    def get(self, key, compute):
+        body = json.dumps(compute(), sort_keys=True, default=str).encode("utf-8")
+        return body, str(hash(body))
+
+
+def percentile(values, q):
+    """Get a percentile from a list of samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def populate_calls(call_manager, calls):
+    """Create active calls with a full window of latency samples each."""
+    for i in range(calls):
+        call_sid = f"CA{i:06d}"
+        call_manager.start_call(call_sid, f"+1555{i:07d}")
+        for _ in range(100):
+            for metric in ("stt", "llm", "tts", "total"):
+                call_manager.record_performance_metric(call_sid, metric, 250.0)
+
+
+def run_scenario(name, cache, rate, duration, workers):
+    """Run monitoring load and the recording path together and collect timings."""
+    agent_module.response_cache = cache
+    call_manager = agent_module.voice_agent.call_manager
+
+    # Count how often and how long the monitoring side computes metrics under the lock
+    original = call_manager.get_performance_metrics
+    compute_times = []
+
+    def timed_metrics():
+        start = time.perf_counter()
+        try:
+            return original()
+        finally:
+            compute_times.append(time.perf_counter() - start)
+
+    call_manager.get_performance_metrics = timed_metrics
+
+    stop = threading.Event()
+    record_waits = []
+    requests_sent = [0] * workers
+
+    def recording_path():
+        i = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            call_manager.record_performance_metric(f"CA{i % 100:06d}", "total", 300.0)
+            record_waits.append(time.perf_counter() - start)
+            i += 1
+            time.sleep(0.001)
+
+    def monitoring_worker(index):
+        client = agent_module.app.test_client()
+        interval = workers / rate
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            client.get(ENDPOINTS[requests_sent[index] % len(ENDPOINTS)])
+            requests_sent[index] += 1
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    threads = [threading.Thread(target=recording_path)]
+    threads += [threading.Thread(target=monitoring_worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    call_manager.get_performance_metrics = original
+
+    return {
+        "scenario": name,
+        "monitoring_rps": round(sum(requests_sent) / duration, 1),
+        "metric_computations": len(compute_times),
+        "avg_compute_ms": round(statistics.mean(compute_times) * 1000, 3) if compute_times else 0.0,
+        "record_p50_us": round(percentile(record_waits, 0.50) * 1e6, 1),
+        "record_p99_us": round(percentile(record_waits, 0.99) * 1e6, 1),
+        "record_max_us": round(max(record_waits) * 1e6, 1) if record_waits else 0.0,
+        "records": len(record_waits),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=int, default=1000, help="monitoring requests per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--calls", type=int, default=500, help="active calls to populate")
+    parser.add_argument("--workers", type=int, default=16, help="monitoring client threads")
+    parser.add_argument("--ttl-ms", type=float, default=250.0, help="cache TTL for the cached scenario")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    agent_module.voice_agent = agent_module.TwilioVoiceAgent()
+    populate_calls(agent_module.voice_agent.call_manager, args.calls)
+
+    results = [
+        run_scenario("uncached", UncachedResponses(), args.rate, args.duration, args.workers),
+        run_scenario(
+            f"cached ({args.ttl_ms:.0f} ms)",
+            agent_module.ResponseCache(ttl=args.ttl_ms / 1000),
+            args.rate,
+            args.duration,
+            args.workers,
+        ),
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Monitoring load: {args.rate} req/s target, {args.calls} active calls, {args.duration}s per scenario")
+    print(f"{'scenario':<18}{'req/s':>9}{'computes':>10}{'compute ms':>12}{'rec p50 µs':>12}{'rec p99 µs':>12}")
+    for r in results:
+        print(
+            f"{r['scenario']:<18}{r['monitoring_rps']:>9}{r['metric_computations']:>10}"
+            f"{r['avg_compute_ms']:>12}{r['record_p50_us']:>12}{r['record_p99_us']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of running /debug/profile against live traffic
+
+Runs a CPU-bound workload on an asyncio loop (standing in for call
+pipelines) alongside idle threads, and compares its throughput with and
+without the sampling profiler running at several sampling intervals.
+
+Usage:
+    python benchmarks/bench_profiler_overhead.py --seconds 3 --intervals 10 5 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import twilio_voice_agent as agent_module  # noqa: E402
+
+
+async def workload(seconds, tasks):
+    """Count units of work done by concurrent tasks in a fixed time."""
+    done = [0]
+
+    async def call(index):
+        agent_module.bind_call_context(f"CA{index:06d}")
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            sum(range(2000))
+            done[0] += 1
+            if done[0] % 20 == 0:
+                await asyncio.sleep(0)
+
+    await asyncio.gather(*(call(i) for i in range(tasks)))
+    return done[0]
+
+
+def run_scenario(seconds, tasks, interval):
+    """Run the workload, optionally while profiling, and return work per second."""
+    profile = {}
+    sampler = None
+    if interval:
+        profiler = agent_module.SamplingProfiler()
+        sampler = threading.Thread(target=lambda: profile.update(profiler.profile(seconds, interval)))
+        sampler.start()
+
+    units = asyncio.run(workload(seconds, tasks))
+    if sampler:
+        sampler.join()
+
+    return {
+        "interval_ms": interval * 1000 if interval else None,
+        "work_per_s": round(units / seconds),
+        "samples": profile.get("samples", 0),
+        "sampling_ms": profile.get("overhead_ms", 0.0),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3.0, help="seconds per scenario")
+    parser.add_argument("--tasks", type=int, default=200, help="concurrent tasks on the loop")
+    parser.add_argument("--threads", type=int, default=20, help="idle threads (Flask workers) to sample")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[10, 5, 1], help="sampling intervals in ms")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    stop = threading.Event()
+    for _ in range(args.threads):
+        threading.Thread(target=stop.wait, daemon=True).start()
+
+    baseline = run_scenario(args.seconds, args.tasks, None)
+    results = [baseline] + [run_scenario(args.seconds, args.tasks, ms / 1000) for ms in args.intervals]
+    for r in results:
+        r["slowdown_pct"] = round((1 - r["work_per_s"] / baseline["work_per_s"]) * 100, 1)
+    stop.set()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Profiler overhead: {args.tasks} loop tasks, {args.threads} idle threads, {args.seconds}s each")
+    print(f"{'interval':<12}{'work/s':>10}{'slowdown %':>12}{'samples':>9}{'sampling ms':>13}")
+    for r in results:
+        label = f"{r['interval_ms']:.0f} ms" if r["interval_ms"] else "off"
+        print(f"{label:<12}{r['work_per_s']:>10}{r['slowdown_pct']:>12}{r['samples']:>9}{r['sampling_ms']:>13}")
+
+
+if __name__ == "__main__":
+    main()
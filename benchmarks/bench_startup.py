@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import time of twilio_voice_agent and time until the server answers health checks
+
+Imports the module in fresh interpreters with ``-X importtime`` and reports the
+total and the heaviest direct imports. The same is measured with the provider
+SDKs imported as well, which is what importing the module cost before they
+became lazy. Then the server is started in ``fast`` and ``eager``
+STARTUP_MODE, and the time until /livez and /readyz first answer 200 is
+measured. No provider is contacted; pre-warming is turned off.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5 --top 8
+    python benchmarks/bench_startup.py --skip-server --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROVIDER_MODULES = ("pipecat.services.deepgram.stt", "pipecat.services.elevenlabs.tts", "pipecat.services.openai.llm")
+PORT = 5001  # Fixed in twilio_voice_agent's __main__
+
+
+def environment() -> Dict[str, str]:
+    """Get the child environment: dummy keys, no stats file, no provider warm-up."""
+    env = dict(os.environ)
+    for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+        env.setdefault(key, "benchmark")
+    env.update(CALL_STATS_PATH="", PROVIDER_PREWARM="false", PYTHONPATH=ROOT)
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """Parse ``-X importtime`` output into (cumulative µs, depth, module) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    return rows
+
+
+def measure_import(statement: str) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """Run ``statement`` in a fresh interpreter and get its total import ms and the parsed rows."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        env=environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    return sum(cumulative for cumulative, depth, _ in rows if depth == 0) / 1000, rows
+
+
+def heaviest(rows: List[Tuple[int, int, str]], top: int) -> List[Dict]:
+    """Get the direct imports of twilio_voice_agent with the largest cumulative time."""
+    children = [(cumulative, name) for cumulative, depth, name in rows if depth == 1]
+    return [{"module": name, "ms": round(cumulative / 1000, 1)} for cumulative, name in sorted(children)[-top:][::-1]]
+
+
+def wait_for(path: str, deadline: float) -> Optional[float]:
+    """Poll an endpoint until it answers 200; get the time it did."""
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{PORT}{path}", timeout=1) as response:
+                if response.status == 200:
+                    return time.monotonic()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def measure_server(mode: str, timeout: float) -> Dict:
+    """Start the server in a STARTUP_MODE and time the first 200 from /livez and /readyz."""
+    env = environment()
+    env["STARTUP_MODE"] = mode
+    start = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "twilio_voice_agent.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        live = wait_for("/livez", start + timeout)
+        ready = wait_for("/readyz", start + timeout)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return {
+        "live_ms": round((live - start) * 1000) if live else None,
+        "ready_ms": round((ready - start) * 1000) if ready else None,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=8, help="heaviest imports to list")
+    parser.add_argument("--skip-server", action="store_true", help="only measure imports")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for the server")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    imports = {}
+    for label, statement in (
+        ("module", "import twilio_voice_agent"),
+        ("module + provider SDKs", f"import twilio_voice_agent, {', '.join(PROVIDER_MODULES)}"),
+    ):
+        runs = [measure_import(statement) for _ in range(args.runs)]
+        imports[label] = {"median_ms": round(statistics.median(total for total, _ in runs), 1)}
+        if label == "module":
+            imports[label]["heaviest"] = heaviest(min(runs)[1], args.top)
+
+    servers = {}
+    if not args.skip_server:
+        for mode in ("fast", "eager"):
+            results = [measure_server(mode, args.timeout) for _ in range(args.runs)]
+            servers[mode] = {
+                key: statistics.median(r[key] for r in results) if all(r[key] for r in results) else None
+                for key in ("live_ms", "ready_ms")
+            }
+
+    if args.json:
+        print(json.dumps({"imports": imports, "startup": servers}, indent=2))
+        return
+
+    print(f"\n📊 Import time (median of {args.runs} fresh interpreters)")
+    for label, result in imports.items():
+        print(f"{label:<28}{result['median_ms']:>10.1f} ms")
+    print("\nHeaviest direct imports of twilio_voice_agent")
+    for entry in imports["module"]["heaviest"]:
+        print(f"  {entry['module']:<40}{entry['ms']:>8.1f} ms")
+    if servers:
+        print("\n📊 Time from process start until 200 (ms)")
+        print(f"{'STARTUP_MODE':<14}{'/livez':>10}{'/readyz':>10}")
+        for mode, result in servers.items():
+            print(f"{mode:<14}{result['live_ms'] or '-':>10}{result['ready_ms'] or '-':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: flight recorder overhead per span and per turn
+
+Times the operations the conversation processor performs on every turn:
+opening and closing a span, recording an event, and starting/finishing a
+turn in the per-call ring buffer.
+
+Usage:
+    python benchmarks/bench_tracing_overhead.py --iterations 200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import twilio_voice_agent as agent_module  # noqa: E402
+
+
+def per_operation_ns(function, iterations):
+    """Get the mean cost of one call in nanoseconds."""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200000, help="operations timed per measurement")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    recorder = agent_module.FlightRecorder(slow_turn_ms=float("inf"))
+    trace = recorder.start_turn("CA000000")
+
+    def span():
+        trace.end(trace.start("llm"))
+        if len(trace.spans) > 1000:
+            trace.spans.clear()
+
+    def event():
+        trace.event("first_audio_sent")
+        if len(trace.events) > 1000:
+            trace.events.clear()
+
+    def turn():
+        recorder.finish_turn(recorder.start_turn("CA000001"))
+
+    results = {
+        "span_ns": round(per_operation_ns(span, args.iterations)),
+        "event_ns": round(per_operation_ns(event, args.iterations)),
+        "turn_ns": round(per_operation_ns(turn, args.iterations // 10)),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Flight recorder overhead ({args.iterations} iterations)")
+    print(f"{'span start+end':<20}{results['span_ns']:>8} ns")
+    print(f"{'event':<20}{results['event_ns']:>8} ns")
+    print(f"{'turn start+finish':<20}{results['turn_ns']:>8} ns")
+
+
+if __name__ == "__main__":
+    main()
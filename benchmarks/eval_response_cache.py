@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation: semantic response cache hit rate and precision over a transcript corpus
+
+Streams a corpus of caller questions through SemanticResponseCache in random
+orders, for each similarity threshold. Each line of the corpus is
+``{"language", "intent", "text"}``, optionally with a ``tenant``. A question
+with an ``intent`` is an FAQ, and a miss stores its intent as the answer. A
+question whose ``intent`` is null depends on the conversation (a follow-up,
+or one carrying a reservation number) and must never be stored. For each
+threshold the evaluation reports:
+
+- the hit rate over cacheable questions;
+- precision, the share of hits whose cached answer has the asker's intent;
+- wrong answers per 1000 questions;
+- how many stateful questions the cache would have stored.
+
+A threshold of 1.0 is exact matching of normalized transcripts.
+
+Usage:
+    python benchmarks/eval_response_cache.py --corpus benchmarks/data/caller_questions.jsonl --orders 20
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Service clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+import twilio_voice_agent as agent_module  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "caller_questions.jsonl")
+
+
+def load_corpus(path: str) -> list:
+    """Read the corpus, one JSON question per line."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(corpus: list, min_similarity: float, orders: int, seed: int) -> dict:
+    """Stream the corpus through a fresh cache in ``orders`` random orders and tally the outcomes."""
+    rng = random.Random(seed)
+    totals = {"questions": 0, "cacheable": 0, "hits": 0, "correct": 0, "unsafe_stored": 0}
+    for _ in range(orders):
+        cache = agent_module.SemanticResponseCache(
+            min_similarity=min_similarity, registry=agent_module.MetricsRegistry()
+        )
+        for question in rng.sample(corpus, len(corpus)):
+            tenant, language = question.get("tenant", ""), question["language"]
+            totals["questions"] += 1
+            hit = cache.lookup(tenant, language, question["text"])
+            if hit is not None:
+                totals["hits"] += 1
+                totals["correct"] += hit.text == question["intent"]
+                continue
+            if not cache.is_cacheable(cache.normalize(question["text"])):
+                continue
+            totals["cacheable"] += 1  # Misses only: hits are counted as cacheable below
+            if question["intent"] is None:
+                totals["unsafe_stored"] += 1
+            else:
+                cache.store(tenant, language, question["text"], question["intent"])
+    cacheable = totals["cacheable"] + totals["hits"]
+    return {
+        "min_similarity": min_similarity,
+        "hit_rate": round(totals["hits"] / cacheable, 4) if cacheable else 0.0,
+        "precision": round(totals["correct"] / totals["hits"], 4) if totals["hits"] else 1.0,
+        "wrong_per_1000": round(1000 * (totals["hits"] - totals["correct"]) / totals["questions"], 2),
+        "unsafe_stored": totals["unsafe_stored"] // orders,
+    }
+
+
+def main():
+    """Run the evaluation."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSONL corpus of caller questions")
+    parser.add_argument(
+        "--thresholds", default="0.5,0.6,0.7,0.75,0.8,0.85,0.9,1.0", help="comma-separated similarity thresholds"
+    )
+    parser.add_argument("--orders", type=int, default=20, help="random orders of the corpus per threshold")
+    parser.add_argument("--seed", type=int, default=7, help="random seed")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("WARNING")
+    corpus = load_corpus(args.corpus)
+    thresholds = [float(value) for value in args.thresholds.split(",")]
+    results = [evaluate(corpus, threshold, args.orders, args.seed) for threshold in thresholds]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    faqs = sum(1 for question in corpus if question["intent"] is not None)
+    print(f"\n📊 {len(corpus)} questions ({faqs} FAQ, {len(corpus) - faqs} stateful), {args.orders} orders")
+    print(f"{'threshold':<12}{'hit rate':>10}{'precision':>11}{'wrong/1000':>12}{'unsafe stored':>15}")
+    for r in results:
+        print(
+            f"{r['min_similarity']:<12}{r['hit_rate']:>10}{r['precision']:>11}"
+            f"{r['wrong_per_1000']:>12}{r['unsafe_stored']:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -137,6 +137,15 @@ const FunnelStep = ({ title, value, icon, color, subtitle, percentage, total, in
   </Grow>
 );
 
+const toCallStats = (callStatsData) => ({
+  totalCalls: callStatsData.total_calls,
+  answeredCalls: callStatsData.answered_calls,
+  positiveCalls: callStatsData.positive_calls,
+  avgCallDuration: callStatsData.avg_call_duration,
+  successRate: callStatsData.success_rate,
+  lastUpdated: new Date(callStatsData.last_updated).toLocaleTimeString(),
+});
+
 const CallStats = () => {
   const [callStats, setCallStats] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -151,14 +160,7 @@ const CallStats = () => {
         // Fetch real data from backend
         const callStatsData = await apiService.getCallStatistics();
         
-        setCallStats({
-          totalCalls: callStatsData.total_calls,
-          answeredCalls: callStatsData.answered_calls,
-          positiveCalls: callStatsData.positive_calls,
-          avgCallDuration: callStatsData.avg_call_duration,
-          successRate: callStatsData.success_rate,
-          lastUpdated: new Date(callStatsData.last_updated).toLocaleTimeString(),
-        });
+        setCallStats(toCallStats(callStatsData));
         
       } catch (error) {
         console.error('Error fetching call stats:', error);
@@ -179,12 +181,21 @@ const CallStats = () => {
       }
     };
 
+    // Apply daily stats pushed by the backend
+    const applyPushedStats = (callStatsData) => {
+      setCallStats(toCallStats(callStatsData));
+      setError(null);
+    };
+
     fetchCallStats();
     
-    // Refresh every 30 seconds
-    const interval = setInterval(fetchCallStats, 30000);
+    // Live updates from /events instead of polling
+    const unsubscribe = apiService.subscribeToEvents({
+      snapshot: (data) => applyPushedStats(data.call_stats),
+      call_stats: applyPushedStats,
+    });
     
-    return () => clearInterval(interval);
+    return unsubscribe;
   }, []);
 
   if (!callStats) {
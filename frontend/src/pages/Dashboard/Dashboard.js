@@ -77,12 +77,25 @@ function Dashboard() {
       }
     };
 
+    // Merge metric deltas pushed by the backend into the latest data
+    const mergePerformance = (delta) => {
+      setDashboardData((previous) =>
+        previous ? { ...previous, performance: { ...previous.performance, ...delta } } : previous
+      );
+    };
+
     fetchDashboardData();
     
-    // Refresh data every 30 seconds
-    const interval = setInterval(() => fetchDashboardData(), 30000);
+    // Live updates from /events instead of polling
+    const unsubscribe = apiService.subscribeToEvents({
+      snapshot: (data) => mergePerformance(data.performance),
+      call_started: ({ active_calls }) => mergePerformance({ active_calls }),
+      call_ended: ({ active_calls }) => mergePerformance({ active_calls }),
+      latency: ({ active_calls }) => mergePerformance({ active_calls }),
+      call_stats: ({ total_calls }) => mergePerformance({ total_calls_today: total_calls }),
+    });
     
-    return () => clearInterval(interval);
+    return unsubscribe;
   }, []);
 
   if (error) {
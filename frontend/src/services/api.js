@@ -9,6 +9,10 @@ class VoiceAIApiService {
     this.headers = {
       'Content-Type': 'application/json',
     };
+
+    // Shared Server-Sent Events connection, opened on first subscription
+    this.eventSource = null;
+    this.eventSubscriptions = new Set();
   }
 
   // Generic API call method
@@ -54,6 +58,47 @@ class VoiceAIApiService {
     return this.apiCall('/call-stats');
   }
 
+  // Live Events (Server-Sent Events)
+  // Subscribes handlers keyed by event type (snapshot, call_started, call_ended,
+  // call_answered, call_stats, latency) and returns an unsubscribe function.
+  // All subscribers in a tab share one connection to /events.
+  subscribeToEvents(handlers = {}) {
+    if (!this.eventSource) {
+      this.eventSource = new EventSource(`${this.baseURL}/events`);
+      this.eventSource.onerror = () => {
+        // EventSource reconnects on its own and receives a fresh snapshot
+        console.warn('Event stream disconnected, reconnecting...');
+      };
+    }
+
+    const listeners = Object.entries(handlers).map(([eventType, handler]) => {
+      const listener = (event) => {
+        try {
+          handler(JSON.parse(event.data));
+        } catch (error) {
+          console.error(`Event Handler Error (${eventType}):`, error);
+        }
+      };
+      this.eventSource.addEventListener(eventType, listener);
+      return [eventType, listener];
+    });
+
+    const subscription = { listeners, source: this.eventSource };
+    this.eventSubscriptions.add(subscription);
+
+    return () => {
+      listeners.forEach(([eventType, listener]) => {
+        subscription.source.removeEventListener(eventType, listener);
+      });
+      this.eventSubscriptions.delete(subscription);
+
+      if (this.eventSubscriptions.size === 0 && this.eventSource) {
+        this.eventSource.close();
+        this.eventSource = null;
+      }
+    };
+  }
+
   // Test API Connections
   async testApiConnections(apiKeys) {
     const results = {};
@@ -274,8 +319,17 @@ class VoiceAIApiService {
   }
 
   // Get Active Calls
-  async getActiveCalls() {
-    return this.apiCall('/api/calls/active');
+  // Pass the previous response's next_cursor to page, or its version as `since`
+  // to receive only calls that changed (plus ended sids in `removed`).
+  async getActiveCalls({ cursor, limit, since, fields } = {}) {
+    const params = new URLSearchParams();
+    if (cursor != null) params.set('cursor', cursor);
+    if (limit != null) params.set('limit', limit);
+    if (since != null) params.set('since', since);
+    if (fields) params.set('fields', Array.isArray(fields) ? fields.join(',') : fields);
+
+    const query = params.toString();
+    return this.apiCall(`/api/calls/active${query ? `?${query}` : ''}`);
   }
 
   // Get Call Details
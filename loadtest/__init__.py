@@ -0,0 +1,8 @@
+"""
+Offline load testing for the voice agent
+
+Local stand-ins for Deepgram, OpenAI and ElevenLabs speak the real streaming
+protocols with configurable latency and error rates, and a fake Twilio
+media-stream client drives concurrent calls through TwilioVoiceAgent. See
+docs/development/PERFORMANCE_TESTING_SUMMARY.md for usage.
+"""
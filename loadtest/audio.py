@@ -0,0 +1,114 @@
+"""
+μ-law audio for simulated callers: codec, recorded utterances and synthetic speech
+"""
+
+import os
+import wave
+from typing import List
+
+import numpy as np
+
+SAMPLE_RATE = 8000  # Twilio media streams are 8 kHz μ-law
+FRAME_BYTES = 160  # 20 ms of μ-law audio
+
+_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+
+
+def linear_to_ulaw(samples: np.ndarray) -> bytes:
+    """Encode 16-bit PCM samples as G.711 μ-law (same output as the reference encoder)."""
+    pcm = samples.astype(np.int32) >> 2  # 14-bit
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), 8159) + 0x21
+    segment = np.searchsorted(_SEGMENT_ENDS, magnitude)
+    code = np.where(segment < 8, (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F), 0x7F)
+    return ((code ^ mask) & 0xFF).astype(np.uint8).tobytes()
+
+
+_EXPONENT_TABLE = np.array([0, 132, 396, 924, 1980, 4092, 8316, 16764])
+_ULAW_TABLE = None
+
+
+def ulaw_to_linear(data: bytes) -> np.ndarray:
+    """Decode G.711 μ-law to 16-bit PCM samples."""
+    global _ULAW_TABLE
+    if _ULAW_TABLE is None:
+        codes = ~np.arange(256) & 0xFF
+        exponent = (codes >> 4) & 0x07
+        mantissa = codes & 0x0F
+        magnitude = _EXPONENT_TABLE[exponent] + (mantissa << (exponent + 3))
+        _ULAW_TABLE = np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+    return _ULAW_TABLE[np.frombuffer(data, dtype=np.uint8)]
+
+
+def frame_energy(frame: bytes) -> float:
+    """Get the RMS level of a μ-law frame."""
+    samples = ulaw_to_linear(frame).astype(np.float64)
+    return float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+
+
+SILENCE_FRAME = linear_to_ulaw(np.zeros(FRAME_BYTES))
+
+
+def synthetic_utterance(seconds: float, seed: int = 0) -> bytes:
+    """Generate speech-like μ-law audio: voiced syllables with short gaps, then trailing silence.
+
+    Used when no recordings are given. The gaps are shorter than any realistic
+    endpointing setting, so each utterance is detected as one turn.
+    """
+    rng = np.random.default_rng(seed)
+    pieces = []
+    remaining = int(seconds * SAMPLE_RATE)
+    while remaining > 0:
+        length = min(remaining, int(rng.uniform(0.12, 0.25) * SAMPLE_RATE))
+        t = np.arange(length) / SAMPLE_RATE
+        pitch = rng.uniform(110, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * np.arange(length) / length)
+        pieces.append(voiced * envelope * rng.uniform(3000, 8000))
+        gap = min(remaining - length, int(0.04 * SAMPLE_RATE))
+        pieces.append(np.zeros(max(gap, 0)))
+        remaining -= length + max(gap, 0)
+    return linear_to_ulaw(np.concatenate(pieces))
+
+
+def load_utterances(directory: str) -> List[bytes]:
+    """Load recorded utterances as μ-law bytes.
+
+    Accepts raw ``.ulaw`` files and 8 kHz mono ``.wav`` files in μ-law or
+    16-bit PCM. Files are returned in name order.
+    """
+    utterances = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith(".ulaw"):
+            with open(path, "rb") as f:
+                utterances.append(f.read())
+        elif name.endswith(".wav"):
+            utterances.append(_read_wav(path))
+    if not utterances:
+        raise ValueError(f"No .ulaw or .wav files in {directory}")
+    return utterances
+
+
+def _read_wav(path: str) -> bytes:
+    """Read an 8 kHz mono wav file as μ-law."""
+    with open(path, "rb") as f:
+        header = f.read(64)
+    if header[20:22] == b"\x07\x00":  # WAVE_FORMAT_MULAW, which the wave module cannot read
+        data_at = header.find(b"data")
+        with open(path, "rb") as f:
+            f.seek(data_at + 8)
+            return f.read()
+
+    with wave.open(path, "rb") as wav:
+        if wav.getframerate() != SAMPLE_RATE or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 8 kHz mono 16-bit PCM or μ-law")
+        return linear_to_ulaw(np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2"))
+
+
+def split_frames(audio: bytes, frame_bytes: int = FRAME_BYTES) -> List[bytes]:
+    """Split μ-law audio into 20 ms frames, padding the last one with silence."""
+    frames = [audio[i : i + frame_bytes] for i in range(0, len(audio), frame_bytes)]
+    if frames and len(frames[-1]) < frame_bytes:
+        frames[-1] = frames[-1] + SILENCE_FRAME[: frame_bytes - len(frames[-1])]
+    return frames
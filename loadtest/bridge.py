@@ -0,0 +1,206 @@
+"""
+The agent under load test: TwilioVoiceAgent plus a Twilio media-stream bridge
+
+The agent has no media-stream server of its own, so this module stands in for
+that leg. It accepts Twilio Media Streams WebSockets (``connected``,
+``start``, ``media``, ``stop`` events with base64 μ-law payloads), forwards
+caller audio to Deepgram, turns Deepgram's VAD events and final results into
+the frames ConversationProcessor handles, and streams TTS audio back to the
+caller as outbound ``media`` events. Audio both ways also goes to the
+processor as raw frames, so it can tell the playback's echo from the caller.
+The Flask app serves ``/webhook`` and the monitoring endpoints from a thread,
+as in production.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+import aiohttp
+from aiohttp import WSMsgType, web
+
+# Provider keys are only used against the mock providers
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "loadtest")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+from pipecat.frames.frames import (  # noqa: E402
+    InputAudioRawFrame,
+    OutputAudioRawFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from werkzeug.serving import make_server  # noqa: E402
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.audio import SAMPLE_RATE, ulaw_to_linear  # noqa: E402
+from loadtest.clients import DeepgramLiveClient, ElevenLabsStreamingClient, OpenAIStreamingClient  # noqa: E402
+
+
+class MediaStreamBridge:
+    """Serves ``/media-stream`` and runs one ConversationProcessor per call."""
+
+    def __init__(
+        self,
+        agent: "agent_module.TwilioVoiceAgent",
+        tts: ElevenLabsStreamingClient,
+    ):
+        """Initialize the bridge with the agent (its ``deepgram`` session pool) and the TTS client."""
+        self.agent = agent
+        self.tts = tts
+        self.stt_limiter = agent_module.ConcurrencyLimiter.from_env("deepgram")  # Gates opening Deepgram streams
+        self.app = web.Application()
+        self.app.router.add_get("/media-stream", self.media_stream)
+
+    async def media_stream(self, request: web.Request) -> web.WebSocketResponse:
+        """Handle one Twilio media stream from ``start`` to ``stop``."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        call_sid = None
+        processor = None
+        deepgram = None
+        transcripts = None
+
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    break
+                data = json.loads(message.data)
+                event = data.get("event")
+
+                if event == "media" and deepgram is not None:
+                    audio = base64.b64decode(data["media"]["payload"])
+                    self.agent.call_recorder.record(call_sid, agent_module.CallRecorder.MEDIA_IN, audio)
+                    await deepgram.send_bytes(audio)
+                    if self.agent.echo_suppressor.enabled:
+                        pcm = ulaw_to_linear(audio).tobytes()
+                        await processor.process(InputAudioRawFrame(audio=pcm, sample_rate=SAMPLE_RATE, num_channels=1))
+                elif event == "start":
+                    call_sid = data["start"]["callSid"]
+                    stream_sid = data["start"]["streamSid"]
+                    agent_module.bind_call_context(call_sid)
+                    processor = self.agent.acquire_call_processor(call_sid)
+                    async with self.stt_limiter.slot(agent_module.ConcurrencyLimiter.FIRST_TURN):
+                        deepgram = await self.agent.connections.acquire_websocket("deepgram")
+                    self.tts.sinks[call_sid] = self._audio_sink(ws, stream_sid, call_sid, processor)
+                    transcripts = asyncio.create_task(self._transcripts(deepgram, processor, call_sid))
+                elif event == "stop":
+                    break
+        finally:
+            if transcripts:
+                transcripts.cancel()
+            if deepgram is not None:
+                await deepgram.close()
+            if call_sid:
+                self.tts.sinks.pop(call_sid, None)
+                self.agent.call_manager.end_call(call_sid, "completed")
+                self.agent.flight_recorder.end_call(call_sid)
+                self.agent.call_recorder.end_call(call_sid)
+            if processor is not None:
+                self.agent.release_call_processor(processor)
+            await ws.close()
+        return ws
+
+    def _audio_sink(self, ws: web.WebSocketResponse, stream_sid: str, call_sid: str, processor):
+        """Build the coroutine that plays TTS audio to the caller."""
+        recorder = self.agent.call_recorder
+
+        async def play(chunk: bytes):
+            recorder.record(call_sid, agent_module.CallRecorder.TTS, {"phase": "chunk", "bytes": len(chunk)})
+            if self.agent.echo_suppressor.enabled:
+                pcm = ulaw_to_linear(chunk).tobytes()
+                await processor.process(OutputAudioRawFrame(audio=pcm, sample_rate=SAMPLE_RATE, num_channels=1))
+            if not ws.closed:
+                payload = base64.b64encode(chunk).decode()
+                await ws.send_json({"event": "media", "streamSid": stream_sid, "media": {"payload": payload}})
+
+        return play
+
+    async def _transcripts(self, deepgram: aiohttp.ClientWebSocketResponse, processor, call_sid: str):
+        """Feed Deepgram results to the processor as pipeline frames."""
+        agent_module.bind_call_context(call_sid)
+        async for message in deepgram:
+            if message.type != WSMsgType.TEXT:
+                break
+            result = json.loads(message.data)
+            if result.get("type") == "SpeechStarted":
+                await processor.process(UserStartedSpeakingFrame())
+            elif result.get("type") == "Results" and result.get("speech_final"):
+                transcript = result["channel"]["alternatives"][0]["transcript"]
+                if transcript:
+                    await processor.process(UserStoppedSpeakingFrame())
+                    timestamp = datetime.now(timezone.utc).isoformat()
+                    await processor.process(TranscriptionFrame(text=transcript, user_id=call_sid, timestamp=timestamp))
+
+
+class AgentUnderTest:
+    """Runs TwilioVoiceAgent against the mock providers, with the webhook and media stream exposed."""
+
+    def __init__(self, provider_url: str, host: str = "127.0.0.1", endpointing_ms: int = 300):
+        """Initialize with the base URL of loadtest.mock_providers."""
+        self.provider_url = provider_url
+        self.host = host
+        self.endpointing_ms = endpointing_ms
+        self.agent: Optional["agent_module.TwilioVoiceAgent"] = None
+        self.webhook_url = None
+        self.media_url = None
+        self._runner = None
+        self._http_server = None
+
+    async def start(self):
+        """Create the agent, swap in the streaming clients, warm their connections and phrases, start both servers."""
+        self.agent = agent_module.TwilioVoiceAgent()
+        agent_module.voice_agent = self.agent
+        languages = self.agent.language_manager
+        connections = self.agent.connections
+        session = connections.get_session()
+        self.agent.llm_service = OpenAIStreamingClient(
+            session, self.provider_url, "loadtest", system_prompt=languages.get_system_prompt()
+        )
+        tts = ElevenLabsStreamingClient(
+            session,
+            self.provider_url,
+            "loadtest",
+            languages.get_tts_voice(),
+            call_sid_getter=agent_module.log_call_sid.get,
+        )
+        backends = [agent_module.TTSBackend("elevenlabs", tts)]
+        local_tts = agent_module.LocalTTSEngine.from_env(lambda: languages.current_language)
+        if local_tts:
+            backends.append(agent_module.TTSBackend("local", local_tts, last_resort=True, streams=False))
+        self.agent.tts_service = agent_module.TTSRouter.from_env(
+            backends, self.agent.phrase_cache, lambda: languages.current_language
+        )
+        stt = DeepgramLiveClient(session, self.provider_url, "loadtest", endpointing_ms=self.endpointing_ms)
+        for name in connections.http_targets:
+            connections.register_http(name, self.provider_url)
+        connections.register_websocket("deepgram", stt.connect, keepalive=DeepgramLiveClient.keepalive)
+        await connections.start()
+        await self.agent.phrase_cache.warm(self.agent.tts_service)
+        self.agent.pipeline_pool.start()
+
+        self._http_server = make_server(self.host, 0, agent_module.app, threaded=True)
+        threading.Thread(target=self._http_server.serve_forever, name="flask", daemon=True).start()
+        self.webhook_url = f"http://{self.host}:{self._http_server.server_port}/webhook"
+
+        bridge = MediaStreamBridge(self.agent, tts)
+        self._runner = web.AppRunner(bridge.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.media_url = f"ws://{self.host}:{site._server.sockets[0].getsockname()[1]}/media-stream"
+
+    async def stop(self):
+        """Stop both servers and close the provider connections."""
+        if self._http_server:
+            self._http_server.shutdown()
+        if self._runner:
+            await self._runner.cleanup()
+        if self.agent:
+            self.agent.pipeline_pool.stop()
+            await self.agent.connections.close()
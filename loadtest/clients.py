@@ -0,0 +1,180 @@
+"""
+Streaming provider clients used by the agent under load test
+
+They talk to the real Deepgram, OpenAI and ElevenLabs wire protocols, so the
+same clients work against loadtest.mock_providers or, with real keys and
+base URLs, the real services. The LLM and TTS clients expose the
+``complete()`` / ``synthesize()`` interface ConversationProcessor calls, and the
+TTS client can ``play()`` cached audio.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+
+AudioSink = Callable[[bytes], Awaitable[None]]
+
+
+class ProviderError(Exception):
+    """A provider answered with an error status."""
+
+    def __init__(self, provider: str, status: int, body: str):
+        """Initialize with the provider name, HTTP status and response body."""
+        super().__init__(f"{provider} returned {status}: {body[:200]}")
+        self.provider = provider
+        self.status = status
+
+
+class DeepgramLiveClient:
+    """Opens Deepgram live-transcription WebSockets for μ-law 8 kHz audio."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        api_key: str,
+        language: str = "es",
+        endpointing_ms: int = 300,
+    ):
+        """Initialize the client."""
+        self.session = session
+        self.base_url = base_url.replace("http", "ws", 1).rstrip("/")
+        self.api_key = api_key
+        self.language = language
+        self.endpointing_ms = endpointing_ms
+
+    async def connect(self) -> aiohttp.ClientWebSocketResponse:
+        """Open a stream; send audio with ``send_bytes`` and read JSON results from it."""
+        params = {
+            "encoding": "mulaw",
+            "sample_rate": 8000,
+            "channels": 1,
+            "language": self.language,
+            "interim_results": "true",
+            "vad_events": "true",
+            "endpointing": self.endpointing_ms,
+        }
+        return await self.session.ws_connect(
+            f"{self.base_url}/v1/listen?{urlencode(params)}", headers={"Authorization": f"Token {self.api_key}"}
+        )
+
+    @staticmethod
+    async def keepalive(ws: aiohttp.ClientWebSocketResponse):
+        """Keep an idle stream open; Deepgram closes streams that get no data for 10 seconds."""
+        await ws.send_str(json.dumps({"type": "KeepAlive"}))
+
+
+class OpenAIStreamingClient:
+    """Chat completions over Server-Sent Events, returning the assembled message."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        system_prompt: Optional[str] = None,
+    ):
+        """Initialize the client."""
+        self.session = session
+        self.url = f"{base_url.rstrip('/')}/v1/chat/completions"
+        self.api_key = api_key
+        self.model = model
+        self.system_prompt = system_prompt
+
+    async def complete(self, messages: List[Dict]) -> SimpleNamespace:
+        """Stream a completion; the result has ``content`` and ``first_token_latency``."""
+        payload = [{"role": message["role"], "content": message["content"]} for message in messages]
+        if self.system_prompt:
+            payload.insert(0, {"role": "system", "content": self.system_prompt})
+
+        start = time.perf_counter()
+        first_token_latency = None
+        parts = []
+        async with self.session.post(
+            self.url,
+            json={"model": self.model, "messages": payload, "stream": True},
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        ) as response:
+            if response.status != 200:
+                raise ProviderError("openai", response.status, await response.text())
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                content = json.loads(data)["choices"][0]["delta"].get("content")
+                if content:
+                    if first_token_latency is None:
+                        first_token_latency = time.perf_counter() - start
+                    parts.append(content)
+        return SimpleNamespace(content="".join(parts), first_token_latency=first_token_latency)
+
+
+class ElevenLabsStreamingClient:
+    """Streaming TTS that forwards audio chunks to the caller's media stream as they arrive.
+
+    ``sinks`` maps call SIDs to coroutines that play audio on that call; the
+    call is taken from the logging context bound for the current turn.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        api_key: str,
+        voice_id: str = "21m00Tcm4TlvDq8ikWAM",
+        model_id: str = "eleven_multilingual_v2",
+        call_sid_getter: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        """Initialize the client."""
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.call_sid_getter = call_sid_getter or (lambda: None)
+        self.sinks: Dict[str, AudioSink] = {}
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+        first_byte: Optional[asyncio.Future] = None,
+    ) -> bytes:
+        """Synthesize ``text`` as μ-law 8 kHz audio, streaming it to the current call's sink.
+
+        ``first_byte`` is resolved when the first chunk arrives, so callers can
+        hold the first byte to a deadline while the rest streams.
+        """
+        sink = self.sinks.get(self.call_sid_getter())
+        chunks = []
+        async with self.session.post(
+            f"{self.base_url}/v1/text-to-speech/{voice_id or self.voice_id}/stream?output_format=ulaw_8000",
+            json={"text": text, "model_id": model_id or self.model_id},
+            headers={"xi-api-key": self.api_key},
+        ) as response:
+            if response.status != 200:
+                raise ProviderError("elevenlabs", response.status, await response.text())
+            async for chunk in response.content.iter_any():
+                if first_byte is not None and not first_byte.done():
+                    first_byte.set_result(None)
+                chunks.append(chunk)
+                if sink:
+                    await sink(chunk)
+        return b"".join(chunks)
+
+    async def play(self, audio: bytes, chunk_bytes: int = 800):
+        """Play already synthesized audio on the current call in 100 ms chunks."""
+        sink = self.sinks.get(self.call_sid_getter())
+        if sink:
+            for offset in range(0, len(audio), chunk_bytes):
+                await sink(audio[offset : offset + chunk_bytes])
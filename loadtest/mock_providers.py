@@ -0,0 +1,406 @@
+"""
+Local stand-ins for Deepgram, OpenAI and ElevenLabs
+
+One aiohttp server speaks the three streaming protocols the agent depends on:
+
+- Deepgram live transcription: WebSocket ``/v1/listen`` taking μ-law audio and
+  sending ``SpeechStarted`` and interim/final ``Results`` messages
+- OpenAI chat completions: ``POST /v1/chat/completions`` with ``stream: true``
+  Server-Sent Events chunks and a ``[DONE]`` terminator
+- ElevenLabs streaming TTS: ``POST /v1/text-to-speech/{voice_id}/stream``
+  returning chunked ``ulaw_8000`` audio
+
+Latency per provider is lognormal with a configurable median and p95, and each
+provider has an error rate. ``capacity`` caps concurrent requests per provider;
+requests over it are answered 429 at once, as a provider's concurrency limit
+does. ``connect_ms`` delays the first request on every
+new connection, standing in for the DNS, TCP and TLS round trips a real
+provider costs. Run standalone with:
+
+    python -m loadtest.mock_providers --port 8765 --llm 250,600 --error-rate llm=0.01
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+import weakref
+from collections import Counter
+from typing import Dict, List, Optional
+
+from aiohttp import WSMsgType, web
+
+from loadtest.audio import FRAME_BYTES, frame_energy, synthetic_utterance
+
+SPEECH_ENERGY = 200.0  # RMS above which a 20 ms frame counts as speech
+
+DEFAULT_TRANSCRIPTS = [
+    "hola buenas tardes quería saber el estado de mi pedido",
+    "órale está chido gracias por la ayuda",
+    "no manches todavía no me llega la factura",
+    "hi I would like to speak English please",
+    "can you check my account balance",
+    "perdón no le escuché bien puede repetir",
+]
+
+DEFAULT_RESPONSES = [
+    "Claro, con gusto le ayudo. Déjeme revisar su pedido, un momento por favor.",
+    "¡Qué bueno! Estoy aquí para lo que necesite.",
+    "Entiendo, voy a revisar su factura y se la envío de nuevo a su correo.",
+    "Of course, I can help you in English. What can I do for you today?",
+    "Sure, your current balance is available. Would you like me to read it to you?",
+    "Disculpe, le repito: ¿en qué le puedo ayudar hoy?",
+]
+
+
+class LatencyProfile:
+    """Lognormal latency given as a median and p95 in milliseconds, plus an error rate."""
+
+    def __init__(self, median_ms: float, p95_ms: Optional[float] = None, error_rate: float = 0.0):
+        """Initialize the profile; p95 defaults to twice the median."""
+        self.median_ms = median_ms
+        self.p95_ms = p95_ms or median_ms * 2
+        self.error_rate = error_rate
+        self.mu = math.log(max(median_ms, 0.001))
+        self.sigma = max(math.log(max(self.p95_ms, median_ms) / max(median_ms, 0.001)) / 1.645, 0.0)
+
+    @classmethod
+    def parse(cls, value: str, error_rate: float = 0.0) -> "LatencyProfile":
+        """Parse "median,p95" (milliseconds)."""
+        parts = [float(part) for part in value.split(",")]
+        return cls(parts[0], parts[1] if len(parts) > 1 else None, error_rate)
+
+    def sample(self) -> float:
+        """Draw a latency in seconds."""
+        return random.lognormvariate(self.mu, self.sigma) / 1000 if self.sigma else self.median_ms / 1000
+
+    def fails(self) -> bool:
+        """Decide whether this request should fail."""
+        return random.random() < self.error_rate
+
+
+class MockProviders:
+    """aiohttp application serving the three provider protocols."""
+
+    def __init__(
+        self,
+        stt: Optional[LatencyProfile] = None,
+        llm: Optional[LatencyProfile] = None,
+        tts: Optional[LatencyProfile] = None,
+        token_interval_ms: float = 15.0,
+        tts_realtime_factor: float = 0.2,
+        endpointing_ms: int = 300,
+        transcripts: Optional[List[str]] = None,
+        responses: Optional[List[str]] = None,
+        connect_ms: float = 0.0,
+        capacity: Optional[Dict[str, int]] = None,
+    ):
+        """Initialize the mocks with per-provider latency profiles."""
+        self.stt = stt or LatencyProfile(150, 300)
+        self.llm = llm or LatencyProfile(250, 600)
+        self.tts = tts or LatencyProfile(150, 350)
+        self.token_interval = token_interval_ms / 1000
+        self.tts_realtime_factor = tts_realtime_factor  # Seconds of synthesis per second of audio
+        self.endpointing_ms = endpointing_ms
+        self.transcripts = transcripts or DEFAULT_TRANSCRIPTS
+        self.responses = responses or DEFAULT_RESPONSES
+        self.counters: Counter = Counter()
+        self.voice_audio = synthetic_utterance(2.0, seed=7)
+        self.connect_delay = connect_ms / 1000
+        self._connections: "weakref.WeakSet" = weakref.WeakSet()
+        self.capacity = capacity or {}  # Max concurrent requests per provider (llm, tts)
+        self.inflight: Counter = Counter()
+
+        self.app = web.Application(middlewares=[self.handshake])
+        self.app.router.add_get("/v1/listen", self.deepgram_listen)
+        self.app.router.add_post("/v1/chat/completions", self.openai_chat_completions)
+        self.app.router.add_post("/v1/text-to-speech/{voice_id}/stream", self.elevenlabs_stream)
+        self.app.router.add_get("/stats", self.stats)
+
+    @web.middleware
+    async def handshake(self, request: web.Request, handler):
+        """Charge the connection set-up delay on the first request of each connection."""
+        if self.connect_delay and request.transport not in self._connections:
+            self._connections.add(request.transport)
+            self.counters["connections"] += 1
+            await asyncio.sleep(self.connect_delay)
+        return await handler(request)
+
+    def over_capacity(self, provider: str) -> bool:
+        """Tell whether a new request would exceed the provider's concurrency cap."""
+        limit = self.capacity.get(provider)
+        if limit and self.inflight[provider] >= limit:
+            self.counters[f"{provider}_throttled"] += 1
+            return True
+        return False
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """Get request and error counters."""
+        return web.json_response(dict(self.counters))
+
+    # Deepgram live transcription
+
+    async def deepgram_listen(self, request: web.Request) -> web.WebSocketResponse:
+        """Transcribe streamed μ-law audio, finalizing an utterance after ``endpointing`` ms of silence."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.counters["stt_streams"] += 1
+
+        endpointing = request.query.get("endpointing", str(self.endpointing_ms))
+        endpointing_ms = self.endpointing_ms if endpointing in ("true", "") else int(endpointing)
+        interim_results = request.query.get("interim_results") == "true"
+        vad_events = request.query.get("vad_events") == "true"
+        request_id = str(uuid.uuid4())
+
+        position = 0.0  # Seconds of audio received
+        speech_start = None
+        silence_ms = 0
+        last_interim = 0.0
+        utterance = 0
+        pending: List[asyncio.Task] = []
+        buffer = b""
+
+        async for message in ws:
+            if message.type == WSMsgType.TEXT:
+                control = json.loads(message.data)
+                if control.get("type") == "CloseStream":
+                    break
+                continue
+            if message.type != WSMsgType.BINARY:
+                break
+
+            buffer += message.data
+            while len(buffer) >= FRAME_BYTES:
+                frame, buffer = buffer[:FRAME_BYTES], buffer[FRAME_BYTES:]
+                position += 0.02
+                if frame_energy(frame) >= SPEECH_ENERGY:
+                    silence_ms = 0
+                    if speech_start is None:
+                        speech_start = position - 0.02
+                        last_interim = position
+                        if vad_events:
+                            await ws.send_json({"type": "SpeechStarted", "channel": [0], "timestamp": speech_start})
+                    elif interim_results and position - last_interim >= 0.5:
+                        last_interim = position
+                        words = self.transcripts[utterance % len(self.transcripts)].split()
+                        partial = " ".join(words[: max(1, int((position - speech_start) * 3))])
+                        await ws.send_json(self._results(partial, speech_start, position, False, request_id))
+                elif speech_start is not None:
+                    silence_ms += 20
+                    if silence_ms >= endpointing_ms:
+                        transcript = self.transcripts[utterance % len(self.transcripts)]
+                        pending.append(
+                            asyncio.create_task(self._finalize(ws, transcript, speech_start, position, request_id))
+                        )
+                        pending = [task for task in pending if not task.done()]
+                        utterance += 1
+                        speech_start = None
+
+        for task in pending:
+            task.cancel()
+        await ws.close()
+        return ws
+
+    async def _finalize(self, ws: web.WebSocketResponse, transcript: str, start: float, end: float, request_id: str):
+        """Send the final result for an utterance after the sampled STT latency (or drop it on error)."""
+        self.counters["stt_utterances"] += 1
+        if self.stt.fails():
+            self.counters["stt_errors"] += 1
+            return
+        await asyncio.sleep(self.stt.sample())
+        if not ws.closed:
+            await ws.send_json(self._results(transcript, start, end, True, request_id))
+
+    @staticmethod
+    def _results(transcript: str, start: float, end: float, final: bool, request_id: str) -> Dict:
+        """Build a Deepgram ``Results`` message."""
+        return {
+            "type": "Results",
+            "channel_index": [0, 1],
+            "duration": round(end - start, 3),
+            "start": round(start, 3),
+            "is_final": final,
+            "speech_final": final,
+            "channel": {"alternatives": [{"transcript": transcript, "confidence": 0.97, "words": []}]},
+            "metadata": {"request_id": request_id},
+        }
+
+    # OpenAI chat completions
+
+    async def openai_chat_completions(self, request: web.Request) -> web.StreamResponse:
+        """Stream a canned answer token by token after the sampled first-token latency."""
+        body = await request.json()
+        self.counters["llm_requests"] += 1
+        if self.over_capacity("llm") or self.llm.fails():
+            self.counters["llm_errors"] += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+                status=429,
+            )
+        self.inflight["llm"] += 1
+        try:
+            return await self._complete(request, body)
+        finally:
+            self.inflight["llm"] -= 1
+
+    async def _complete(self, request: web.Request, body: Dict) -> web.StreamResponse:
+        """Answer a completion request that was let through."""
+
+        turns = sum(1 for message in body.get("messages", []) if message.get("role") == "user")
+        answer = self.responses[(turns - 1) % len(self.responses)]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = body.get("model", "gpt-4o-mini")
+        await asyncio.sleep(self.llm.sample())
+
+        if not body.get("stream"):
+            return web.json_response(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}
+                    ],
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        words = answer.split(" ")
+        for i, word in enumerate(words):
+            delta = {"role": "assistant", "content": word} if i == 0 else {"content": " " + word}
+            await response.write(self._chunk(completion_id, model, delta, None))
+            await asyncio.sleep(self.token_interval)
+        await response.write(self._chunk(completion_id, model, {}, "stop"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    @staticmethod
+    def _chunk(completion_id: str, model: str, delta: Dict, finish_reason: Optional[str]) -> bytes:
+        """Encode one ``chat.completion.chunk`` event."""
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(chunk)}\n\n".encode()
+
+    # ElevenLabs streaming TTS
+
+    async def elevenlabs_stream(self, request: web.Request) -> web.StreamResponse:
+        """Stream μ-law audio for the text, about 65 ms per character, after the sampled first-byte latency."""
+        body = await request.json()
+        self.counters["tts_requests"] += 1
+        if self.over_capacity("tts"):
+            self.counters["tts_errors"] += 1
+            return web.json_response(
+                {"detail": {"status": "too_many_concurrent_requests", "message": "Concurrency limit reached"}},
+                status=429,
+            )
+        if self.tts.fails():
+            self.counters["tts_errors"] += 1
+            return web.json_response({"detail": {"status": "system_busy", "message": "Try again later"}}, status=503)
+        self.inflight["tts"] += 1
+        try:
+            return await self._synthesize(request, body)
+        finally:
+            self.inflight["tts"] -= 1
+
+    async def _synthesize(self, request: web.Request, body: Dict) -> web.StreamResponse:
+        """Stream audio for a synthesis request that was let through."""
+
+        text = body.get("text", "")
+        audio_bytes = int(max(len(text) * 0.065, 0.3) * 8000)
+        chunk_bytes = 800  # 100 ms
+        await asyncio.sleep(self.tts.sample())
+
+        response = web.StreamResponse(headers={"Content-Type": "audio/basic"})
+        await response.prepare(request)
+        sent = 0
+        while sent < audio_bytes:
+            size = min(chunk_bytes, audio_bytes - sent)
+            offset = sent % (len(self.voice_audio) - chunk_bytes)
+            await response.write(self.voice_audio[offset : offset + size])
+            sent += size
+            if sent < audio_bytes:
+                await asyncio.sleep(size / 8000 * self.tts_realtime_factor)
+        await response.write_eof()
+        return response
+
+
+async def start_mock_providers(providers: MockProviders, host: str = "127.0.0.1", port: int = 0):
+    """Start the mock server and return (runner, base_url)."""
+    runner = web.AppRunner(providers.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def parse_per_provider(value: str) -> Dict[str, float]:
+    """Parse per-provider values such as "stt=0,llm=0.01,tts=0.005"."""
+    values = {}
+    for item in filter(None, value.split(",")):
+        name, _, number = item.partition("=")
+        values[name.strip()] = float(number)
+    return values
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the mock latency options shared with loadtest.run."""
+    parser.add_argument("--stt", default="150,300", help="Deepgram final-result latency median,p95 in ms")
+    parser.add_argument("--llm", default="250,600", help="OpenAI first-token latency median,p95 in ms")
+    parser.add_argument("--tts", default="150,350", help="ElevenLabs first-byte latency median,p95 in ms")
+    parser.add_argument("--token-interval-ms", type=float, default=15.0, help="delay between streamed LLM tokens")
+    parser.add_argument("--endpointing-ms", type=int, default=300, help="silence that ends an utterance")
+    parser.add_argument("--error-rate", default="", help="per-provider error rates, e.g. llm=0.01,tts=0.005")
+    parser.add_argument("--connect-ms", type=float, default=0.0, help="set-up delay of each new connection")
+    parser.add_argument("--capacity", default="", help="max concurrent requests per provider, e.g. llm=8,tts=8")
+
+
+def providers_from_args(args: argparse.Namespace) -> MockProviders:
+    """Build MockProviders from parsed command-line options."""
+    errors = parse_per_provider(args.error_rate)
+    return MockProviders(
+        stt=LatencyProfile.parse(args.stt, errors.get("stt", 0.0)),
+        llm=LatencyProfile.parse(args.llm, errors.get("llm", 0.0)),
+        tts=LatencyProfile.parse(args.tts, errors.get("tts", 0.0)),
+        token_interval_ms=args.token_interval_ms,
+        endpointing_ms=args.endpointing_ms,
+        connect_ms=args.connect_ms,
+        capacity={name: int(limit) for name, limit in parse_per_provider(args.capacity).items()},
+    )
+
+
+def serve(args: argparse.Namespace, port: int, ready=None):
+    """Run the mock server until killed (multiprocessing target)."""
+
+    async def run():
+        await start_mock_providers(providers_from_args(args), port=port)
+        if ready is not None:
+            ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def main():
+    """Run the mock providers standalone."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(f"🧪 Mock Deepgram/OpenAI/ElevenLabs on http://127.0.0.1:{args.port}")
+    serve(args, args.port)
+
+
+if __name__ == "__main__":
+    main()
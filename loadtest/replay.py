@@ -0,0 +1,257 @@
+"""
+Replay recorded calls through ConversationProcessor with the recorded provider timings
+
+Reads a ``.vcr`` file written by CallRecorder (set CALL_RECORDING_DIR on the
+agent) and pushes its inbound media and caller-side frames back through a
+fresh ConversationProcessor at their recorded offsets. LLM and TTS calls are
+answered locally with the recorded responses after the recorded delays, so
+the provider side of a slow call is reproduced exactly.
+
+By default the replay runs on the virtual clock from loadtest.simulate and
+finishes instantly and deterministically, which isolates changes in turn-taking
+and pipeline logic. ``--realtime`` replays on a normal loop so the agent's own
+CPU time shows up in the breakdown too.
+
+Usage:
+    python -m loadtest.replay recordings/CA123.vcr --save before.json    # on the old version
+    python -m loadtest.replay recordings/CA123.vcr --compare before.json # on the new version
+    python -m loadtest.replay recordings/CA123.vcr --dump
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipecat.frames.frames import (  # noqa: E402
+    BotStoppedSpeakingFrame,
+    InputAudioRawFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+
+from loadtest.audio import ulaw_to_linear  # noqa: E402
+from loadtest.simulate import VirtualClock, VirtualTimeEventLoop, agent_module, virtual_time  # noqa: E402
+
+CallRecorder = agent_module.CallRecorder
+
+FRAME_TYPES = {
+    "user_started_speaking": UserStartedSpeakingFrame,
+    "user_stopped_speaking": UserStoppedSpeakingFrame,
+    "bot_stopped_speaking": BotStoppedSpeakingFrame,
+}
+
+
+class Recording:
+    """A call recording loaded into memory."""
+
+    def __init__(self, path: str):
+        """Load every record of ``path``."""
+        self.path = path
+        self.call_sid = os.path.splitext(os.path.basename(path))[0]
+        self.records = list(CallRecorder.read(path))
+
+    def provider_calls(self, kind: int) -> List[Dict]:
+        """Group LLM or TTS records into calls with their recorded delays and outcome."""
+        calls = []
+        current = None
+        for record_kind, offset_ns, event in self.records:
+            if record_kind != kind:
+                continue
+            phase = event["phase"]
+            if phase == "request":
+                current = {"start_ns": offset_ns, "first_byte_s": None, "content": None, "error": None}
+                calls.append(current)
+            elif current is None:
+                continue
+            elif phase == "chunk" and current["first_byte_s"] is None:
+                current["first_byte_s"] = (offset_ns - current["start_ns"]) / 1e9
+            elif phase in ("done", "error"):
+                current["duration_s"] = (offset_ns - current["start_ns"]) / 1e9
+                current["content"] = event.get("content")
+                current["error"] = event.get("error")
+                if event.get("first_token_ms") is not None:
+                    current["first_byte_s"] = event["first_token_ms"] / 1000
+                current = None
+        return [call for call in calls if "duration_s" in call]
+
+
+class ReplayLLM:
+    """Answers with the recorded completions after the recorded delays."""
+
+    def __init__(self, calls: List[Dict]):
+        """Initialize with the recording's LLM calls, in order."""
+        self.calls = deque(calls)
+
+    async def complete(self, messages: List[Dict]) -> SimpleNamespace:
+        """Return the next recorded completion, or raise its recorded error."""
+        if not self.calls:
+            raise RuntimeError("recording has no more LLM responses")
+        call = self.calls.popleft()
+        await asyncio.sleep(call["duration_s"])
+        if call["error"] == CallRecorder.ABANDONED:
+            await asyncio.Future()  # Still pending when the agent's deadline cancels it, as recorded
+        if call["error"]:
+            raise RuntimeError(call["error"])
+        return SimpleNamespace(content=call["content"], first_token_latency=call["first_byte_s"])
+
+
+class ReplayTTS:
+    """Finishes synthesis after the recorded delays."""
+
+    def __init__(self, calls: List[Dict]):
+        """Initialize with the recording's TTS calls, in order."""
+        self.calls = deque(calls)
+
+    async def synthesize(self, text: str, first_byte: Optional[asyncio.Future] = None, **options) -> None:
+        """Wait as long as the recorded synthesis took, resolving ``first_byte`` at the recorded first chunk."""
+        if not self.calls:
+            raise RuntimeError("recording has no more TTS responses")
+        call = self.calls.popleft()
+        if call["first_byte_s"] is not None:
+            await asyncio.sleep(call["first_byte_s"])
+            if first_byte is not None and not first_byte.done():
+                first_byte.set_result(None)
+        await asyncio.sleep(call["duration_s"] - (call["first_byte_s"] or 0.0))
+        if call["error"] == CallRecorder.ABANDONED:
+            await asyncio.Future()
+        if call["error"]:
+            raise RuntimeError(call["error"])
+
+
+def turn_breakdown(trace: "agent_module.TurnTrace") -> Dict:
+    """Summarize a traced turn as span durations and event offsets in milliseconds."""
+    return {
+        "turn": trace.turn,
+        "duration_ms": round(trace.duration_ms() or 0.0, 1),
+        "spans": {name: round(trace.span_ms(name), 1) for name, _, end_ns, _ in trace.spans if end_ns is not None},
+        "events": {name: round(trace.event_ms(name), 1) for name, _ in trace.events},
+    }
+
+
+async def replay(agent: "agent_module.TwilioVoiceAgent", recording: Recording) -> List[Dict]:
+    """Push a recording through a fresh processor and get its per-turn breakdown."""
+    call_sid = recording.call_sid
+    agent.llm_service = ReplayLLM(recording.provider_calls(CallRecorder.LLM))
+    agent.tts_service = ReplayTTS(recording.provider_calls(CallRecorder.TTS))
+    agent.response_cache.enabled = False  # The recording holds every provider call the turns made
+    agent_module.bind_call_context(call_sid)
+    agent.call_manager.start_call(call_sid, "replay", "inbound")
+    agent.performance_monitor.start_call_monitoring(call_sid)
+    processor = agent.create_call_processor(call_sid)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for kind, offset_ns, payload in recording.records:
+        if kind == CallRecorder.MEDIA_IN:
+            frame = InputAudioRawFrame(audio=ulaw_to_linear(payload).tobytes(), sample_rate=8000, num_channels=1)
+        elif kind == CallRecorder.FRAME and payload["type"] == "transcription":
+            frame = TranscriptionFrame(text=payload["text"], user_id=call_sid, timestamp=str(offset_ns))
+        elif kind == CallRecorder.FRAME and payload["type"] in FRAME_TYPES:
+            frame = FRAME_TYPES[payload["type"]]()
+        else:
+            continue
+        delay = start + offset_ns / 1e9 - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await processor.process(frame)
+    await processor.turn_taken()  # A turn still held at the end of the recording
+
+    agent.call_manager.end_call(call_sid, "replayed")
+    agent.flight_recorder.end_call(call_sid)
+    return [turn_breakdown(trace) for trace in agent.flight_recorder.get_turns(call_sid)]
+
+
+def run_replay(path: str, realtime: bool = False) -> List[Dict]:
+    """Replay a recording against a new agent, on the virtual clock unless ``realtime``."""
+    recording = Recording(path)
+    if realtime:
+        agent = agent_module.TwilioVoiceAgent()
+        agent.call_recorder = CallRecorder()  # Never re-record a replay
+        return asyncio.run(replay(agent, recording))
+
+    clock = VirtualClock(time.time())
+    loop = VirtualTimeEventLoop(clock)
+    with virtual_time(clock):
+        agent = agent_module.TwilioVoiceAgent()
+        agent.call_recorder = CallRecorder()
+        try:
+            return loop.run_until_complete(replay(agent, recording))
+        finally:
+            loop.close()
+
+
+def compare(before: List[Dict], after: List[Dict]) -> List[Dict]:
+    """Line up two breakdowns turn by turn and get the change of every span and event."""
+    rows = []
+    for old, new in zip(before, after):
+        for group in ("spans", "events"):
+            for name in dict.fromkeys([*old[group], *new[group]]):
+                old_ms: Optional[float] = old[group].get(name)
+                new_ms: Optional[float] = new[group].get(name)
+                delta = round(new_ms - old_ms, 1) if old_ms is not None and new_ms is not None else None
+                rows.append(
+                    {"turn": new["turn"], "name": name, "before_ms": old_ms, "after_ms": new_ms, "delta_ms": delta}
+                )
+    return rows
+
+
+def main():
+    """Replay a recording and print, save or compare its turn breakdown."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", help="a .vcr file written by CallRecorder")
+    parser.add_argument("--realtime", action="store_true", help="replay in real time instead of on the virtual clock")
+    parser.add_argument("--save", help="write the turn breakdown as JSON")
+    parser.add_argument("--compare", help="compare with a breakdown saved by --save")
+    parser.add_argument("--dump", action="store_true", help="list the records instead of replaying them")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if args.dump:
+        for kind, offset_ns, payload in CallRecorder.read(args.recording):
+            detail = (
+                f"{len(payload)} bytes" if kind == CallRecorder.MEDIA_IN else json.dumps(payload, ensure_ascii=False)
+            )
+            print(f"{offset_ns / 1e6:>10.1f} ms  {CallRecorder.KIND_NAMES.get(kind, kind):<9}{detail}")
+        return
+
+    agent_module.logger.setLevel("ERROR")
+    turns = run_replay(args.recording, args.realtime)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(turns, f, indent=2)
+
+    rows = []
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(json.load(f), turns)
+
+    if args.json:
+        print(json.dumps({"turns": turns, "comparison": rows}, indent=2))
+        return
+
+    print(f"\n📊 Replay of {args.recording} ({'real time' if args.realtime else 'virtual clock'})")
+    for turn in turns:
+        spans = "  ".join(f"{name} {ms:.0f}" for name, ms in turn["spans"].items())
+        first_audio = turn["events"].get("first_audio_sent")
+        first_audio = f"{first_audio:.0f}" if first_audio is not None else "-"
+        print(f"turn {turn['turn']:>3}: first audio {first_audio:>6} ms | {spans}")
+    if rows:
+        print(f"\n📊 Against {args.compare} (ms)")
+        print(f"{'turn':>5}  {'stage':<22}{'before':>10}{'after':>10}{'delta':>10}")
+        for row in rows:
+            values = [f"{row[key]:.1f}" if row[key] is not None else "-" for key in ("before_ms", "after_ms")]
+            delta = f"{row['delta_ms']:+.1f}" if row["delta_ms"] is not None else "-"
+            print(f"{row['turn']:>5}  {row['name']:<22}{values[0]:>10}{values[1]:>10}{delta:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Ramp concurrent calls against the agent and find how many it sustains
+
+The mock providers and the fake callers run in their own processes; this
+process runs the agent under test (webhook, media-stream bridge and one
+ConversationProcessor per call), so its CPU time is the agent's. Each step
+holds a number of concurrent calls for a fixed time and records first-audio
+latency per turn. The highest step whose p95 meets the target with an
+acceptable error rate is the sustainable concurrency of one agent process.
+
+Usage:
+    python -m loadtest.run --steps 5 10 20 40 --step-seconds 30 --p95-target-ms 1500
+    python -m loadtest.run --llm 400,1200 --error-rate llm=0.02 --audio-dir recordings/ --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from typing import Dict, List
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest import mock_providers  # noqa: E402
+from loadtest.twilio_client import caller_process  # noqa: E402
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def free_port() -> int:
+    """Reserve an ephemeral port number."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_step(aut, loop_monitor, args: argparse.Namespace, concurrency: int, context) -> Dict:
+    """Hold ``concurrency`` calls for one step and measure latency, errors and agent CPU."""
+    processes = max(1, min(args.caller_processes, concurrency))
+    shares = [concurrency // processes + (1 if i < concurrency % processes else 0) for i in range(processes)]
+    queue = context.Queue()
+    callers = [
+        context.Process(
+            target=caller_process,
+            args=(
+                aut.webhook_url,
+                aut.media_url,
+                args.audio_dir,
+                share,
+                args.step_seconds,
+                args.turns,
+                args.answer_timeout,
+                queue,
+            ),
+            daemon=True,
+        )
+        for share in shares
+    ]
+
+    loop_monitor.recent_lags.clear()
+    wall_start, cpu_start = time.monotonic(), time.process_time()
+    for process in callers:
+        process.start()
+    loop = asyncio.get_running_loop()
+    calls = []
+    for _ in callers:
+        calls.extend(await loop.run_in_executor(None, queue.get))
+    for process in callers:
+        await loop.run_in_executor(None, process.join)
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    latencies = [latency for call in calls for latency in call["latencies_ms"]]
+    errors = sum(len(call["errors"]) for call in calls)
+    turns = len(latencies) + errors
+    return {
+        "concurrency": concurrency,
+        "calls": len(calls),
+        "turns": turns,
+        "p50_ms": round(percentile(latencies, 0.50)),
+        "p95_ms": round(percentile(latencies, 0.95)),
+        "p99_ms": round(percentile(latencies, 0.99)),
+        "error_rate": round(errors / turns, 4) if turns else 0.0,
+        "agent_cpu": round(cpu / wall, 3),
+        "loop_lag_p99_ms": loop_monitor.get_snapshot()["lag_ms"]["p99"],
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    """Start the mocks and the agent, then ramp through the steps."""
+    from loadtest.bridge import AgentUnderTest, agent_module  # Imported here so spawned children skip the agent
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    port = free_port()
+    providers = context.Process(target=mock_providers.serve, args=(args, port, ready), daemon=True)
+    providers.start()
+    await asyncio.get_running_loop().run_in_executor(None, ready.wait, 30)
+
+    aut = AgentUnderTest(f"http://127.0.0.1:{port}", endpointing_ms=args.endpointing_ms)
+    await aut.start()
+    agent_module.loop_monitor.start(asyncio.get_running_loop())
+
+    steps = []
+    try:
+        for concurrency in args.steps:
+            step = await run_step(aut, agent_module.loop_monitor, args, concurrency, context)
+            step["passed"] = step["p95_ms"] <= args.p95_target_ms and step["error_rate"] <= args.max_error_rate
+            steps.append(step)
+            if not args.json:
+                print_step(step)
+            if not step["passed"] and not args.keep_going:
+                break
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/stats") as response:
+                provider_stats = await response.json()
+    finally:
+        agent_module.loop_monitor.stop()
+        await aut.stop()
+        providers.terminate()
+
+    sustained = [step for step in steps if step["passed"]]
+    best = max(sustained, key=lambda step: step["concurrency"]) if sustained else None
+    return {
+        "p95_target_ms": args.p95_target_ms,
+        "max_error_rate": args.max_error_rate,
+        "steps": steps,
+        "providers": provider_stats,
+        # One agent process runs on one core, so its sustainable concurrency is the per-core figure
+        "max_calls_per_core": best["concurrency"] if best else 0,
+        "cpu_at_max": best["agent_cpu"] if best else None,
+    }
+
+
+def print_step(step: Dict):
+    """Print one row of the results table."""
+    print(
+        f"{step['concurrency']:>6}{step['calls']:>7}{step['turns']:>7}{step['p50_ms']:>8}{step['p95_ms']:>8}"
+        f"{step['p99_ms']:>8}{step['error_rate'] * 100:>8.1f}{step['agent_cpu'] * 100:>8.0f}"
+        f"{step['loop_lag_p99_ms']:>10}  {'✅' if step['passed'] else '❌'}",
+        flush=True,
+    )
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, nargs="+", default=[5, 10, 20, 40, 80], help="concurrent calls per step")
+    parser.add_argument("--step-seconds", type=float, default=30.0, help="how long each step holds its calls")
+    parser.add_argument("--turns", type=int, default=3, help="turns per call before hanging up")
+    parser.add_argument("--answer-timeout", type=float, default=5.0, help="seconds before a turn counts as failed")
+    parser.add_argument("--p95-target-ms", type=float, default=2000.0, help="first-audio p95 a step must meet")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="failed-turn rate a step may have")
+    parser.add_argument("--caller-processes", type=int, default=max(1, (os.cpu_count() or 2) - 2))
+    parser.add_argument("--audio-dir", default="", help="recorded utterances (.ulaw or 8 kHz .wav)")
+    parser.add_argument("--keep-going", action="store_true", help="run every step even after one fails")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    mock_providers.add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.getLogger("twilio_voice_agent").setLevel("ERROR")
+    logging.getLogger("werkzeug").setLevel("WARNING")
+    if not args.json:
+        print(f"\n📊 Load test: p95 target {args.p95_target_ms:.0f} ms, max error rate {args.max_error_rate:.1%}")
+        print(
+            f"{'calls':>6}{'total':>7}{'turns':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'err %':>8}{'cpu %':>8}{'lag p99':>10}"
+        )
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    if results["max_calls_per_core"]:
+        print(
+            f"\n✅ Sustains {results['max_calls_per_core']} concurrent calls per core "
+            f"({results['cpu_at_max'] * 100:.0f}% of a core busy)"
+        )
+        if results["cpu_at_max"] < 0.8 and results["steps"][-1]["passed"]:
+            print("   The agent was not saturated; add larger --steps to find its limit")
+    else:
+        print("\n❌ No step met the target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Capacity-planning simulation on a virtual clock
+
+Runs the real ConversationProcessor, RealCallManager, PerformanceMonitor,
+FlightRecorder and metrics code on an asyncio loop whose clock jumps straight
+to the next timer instead of waiting, so hours of traffic run in minutes.
+Calls arrive from a Poisson or diurnal process, and caller speech, think time,
+turns per call and provider latencies are drawn from distributions. Provider
+calls are modelled as virtual-time sleeps.
+
+Code runs in zero virtual time, so CPU is reported separately as the real CPU
+time the agent spent per virtual second (cores needed). Event-loop contention
+is not modelled; use loadtest.run to find where a single process saturates.
+
+Usage:
+    python -m loadtest.simulate --rate 10000 --hours 2
+    python -m loadtest.simulate --diurnal 12000,800 --hours 24 --sample-minutes 60 --json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import resource
+import selectors
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Provider clients are constructed but never contacted
+for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+    os.environ.setdefault(key, "simulation")
+os.environ.setdefault("CALL_STATS_PATH", "")
+
+from pipecat.frames.frames import (  # noqa: E402
+    BotStoppedSpeakingFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+
+import twilio_voice_agent as agent_module  # noqa: E402
+from loadtest.mock_providers import DEFAULT_RESPONSES, DEFAULT_TRANSCRIPTS, LatencyProfile  # noqa: E402
+
+
+class VirtualClock:
+    """Simulated time: seconds since the start of the run, plus the wall-clock time it started at."""
+
+    def __init__(self, epoch: float):
+        """Initialize the clock at ``epoch`` (a Unix timestamp)."""
+        self.epoch = epoch
+        self.now = 0.0
+
+    def wall(self) -> float:
+        """Get the simulated Unix time."""
+        return self.epoch + self.now
+
+
+class _VirtualTimeSelector(selectors.DefaultSelector):
+    """Polls real I/O without blocking and advances the clock to the next timer instead of sleeping."""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout=None):
+        events = super().select(None if timeout is None else 0)
+        if not events and timeout:
+            self.clock.now += timeout
+        return events
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose ``time()`` is a VirtualClock; idle waits take no real time."""
+
+    def __init__(self, clock: VirtualClock):
+        """Initialize the loop on ``clock``."""
+        self.clock = clock
+        super().__init__(selector=_VirtualTimeSelector(clock))
+
+    def time(self) -> float:
+        """Get the loop's (virtual) monotonic time."""
+        return self.clock.now
+
+
+class _VirtualTimeModule:
+    """Stand-in for the ``time`` module that reads a VirtualClock."""
+
+    def __init__(self, clock: VirtualClock):
+        self._clock = clock
+
+    def time(self) -> float:
+        return self._clock.wall()
+
+    def time_ns(self) -> int:
+        return int(self._clock.wall() * 1e9)
+
+    def monotonic(self) -> float:
+        return self._clock.now
+
+    def monotonic_ns(self) -> int:
+        return int(self._clock.now * 1e9)
+
+    perf_counter = monotonic
+    perf_counter_ns = monotonic_ns
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@contextlib.contextmanager
+def virtual_time(clock: VirtualClock):
+    """Make the agent module read ``time`` and ``datetime.now()`` from ``clock``."""
+
+    class VirtualDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock.wall(), tz)
+
+    saved = agent_module.time, agent_module.datetime
+    agent_module.time, agent_module.datetime = _VirtualTimeModule(clock), VirtualDatetime
+    try:
+        yield
+    finally:
+        agent_module.time, agent_module.datetime = saved
+
+
+class PoissonArrivals:
+    """Calls arriving at a constant average rate."""
+
+    def __init__(self, per_hour: float):
+        """Initialize with the mean arrival rate in calls per hour."""
+        self.per_hour = per_hour
+
+    def rate(self, t: float) -> float:
+        """Get the arrival rate (calls per second) at simulated time ``t``."""
+        return self.per_hour / 3600
+
+    def next_arrival(self, t: float) -> float:
+        """Get the time of the next arrival after ``t``."""
+        return t + random.expovariate(self.rate(t))
+
+
+class DiurnalArrivals(PoissonArrivals):
+    """Calls arriving at a rate that follows the time of day, peaking at ``peak_hour``.
+
+    Arrivals are drawn by thinning a Poisson process at the peak rate.
+    """
+
+    def __init__(self, peak_per_hour: float, trough_per_hour: float, peak_hour: float = 14.0, start_hour: float = 0.0):
+        """Initialize with the peak and overnight rates in calls per hour."""
+        super().__init__(peak_per_hour)
+        self.trough_per_hour = trough_per_hour
+        self.peak_hour = peak_hour
+        self.start_hour = start_hour
+
+    def rate(self, t: float) -> float:
+        """Get the arrival rate (calls per second) at simulated time ``t``."""
+        hour = self.start_hour + t / 3600
+        shape = (1 + math.cos(2 * math.pi * (hour - self.peak_hour) / 24)) / 2
+        return (self.trough_per_hour + (self.per_hour - self.trough_per_hour) * shape) / 3600
+
+    def next_arrival(self, t: float) -> float:
+        """Get the time of the next arrival after ``t``."""
+        peak = self.per_hour / 3600
+        while True:
+            t += random.expovariate(peak)
+            if random.random() * peak <= self.rate(t):
+                return t
+
+
+class SimulatedLLM:
+    """LLM whose first-token latency is a virtual-time sleep."""
+
+    def __init__(self, latency: LatencyProfile, responses: List[str]):
+        """Initialize with a latency profile and canned answers."""
+        self.latency = latency
+        self.responses = responses
+
+    async def complete(self, messages: List[Dict]) -> SimpleNamespace:
+        """Answer after a sampled delay, or fail at the profile's error rate."""
+        await asyncio.sleep(self.latency.sample())
+        if self.latency.fails():
+            raise RuntimeError("simulated LLM error")
+        return SimpleNamespace(content=self.responses[len(messages) % len(self.responses)])
+
+
+class SimulatedTTS:
+    """TTS whose first-byte latency is a virtual-time sleep; playback is timed by the caller."""
+
+    def __init__(self, latency: LatencyProfile):
+        """Initialize with a latency profile."""
+        self.latency = latency
+
+    async def synthesize(self, text: str, **options) -> None:
+        """Return after a sampled delay, or fail at the profile's error rate."""
+        await asyncio.sleep(self.latency.sample())
+        if self.latency.fails():
+            raise RuntimeError("simulated TTS error")
+
+
+def rss_mb() -> float:
+    """Get this process's resident memory in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Simulation:
+    """Drives simulated calls through a TwilioVoiceAgent and samples capacity curves."""
+
+    def __init__(
+        self,
+        agent: "agent_module.TwilioVoiceAgent",
+        clock: VirtualClock,
+        arrivals: PoissonArrivals,
+        duration: float,
+        sample_interval: float = 300.0,
+        utterance: Optional[LatencyProfile] = None,
+        think: Optional[LatencyProfile] = None,
+        mean_turns: float = 4.0,
+        endpointing: float = 0.3,
+        stt: Optional[LatencyProfile] = None,
+    ):
+        """Initialize the simulation; durations are in simulated seconds, profiles in milliseconds."""
+        self.agent = agent
+        self.clock = clock
+        self.arrivals = arrivals
+        self.duration = duration
+        self.sample_interval = sample_interval
+        self.utterance = utterance or LatencyProfile(1500, 4000)
+        self.think = think or LatencyProfile(600, 2000)
+        self.mean_turns = mean_turns
+        self.endpointing = endpointing
+        self.stt = stt or LatencyProfile(150, 300)
+        self.calls_started = 0
+        self.turn_latencies: List[float] = []  # First-audio latency (s) of turns in the current window
+        self.failed_turns = 0
+        self.total_turns = 0
+        self.all_latencies: List[float] = []
+        self.peak_active = 0
+        self.agent_cpu = 0.0  # Real CPU seconds spent in agent code in the current window
+        self.curve: List[Dict] = []
+
+    async def run(self):
+        """Generate arrivals until the end of the run, then let calls in progress finish."""
+        loop = asyncio.get_running_loop()
+        sampler = asyncio.create_task(self._sample())
+        calls = set()
+        t = self.arrivals.next_arrival(0.0)
+        while t < self.duration:
+            await asyncio.sleep(t - loop.time())
+            task = asyncio.create_task(self._call(self.calls_started))
+            calls.add(task)
+            task.add_done_callback(calls.discard)
+            self.calls_started += 1
+            t = self.arrivals.next_arrival(t)
+        if calls:
+            await asyncio.gather(*calls)
+        sampler.cancel()
+        self._record_sample()
+
+    async def _process(self, processor, frame):
+        """Run one frame through the processor, charging its real CPU time to the agent."""
+        start = time.process_time()
+        await processor.process(frame)
+        await processor.turn_taken()  # Callers here never resume a held turn
+        self.agent_cpu += time.process_time() - start
+
+    async def _call(self, index: int):
+        """One caller: answer, a geometric number of turns, hang up."""
+        call_sid = f"SIM{index:09d}"
+        agent_module.bind_call_context(call_sid)
+        start = time.process_time()
+        self.agent.call_manager.start_call(call_sid, "+15550100", "inbound")
+        self.agent.performance_monitor.start_call_monitoring(call_sid)
+        processor = self.agent.create_call_processor(call_sid)
+        self.agent_cpu += time.process_time() - start
+        self.peak_active = max(self.peak_active, len(self.agent.call_manager.active_calls))
+
+        turns = 1 + int(random.expovariate(1 / max(self.mean_turns - 1, 1e-9))) if self.mean_turns > 1 else 1
+        for turn in range(turns):
+            await self._process(processor, UserStartedSpeakingFrame())
+            await asyncio.sleep(self.utterance.sample())
+            speech_end = asyncio.get_running_loop().time()
+            await self._process(processor, UserStoppedSpeakingFrame())
+            await asyncio.sleep(self.endpointing + self.stt.sample())
+
+            answers = len(processor.conversation_history)
+            text = DEFAULT_TRANSCRIPTS[(index + turn) % len(DEFAULT_TRANSCRIPTS)]
+            frame = TranscriptionFrame(text=text, user_id=call_sid, timestamp=str(speech_end))
+            await self._process(processor, frame)
+            self.total_turns += 1
+            if len(processor.conversation_history) < answers + 2:
+                self.failed_turns += 1
+                continue
+            self.turn_latencies.append(asyncio.get_running_loop().time() - speech_end)
+
+            # Play the answer at ~65 ms per character, then the caller thinks
+            await asyncio.sleep(len(processor.conversation_history[-1]["content"]) * 0.065)
+            await self._process(processor, BotStoppedSpeakingFrame())
+            await asyncio.sleep(self.think.sample())
+
+        start = time.process_time()
+        self.agent.call_manager.end_call(call_sid, "completed")
+        self.agent.flight_recorder.end_call(call_sid)
+        self.agent_cpu += time.process_time() - start
+
+    async def _sample(self):
+        """Record one point of the capacity curves every sample interval."""
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            self._record_sample()
+
+    def _record_sample(self):
+        """Close the current window and append its curve point."""
+        loop = asyncio.get_running_loop()
+        latencies = sorted(self.turn_latencies)
+        elapsed = loop.time() - (self.curve[-1]["t"] if self.curve else 0.0)
+        if not elapsed and self.curve:
+            return
+
+        def quantile(q):
+            return round(latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000) if latencies else 0
+
+        self.curve.append(
+            {
+                "t": round(loop.time(), 1),
+                "clock": datetime.fromtimestamp(self.clock.wall()).strftime("%H:%M"),
+                "arrivals_per_hour": round(self.arrivals.rate(loop.time()) * 3600),
+                "active_calls": len(self.agent.call_manager.active_calls),
+                "peak_active_calls": self.peak_active,
+                "turns": len(latencies),
+                "p50_ms": quantile(0.50),
+                "p95_ms": quantile(0.95),
+                "cpu_cores": round(self.agent_cpu / elapsed, 3) if elapsed else 0.0,
+                "rss_mb": round(rss_mb(), 1),
+                "tracked": self.agent.get_tracked_sizes(),
+            }
+        )
+        self.all_latencies.extend(latencies)
+        self.turn_latencies = []
+        self.agent_cpu = 0.0
+        self.peak_active = len(self.agent.call_manager.active_calls)
+
+
+def simulate(args: argparse.Namespace) -> Dict:
+    """Build the agent and run the simulation on a virtual clock."""
+    midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    clock = VirtualClock(midnight + args.start_hour * 3600)
+    if args.diurnal:
+        peak, trough = (float(value) for value in args.diurnal.split(","))
+        arrivals = DiurnalArrivals(peak, trough, args.peak_hour, args.start_hour)
+    else:
+        arrivals = PoissonArrivals(args.rate)
+
+    random.seed(args.seed)
+    loop = VirtualTimeEventLoop(clock)
+    with virtual_time(clock):
+        agent = agent_module.TwilioVoiceAgent()
+        agent.llm_service = SimulatedLLM(LatencyProfile.parse(args.llm, args.llm_error_rate), DEFAULT_RESPONSES)
+        agent.tts_service = SimulatedTTS(LatencyProfile.parse(args.tts, args.tts_error_rate))
+        simulation = Simulation(
+            agent,
+            clock,
+            arrivals,
+            args.hours * 3600,
+            args.sample_minutes * 60,
+            utterance=LatencyProfile.parse(args.utterance),
+            think=LatencyProfile.parse(args.think),
+            mean_turns=args.turns,
+            endpointing=args.endpointing_ms / 1000,
+            stt=LatencyProfile.parse(args.stt),
+        )
+
+        wall_start = time.perf_counter()
+        try:
+            loop.run_until_complete(simulation.run())
+        finally:
+            loop.close()
+        wall = time.perf_counter() - wall_start
+
+    latencies = sorted(simulation.all_latencies)
+    p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000 if latencies else 0.0
+    return {
+        "simulated_hours": round(clock.now / 3600, 2),
+        "wall_seconds": round(wall, 1),
+        "speedup": round(clock.now / wall) if wall else None,
+        "calls": simulation.calls_started,
+        "turns": simulation.total_turns,
+        "failed_turns": simulation.failed_turns,
+        "p95_ms": round(p95),
+        "peak_active_calls": max((point["peak_active_calls"] for point in simulation.curve), default=0),
+        "peak_cpu_cores": max((point["cpu_cores"] for point in simulation.curve), default=0.0),
+        "peak_rss_mb": max((point["rss_mb"] for point in simulation.curve), default=0.0),
+        "curve": simulation.curve,
+    }
+
+
+def main():
+    """Run the simulation."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=10000, help="Poisson arrivals in calls per hour")
+    parser.add_argument("--diurnal", default="", help="peak,trough calls per hour over a 24-hour cycle")
+    parser.add_argument("--peak-hour", type=float, default=14.0, help="hour of day of the diurnal peak")
+    parser.add_argument("--start-hour", type=float, default=0.0, help="simulated hour of day to start at")
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated hours of arrivals")
+    parser.add_argument("--sample-minutes", type=float, default=5.0, help="simulated minutes per curve point")
+    parser.add_argument("--turns", type=float, default=4.0, help="mean turns per call (geometric)")
+    parser.add_argument("--utterance", default="1500,4000", help="caller speech median,p95 in ms")
+    parser.add_argument("--think", default="600,2000", help="caller pause after an answer median,p95 in ms")
+    parser.add_argument("--endpointing-ms", type=float, default=300, help="silence before the final transcript")
+    parser.add_argument("--stt", default="150,300", help="STT final-result latency median,p95 in ms")
+    parser.add_argument("--llm", default="250,600", help="LLM latency median,p95 in ms")
+    parser.add_argument("--tts", default="150,350", help="TTS first-byte latency median,p95 in ms")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--tts-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    agent_module.logger.setLevel("ERROR")
+    results = simulate(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"\n📊 Simulated {results['simulated_hours']}h in {results['wall_seconds']}s ({results['speedup']}x): "
+        f"{results['calls']} calls, {results['turns']} turns, {results['failed_turns']} failed"
+    )
+    print(f"{'time':<7}{'arr/h':>8}{'active':>8}{'peak':>7}{'turns':>8}{'p50':>7}{'p95':>7}{'cores':>8}{'RSS MB':>9}")
+    for p in results["curve"]:
+        print(
+            f"{p['clock']:<7}{p['arrivals_per_hour']:>8}{p['active_calls']:>8}{p['peak_active_calls']:>7}"
+            f"{p['turns']:>8}{p['p50_ms']:>7}{p['p95_ms']:>7}{p['cpu_cores']:>8}{p['rss_mb']:>9}"
+        )
+    print(
+        f"\nProjected: p95 {results['p95_ms']} ms, peak {results['peak_active_calls']} concurrent calls, "
+        f"{results['peak_cpu_cores']} cores, {results['peak_rss_mb']} MB RSS"
+    )
+    if results["curve"]:
+        print(f"Per-call structures at the end: {results['curve'][-1]['tracked']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Fake Twilio caller
+
+Places a call the way Twilio does (``POST /webhook``, then a media-stream
+WebSocket) and plays utterances as real-time 20 ms μ-law frames, sending
+silence between them like a live phone line. A turn's latency is measured
+from the caller's last speech frame to the first outbound audio from the
+agent; a turn with no answer within the timeout counts as an error.
+"""
+
+import asyncio
+import base64
+import json
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from loadtest.audio import FRAME_BYTES, SILENCE_FRAME, load_utterances, split_frames, synthetic_utterance
+
+FRAME_SECONDS = 0.02
+
+
+class FakeTwilioCall:
+    """One simulated phone call."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        webhook_url: str,
+        media_url: str,
+        utterances: List[bytes],
+        turns: int = 3,
+        answer_timeout: float = 5.0,
+        pause: float = 0.5,
+        call_sid: Optional[str] = None,
+    ):
+        """Initialize the call; ``pause`` is how long the caller waits after the agent finishes speaking."""
+        self.session = session
+        self.webhook_url = webhook_url
+        self.media_url = media_url
+        self.utterances = utterances
+        self.turns = turns
+        self.answer_timeout = answer_timeout
+        self.pause = pause
+        self.call_sid = call_sid or f"CA{uuid.uuid4().hex}"
+        self.stream_sid = f"MZ{uuid.uuid4().hex}"
+        self.latencies_ms: List[float] = []
+        self.errors: List[str] = []
+        self._first_audio = asyncio.Event()
+        self._first_audio_at = 0.0
+        self._bot_audio_bytes = 0
+        self._sequence = 0
+        self._next_frame = 0.0
+
+    async def run(self) -> Dict:
+        """Place the call, play every turn and hang up."""
+        try:
+            async with self.session.post(
+                self.webhook_url, data={"CallSid": self.call_sid, "From": "+15550100", "To": "+15550199"}
+            ) as response:
+                if response.status != 200:
+                    self.errors.append(f"webhook {response.status}")
+                    return self.result()
+            async with self.session.ws_connect(self.media_url) as ws:
+                await self._stream(ws)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.errors.append(type(e).__name__)
+        return self.result()
+
+    def result(self) -> Dict:
+        """Summarize the call."""
+        return {"call_sid": self.call_sid, "latencies_ms": self.latencies_ms, "errors": self.errors}
+
+    async def _stream(self, ws: aiohttp.ClientWebSocketResponse):
+        """Run the media stream: caller audio out, agent audio in."""
+        await ws.send_json({"event": "connected", "protocol": "Call", "version": "1.0.0"})
+        await ws.send_json(
+            {
+                "event": "start",
+                "sequenceNumber": "1",
+                "streamSid": self.stream_sid,
+                "start": {
+                    "streamSid": self.stream_sid,
+                    "callSid": self.call_sid,
+                    "tracks": ["inbound"],
+                    "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": 8000, "channels": 1},
+                },
+            }
+        )
+        receiver = asyncio.create_task(self._receive(ws))
+        self._next_frame = time.monotonic()
+        try:
+            for turn in range(self.turns):
+                utterance = self.utterances[turn % len(self.utterances)]
+                for frame in split_frames(utterance):
+                    await self._send_frame(ws, frame)
+                speech_end = time.monotonic()
+
+                self._first_audio.clear()
+                self._bot_audio_bytes = 0
+                deadline = speech_end + self.answer_timeout
+                while not self._first_audio.is_set() and time.monotonic() < deadline:
+                    await self._send_frame(ws, SILENCE_FRAME)
+                if not self._first_audio.is_set():
+                    self.errors.append(f"turn {turn + 1}: no answer within {self.answer_timeout}s")
+                    continue
+                self.latencies_ms.append((self._first_audio_at - speech_end) * 1000)
+
+                # Listen to the answer, then pause before speaking again
+                while time.monotonic() < self._first_audio_at + self._bot_audio_bytes / 8000 + self.pause:
+                    await self._send_frame(ws, SILENCE_FRAME)
+            await ws.send_json({"event": "stop", "streamSid": self.stream_sid, "stop": {"callSid": self.call_sid}})
+        finally:
+            receiver.cancel()
+
+    async def _send_frame(self, ws: aiohttp.ClientWebSocketResponse, frame: bytes):
+        """Send one frame on the absolute 20 ms schedule so pacing does not drift."""
+        delay = self._next_frame - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._next_frame += FRAME_SECONDS
+        self._sequence += 1
+        await ws.send_json(
+            {
+                "event": "media",
+                "sequenceNumber": str(self._sequence),
+                "streamSid": self.stream_sid,
+                "media": {"track": "inbound", "payload": base64.b64encode(frame[:FRAME_BYTES]).decode()},
+            }
+        )
+
+    async def _receive(self, ws: aiohttp.ClientWebSocketResponse):
+        """Record when agent audio arrives and how much of it there is."""
+        async for message in ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            data = json.loads(message.data)
+            if data.get("event") == "media":
+                if not self._first_audio.is_set():
+                    self._first_audio_at = time.monotonic()
+                    self._first_audio.set()
+                self._bot_audio_bytes += len(base64.b64decode(data["media"]["payload"]))
+
+
+async def run_calls(
+    webhook_url: str,
+    media_url: str,
+    utterances: List[bytes],
+    concurrency: int,
+    duration: float,
+    turns: int = 3,
+    answer_timeout: float = 5.0,
+    ramp: float = 2.0,
+) -> List[Dict]:
+    """Keep ``concurrency`` calls up for ``duration`` seconds, starting a new call as each one ends.
+
+    Call starts are spread over ``ramp`` seconds so turns do not line up.
+    """
+    results = []
+    deadline = time.monotonic() + duration
+
+    async def slot(index: int):
+        await asyncio.sleep(ramp * index / max(concurrency, 1))
+        while time.monotonic() < deadline:
+            call = FakeTwilioCall(session, webhook_url, media_url, utterances, turns, answer_timeout)
+            results.append(await call.run())
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        await asyncio.gather(*(slot(i) for i in range(concurrency)))
+    return results
+
+
+def load_audio(audio_dir: str) -> List[bytes]:
+    """Load recorded utterances, or synthesize a few if no directory is given."""
+    if audio_dir:
+        return load_utterances(audio_dir)
+    return [synthetic_utterance(seconds, seed) for seed, seconds in enumerate((1.2, 0.8, 1.6, 1.0))]
+
+
+def caller_process(webhook_url, media_url, audio_dir, concurrency, duration, turns, answer_timeout, results):
+    """Run a share of a load step's calls in a separate process (multiprocessing target)."""
+    calls = asyncio.run(
+        run_calls(webhook_url, media_url, load_audio(audio_dir), concurrency, duration, turns, answer_timeout)
+    )
+    results.put(calls)
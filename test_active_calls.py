@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the /api/calls/active snapshots, pagination and change polling
+"""
+
+import pytest
+
+from twilio_voice_agent import CallStatsAggregator, RealCallManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Call manager with five active calls."""
+    manager = RealCallManager(CallStatsAggregator(persist_path=str(tmp_path / "stats.json")))
+    for i in range(5):
+        manager.start_call(f"CA{i}", f"+1555000{i}")
+    return manager
+
+
+def test_cursor_pagination_walks_calls_in_start_order(manager):
+    """Pages follow start order even when calls end between requests."""
+    first = manager.get_active_calls_page(limit=2)
+    assert [call["call_sid"] for call in first["calls"]] == ["CA0", "CA1"]
+    assert first["has_more"]
+
+    manager.end_call("CA2")
+    second = manager.get_active_calls_page(cursor=first["next_cursor"], limit=2)
+    assert [call["call_sid"] for call in second["calls"]] == ["CA3", "CA4"]
+    assert second["next_cursor"] is None
+    assert second["total_active"] == 4
+
+
+def test_since_returns_only_changed_and_removed_calls(manager):
+    """Polling with since returns calls changed after that version."""
+    version = manager.get_active_calls_page()["version"]
+
+    manager.record_utterance("CA3")
+    manager.update_call_language("CA1", "en-US")
+    manager.end_call("CA4")
+
+    delta = manager.get_active_calls_page(since=version)
+    assert [call["call_sid"] for call in delta["calls"]] == ["CA3", "CA1"]
+    assert delta["removed"] == ["CA4"]
+    assert delta["calls"][1]["language"] == "en-US"
+
+    assert manager.get_active_calls_page(since=delta["version"])["calls"] == []
+
+
+def test_since_pages_through_large_deltas(manager):
+    """Deltas larger than the page size resume from the last version returned."""
+    version = manager.get_active_calls_page()["version"]
+    for i in range(5):
+        manager.record_interruption(f"CA{i}")
+
+    first = manager.get_active_calls_page(since=version, limit=3)
+    assert [call["call_sid"] for call in first["calls"]] == ["CA0", "CA1", "CA2"]
+    assert first["has_more"]
+
+    rest = manager.get_active_calls_page(since=first["version"], limit=3)
+    assert [call["call_sid"] for call in rest["calls"]] == ["CA3", "CA4"]
+    assert not rest["has_more"]
+
+
+def test_since_older_than_retained_removals_requests_reset(tmp_path):
+    """A client that fell too far behind is told to resync."""
+    manager = RealCallManager(CallStatsAggregator(persist_path=str(tmp_path / "stats.json")), max_removed_calls=2)
+    for i in range(4):
+        manager.start_call(f"CA{i}", "+15550000")
+    version = manager.get_active_calls_page()["version"]
+    for i in range(3):
+        manager.end_call(f"CA{i}")
+
+    page = manager.get_active_calls_page(since=version)
+    assert page["reset"]
+    assert [call["call_sid"] for call in page["calls"]] == ["CA3"]
+
+
+def test_since_ahead_of_the_current_version_requests_reset(manager, tmp_path):
+    """A client holding a version from before a restart resyncs instead of getting an empty delta."""
+    version = manager.get_active_calls_page()["version"]
+    restarted = RealCallManager(CallStatsAggregator(persist_path=str(tmp_path / "restarted.json")))
+    restarted.start_call("CA9", "+15550009")
+
+    page = restarted.get_active_calls_page(since=version)
+    assert page["reset"] and page["version"] == restarted.version
+    assert [call["call_sid"] for call in page["calls"]] == ["CA9"]
+
+
+def test_snapshots_are_immutable_and_selectable(manager):
+    """Snapshots cannot be modified and support field selection."""
+    manager.record_performance_metric("CA0", "total", 420.0)
+    info = manager.get_call_info("CA0")
+
+    with pytest.raises(TypeError):
+        info["status"] = "hacked"
+    assert info["total_latency"] == (420.0,)
+
+    manager.record_performance_metric("CA0", "total", 380.0)
+    assert info["total_latency"] == (420.0,)
+    assert manager.get_call_info("CA0")["total_latency"] == (420.0, 380.0)
+
+    page = manager.get_active_calls_page(limit=1, fields=["call_sid", "total_latency", "unknown"])
+    assert page["calls"] == [{"call_sid": "CA0", "total_latency": (420.0, 380.0)}]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for admission control in /webhook
+"""
+
+import time
+
+import twilio_voice_agent
+from twilio_voice_agent import AdmissionController, LanguageManager, MetricsRegistry
+
+
+def make_controller(calls, lag, **kwargs):
+    """Create a controller reading mutable call-count and lag holders, reporting to a private registry."""
+    return AdmissionController(
+        lambda: calls[0], lambda: lag[0], LanguageManager(), registry=MetricsRegistry(), **kwargs
+    )
+
+
+def test_webhook_queues_overflow_and_lets_callers_in_when_capacity_frees(monkeypatch):
+    """Over the call limit new calls are queued; the head of the queue leaves only once a call can be taken."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    monkeypatch.setattr(twilio_voice_agent, "voice_agent", agent)
+    agent.admission = AdmissionController(
+        lambda: len(agent.call_manager.active_calls),
+        lambda: 0.0,
+        agent.language_manager,
+        max_calls=1,
+        overflow="queue",
+        registry=MetricsRegistry(),
+    )
+    client = twilio_voice_agent.app.test_client()
+
+    first = client.post("/webhook", data={"CallSid": "CAADMIT1", "From": "+15550001", "To": "+15559999"})
+    assert "<Gather" in first.get_data(as_text=True)
+
+    queued = client.post("/webhook", data={"CallSid": "CAADMIT2", "From": "+15550002", "To": "+15559999"})
+    body = queued.get_data(as_text=True)
+    assert "<Enqueue" in body and 'waitUrl="/queue-wait"' in body and "CAADMIT2" not in agent.call_manager.active_calls
+
+    assert "<Play>" in client.post("/queue-wait", data={"QueuePosition": "1"}).get_data(as_text=True)
+    agent.call_manager.end_call("CAADMIT1", "completed")
+    assert "<Play>" in client.post("/queue-wait", data={"QueuePosition": "2"}).get_data(as_text=True)
+    assert "<Leave" in client.post("/queue-wait", data={"QueuePosition": "1"}).get_data(as_text=True)
+
+    readmitted = client.post(
+        "/webhook?overflow=queue",
+        data={"CallSid": "CAADMIT2", "From": "+15550002", "To": "+15559999", "QueueResult": "leave"},
+    )
+    assert "<Gather" in readmitted.get_data(as_text=True)
+    assert "CAADMIT2" in agent.call_manager.active_calls
+    assert agent.admission.get_stats()["decisions"] == {"accept": 2, "reject": 0, "queue": 1, "redirect": 0}
+
+    malformed = client.post("/queue-wait", data={"QueuePosition": "first"})
+    assert malformed.status_code == 200 and "<Play>" in malformed.get_data(as_text=True)
+
+
+def test_reasons_redirect_fallback_and_rolling_p95():
+    """Loop lag and turn p95 trip admission; a redirected call is never redirected again; old turns age out."""
+    calls, lag = [0], [0.0]
+    controller = make_controller(
+        calls, lag, max_calls=10, overflow="redirect", redirect_url="https://node-b.example.com/webhook", window=0.2
+    )
+    assert controller.admit() == ("accept", None)
+
+    lag[0] = 0.3
+    assert controller.admit() == ("redirect", "loop_lag")
+    assert "https://node-b.example.com/webhook?overflow=redirect" in controller.twiml["redirect"]
+    assert controller.admit(redirected=True) == ("reject", "loop_lag")
+    lag[0] = 0.0
+
+    for _ in range(controller.min_turns - 1):
+        controller.record_turn(3.0)
+    assert controller.turn_p95() == 0.0  # Too few turns to judge
+    controller.record_turn(3.0)
+    assert controller.turn_p95() >= controller.max_p95
+    assert controller.admit() == ("redirect", "turn_p95")
+
+    time.sleep(0.25)  # More than a full window without turns
+    assert controller.admit() == ("accept", None)
+
+    calls[0] = 10
+    assert controller.overload_reason() == "active_calls"
+    no_target = make_controller(calls, lag, max_calls=10, overflow="redirect")
+    assert no_target.admit() == ("reject", "active_calls")
+    assert "<Hangup" in no_target.twiml["reject"]
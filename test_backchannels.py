@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for backchannel scheduling: predicted and observed cues, and holding back while the caller speaks
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from pipecat.frames.frames import TranscriptionFrame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame
+
+import twilio_voice_agent
+from twilio_voice_agent import BackchannelScheduler, LanguageManager, MetricsRegistry, StageDeadlines, TurnTrace
+
+
+class SlowLLM:
+    """LLM stub answering after a fixed delay."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def complete(self, messages):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(content="Su pedido llega mañana.")
+
+
+class PlayingTTS:
+    """TTS stub whose audio is its text; logs what was played, cached phrases included."""
+
+    def __init__(self):
+        self.played = []
+
+    async def synthesize(self, text, **options):
+        if "first_byte" in options:  # An answer, not a phrase being cached
+            self.played.append(text)
+        return text.encode()
+
+    async def play(self, audio):
+        self.played.append(audio.decode())
+
+
+def make_agent(llm_delay, max_per_turn=2):
+    """Create an agent with stub services, cached phrases and a scheduler that predicts from three turns."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    agent.llm_service, agent.tts_service = SlowLLM(llm_delay), PlayingTTS()
+    agent.response_cache.enabled = False
+    budgets = {"llm_first_token": 0.2, "llm_response": 2.0, "tts_first_byte": 0.0}
+    agent.deadlines = StageDeadlines({"es-LA": budgets, "en-US": budgets}, registry=MetricsRegistry())
+    agent.backchannels = BackchannelScheduler(
+        agent.language_manager, lead=0.05, max_per_turn=max_per_turn, min_samples=3, registry=MetricsRegistry()
+    )
+    asyncio.run(agent.phrase_cache.warm(agent.tts_service))
+    return agent
+
+
+def test_turn_expected_to_be_slow_gets_a_backchannel_before_the_filler():
+    """Once recent turns are slow, a backchannel plays first, then the filler at the deadline, then the answer."""
+    agent = make_agent(0.3)
+    processor = agent.create_call_processor("CABACKCHANNEL1")
+    config = agent.language_manager.language_configs["es-LA"]
+
+    def turn():
+        processor.trace = TurnTrace("CABACKCHANNEL1", 1)
+        processor.endpointing_span = processor.trace.start("endpointing")
+        processor.conversation_history.append({"role": "user", "content": "¿dónde está mi pedido?"})
+        agent.tts_service.played.clear()
+        asyncio.run(processor._get_ai_response("¿dónde está mi pedido?"))
+        return agent.tts_service.played
+
+    assert turn() == [config["filler"], "Su pedido llega mañana."]  # Nothing predicted yet
+    for _ in range(4):
+        agent.backchannels.observe(1.5)
+    assert agent.backchannels.predicted() >= 1.0
+
+    assert turn() == ["Mm-hmm.", config["filler"], "Su pedido llega mañana."]
+    events = [name for name, _ in processor.trace.events]
+    assert events.index("backchannel") < events.index("filler") < events.index("first_audio_sent")
+    assert turn()[0] == "Claro."  # Backchannels take turns
+
+    stats = agent.backchannels.get_stats()
+    assert stats["predicted"]["played"] == 2 and stats["observed"]["played"] == 3
+
+
+def test_cues_never_play_over_the_caller():
+    """A caller talking over the wait is an interruption, and the cues due meanwhile are held back."""
+    agent = make_agent(0.3)
+    for _ in range(3):
+        agent.backchannels.observe(1.5)
+    agent.call_manager.start_call("CABACKCHANNEL2", "+15550123", "inbound")
+    agent.performance_monitor.start_call_monitoring("CABACKCHANNEL2")
+    processor = agent.create_call_processor("CABACKCHANNEL2")
+
+    async def run():
+        await processor.process(UserStartedSpeakingFrame())
+        await processor.process(UserStoppedSpeakingFrame())
+        frame = TranscriptionFrame(text="¿Dónde está mi pedido?", user_id="CABACKCHANNEL2", timestamp="")
+        answer = asyncio.ensure_future(processor.process(frame))
+        await asyncio.sleep(0.02)
+        await processor.process(UserStartedSpeakingFrame())  # "¿Hola?" over the silence
+        await asyncio.sleep(0.22)
+        await processor.process(UserStoppedSpeakingFrame())
+        await answer
+
+    asyncio.run(run())
+    assert agent.tts_service.played[-1:] == ["Su pedido llega mañana."]
+    assert "Mm-hmm." not in agent.tts_service.played
+    assert agent.performance_monitor.call_metrics["CABACKCHANNEL2"]["interruptions"] == 1
+    stats = agent.backchannels.get_stats()
+    assert stats["predicted"]["suppressed"] == 1 and stats["observed"]["suppressed"] == 1
+
+    registry = MetricsRegistry()
+    disabled = BackchannelScheduler(LanguageManager(), enabled=False, registry=registry)
+    assert disabled.plan("en-US", 0.8) == [(0.8, "Let me check, one moment...", "observed")]
+    assert not disabled.holds_back(True, 0.0)
+    disabled.record("en-US", "observed", "played")
+    assert 'voice_agent_backchannels_total{language="en-US",trigger="observed",outcome="played"} 1' in registry.render()
+
+
+def test_deadline_filler_is_kept_and_counted_when_cues_are_capped():
+    """With room for one cue, the predicted backchannel gives way to the filler, so the missed deadline is counted."""
+    agent = make_agent(0.3, max_per_turn=1)
+    for _ in range(3):
+        agent.backchannels.observe(1.5)
+    config = agent.language_manager.language_configs["es-LA"]
+    assert agent.backchannels.plan("es-LA", 0.2) == [(0.2, config["filler"], "observed")]
+
+    processor = agent.create_call_processor("CABACKCHANNEL3")
+    processor.trace = TurnTrace("CABACKCHANNEL3", 1)
+    processor.endpointing_span = processor.trace.start("endpointing")
+    processor.conversation_history.append({"role": "user", "content": "¿dónde está mi pedido?"})
+    asyncio.run(processor._get_ai_response("¿dónde está mi pedido?"))
+    assert agent.tts_service.played[-2:] == [config["filler"], "Su pedido llega mañana."]
+    assert agent.deadlines.get_stats()["hits"]["llm_first_token"] == 1
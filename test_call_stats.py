@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the time-bucketed call statistics behind the /call-stats endpoint
+"""
+
+import os
+import threading
+from datetime import datetime, timezone
+
+import twilio_voice_agent
+from twilio_voice_agent import CallStatsAggregator, LatencySketch, RealCallManager
+
+# 2025-01-15 14:30:00 UTC
+BASE_TS = datetime(2025, 1, 15, 14, 30, tzinfo=timezone.utc).timestamp()
+
+
+def test_daily_stats_roll_up_from_events():
+    """Calls, answers and outcomes roll up into the daily bucket."""
+    stats = CallStatsAggregator(timezone=timezone.utc)
+
+    for i in range(4):
+        stats.record_call_started(BASE_TS + i)
+    stats.record_call_started(BASE_TS + 3600)  # One call in the next hour
+
+    for i in range(3):
+        stats.record_call_answered(BASE_TS + i)
+
+    stats.record_call_ended(240, "completed", "es-LA", answered=True, timestamp=BASE_TS + 300)
+    stats.record_call_ended(300, "completed", "en-US", answered=True, timestamp=BASE_TS + 400)
+    stats.record_call_ended(30, "hangup", "es-LA", answered=True, timestamp=BASE_TS + 500)
+    stats.record_call_ended(5, "declined", "es-LA", answered=False, timestamp=BASE_TS + 600)
+
+    daily = stats.get_daily_stats("2025-01-15")
+    assert daily["total_calls"] == 5
+    assert daily["answered_calls"] == 3
+    assert daily["missed_calls"] == 2
+    assert daily["positive_calls"] == 2
+    assert daily["answer_rate"] == 60.0
+    assert daily["success_rate"] == 66.7
+    assert daily["avg_call_duration"] == "2:23"
+    assert daily["peak_hour"] == "14:00-15:00"
+    assert daily["end_reasons"] == {"completed": 2, "hangup": 1, "declined": 1}
+    assert daily["languages"] == {"es-LA": 3, "en-US": 1}
+
+
+def test_day_boundaries_follow_timezone():
+    """A call at 02:00 UTC belongs to the previous day in Mexico City."""
+    from zoneinfo import ZoneInfo
+
+    stats = CallStatsAggregator(timezone=ZoneInfo("America/Mexico_City"))
+    stats.record_call_started(datetime(2025, 1, 16, 2, 0, tzinfo=timezone.utc).timestamp())
+
+    assert stats.get_daily_stats("2025-01-15")["total_calls"] == 1
+    assert stats.get_daily_stats("2025-01-15")["peak_hour"] == "20:00-21:00"
+    assert stats.get_daily_stats("2025-01-16")["total_calls"] == 0
+
+
+def test_minute_buckets_are_pruned():
+    """Only the most recent minute buckets are kept."""
+    stats = CallStatsAggregator(timezone=timezone.utc, max_minute_buckets=10)
+    for minute in range(30):
+        stats.record_call_started(BASE_TS + minute * 60)
+
+    assert len(stats.buckets["minute"]) == 10
+    assert min(stats.buckets["minute"]) == int(BASE_TS // 60) + 20
+    assert stats.get_daily_stats("2025-01-15")["total_calls"] == 30
+
+
+def test_stats_survive_restart(tmp_path):
+    """Persisted buckets are reloaded by a new aggregator."""
+    path = str(tmp_path / "call_stats.json")
+    stats = CallStatsAggregator(timezone=timezone.utc, persist_path=path)
+    stats.record_call_started(BASE_TS)
+    stats.record_call_answered(BASE_TS)
+    stats.record_latency(420.0, BASE_TS)
+    stats.record_call_ended(60, "completed", "es-LA", answered=True, timestamp=BASE_TS + 60)
+    stats.persist()
+
+    restored = CallStatsAggregator(timezone=timezone.utc, persist_path=path)
+    before = stats.get_daily_stats("2025-01-15")
+    after = restored.get_daily_stats("2025-01-15")
+    before.pop("last_updated")
+    after.pop("last_updated")
+    assert after == before
+    assert list(restored.buckets["minute"]) == list(stats.buckets["minute"])
+
+
+def test_latency_sketch_quantiles():
+    """Sketch quantiles stay within the bucket that holds the true value."""
+    sketch = LatencySketch()
+    for latency in range(1, 1001):
+        sketch.add(float(latency))
+
+    assert 900 <= sketch.quantile(0.95) <= 1000
+    assert 400 <= sketch.quantile(0.5) <= 500
+    assert sketch.quantile(1.0) == 1000
+
+    merged = LatencySketch()
+    merged.merge(sketch)
+    merged.merge(sketch)
+    assert merged.count == 2000
+    assert merged.quantile(0.95) == sketch.quantile(0.95)
+
+
+def test_call_manager_feeds_aggregator(tmp_path):
+    """RealCallManager records starts, answers and outcomes."""
+    manager = RealCallManager(CallStatsAggregator(persist_path=str(tmp_path / "stats.json")))
+    manager.start_call("CA1", "+15550001", "inbound")
+    manager.start_call("CA2", "+15550002", "inbound")
+    manager.mark_answered("CA1")
+    manager.mark_answered("CA1")
+    manager.end_call("CA1", "completed")
+    manager.end_call("CA2", "declined")
+
+    daily = manager.stats.get_daily_stats()
+    assert manager.total_calls_today == 2
+    assert daily["answered_calls"] == 1
+    assert daily["positive_calls"] == 1
+    assert daily["missed_calls"] == 1
+
+
+def test_ending_a_call_persists_off_the_callers_thread(tmp_path, monkeypatch):
+    """The stats file is written by a background thread, never while the call manager's lock is held."""
+    path = str(tmp_path / "stats.json")
+    manager = RealCallManager(CallStatsAggregator(persist_path=path))
+    writers = []
+    dump = twilio_voice_agent.json.dump
+
+    def recording_dump(data, f):
+        writers.append((threading.current_thread(), manager.lock.locked()))
+        dump(data, f)
+
+    monkeypatch.setattr(twilio_voice_agent.json, "dump", recording_dump)
+    manager.start_call("CA1", "+15550001", "inbound")
+    manager.end_call("CA1", "completed")
+    for thread in threading.enumerate():
+        if thread.name == "call-stats-persist":
+            thread.join()
+
+    assert os.path.exists(path)
+    assert [(thread is threading.current_thread(), locked) for thread, locked in writers] == [(False, False)]
+
+
+def test_call_stats_are_not_persisted_unless_configured(monkeypatch):
+    """Without CALL_STATS_PATH the aggregator keeps its buckets in memory only."""
+    monkeypatch.delenv("CALL_STATS_PATH", raising=False)
+    assert CallStatsAggregator.from_env().persist_path is None
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for provider connection pre-warming
+"""
+
+import asyncio
+import time
+
+from loadtest.clients import DeepgramLiveClient, OpenAIStreamingClient
+from loadtest.mock_providers import LatencyProfile, MockProviders, start_mock_providers
+from twilio_voice_agent import ConnectionManager, MetricsRegistry
+
+
+async def timed(coroutine):
+    """Await a coroutine and get (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = await coroutine
+    return result, time.perf_counter() - start
+
+
+def test_warm_connections_skip_handshakes():
+    """A warm manager hands out an open stream and a pooled HTTP connection; a cold one pays set-up."""
+
+    async def main():
+        providers = MockProviders(llm=LatencyProfile(5, 5), token_interval_ms=0.0, connect_ms=150)
+        runner, url = await start_mock_providers(providers)
+        try:
+            results = {}
+            for warm in (False, True):
+                connections = ConnectionManager(enabled=warm, ws_keepalive=0.05, registry=MetricsRegistry())
+                session = connections.get_session()
+                connections.register_http("openai", url)
+                connections.register_websocket("deepgram", DeepgramLiveClient(session, url, "test").connect)
+                await connections.start()
+                await asyncio.sleep(0.2)  # A few keepalive rounds on the idle stream
+                stream, stt_s = await timed(connections.acquire_websocket("deepgram"))
+                _, llm_s = await timed(OpenAIStreamingClient(session, url, "test").complete([]))
+                results[warm] = (stt_s, llm_s, connections.get_stats())
+                await stream.close()
+                await connections.close()
+            return results, providers.counters["connections"]
+        finally:
+            await runner.cleanup()
+
+    results, connections_opened = asyncio.run(main())
+    cold_stt, cold_llm, cold_stats = results[False]
+    warm_stt, warm_llm, warm_stats = results[True]
+    assert cold_stt >= 0.15 and cold_llm >= 0.15
+    assert warm_stt < 0.1 and warm_llm < 0.1
+    assert cold_stats["websockets"]["deepgram"]["cold"] == 1
+    assert warm_stats["websockets"]["deepgram"]["warm"] == 1
+    assert warm_stats["http"]["openai"] == {"pings": 2, "failures": 0}
+    assert connections_opened >= 5  # 2 cold, then 2 warm HTTP connections and at least one pooled stream
+
+
+def test_pool_target_follows_arrival_rate():
+    """The ready-session target grows with acquires per connect time and is capped."""
+    connections = ConnectionManager(enabled=False, ws_max=8, registry=MetricsRegistry())
+    connections.register_websocket("deepgram", connect=None, min_size=1)
+    pool = connections.ws_pools["deepgram"]
+    pool["connect_s"] = 0.5
+    assert connections.target_size("deepgram") == 1
+
+    now = time.monotonic()
+    pool["acquires"].extend([now - 120] * 100)  # Outside the rate window
+    pool["acquires"].extend([now - i * 0.5 for i in range(120)])  # 2 calls per second
+    assert connections.target_size("deepgram") == 1 + 2
+    assert len(pool["acquires"]) == 120
+
+    pool["acquires"].extend([now] * 1000)
+    assert connections.target_size("deepgram") == 8
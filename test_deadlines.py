@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage latency deadlines and their fallbacks
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import twilio_voice_agent
+from twilio_voice_agent import LanguageManager, MetricsRegistry, StageDeadlines, TurnTrace
+
+
+class SlowLLM:
+    """LLM stub answering after a fixed delay."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.cancelled = 0
+
+    async def complete(self, messages):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return SimpleNamespace(content="Su pedido llega mañana.")
+
+
+class RecordingTTS:
+    """TTS stub whose first byte arrives after a per-model delay; logs what was played."""
+
+    def __init__(self, first_byte_s):
+        self.first_byte_s = first_byte_s
+        self.played = []
+
+    async def synthesize(self, text, voice_id=None, model_id=None, first_byte=None):
+        await asyncio.sleep(self.first_byte_s.get(model_id, 0.0))
+        if first_byte is not None and not first_byte.done():
+            first_byte.set_result(None)
+        self.played.append((text, model_id))
+        return b"\xff" * 800
+
+    async def play(self, audio):
+        self.played.append(("cached", len(audio)))
+
+
+def make_agent(llm_delay, first_byte_s, budgets_ms):
+    """Create an agent with stub services and the given budgets for both languages."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    agent.llm_service = SlowLLM(llm_delay)
+    agent.tts_service = RecordingTTS(first_byte_s)
+    budgets = {stage: ms / 1000 for stage, ms in budgets_ms.items()}
+    agent.deadlines = StageDeadlines({"es-LA": budgets, "en-US": budgets}, registry=MetricsRegistry())
+    return agent
+
+
+def run_turn(agent, call_sid):
+    """Run one user turn through a fresh processor and get its trace."""
+    processor = agent.create_call_processor(call_sid)
+    processor.trace = TurnTrace(call_sid, 1)
+    processor.endpointing_span = processor.trace.start("endpointing")
+    processor.conversation_history.append({"role": "user", "content": "¿dónde está mi pedido?"})
+
+    async def turn():
+        await agent.phrase_cache.warm(agent.tts_service)
+        agent.tts_service.played.clear()
+        await processor._get_ai_response("¿dónde está mi pedido?")
+
+    asyncio.run(turn())
+    return processor
+
+
+def test_late_llm_plays_cached_filler_then_falls_back():
+    """Past the first-token budget the cached filler plays; past the response budget the fallback is spoken."""
+    agent = make_agent(0.5, {}, {"llm_first_token": 50, "llm_response": 150, "tts_first_byte": 0})
+    processor = run_turn(agent, "CADEADLINE1")
+
+    fallback = agent.language_manager.language_configs["es-LA"]["fallback_response"]
+    assert agent.tts_service.played == [("cached", 800), (fallback, None)]
+    assert processor.conversation_history[-1]["content"] == fallback
+    assert agent.llm_service.cancelled == 1
+    assert agent.deadlines.get_stats()["hits"] == {"llm_first_token": 1, "llm_response": 1, "tts_first_byte": 0}
+    events = [name for name, _ in processor.trace.events]
+    assert events.index("filler") < events.index("llm_fallback") < events.index("first_audio_sent")
+
+    on_time = make_agent(0.01, {}, {"llm_first_token": 50, "llm_response": 150, "tts_first_byte": 0})
+    run_turn(on_time, "CADEADLINE2")
+    assert on_time.tts_service.played == [("Su pedido llega mañana.", None)]
+    assert sum(on_time.deadlines.get_stats()["hits"].values()) == 0
+
+
+def test_slow_tts_first_byte_switches_to_secondary_model(monkeypatch):
+    """A primary voice that misses its first-byte budget is abandoned for the secondary model."""
+    agent = make_agent(0.0, {None: 0.5, "eleven_flash_v2_5": 0.01}, {"tts_first_byte": 100})
+    processor = run_turn(agent, "CADEADLINE3")
+
+    assert agent.tts_service.played == [("Su pedido llega mañana.", "eleven_flash_v2_5")]
+    assert agent.deadlines.get_stats()["hits"]["tts_first_byte"] == 1
+    assert processor.trace.span_ms("tts_secondary") is not None
+
+    monkeypatch.setenv("DEADLINE_TTS_FIRST_BYTE_MS", "700")
+    monkeypatch.setenv("DEADLINE_TTS_FIRST_BYTE_MS_EN_US", "400")
+    deadlines = StageDeadlines.from_env(LanguageManager())
+    assert deadlines.budget("es-LA", "tts_first_byte") == 0.7
+    assert deadlines.budget("en-US", "tts_first_byte") == 0.4
+    assert deadlines.budget("en-US", "llm_response") == 3.0
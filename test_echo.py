@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for echo-aware barge-in: telling the playback's echo from the caller speaking over it
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+from pipecat.frames.frames import (
+    InputAudioRawFrame,
+    OutputAudioRawFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+
+import twilio_voice_agent
+from loadtest.audio import linear_to_ulaw, synthetic_utterance, ulaw_to_linear
+from twilio_voice_agent import EchoSuppressor, MetricsRegistry
+
+PLAYED = ulaw_to_linear(synthetic_utterance(3.0, seed=1)).astype(np.float64)
+CALLER = ulaw_to_linear(synthetic_utterance(1.0, seed=2)).astype(np.float64)
+
+
+def over_the_line(samples, seed=0):
+    """Get audio as heard back from the phone line: attenuated, smeared, noisy and μ-law coded."""
+    rng = np.random.default_rng(seed)
+    echo = np.convolve(samples, [0.6, 0.3, -0.1])[: len(samples)] * 0.3 + rng.normal(0, 30, len(samples))
+    return ulaw_to_linear(linear_to_ulaw(np.clip(echo, -32768, 32767)))
+
+
+def frame(frame_type, samples):
+    """Wrap 8 kHz samples in an audio frame."""
+    return frame_type(audio=np.asarray(samples).astype("<i2").tobytes(), sample_rate=8000, num_channels=1)
+
+
+def test_echo_of_the_playback_is_told_from_the_caller_talking_over_it():
+    """Heard audio the playback explains is echo; the caller's voice over it, or audio after playback, is not."""
+    registry = MetricsRegistry()
+    suppressor = EchoSuppressor(registry=registry)
+    call = suppressor.new_call()
+    suppressor.feed(call, frame(OutputAudioRawFrame, PLAYED[:8000]), 100.0)
+    suppressor.feed(call, frame(OutputAudioRawFrame, PLAYED[8000:]), 100.2)  # Queued behind the first second
+    assert call["played_from"] == 100.0
+
+    echo = over_the_line(PLAYED[8000 - 1200 - 2000 : 8000 - 1200])  # 150 ms round trip, heard at 101.0
+    suppressor.feed(call, frame(InputAudioRawFrame, echo), 101.0)
+    assert suppressor.is_echo(call, 101.0)
+
+    suppressor.feed(call, frame(InputAudioRawFrame, echo + CALLER[2000:4000]), 101.0)
+    assert not suppressor.is_echo(call, 101.0)
+
+    suppressor.feed(call, frame(InputAudioRawFrame, np.zeros(2000)), 101.2)
+    assert not suppressor.releases(call, 101.2)  # Quiet: neither echo nor the caller
+
+    suppressor.feed(call, frame(InputAudioRawFrame, CALLER[2000:4000]), 103.8)
+    assert not suppressor.playing(call, 103.8) and not suppressor.is_echo(call, 103.8)  # Not counted
+    assert suppressor.releases(call, 103.8)
+
+    stats = suppressor.get_stats()
+    assert (stats["echo"], stats["speech"], stats["released"]) == (1, 1, 1) and stats["echo_ratio"] == 0.5
+    assert 'voice_agent_echo_checks_total{outcome="echo"} 1' in registry.render()
+
+
+class CountingLLM:
+    """LLM stub answering at once and counting its requests."""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def complete(self, messages):
+        self.requests += 1
+        return SimpleNamespace(content="Su pedido llega mañana.")
+
+
+def test_echo_does_not_interrupt_the_answer_but_the_caller_talking_over_it_does():
+    """A speech start on the echo is gated with its transcript; it is released once the caller speaks over it."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    agent.llm_service = CountingLLM()
+    agent.echo_suppressor = EchoSuppressor(registry=MetricsRegistry())
+    agent.call_manager.start_call("CAECHO", "+15550123", "inbound")
+    agent.performance_monitor.start_call_monitoring("CAECHO")
+    processor = agent.create_call_processor("CAECHO")
+    processor.answering = processor.is_speaking = True  # The answer is playing
+
+    async def run():
+        await processor.process(frame(OutputAudioRawFrame, PLAYED))
+        await asyncio.sleep(0.6)
+        echo = over_the_line(PLAYED[2000:4000])  # Played 0.35 s to 0.1 s before being heard
+        await processor.process(frame(InputAudioRawFrame, echo))
+        await processor.process(UserStartedSpeakingFrame())
+        assert processor.echo_gated and processor.is_speaking
+        await processor.process(UserStoppedSpeakingFrame())
+        await processor.process(TranscriptionFrame(text="Su pedido llega", user_id="CAECHO", timestamp=""))
+        assert not processor.echo_gated and agent.llm_service.requests == 0
+
+        await processor.process(UserStartedSpeakingFrame())
+        assert processor.echo_gated
+        await asyncio.sleep(0.11)
+        await processor.process(frame(InputAudioRawFrame, echo + CALLER[2000:4000]))
+        assert not processor.echo_gated and processor.caller_speaking and not processor.is_speaking
+
+    asyncio.run(run())
+    assert agent.performance_monitor.call_metrics["CAECHO"]["interruptions"] == 1
+    stats = agent.echo_suppressor.get_stats()
+    assert (stats["echo"], stats["speech"], stats["released"]) == (2, 0, 1)
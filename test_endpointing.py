@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for adaptive endpointing: transcript completeness, per-caller timing and held turns
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from pipecat.frames.frames import TranscriptionFrame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame
+
+import twilio_voice_agent
+from twilio_voice_agent import MetricsRegistry, TurnTakingController
+
+
+def test_completeness_and_caller_timing_set_the_silence_that_ends_a_turn():
+    """Short answers and punctuated sentences end sooner than hanging ones; slow or pausing callers get longer."""
+    controller = TurnTakingController(registry=MetricsRegistry())
+    assert controller.classify("Sí") == controller.classify("okay, thanks") == "complete"
+    assert controller.classify("¿A qué hora abren?") == "complete"
+    assert controller.classify("Quiero cambiar mi reserva para el") == "incomplete"
+    assert controller.classify("Quiero cambiar mi reserva para el.") == "incomplete"  # STT punctuated a pause
+    assert controller.classify("Mi número es el 4521,") == controller.classify("I was wondering...") == "incomplete"
+    assert controller.classify("quiero saber el estado de mi pedido") == "neutral"
+
+    caller = controller.new_caller()
+    assert controller.required_silence("Sí", caller) == ("complete", 0.3)
+    assert controller.hold("quiero saber el estado de mi pedido", caller, 0.1) == ("neutral", 0.7 - 0.3 - 0.1)
+    assert controller.hold("Sí", caller, 0.0) == ("complete", 0.0)  # The VAD already waited long enough
+
+    controller.observe_speech(caller, "quiero saber el estado de mi pedido", 5.6)  # 1.25 words per second
+    assert controller.required_silence("quiero saber el estado", caller)[1] == 0.7 * 1.5
+    assert controller.required_silence("Sí", caller)[1] == 0.3  # A complete answer is not stretched
+    controller.observe_pause(caller, 1.5)
+    assert controller.required_silence("quiero saber el estado", caller)[1] == 1.2 * 1.5
+    controller.observe_pause(caller, 3.0)
+    assert controller.required_silence("para el", caller)[1] == 2.0  # Capped at max_silence
+
+    controller.enabled = False
+    assert controller.hold("para el", caller, 0.0) == ("incomplete", 0.0)
+
+
+class CountingLLM:
+    """LLM stub answering at once and keeping what it was asked."""
+
+    def __init__(self):
+        self.questions = []
+
+    async def complete(self, messages):
+        self.questions.append(messages[-1]["content"])
+        return SimpleNamespace(content="Claro, queda para el viernes.")
+
+
+class SilentTTS:
+    """TTS stub returning no audio."""
+
+    async def synthesize(self, text, **options):
+        return b""
+
+
+def test_caller_pausing_mid_sentence_is_not_cut_off():
+    """A hanging transcript is held; when the caller goes on, both parts are answered as one turn."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    agent.llm_service, agent.tts_service = CountingLLM(), SilentTTS()
+    agent.response_cache.enabled = False
+    registry = MetricsRegistry()
+    agent.turn_taking = TurnTakingController(
+        complete=0.2, neutral=0.3, incomplete=0.4, vad_silence=0.2, max_silence=0.5, registry=registry
+    )
+    agent.call_manager.start_call("CAENDPOINT", "+15550123", "inbound")
+    agent.performance_monitor.start_call_monitoring("CAENDPOINT")
+    processor = agent.create_call_processor("CAENDPOINT")
+
+    async def say(text, pause=0.0):
+        await processor.process(UserStartedSpeakingFrame())
+        await processor.process(UserStoppedSpeakingFrame())
+        await processor.process(TranscriptionFrame(text=text, user_id="CAENDPOINT", timestamp=""))
+        await asyncio.sleep(pause)
+
+    async def run():
+        await say("Quiero cambiar mi reserva para el", pause=0.05)
+        assert processor.held_text and agent.llm_service.questions == []
+        await say("viernes a las ocho.")  # Complete: answered without a hold
+        assert not processor.held_text and processor.pending_turn is None
+
+        await say("Sí")
+        await say("pues", pause=0.05)
+        await processor.process(UserStartedSpeakingFrame())
+        await processor.process(UserStoppedSpeakingFrame())  # No transcript follows: held up to max_silence
+        assert processor.pending_turn is not None and agent.llm_service.questions[-1] == "Sí"
+        await processor.turn_taken()
+
+    asyncio.run(run())
+    assert agent.llm_service.questions == ["Quiero cambiar mi reserva para el viernes a las ocho.", "Sí", "pues"]
+    # Spoken over the two answers; the resumptions are not interruptions
+    assert agent.performance_monitor.call_metrics["CAENDPOINT"]["interruptions"] == 2
+    stats = agent.turn_taking.get_stats()
+    assert stats["turns"] == {"complete": 2, "neutral": 0, "incomplete": 1} and stats["resumed"] == 2
+    assert 150 <= stats["mean_delay_ms"] <= 200  # 0.5 s held once over three turns
+    assert processor.caller_timing["pause"] is not None
+    metrics = registry.render()
+    assert 'voice_agent_endpointing_delay_seconds_count{completeness="incomplete"} 1' in metrics
+    assert "voice_agent_endpointing_resumed_total 2" in metrics
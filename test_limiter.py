@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-provider adaptive concurrency limiters
+"""
+
+import asyncio
+import time
+
+import twilio_voice_agent
+from twilio_voice_agent import ConcurrencyLimiter, MetricsRegistry, TurnTrace
+
+
+class RateLimited(Exception):
+    """Stands in for a provider SDK's 429 error."""
+
+    status_code = 429
+
+
+def test_queue_serves_first_turns_first_and_skips_cancelled_waiters():
+    """Over the limit, a first turn overtakes earlier mid-call turns; a cancelled waiter never gets the slot."""
+    registry = MetricsRegistry()
+    limiter = ConcurrencyLimiter("openai", max_limit=4, initial_limit=1, registry=registry)
+    order = []
+
+    async def request(name, priority, trace=None):
+        async with limiter.slot(priority, trace):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        holder = asyncio.create_task(request("holder", ConcurrencyLimiter.TURN))
+        await asyncio.sleep(0)
+        later = asyncio.create_task(request("later-turn", ConcurrencyLimiter.TURN))
+        gone = asyncio.create_task(request("hung-up", ConcurrencyLimiter.FIRST_TURN))
+        trace = TurnTrace("CALIMIT", 1)
+        first = asyncio.create_task(request("first-turn", ConcurrencyLimiter.FIRST_TURN, trace))
+        await asyncio.sleep(0)
+        assert limiter.get_stats()["queued"] == 3
+        gone.cancel()
+        await asyncio.gather(holder, later, first, gone, return_exceptions=True)
+        return trace
+
+    trace = asyncio.run(run())
+    assert order == ["holder", "first-turn", "later-turn"]
+    assert trace.span_ms("openai_queue") > 0
+    stats = limiter.get_stats()
+    assert stats["inflight"] == 0 and stats["queued"] == 0 and stats["queue_wait_p95_ms"] > 0
+    assert 'voice_agent_provider_queue_wait_seconds_count{provider="openai",priority="first_turn"} 1' in (
+        registry.render()
+    )
+
+
+def test_limit_grows_additively_and_backs_off_once_per_round_trip():
+    """Fast successes add 1/limit; a burst of 429s from one round trip cuts once; slow answers cut too."""
+    limiter = ConcurrencyLimiter("elevenlabs", max_limit=8, initial_limit=4, slow_s=0.5, registry=MetricsRegistry())
+
+    async def run():
+        for _ in range(4):
+            await limiter.acquire()
+        limiter.release(time.monotonic(), 0.05)
+        assert limiter.limit == 4.25
+
+        started = time.monotonic()
+        limiter.release(started, 0.05, RateLimited())
+        limiter.release(started, 0.05, RateLimited())  # Same round trip: no second cut
+        assert limiter.limit == 4.25 * 0.7 and limiter.decreases == 1
+
+        limiter.release(time.monotonic(), 0.05, ValueError("bad request"))  # Not the provider pushing back
+        assert limiter.limit == 4.25 * 0.7
+
+        await limiter.acquire()
+        limiter.release(time.monotonic(), 0.6)
+        assert limiter.limit == 4.25 * 0.7 * 0.7 and limiter.decreases == 2
+
+    asyncio.run(run())
+    assert limiter.inflight == 0
+    assert ConcurrencyLimiter.is_overload(asyncio.TimeoutError())
+
+
+def test_agent_limits_only_the_providers_its_calls_use():
+    """Deepgram streams are opened per call only by the load-test bridge, so the agent keeps no limiter for them."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    assert set(agent.limiters) == set(ConcurrencyLimiter.PROVIDERS) == {"openai", "elevenlabs"}
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the Server-Sent Events broadcaster behind the /events endpoint
+"""
+
+from types import SimpleNamespace
+
+import twilio_voice_agent
+from twilio_voice_agent import CallStatsAggregator, EventBroadcaster, RealCallManager
+
+
+def test_publish_fans_out_same_encoded_event():
+    """Every subscriber receives the same pre-encoded bytes."""
+    events = EventBroadcaster()
+    first = events.subscribe()
+    second = events.subscribe()
+
+    events.publish("call_started", {"call_sid": "CA1", "active_calls": 1})
+
+    message = first.get_nowait()
+    assert message is second.get_nowait()
+    assert message == b'id: 1\nevent: call_started\ndata: {"call_sid":"CA1","active_calls":1}\n\n'
+
+
+def test_slow_subscriber_is_dropped():
+    """A full subscriber queue drops that subscriber without affecting others."""
+    events = EventBroadcaster(max_queue_size=2)
+    slow = events.subscribe()
+    fast = events.subscribe()
+
+    for i in range(3):
+        events.publish("latency", {"n": i})
+        fast.get_nowait()
+
+    assert events.dropped_subscribers == 1
+    assert events.subscribers == [fast]
+    assert slow.qsize() == 1  # Only the end-of-stream marker is left
+
+    chunks = list(events.stream(slow, {"performance": {}}))
+    assert chunks[-1].startswith(b"event: dropped")
+
+
+def test_subscriber_limit():
+    """Subscriptions beyond the limit are refused."""
+    events = EventBroadcaster(max_subscribers=1)
+    assert events.subscribe() is not None
+    assert events.subscribe() is None
+
+
+def test_call_manager_publishes_call_events(tmp_path):
+    """Call lifecycle changes and per-second aggregates reach subscribers."""
+    manager = RealCallManager(CallStatsAggregator(persist_path=str(tmp_path / "stats.json")))
+    subscriber = manager.events.subscribe()
+
+    manager.start_call("CA1", "+15550001")
+    manager.record_performance_metric("CA1", "total", 300.0)
+    manager.record_performance_metric("CA1", "total", 500.0)
+    manager.end_call("CA1", "completed")
+
+    assert b"event: call_started" in subscriber.get_nowait()
+    assert b"event: call_ended" in subscriber.get_nowait()
+
+    ticks = dict(manager._tick_events())
+    assert ticks["latency"] == {"n": 2, "avg": 400.0, "max": 500.0, "active_calls": 0}
+    assert ticks["call_stats"]["total_calls"] == 1
+    assert manager._tick_events() == []
+
+
+def test_client_leaving_before_the_first_event_is_unsubscribed(monkeypatch):
+    """Closing the /events response before the stream starts still frees the subscriber slot."""
+    manager = RealCallManager(CallStatsAggregator(persist_path=None))
+    monkeypatch.setattr(twilio_voice_agent, "voice_agent", SimpleNamespace(call_manager=manager))
+
+    with twilio_voice_agent.app.test_request_context("/events"):
+        response = twilio_voice_agent.event_stream()
+    assert response.status_code == 200 and len(manager.events.subscribers) == 1
+    response.close()  # The server closes the body without ever iterating it
+    assert manager.events.subscribers == []
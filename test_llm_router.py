@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged and failover LLM requests, against local mock LLM servers
+"""
+
+import asyncio
+
+import aiohttp
+
+from loadtest.clients import OpenAIStreamingClient
+from loadtest.mock_providers import LatencyProfile, MockProviders, start_mock_providers
+from twilio_voice_agent import LLMBackend, LLMRouter, MetricsRegistry
+
+MESSAGES = [{"role": "user", "content": "hola, ¿dónde está mi pedido?"}]
+
+
+async def with_backends(profiles, scenario):
+    """Start one mock LLM server per latency profile and run ``scenario`` with a backend for each."""
+    runners, backends = [], []
+    async with aiohttp.ClientSession() as session:
+        try:
+            for i, profile in enumerate(profiles):
+                providers = MockProviders(llm=profile, token_interval_ms=0.0, responses=[f"respuesta de backend-{i}"])
+                runner, url = await start_mock_providers(providers)
+                runners.append(runner)
+                backends.append(LLMBackend(f"backend-{i}", OpenAIStreamingClient(session, url, "test"), 0.01))
+            return await scenario(backends)
+        finally:
+            for runner in runners:
+                await runner.cleanup()
+
+
+def test_slow_primary_is_hedged_at_its_rolling_p90_and_loses():
+    """A primary slower than its own p90 is hedged; the faster backend wins and the primary is cancelled."""
+
+    async def scenario(backends):
+        router = LLMRouter(backends, initial_hedge_delay=0.05, min_samples=10, registry=MetricsRegistry())
+        first = await router.complete(MESSAGES)
+
+        for latency_ms in [100.0] * 19 + [1000.0] * 2:  # A primary with a slow tail
+            router.latency["backend-0"].add(latency_ms)
+        assert 0.09 <= router.hedge_delay() <= 0.11
+        second = await router.complete(MESSAGES)
+        return router, first, second
+
+    router, first, second = asyncio.run(with_backends([LatencyProfile(400, 400), LatencyProfile(20, 20)], scenario))
+    assert first.content == second.content == "respuesta de backend-1"
+    stats = router.get_stats()
+    assert stats["turns"] == 2 and stats["hedged"] == 2 and stats["hedge_wins"] == 2 and stats["cancelled"] == 2
+    assert stats["overhead_cost_usd"] > 0 and 0 < stats["cost_overhead_ratio"] < 1
+    assert stats["latency_gained_s"] > 0  # The second hedge was credited against the primary's latencies
+
+
+def test_errors_fail_over_and_fast_primaries_are_not_hedged():
+    """A 429 from the primary fails over to the next backend; a primary answering in time sends nothing else."""
+
+    async def scenario(backends):
+        failing = LLMRouter(backends[:2], initial_hedge_delay=5.0, registry=MetricsRegistry())
+        failed_over = await failing.complete(MESSAGES)
+
+        fast = LLMRouter(backends[2:], initial_hedge_delay=0.5, registry=MetricsRegistry())
+        answered = await fast.complete(MESSAGES)
+        return failing, failed_over, fast, answered
+
+    failing, failed_over, fast, answered = asyncio.run(
+        with_backends(
+            [
+                LatencyProfile(10, 10, error_rate=1.0),
+                LatencyProfile(10, 10),
+                LatencyProfile(10, 10),
+                LatencyProfile(10),
+            ],
+            scenario,
+        )
+    )
+    assert failed_over.content == "respuesta de backend-1"
+    assert failing.get_stats()["failovers"] == 1 and failing.get_stats()["error"] == 1
+    assert answered.content == "respuesta de backend-2"
+    assert fast.get_stats()["hedged"] == 0 and fast.get_stats()["overhead_cost_usd"] == 0
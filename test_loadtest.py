@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline load-test harness
+"""
+
+import asyncio
+
+import numpy as np
+
+from loadtest.audio import frame_energy, linear_to_ulaw, split_frames, synthetic_utterance, ulaw_to_linear
+from loadtest.bridge import AgentUnderTest, agent_module
+from loadtest.mock_providers import LatencyProfile, MockProviders, start_mock_providers
+from loadtest.twilio_client import run_calls
+
+
+def test_ulaw_round_trip():
+    """μ-law encoding keeps samples within the codec's quantization error."""
+    samples = (np.sin(np.linspace(0, 20, 1600)) * 20000).astype(np.int16)
+    decoded = ulaw_to_linear(linear_to_ulaw(samples))
+    assert np.max(np.abs(decoded.astype(int) - samples) / (np.abs(samples) + 64)) < 0.07
+
+    frames = split_frames(synthetic_utterance(1.0))
+    assert all(len(frame) == 160 for frame in frames)
+    assert frame_energy(frames[0]) > 200
+    assert frame_energy(linear_to_ulaw(np.zeros(160))) == 0
+
+
+def test_latency_profile_matches_median_and_p95():
+    """Sampled latencies follow the configured median and p95."""
+    profile = LatencyProfile.parse("200,500")
+    samples = sorted(profile.sample() * 1000 for _ in range(20000))
+    assert 185 < samples[10000] < 215
+    assert 460 < samples[19000] < 540
+    assert LatencyProfile(100, error_rate=1.0).fails()
+
+
+def test_calls_run_end_to_end_through_the_agent():
+    """Fake Twilio calls get answers from ConversationProcessor via the mock providers."""
+
+    async def main():
+        fast = LatencyProfile(20, 40)
+        providers, provider_url = await start_mock_providers(
+            MockProviders(stt=fast, llm=fast, tts=fast, token_interval_ms=1, endpointing_ms=200)
+        )
+        aut = AgentUnderTest(provider_url, endpointing_ms=200)
+        await aut.start()
+        try:
+            utterances = [synthetic_utterance(0.5, seed) for seed in range(2)]
+            return await run_calls(aut.webhook_url, aut.media_url, utterances, 2, 0.1, turns=1, ramp=0), aut.agent
+        finally:
+            await aut.stop()
+            await providers.cleanup()
+
+    try:
+        calls, agent = asyncio.run(main())
+    finally:
+        agent_module.voice_agent = None
+
+    assert len(calls) == 2
+    for call in calls:
+        assert call["errors"] == []
+        (latency,) = call["latencies_ms"]
+        assert 200 <= latency < 2000
+        assert [trace.spans[-1][0] for trace in agent.flight_recorder.get_turns(call["call_sid"])] == ["tts"]
+    assert agent.call_manager.get_active_call_count() == 0
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the queue-based logging pipeline
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from twilio_voice_agent import LogContextFilter, LogPipeline, log_call_sid, log_turn
+
+
+@pytest.fixture
+def pipeline():
+    """Install a JSON pipeline writing to a buffer, restoring the root logger afterwards."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    stream = io.StringIO()
+    pipeline = LogPipeline(json_format=True, rate_limits={"frame": 2}, stream=stream)
+    pipeline.install(force=True)
+    yield pipeline, stream
+    pipeline.stop()
+    for handler in saved_handlers:
+        root.addHandler(handler)
+    root.setLevel(saved_level)
+
+
+def test_records_carry_call_context_as_json(pipeline):
+    """Records logged inside a call context include call_sid and turn."""
+    pipeline, stream = pipeline
+    call_token, turn_token = log_call_sid.set("CA1"), log_turn.set(3)
+    try:
+        logging.getLogger("test").info("🎯 User said: %s", "hola", extra={"category": "transcript"})
+    finally:
+        log_call_sid.reset(call_token)
+        log_turn.reset(turn_token)
+    pipeline.stop()
+
+    entry = json.loads(stream.getvalue().splitlines()[-1])
+    assert entry["message"] == "🎯 User said: hola"
+    assert (entry["call_sid"], entry["turn"], entry["category"]) == ("CA1", 3, "transcript")
+
+
+def test_queue_handler_defers_formatting():
+    """Records are queued with their %-style arguments unformatted."""
+    pipeline = LogPipeline(stream=io.StringIO())
+    formatted = []
+
+    class Argument:
+        def __str__(self):
+            formatted.append(True)
+            return "value"
+
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "lazy %s", (Argument(),), None)
+    pipeline.handler.handle(record)
+
+    assert pipeline.queue.get_nowait() is record
+    assert formatted == []
+    assert record.getMessage() == "lazy value"
+
+
+def test_rate_limits_apply_per_category_below_warning(pipeline):
+    """Per-frame records beyond the limit are suppressed; warnings always pass."""
+    pipeline, stream = pipeline
+    log = logging.getLogger("test")
+    for _ in range(5):
+        log.info("🔇 User stopped speaking", extra={"category": "frame"})
+    log.warning("⚠️ slow", extra={"category": "frame"})
+    pipeline.stop()
+
+    assert len(stream.getvalue().splitlines()) == 3
+    assert pipeline.get_stats()["rate_limited"] == 3
+
+
+def test_sampling_keeps_one_in_n():
+    """A sampling rate of 0.25 keeps every fourth record of that category."""
+    sampler = LogContextFilter(sampling={"frame": 0.25})
+    records = [logging.LogRecord("test", logging.INFO, __file__, 1, "frame", None, None) for _ in range(8)]
+    for record in records:
+        record.category = "frame"
+    assert sum(sampler.filter(record) for record in records) == 2
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-loop lag and task-health monitor
+"""
+
+import asyncio
+import time
+
+import twilio_voice_agent
+from twilio_voice_agent import LoopMonitor, MetricsRegistry
+
+
+def blocking_handler():
+    """Stand-in for a synchronous call made from a coroutine."""
+    time.sleep(0.2)
+
+
+async def run_with_monitor(monitor, body):
+    """Run a coroutine body with the monitor attached to the running loop."""
+    monitor.start(asyncio.get_running_loop())
+    try:
+        await asyncio.sleep(0.05)
+        await body()
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+
+def test_blocking_call_is_captured_with_its_stack():
+    """A blocked loop is reported with the stack of the blocking coroutine."""
+    registry = MetricsRegistry()
+    monitor = LoopMonitor(interval=0.005, threshold=0.05, registry=registry)
+
+    async def body():
+        await asyncio.create_task(slow_request(), name="slow-request")
+
+    async def slow_request():
+        blocking_handler()
+
+    asyncio.run(run_with_monitor(monitor, body))
+
+    (stall,) = monitor.stalls
+    assert stall["lag_ms"] >= 150
+    assert stall["task"] == "slow-request"
+    assert any("blocking_handler" in line for line in stall["stack"])
+    assert "voice_agent_event_loop_stalls_total 1.0" in registry.render()
+
+
+def test_healthy_loop_reports_low_lag_and_tasks():
+    """Without blocking calls there are no stalls and pending tasks are counted."""
+    monitor = LoopMonitor(interval=0.005, threshold=0.2, registry=MetricsRegistry())
+
+    async def body():
+        idle = asyncio.create_task(asyncio.sleep(10))
+        await asyncio.sleep(1.1)
+        idle.cancel()
+
+    asyncio.run(run_with_monitor(monitor, body))
+
+    snapshot = monitor.get_snapshot()
+    assert snapshot["stalls"] == []
+    assert snapshot["lag_ms"]["samples"] > 50
+    assert snapshot["tasks"]["total"] >= 2
+    assert snapshot["tasks"]["oldest_age_s"] >= 0
+
+
+def test_debug_loop_endpoint(monkeypatch):
+    """/debug/loop serves the module monitor's snapshot."""
+    monkeypatch.setenv("DEBUG_API_TOKEN", "secret")
+    response = twilio_voice_agent.app.test_client().get("/debug/loop", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert set(response.get_json()) >= {"lag_ms", "tasks", "stalls"}
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the OpenMetrics registry behind the /metrics endpoint
+"""
+
+import twilio_voice_agent
+from twilio_voice_agent import MetricsRegistry, PerformanceMonitor
+
+
+def test_histogram_buckets_are_cumulative():
+    """Observations land in fixed buckets and are exposed cumulatively."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 0.5))
+    for value in (0.05, 0.3, 0.4, 2.0):
+        histogram.observe(value, stage="llm")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{stage="llm",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="llm",le="0.5"} 3' in text
+    assert 'latency_seconds_bucket{stage="llm",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{stage="llm"} 4' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_performance_monitor_updates_registry():
+    """Recording through PerformanceMonitor updates counters and stage histograms."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry)
+    monitor.start_call_monitoring("CA1")
+    monitor.record_roundtrip_latency("CA1", 0.7)
+    monitor.record_first_audio_latency("CA1", 0.45)
+    monitor.record_low_quality_handling("CA1", 'bad "line"')
+
+    text = registry.render()
+    assert "# TYPE voice_agent_calls counter" in text
+    assert "voice_agent_calls_total 1.0" in text
+    assert 'voice_agent_latency_target_total{result="missed"} 1.0' in text
+    assert 'voice_agent_stage_latency_seconds_count{stage="first_audio"} 1' in text
+    assert 'voice_agent_low_quality_handling_total{issue="bad \\"line\\""} 1.0' in text
+
+
+def test_callback_metrics_and_endpoint():
+    """/metrics serves callback gauges with the OpenMetrics content type."""
+    registry = twilio_voice_agent.metrics_registry
+    registry.gauge("voice_agent_test_gauge", "Test gauge", callback=lambda: 7)
+
+    try:
+        response = twilio_voice_agent.app.test_client().get("/metrics")
+    finally:
+        registry.metrics.pop("voice_agent_test_gauge")
+    assert response.status_code == 200
+    assert response.content_type.startswith("application/openmetrics-text")
+    body = response.get_data(as_text=True)
+    assert "voice_agent_test_gauge 7" in body
+    assert 'voice_agent_monitoring_cache_lookups_total{result="hits"}' in body
+    assert "voice_agent_monitoring_cache_hit_ratio " in body
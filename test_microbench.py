@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests for the micro-benchmark suite and its baseline comparison
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import bench_micro  # noqa: E402
+
+
+def test_suite_measures_per_item_cost():
+    """Selected benchmarks run against a real agent and report per-item nanoseconds."""
+    current = bench_micro.run_suite(["agent.detect_mexican_slang", "pipeline.turn"], repeat=2, min_time=0.005)
+    assert set(current["results"]) == {"agent.detect_mexican_slang", "pipeline.turn"}
+    for result in current["results"].values():
+        assert 0 < result["min_ns"] <= result["median_ns"]
+        assert result["relative"] > 0
+    assert len(bench_micro.all_phrases()) > 30
+
+
+def test_comparison_flags_regressions_beyond_threshold():
+    """Only benchmarks slower than the threshold are flagged; new benchmarks are skipped."""
+    baseline = {"results": {"a": {"min_ns": 100.0}, "b": {"min_ns": 100.0}}}
+    current = {"results": {"a": {"min_ns": 114.0}, "b": {"min_ns": 130.0}, "c": {"min_ns": 1.0}}}
+    rows = {row["name"]: row for row in bench_micro.compare(baseline, current, threshold_pct=15)}
+    assert set(rows) == {"a", "b"}
+    assert not rows["a"]["regressed"]
+    assert rows["b"]["regressed"] and rows["b"]["change_pct"] == 30.0
+
+
+def test_comparison_prefers_machine_normalized_cost():
+    """A uniformly slower machine is not a regression when relative costs are recorded."""
+    baseline = {"results": {"a": {"min_ns": 100.0, "relative": 2.0}}}
+    current = {"results": {"a": {"min_ns": 150.0, "relative": 2.1}}}
+    (row,) = bench_micro.compare(baseline, current, threshold_pct=15)
+    assert row["change_pct"] == 5.0 and not row["regressed"]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-flight response cache used by the monitoring endpoints
+"""
+
+import threading
+import time
+
+import twilio_voice_agent
+from twilio_voice_agent import ResponseCache
+
+
+def test_concurrent_reads_share_one_computation():
+    """Requests that arrive while a value is being computed wait for it."""
+    cache = ResponseCache(ttl=0)
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"active_calls": 3}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("performance", compute))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({etag for _, etag in results}) == 1
+    assert cache.coalesced == 7
+
+
+def test_results_expire_after_ttl():
+    """Cached bodies are reused until the TTL elapses."""
+    cache = ResponseCache(ttl=0.05)
+    counter = iter(range(100))
+
+    def compute():
+        return {"value": next(counter)}
+
+    first, _ = cache.get("health", compute)
+    assert cache.get("health", compute)[0] == first
+    time.sleep(0.06)
+    assert cache.get("health", compute)[0] != first
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_errors_are_not_cached():
+    """A failed computation is raised to every waiter and retried next time."""
+    cache = ResponseCache(ttl=1.0)
+
+    def fail():
+        raise RuntimeError("lock timeout")
+
+    try:
+        cache.get("language", fail)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+
+    assert cache.get("language", lambda: {"ok": True})[0] == b'{"ok": true}'
+
+
+def test_if_none_match_returns_not_modified(monkeypatch):
+    """/health answers 304 when the client already has the current ETag."""
+    monkeypatch.setattr(twilio_voice_agent, "response_cache", ResponseCache(ttl=1.0))
+    client = twilio_voice_agent.app.test_client()
+
+    response = client.get("/health")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    cached = client.get("/health", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+
+def test_etag_ignores_volatile_fields(monkeypatch):
+    """A fresh /health payload differing only in its timestamp keeps the ETag, so clients still get 304."""
+    cache = ResponseCache(ttl=0)
+    stamps = iter(["2024-01-01T00:00:00", "2024-01-01T00:00:01", "2024-01-01T00:00:02"])
+    first = cache.get("health", lambda: {"timestamp": next(stamps), "active_calls": 0}, ("timestamp",))
+    second = cache.get("health", lambda: {"timestamp": next(stamps), "active_calls": 0}, ("timestamp",))
+    busy = cache.get("health", lambda: {"timestamp": next(stamps), "active_calls": 1}, ("timestamp",))
+    assert first[0] != second[0] and first[1] == second[1] != busy[1]
+
+    monkeypatch.setattr(twilio_voice_agent, "response_cache", ResponseCache(ttl=0))  # Every request recomputes
+    client = twilio_voice_agent.app.test_client()
+    etag = client.get("/health").headers["ETag"]
+    time.sleep(0.01)
+    assert client.get("/health", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_idle_health_keeps_its_etag_while_live_gauges_move(monkeypatch):
+    """Loop lag, keepalive pings and limiter gauges change between idle polls without changing the ETag."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    monkeypatch.setattr(twilio_voice_agent, "voice_agent", agent)
+    monkeypatch.setattr(twilio_voice_agent, "response_cache", ResponseCache(ttl=0))
+    client = twilio_voice_agent.app.test_client()
+    lag = [0.001]
+    agent.admission.loop_lag = lambda: lag[0]
+
+    first = client.get("/health")
+    lag[0] = 0.004
+    agent.connections.http_targets["openai"]["pings"] += 1
+    agent.limiters["openai"].inflight += 1
+    second = client.get("/health", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+
+    agent.call_manager.start_call("CAHEALTH", "+15550100", "inbound")
+    assert client.get("/health").headers["ETag"] != first.headers["ETag"]
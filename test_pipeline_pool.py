@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the pool of pre-built per-call pipelines
+"""
+
+import time
+
+import twilio_voice_agent
+from twilio_voice_agent import MetricsRegistry, PipelinePool
+
+
+def make_agent():
+    """Create an agent whose pool reports to a private registry."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    agent.pipeline_pool = PipelinePool(
+        agent.build_call_pipeline, ["es-LA", "en-US"], min_size=2, registry=MetricsRegistry()
+    )
+    return agent
+
+
+def test_acquire_binds_prebuilt_pipeline_and_release_resets_it():
+    """Warm acquires hand out pooled pipelines bound to the call; released ones come back clean."""
+    agent = make_agent()
+    pool = agent.pipeline_pool
+    pool.running = True  # Fill synchronously instead of from the background thread
+    pool.replenish()
+    assert {language: stats["ready"] for language, stats in pool.get_stats().items()} == {"es-LA": 2, "en-US": 2}
+
+    processor = agent.acquire_call_processor("CAPOOL1", "en-US")
+    assert processor.current_call_sid == "CAPOOL1" and processor.language == "en-US"
+    assert processor.pipeline is not None
+    processor.conversation_history.append({"role": "user", "content": "hello"})
+    processor.is_speaking = True
+
+    agent.release_call_processor(processor)
+    assert processor.current_call_sid is None and processor.conversation_history == [] and not processor.is_speaking
+    stats = pool.get_stats()["en-US"]
+    assert stats["warm"] == 1 and stats["recycled"] == 1 and stats["ready"] == 2
+
+    pool.pools["es-LA"]["ready"].clear()
+    cold = agent.acquire_call_processor("CAPOOL2", "es-LA")
+    assert cold.current_call_sid == "CAPOOL2" and pool.get_stats()["es-LA"]["cold"] == 1
+
+
+def test_pool_size_follows_arrival_rate_and_background_refill():
+    """A busy language gets a larger target, which the background thread builds."""
+    agent = make_agent()
+    pool = agent.pipeline_pool
+    now = time.monotonic()
+    pool.pools["es-LA"]["acquires"].extend([now - i * 0.1 for i in range(300)])  # 5 calls per second
+    assert pool.target_size("es-LA") == 2 + 10
+    assert pool.target_size("en-US") == 2
+
+    pool.start()
+    try:
+        deadline = time.monotonic() + 5
+        while pool.get_stats()["es-LA"]["ready"] < 12 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert pool.get_stats()["es-LA"]["ready"] == 12
+        assert pool.get_stats()["en-US"]["ready"] == 2
+    finally:
+        pool.stop()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the /debug profiling endpoints
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import twilio_voice_agent
+from twilio_voice_agent import MemoryProfiler, SamplingProfiler, bind_call_context
+
+AUTH = {"Authorization": "Bearer secret"}
+
+
+def busy_worker(stop):
+    """Spin until told to stop so the profiler has something to see."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with debug endpoints enabled."""
+    monkeypatch.setenv("DEBUG_API_TOKEN", "secret")
+    return twilio_voice_agent.app.test_client()
+
+
+def test_debug_endpoints_require_token(client, monkeypatch):
+    """Debug endpoints reject bad tokens and are off without DEBUG_API_TOKEN."""
+    assert client.get("/debug/memory", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    monkeypatch.delenv("DEBUG_API_TOKEN")
+    assert client.get("/debug/memory", headers=AUTH).status_code == 404
+
+
+def test_profile_samples_all_threads(client):
+    """Collapsed stacks include frames from other threads."""
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker, args=(stop,), name="busy")
+    worker.start()
+    try:
+        response = client.get("/debug/profile?seconds=0.3&interval_ms=5", headers=AUTH)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    assert any(line.startswith("busy;") and "busy_worker (test_profiler.py" in line for line in lines)
+
+
+def test_profile_filters_by_call_sid():
+    """With call_sid, only samples taken while the loop runs that call's task are kept."""
+    profiler = SamplingProfiler()
+    result = {}
+
+    def burn(call_sid):
+        bind_call_context(call_sid)
+        deadline = time.monotonic() + 0.4
+        while time.monotonic() < deadline:
+            step = time.monotonic() + 0.02  # CPU-bound step, like a slow regex between awaits
+            while time.monotonic() < step:
+                sum(range(1000))
+            yield
+
+    async def first_call():
+        for _ in burn("CA1"):
+            await asyncio.sleep(0)
+
+    async def second_call():
+        for _ in burn("CA2"):
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(first_call(), second_call())
+
+    sampler = threading.Thread(target=lambda: result.update(profiler.profile(0.3, 0.005, call_sid="CA1")))
+    sampler.start()
+    asyncio.run(main())
+    sampler.join()
+
+    frames = [frame for _, stack in result["stacks"] for frame in stack]
+    assert any("first_call" in frame for frame in frames)
+    assert not any("second_call" in frame for frame in frames)
+
+    speedscope = SamplingProfiler.to_speedscope(result)
+    assert speedscope["profiles"][0]["type"] == "sampled"
+    assert len(speedscope["profiles"][0]["samples"]) == len(speedscope["profiles"][0]["weights"])
+
+
+def test_memory_diff_reports_growth():
+    """Allocations made after the baseline show up in the diff."""
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        leak = [bytearray(1024) for _ in range(2000)]
+        diff = profiler.diff(limit=5)
+    finally:
+        profiler.stop()
+
+    assert diff["tracing"]
+    assert any("test_profiler.py" in entry["location"] and entry["size_diff_kb"] > 1000 for entry in diff["top"])
+    assert len(leak) == 2000
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for call recording and deterministic replay
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from pipecat.frames.frames import (
+    BotStoppedSpeakingFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+
+import twilio_voice_agent
+from loadtest.audio import SILENCE_FRAME
+from loadtest.replay import Recording, compare, run_replay
+from twilio_voice_agent import CallRecorder
+
+
+class SlowLLM:
+    """LLM stub with a fixed delay."""
+
+    async def complete(self, messages):
+        await asyncio.sleep(0.12)
+        return SimpleNamespace(content=f"Respuesta {len(messages)}")
+
+
+class SlowTTS:
+    """TTS stub with a fixed delay."""
+
+    async def synthesize(self, text, **options):
+        await asyncio.sleep(0.05)
+        return b"\xff" * 800
+
+
+def record_call(directory, call_sid="CAREPLAY01"):
+    """Run two turns through a processor with recording on and return the recording path."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    agent.call_recorder = CallRecorder(str(directory))
+    agent.llm_service, agent.tts_service = SlowLLM(), SlowTTS()
+    processor = agent.create_call_processor(call_sid)
+
+    async def main():
+        for text in ("hola necesito ayuda con mi reserva", "gracias por la información"):
+            await processor.process(UserStartedSpeakingFrame())
+            for _ in range(5):
+                agent.call_recorder.record(call_sid, CallRecorder.MEDIA_IN, SILENCE_FRAME)
+                await asyncio.sleep(0.02)
+            await processor.process(UserStoppedSpeakingFrame())
+            await asyncio.sleep(0.03)
+            await processor.process(TranscriptionFrame(text=text, user_id=call_sid, timestamp=""))
+            await processor.turn_taken()
+            await processor.process(BotStoppedSpeakingFrame())
+
+    asyncio.run(main())
+    agent.call_recorder.end_call(call_sid)
+    agent.call_recorder.flush()
+    return agent.call_recorder.path_for(call_sid)
+
+
+def test_recording_round_trips_through_mmap_reader(tmp_path):
+    """Records come back in order with their kinds and payloads, and a torn tail is ignored."""
+    path = record_call(tmp_path)
+    records = list(CallRecorder.read(path))
+    kinds = [kind for kind, _, _ in records]
+    assert kinds.count(CallRecorder.MEDIA_IN) == 10
+    assert [payload["phase"] for kind, _, payload in records if kind == CallRecorder.LLM] == ["request", "done"] * 2
+    assert [offset for _, offset, _ in records] == sorted(offset for _, offset, _ in records)
+    assert records[0][2] == {"type": "user_started_speaking"}
+
+    with open(path, "ab") as f:
+        f.write(CallRecorder.HEADER.pack(CallRecorder.FRAME, 10**9, 100) + b"{")
+    assert len(list(CallRecorder.read(path))) == len(records)
+
+
+def test_a_recording_that_cannot_be_opened_skips_only_that_call(tmp_path):
+    """The failing call goes unrecorded off the caller's thread; later calls are still recorded."""
+    recorder = CallRecorder(str(tmp_path))
+    (tmp_path / "CABROKEN.vcr").mkdir()  # Opening it for appending fails
+    writers = []
+    open_file = recorder._open
+    recorder._open = lambda call_sid: writers.append(threading.current_thread().name) or open_file(call_sid)
+
+    for call_sid in ("CABROKEN", "CAFINE"):
+        recorder.record(call_sid, CallRecorder.FRAME, {"type": "user_started_speaking"})
+        recorder.end_call(call_sid)
+    recorder.flush()
+
+    assert recorder.enabled and writers == ["call-recorder", "call-recorder"]
+    assert list(CallRecorder.read(recorder.path_for("CAFINE")))[0][2] == {"type": "user_started_speaking"}
+
+
+def test_replay_reproduces_recorded_provider_timings(tmp_path):
+    """A virtual-clock replay gives each turn the recorded LLM and TTS durations and answers."""
+    path = record_call(tmp_path)
+    recorded = Recording(path).provider_calls(CallRecorder.LLM)
+    assert [call["content"] for call in recorded] == ["Respuesta 1", "Respuesta 3"]
+
+    turns = run_replay(path)
+    assert len(turns) == 2
+    for turn, call in zip(turns, recorded):
+        assert abs(turn["spans"]["llm"] - call["duration_s"] * 1000) < 0.5
+        assert 50 <= turn["spans"]["tts"] < 60
+        assert turn["events"]["first_audio_sent"] >= 200
+
+    assert run_replay(path) == turns
+    rows = compare(turns, turns)
+    assert rows and all(row["delta_ms"] == 0 for row in rows)
+
+
+def test_declined_consent_without_an_agent_still_hangs_up(monkeypatch):
+    """Declining consent before the agent is up gets the hangup TwiML, not an error."""
+    monkeypatch.setattr(twilio_voice_agent, "voice_agent", None)
+    client = twilio_voice_agent.app.test_client()
+    response = client.post("/consent-response", data={"CallSid": "CA1", "SpeechResult": "no"})
+    assert response.status_code == 200 and b"<Hangup" in response.data
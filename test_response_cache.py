@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the semantic response cache
+"""
+
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+import twilio_voice_agent
+from twilio_voice_agent import MetricsRegistry, SemanticResponseCache, TurnTrace
+
+
+def test_paraphrases_hit_but_different_questions_and_stateful_turns_do_not():
+    """Fuzzy matches stay within tenant and language; substituted key words, follow-ups and digits never match."""
+    registry = MetricsRegistry()
+    cache = SemanticResponseCache(registry=registry)
+    assert cache.store("+15550100", "es-LA", "¿A qué hora abren?", "Abrimos a las 9.", b"\xff" * 160)
+    assert cache.store("+15550100", "en-US", "What time does the restaurant open?", "We open at 9.")
+
+    hit = cache.lookup("+15550100", "es-LA", "Hola, ¿a qué horas abren, por favor?")
+    assert hit.text == "Abrimos a las 9." and hit.audio == b"\xff" * 160 and 0.6 <= hit.similarity < 1
+    assert cache.lookup("+15550100", "es-LA", "¿a que hora abren?").similarity == 1.0
+    assert cache.lookup("+15550100", "en-US", "What time does the restaurant close?") is None
+    assert cache.lookup("+15550199", "es-LA", "¿A qué hora abren?") is None  # Another tenant
+    assert cache.lookup("+15550100", "en-US", "¿A qué hora abren?") is None
+
+    for stateful in ("¿Y los domingos?", "Mi reservación es la 4521", "¿Eso incluye el postre?", "What about Sundays?"):
+        assert not cache.store("+15550100", "es-LA", stateful, "...")
+        assert cache.lookup("+15550100", "es-LA", stateful) is None
+
+    stats = cache.get_stats()
+    assert (stats["hit"], stats["miss"], stats["uncacheable"]) == (2, 3, 4) and stats["hit_ratio"] == 0.4
+    assert "voice_agent_response_cache_hit_ratio 0.4" in registry.render()
+
+
+def test_entries_expire_and_least_recently_used_are_evicted_from_the_index(monkeypatch):
+    """Expired answers miss; past max_entries the least recently used answer leaves the index."""
+    now = [1000.0]
+    monkeypatch.setattr(twilio_voice_agent.time, "monotonic", lambda: now[0])
+    cache = SemanticResponseCache(ttl=60, max_entries=2, registry=MetricsRegistry())
+    cache.store("", "en-US", "Do you have parking?", "Yes, free parking.")
+    cache.store("", "en-US", "Where are you located?", "Main Street.")
+    assert cache.lookup("", "en-US", "Do you guys have parking?").text == "Yes, free parking."
+    cache.store("", "en-US", "Do you accept credit cards?", "We do.")  # Evicts the location answer
+
+    assert cache.lookup("", "en-US", "Where are you located?") is None
+    assert all("located" not in question for question in cache.partitions[("", "en-US")]["questions"])
+    now[0] += 61
+    assert cache.lookup("", "en-US", "Do you have parking?") is None
+    assert len(cache.entries) == 1 and "parking" not in " ".join(cache.partitions[("", "en-US")]["postings"])
+
+
+class CountingLLM:
+    """LLM stub answering at once and counting its requests."""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def complete(self, messages):
+        self.requests += 1
+        return SimpleNamespace(content="Abrimos de 9 a 18 horas.")
+
+
+class PlayingTTS:
+    """TTS stub logging what it synthesized and played."""
+
+    def __init__(self):
+        self.synthesized = []
+        self.played = []
+
+    async def synthesize(self, text, **options):
+        self.synthesized.append(text)
+        return b"\x7f" * 800
+
+    async def play(self, audio):
+        self.played.append(audio)
+
+
+def test_first_turn_answer_is_reused_with_its_audio_on_another_call():
+    """A first turn's answer is stored; the same question on another call plays it without the LLM or TTS."""
+    agent = twilio_voice_agent.TwilioVoiceAgent()
+    agent.llm_service, agent.tts_service = CountingLLM(), PlayingTTS()
+    agent.response_cache = SemanticResponseCache(registry=MetricsRegistry())
+
+    def turn(call_sid, question, earlier_turns=()):
+        agent.call_manager.start_call(call_sid, "+15550123", "inbound", tenant="+15550100")
+        processor = agent.create_call_processor(call_sid)
+        processor.trace = TurnTrace(call_sid, 1)
+        processor.endpointing_span = processor.trace.start("endpointing")
+        processor.conversation_history.extend(earlier_turns)
+        processor.conversation_history.append({"role": "user", "content": question})
+        asyncio.run(processor._get_ai_response(question))
+        return processor
+
+    turn("CACACHE1", "¿A qué hora abren?")
+    second = turn("CACACHE2", "Buenas tardes, ¿a qué horas abren?")
+
+    assert agent.llm_service.requests == 1 and agent.tts_service.synthesized == ["Abrimos de 9 a 18 horas."]
+    assert agent.tts_service.played == [b"\x7f" * 800]
+    assert second.conversation_history[-1]["content"] == "Abrimos de 9 a 18 horas."
+    events = [name for name, _ in second.trace.events]
+    assert events.index("response_cache_hit") < events.index("first_audio_sent")
+
+    earlier = [{"role": "user", "content": "Hola"}, {"role": "assistant", "content": "¿En qué le ayudo?"}]
+    turn("CACACHE3", "¿Tienen estacionamiento?", earlier)  # Not a first turn: the answer may depend on them
+    assert agent.response_cache.lookup("+15550100", "es-LA", "¿Tienen estacionamiento?") is None
+
+
+def test_stored_questions_are_weighed_as_they_come_and_the_idf_is_refreshed_now_and_then():
+    """Storing a question does not reweigh the partition; lookups do that only every ``idf_refresh`` changes."""
+    cache = SemanticResponseCache(idf_refresh=4, registry=MetricsRegistry())
+    refreshes, refresh = [], cache._refresh_idf
+    cache._refresh_idf = lambda partition: refreshes.append(len(partition["questions"])) or refresh(partition)
+    questions = [
+        "Do you have parking?",
+        "Where are you located?",
+        "Do you accept credit cards?",
+        "Is there a kids menu?",
+        "Do you have vegan dishes?",
+        "Can I bring my dog?",
+        "Do you deliver to offices?",
+        "Is the patio open in winter?",
+        "Do you take reservations?",
+        "Is there wifi for guests?",
+    ]
+    for index, question in enumerate(questions):
+        cache.store("", "en-US", question, f"Answer {index}.")
+        if index:
+            assert cache.lookup("", "en-US", f"So, {question}").text == f"Answer {index}."
+
+    assert refreshes == [2, 6, 10]
+    partition = cache.partitions[("", "en-US")]
+    assert set(partition["vectors"]) == set(partition["questions"])
+    cache.store("", "en-US", "Do you have highchairs?", "We do.", None)  # Weighed on arrival, no refresh
+    assert "do you have highchairs" in partition["vectors"] and refreshes == [2, 6, 10]
+
+
+def test_questions_within_a_longer_cached_question_and_personal_first_turns_do_not_match():
+    """Extra content words on either side reject a match; names and transactions are never stored."""
+    cache = SemanticResponseCache(registry=MetricsRegistry())
+    assert cache.store("", "en-US", "Do you have parking for delivery trucks?", "Trucks unload in the back alley.")
+    assert cache.lookup("", "en-US", "Do you have parking?") is None
+    assert cache.lookup("", "en-US", "So, do you guys have parking for delivery trucks?").text.startswith("Trucks")
+
+    assert not cache.store(
+        "", "en-US", "My name is Maria Lopez and I want to cancel my reservation", "Sure Maria Lopez, it is cancelled."
+    )
+    assert cache.lookup("", "en-US", "I want to cancel my reservation") is None
+    assert not cache.store("", "es-LA", "Hola, me llamo Carlos Cardona, ¿a qué hora abren?", "Hola Carlos, a las 9.")
+    assert not cache.store("", "en-US", "Can I pay my bill over the phone?", "Your balance is paid.")
+    assert cache.store("", "en-US", "Can I pay by card?", "We take all major cards.")
+    assert len(cache.entries) == 2
+
+
+def test_evicting_a_question_only_touches_its_own_ngrams():
+    """Document frequencies of an evicted question's n-grams drop by one; shared ones stay, unique ones go."""
+    cache = SemanticResponseCache(registry=MetricsRegistry())
+    cache.store("", "en-US", "Do you have parking?", "Yes.")
+    cache.store("", "en-US", "Do you have a patio?", "No.")
+    cache._evict(("", "en-US", "do you have a patio"))
+    df = cache.partitions[("", "en-US")]["df"]
+    assert df == Counter(cache._ngrams("do you have parking").keys())
+
+
+def test_expired_nearest_match_falls_back_to_the_next_live_one(monkeypatch):
+    """An expired best match is evicted and the lookup goes on to the next question above the threshold."""
+    now = [1000.0]
+    monkeypatch.setattr(twilio_voice_agent.time, "monotonic", lambda: now[0])
+    cache = SemanticResponseCache(ttl=60, registry=MetricsRegistry())
+    cache.store("", "en-US", "Do you have parking?", "Yes, free parking.")
+    now[0] += 30
+    cache.store("", "en-US", "Do you guys have any parking?", "Yes, behind the building.")
+    now[0] += 31  # Only the first answer has expired
+
+    hit = cache.lookup("", "en-US", "Do you have parking?")
+    assert hit.text == "Yes, behind the building." and hit.similarity < 1
+    assert list(cache.partitions[("", "en-US")]["questions"]) == ["do you guys have any parking"]
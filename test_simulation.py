@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the virtual-clock capacity simulator
+"""
+
+import argparse
+import asyncio
+import time
+
+import twilio_voice_agent
+from loadtest.simulate import DiurnalArrivals, VirtualClock, VirtualTimeEventLoop, simulate, virtual_time
+
+
+def test_virtual_loop_skips_idle_time():
+    """An hour of sleeping finishes instantly and the agent module sees simulated time."""
+    clock = VirtualClock(epoch=1_700_000_000)
+    loop = VirtualTimeEventLoop(clock)
+
+    async def main():
+        await asyncio.gather(asyncio.sleep(3600), asyncio.sleep(60))
+        return loop.time()
+
+    start = time.perf_counter()
+    with virtual_time(clock):
+        assert loop.run_until_complete(main()) == 3600
+        assert twilio_voice_agent.time.time() == 1_700_003_600
+        assert twilio_voice_agent.datetime.now().timestamp() == 1_700_003_600
+    loop.close()
+    assert time.perf_counter() - start < 1
+    assert twilio_voice_agent.time is time
+
+
+def test_diurnal_arrivals_follow_the_day():
+    """The diurnal process peaks at the peak hour and bottoms out twelve hours later."""
+    arrivals = DiurnalArrivals(peak_per_hour=7200, trough_per_hour=720, peak_hour=14)
+    assert arrivals.rate(14 * 3600) * 3600 == 7200
+    assert round(arrivals.rate(2 * 3600) * 3600) == 720
+
+    t, count = 13.5 * 3600, 0
+    while t < 14.5 * 3600:
+        t = arrivals.next_arrival(t)
+        count += 1
+    assert 6500 < count < 7900
+
+
+def test_simulation_projects_latency_and_concurrency():
+    """A short run drives real processors and reports latency, concurrency and memory curves."""
+    args = argparse.Namespace(
+        rate=1800,
+        diurnal="",
+        peak_hour=14,
+        start_hour=9,
+        hours=0.25,
+        sample_minutes=5,
+        turns=3,
+        utterance="1500,4000",
+        think="600,2000",
+        endpointing_ms=300,
+        stt="150,300",
+        llm="250,600",
+        tts="150,350",
+        llm_error_rate=0.0,
+        tts_error_rate=0.0,
+        seed=3,
+    )
+    results = simulate(args)
+
+    assert results["speedup"] > 20
+    assert 300 < results["calls"] < 600
+    assert results["failed_turns"] == 0
+    assert 850 < results["p95_ms"] < 2500
+    assert results["peak_active_calls"] > 5
+    assert [point["clock"] for point in results["curve"][:3]] == ["09:05", "09:10", "09:15"]
+    assert results["curve"][-1]["tracked"]["active_calls"] == 0
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy provider imports and the liveness/readiness split
+"""
+
+import os
+import subprocess
+import sys
+
+import twilio_voice_agent
+from twilio_voice_agent import StartupState
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_liveness_and_readiness_follow_startup_phases(monkeypatch):
+    """/livez answers at once, /readyz only once the pipeline is started, and a failed start fails both."""
+    state = StartupState()
+    monkeypatch.setattr(twilio_voice_agent, "startup", state)
+    client = twilio_voice_agent.app.test_client()
+
+    assert client.get("/livez").status_code == 200
+    assert client.get("/readyz").status_code == 503
+
+    state.mark("initializing_services")
+    state.mark("starting_pipeline")
+    state.mark("ready")
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert set(response.get_json()["timings_ms"]) == set(StartupState.PHASES)
+
+    state.fail(RuntimeError("deepgram key rejected"))
+    assert client.get("/livez").status_code == 503
+    assert client.get("/readyz").get_json()["error"] == "deepgram key rejected"
+
+
+def test_provider_sdks_load_with_the_agent_not_the_module():
+    """Importing the module leaves the provider SDKs unloaded; main() loads them and reaches ready."""
+    script = """
+import asyncio, sys
+import twilio_voice_agent as m
+print("sdk" if "pipecat.services.openai.llm" in sys.modules else "no-sdk")
+asyncio.run(m.main())
+print("sdk" if "pipecat.services.openai.llm" in sys.modules else "no-sdk", m.startup.phase, m.voice_agent is not None)
+"""
+    env = dict(os.environ, CALL_STATS_PATH="", PROVIDER_PREWARM="false", PYTHONPATH=ROOT)
+    for key in ("ELEVENLABS_API_KEY", "DEEPGRAM_API_KEY", "OPENAI_API_KEY"):
+        env.setdefault(key, "test")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.split() == ["no-sdk", "sdk", "ready", "True"]
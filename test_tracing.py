@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for per-turn span tracing and the flight recorder
+"""
+
+import json
+
+import twilio_voice_agent
+from twilio_voice_agent import FlightRecorder
+
+
+def test_turn_spans_and_events_are_relative_to_turn_start():
+    """Spans and events are reported in milliseconds from the start of the turn."""
+    recorder = FlightRecorder(slow_turn_ms=10000)
+    trace = recorder.start_turn("CA1")
+    stt = trace.start("stt_final", trace.start_ns)
+    trace.end(stt, text_length=5)
+    trace.event("first_audio_sent")
+    assert not recorder.finish_turn(trace)
+
+    turn = recorder.get_turns("CA1")[0].to_dict()
+    assert turn["turn"] == 1
+    assert turn["spans"][0]["name"] == "stt_final"
+    assert turn["spans"][0]["start_ms"] == 0
+    assert turn["spans"][0]["attributes"] == {"text_length": 5}
+    assert 0 <= turn["events"]["first_audio_sent"] <= turn["duration_ms"]
+
+
+def test_ring_buffer_keeps_last_turns_and_evicts_old_calls():
+    """Each call keeps a bounded number of turns; the oldest calls are evicted."""
+    recorder = FlightRecorder(turns_per_call=2, max_calls=2)
+    for _ in range(3):
+        recorder.finish_turn(recorder.start_turn("CA1"))
+    assert [trace.turn for trace in recorder.get_turns("CA1")] == [2, 3]
+
+    recorder.start_turn("CA2")
+    recorder.end_call("CA1")  # Ended calls move to the back of the eviction order
+    recorder.start_turn("CA3")
+    assert recorder.get_turns("CA2") == []
+    assert len(recorder.get_turns("CA1")) == 2
+
+
+def test_slow_turns_are_exported_as_otel_json(tmp_path):
+    """Turns over the threshold are written as OTLP/JSON with a root span and children."""
+    recorder = FlightRecorder(slow_turn_ms=0, export_dir=str(tmp_path))
+    trace = recorder.start_turn("CA1")
+    trace.end(trace.start("llm"))
+    trace.event("llm_first_token")
+    assert recorder.finish_turn(trace)
+    recorder.flush()  # Written by the export thread, not in the turn
+
+    assert recorder.export_thread is not None and recorder.exported == 1
+    (path,) = tmp_path.iterdir()
+    spans = json.loads(path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["turn", "llm"]
+    assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+    assert {span["traceId"] for span in spans} == {trace.trace_id}
+    assert spans[0]["events"][0]["name"] == "llm_first_token"
+    assert int(spans[0]["endTimeUnixNano"]) >= int(spans[0]["startTimeUnixNano"])
+
+
+def test_traces_endpoint(monkeypatch):
+    """/traces/<call_sid> serves recorded turns and 404s for unknown calls."""
+
+    class Agent:
+        flight_recorder = FlightRecorder()
+
+    monkeypatch.setattr(twilio_voice_agent, "voice_agent", Agent())
+    Agent.flight_recorder.finish_turn(Agent.flight_recorder.start_turn("CA1"))
+    client = twilio_voice_agent.app.test_client()
+
+    assert client.get("/traces/CA1").get_json()["turns"][0]["turn"] == 1
+    assert "resourceSpans" in client.get("/traces/CA1?format=otel").get_json()
+    assert client.get("/traces/CA2").status_code == 404
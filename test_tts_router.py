@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the TTS router: health-based failover, first-byte ranking, the local engine and the audio cache
+"""
+
+import asyncio
+import io
+import sys
+import wave
+
+import numpy as np
+
+from loadtest.audio import ulaw_to_linear
+from twilio_voice_agent import LanguageManager, LocalTTSEngine, MetricsRegistry, PhraseCache, TTSBackend, TTSRouter
+
+
+class StubTTS:
+    """TTS stub whose first byte arrives after a delay (never, if None), optionally failing instead."""
+
+    def __init__(self, name, first_byte_s=0.0, fail=False):
+        self.name = name
+        self.first_byte_s = first_byte_s
+        self.fail = fail
+        self.texts = []
+        self.played = []
+
+    async def synthesize(self, text, voice_id=None, model_id=None, first_byte=None):
+        self.texts.append(text)
+        await asyncio.sleep(self.first_byte_s if self.first_byte_s is not None else 60)
+        if self.fail:
+            raise RuntimeError("503 Service Unavailable")
+        if first_byte is not None and not first_byte.done():
+            first_byte.set_result(None)
+        return f"{self.name}:{text}".encode()
+
+    async def play(self, audio):
+        self.played.append(audio)
+
+
+def test_failing_provider_falls_back_to_local_engine_and_recovers():
+    """Errors fail over to the last resort and then skip the provider; its audio is cached until it recovers."""
+    languages = LanguageManager()
+    cache = PhraseCache(languages)
+    provider, local = StubTTS("elevenlabs", fail=True), StubTTS("local")
+    router = TTSRouter(
+        [TTSBackend("elevenlabs", provider), TTSBackend("local", local, last_resort=True, streams=False)],
+        cache,
+        registry=MetricsRegistry(),
+    )
+    filler = languages.language_configs["es-LA"]["filler"]
+
+    async def run():
+        assert await router.synthesize("Su pedido llega mañana.") == "local:Su pedido llega mañana.".encode()
+        await cache.warm(router)  # Second error: the provider is now unhealthy
+        assert not router.is_healthy("elevenlabs") and router.ranked()[0].name == "local"
+
+        calls, hits = len(provider.texts), router.get_stats()["cache_hits"]
+        await router.synthesize("¿Algo más?")
+        assert len(provider.texts) == calls  # Skipped, straight to the local engine
+        await router.synthesize("Su pedido llega mañana.")  # From the cache while no provider is healthy
+        assert router.get_stats()["cache_hits"] == hits + 1
+        assert cache.get("es-LA", "filler") == b"local:" + filler.encode()
+
+        provider.fail = False
+        router.next_probe["elevenlabs"] = 0.0  # The retry interval has passed: the next utterance probes it
+        assert await router.synthesize("Su pedido llega mañana.") == "elevenlabs:Su pedido llega mañana.".encode()
+        await router._refresh
+        return calls
+
+    calls = asyncio.run(run())
+    assert router.is_healthy("elevenlabs")
+    assert cache.lookup("es-LA", "Su pedido llega mañana.")[1] == "elevenlabs"
+    assert cache.get("es-LA", "filler") == b"elevenlabs:" + filler.encode()  # Phrases re-made by the provider
+    assert "local:Su pedido llega mañana.".encode() in provider.played  # Played through the provider
+    stats = router.get_stats()
+    assert stats["failovers"] == calls and stats["backends"]["elevenlabs"]["healthy"]
+
+
+def test_fastest_healthy_provider_first_and_stalled_first_byte_fails_over():
+    """Providers are ranked by median first byte; one without a first byte in time counts as an error."""
+    fast, slow = StubTTS("fast", 0.02), StubTTS("slow", 0.06)
+    router = TTSRouter([TTSBackend("slow", slow), TTSBackend("fast", fast)], min_samples=3, registry=MetricsRegistry())
+
+    async def run():
+        for _ in range(3):
+            await router.synthesize("hola", first_byte=asyncio.get_running_loop().create_future())
+        assert [b.name for b in router.ranked()] == ["fast", "slow"]  # "fast" unmeasured yet ranks first
+        for _ in range(3):
+            await router.synthesize("hola")
+        assert [b.name for b in router.ranked()] == ["fast", "slow"]
+        assert len(fast.texts) == 3
+
+        fast.first_byte_s = None  # Stalls
+        router.first_byte_timeout = 0.1
+        return await router.synthesize("hola")
+
+    assert asyncio.run(run()) == b"slow:hola"
+    stats = router.get_stats()
+    assert stats["error"] == 1 and stats["failovers"] == 1
+    assert stats["backends"]["fast"]["error_rate"] == 0.3 and stats["backends"]["fast"]["first_byte_p95_ms"] >= 100
+
+
+def test_local_engine_converts_wav_output_to_ulaw(tmp_path):
+    """The local engine runs its command with the language's voice and resamples its WAV to 8 kHz μ-law."""
+    script = tmp_path / "fake_espeak.py"
+    script.write_text(
+        "import sys, wave, math, struct\n"
+        "sys.stdin.read()\n"
+        "assert sys.argv[1] == 'en-us'\n"
+        "out = wave.open(sys.stdout.buffer, 'wb')\n"
+        "out.setnchannels(1); out.setsampwidth(2); out.setframerate(16000)\n"
+        "out.writeframes(b''.join(struct.pack('<h', int(8000 * math.sin(i / 16000 * 2 * math.pi * 200)))"
+        " for i in range(16000)))\n"
+        "out.close()\n"
+    )
+    engine = LocalTTSEngine(f"{sys.executable} {script} {{voice}}", language_getter=lambda: "en-US")
+    assert engine.available
+
+    audio = asyncio.run(engine.synthesize("hello"))
+    samples = ulaw_to_linear(audio).astype(float)
+    assert abs(len(audio) - 8000) <= 1
+    expected = 8000 * np.sin(np.arange(len(samples)) / 8000 * 2 * np.pi * 200)
+    assert np.abs(samples[10:-10] - expected[10:-10]).max() < 600
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as stereo:
+        stereo.setnchannels(2)
+        stereo.setsampwidth(2)
+        stereo.setframerate(8000)
+        stereo.writeframes(np.array([[1000, 3000]] * 80, dtype="<i2").tobytes())
+    assert np.abs(ulaw_to_linear(LocalTTSEngine.wav_to_ulaw(buffer.getvalue())) - 2000).max() < 64
+    assert not LocalTTSEngine("no-such-tts-engine --stdout").available
@@ -17,40 +17,305 @@ Features:
 """
 
 import asyncio
+import atexit
+import bisect
+import contextlib
+import contextvars
+import hashlib
+import heapq
+import hmac
+import json
 import logging
+import logging.handlers
+import math
+import mmap
 import os
+import queue
+import re
+import shlex
+import shutil
 import statistics
+import struct
 import sys
 import threading
 import time
+import traceback
+import tracemalloc
+import unicodedata
+import weakref
 import xml.etree.ElementTree as ET
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, tzinfo
+from functools import wraps
+from types import MappingProxyType, SimpleNamespace
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from flask import Flask, Response, request
+from flask import Flask, Response, request, stream_with_context
 from flask_cors import CORS
 
+if TYPE_CHECKING:
+    import aiohttp  # Imported when ConnectionManager first opens a session
+
 # Load environment variables
 load_dotenv()
 
+# Call context attached to every log record (set per request or per pipeline task)
+log_call_sid: contextvars.ContextVar = contextvars.ContextVar("log_call_sid", default=None)
+log_turn: contextvars.ContextVar = contextvars.ContextVar("log_turn", default=None)
+
+# Which call a task or thread is working for, readable from other threads (debug profiler, loop monitor)
+_task_call_sids: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+_thread_call_sids: Dict[int, Optional[str]] = {}
+
+
+def bind_call_context(call_sid: Optional[str], turn: Optional[int] = None):
+    """Attach a call (and turn) to the current task or thread for logs, traces and profiles."""
+    log_call_sid.set(call_sid)
+    log_turn.set(turn)
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        if call_sid:
+            _task_call_sids[task] = call_sid
+        else:
+            _task_call_sids.pop(task, None)
+    elif call_sid:
+        _thread_call_sids[threading.get_ident()] = call_sid
+    else:
+        _thread_call_sids.pop(threading.get_ident(), None)
+
+
+def call_sid_for_task(task: "asyncio.Task") -> Optional[str]:
+    """Get the call a task is bound to."""
+    if hasattr(task, "get_context"):  # Python 3.12+
+        call_sid = task.get_context().get(log_call_sid)
+        if call_sid:
+            return call_sid
+    return _task_call_sids.get(task)
+
+
+def _parse_category_settings(value: str) -> Dict[str, float]:
+    """Parse "frame=0.1,latency=0.5" style settings."""
+    settings = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(","))):
+        name, _, number = item.partition("=")
+        try:
+            settings[name.strip()] = float(number)
+        except ValueError:
+            pass
+    return settings
+
+
+class LogContextFilter(logging.Filter):
+    """Stamps records with the call_sid/turn of the calling context, then samples and rate-limits them.
+
+    Runs in the thread that logs, before the record is queued. Records logged
+    with ``extra={"category": ...}`` below WARNING are kept at the category's
+    sampling rate (1 in N) and at most ``rate_limits[category]`` per second.
+    """
+
+    def __init__(self, sampling: Optional[Dict[str, float]] = None, rate_limits: Optional[Dict[str, float]] = None):
+        """Initialize the filter with per-category sampling rates (0-1) and per-second limits."""
+        super().__init__()
+        self.sample_every = {
+            category: max(1, round(1 / rate)) if rate > 0 else 0 for category, rate in (sampling or {}).items()
+        }
+        self.rate_limits = rate_limits or {}
+        self.seen: Dict[str, int] = {}
+        self.windows: Dict[str, List[float]] = {}  # category -> [window_start, count]
+        self.suppressed = Counter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Add context and decide whether to keep the record."""
+        record.call_sid = log_call_sid.get()
+        record.turn = log_turn.get()
+
+        category = getattr(record, "category", None)
+        if category is None or record.levelno >= logging.WARNING:
+            return True
+
+        every = self.sample_every.get(category)
+        if every is not None:
+            seen = self.seen.get(category, 0)
+            self.seen[category] = seen + 1
+            if every == 0 or seen % every:
+                self.suppressed["sampled"] += 1
+                return False
+
+        limit = self.rate_limits.get(category)
+        if limit is not None:
+            now = time.monotonic()
+            window = self.windows.get(category)
+            if window is None or now - window[0] >= 1.0:
+                window = self.windows[category] = [now, 0]
+            if window[1] >= limit:
+                self.suppressed["rate_limited"] += 1
+                return False
+            window[1] += 1
+
+        return True
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line with call context, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as JSON."""
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("call_sid", "turn", "category"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TextLogFormatter(logging.Formatter):
+    """The classic text format, with the call_sid appended when known."""
+
+    def __init__(self):
+        """Initialize with the standard format string."""
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as text."""
+        text = super().format(record)
+        call_sid = getattr(record, "call_sid", None)
+        return f"{text} [{call_sid}]" if call_sid else text
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the writer thread and never blocks."""
+
+    def __init__(self, log_queue: queue.Queue):
+        """Initialize the handler."""
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue the record as-is; %-style arguments are formatted by the listener."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """Queue a record, dropping it if the writer has fallen behind."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Non-blocking logging: callers enqueue records, a background thread formats and writes them.
+
+    Configured from LOG_LEVEL, LOG_FILE, LOG_FORMAT (text or json),
+    LOG_SAMPLING, LOG_RATE_LIMITS and LOG_QUEUE_SIZE.
+    """
+
+    def __init__(
+        self,
+        level: str = "INFO",
+        log_file: Optional[str] = None,
+        json_format: bool = False,
+        sampling: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        queue_size: int = 10000,
+        stream=None,
+    ):
+        """Build the handlers; nothing is installed until install()."""
+        self.level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+        if not isinstance(self.level, int):
+            self.level = logging.INFO
+        formatter = JsonLogFormatter() if json_format else TextLogFormatter()
+
+        self.writers: List[logging.Handler] = [logging.StreamHandler(stream)]
+        if log_file:
+            self.writers.append(logging.FileHandler(log_file, encoding="utf-8"))
+        for writer in self.writers:
+            writer.setFormatter(formatter)
+
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = DeferredQueueHandler(self.queue)
+        self.filter = LogContextFilter(sampling, rate_limits)
+        self.handler.addFilter(self.filter)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.writers, respect_handler_level=True)
+        self.installed = False
+
+    @classmethod
+    def from_env(cls) -> "LogPipeline":
+        """Create a pipeline from environment variables."""
+        return cls(
+            level=os.getenv("LOG_LEVEL", "INFO"),
+            log_file=os.getenv("LOG_FILE") or None,
+            json_format=os.getenv("LOG_FORMAT", "text").lower() == "json",
+            sampling=_parse_category_settings(os.getenv("LOG_SAMPLING", "")),
+            rate_limits=_parse_category_settings(os.getenv("LOG_RATE_LIMITS", "frame=20")),
+            queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+        )
+
+    def install(self, force: bool = False):
+        """Route the root logger through the queue, unless logging was already configured (like basicConfig)."""
+        root = logging.getLogger()
+        if self.installed or (root.handlers and not force):
+            return
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+        self.listener.start()
+        atexit.register(self.stop)
+        self.installed = True
+
+    def stop(self):
+        """Flush queued records and stop the writer thread."""
+        if not self.installed:
+            return
+        logging.getLogger().removeHandler(self.handler)
+        self.listener.stop()
+        for writer in self.writers:
+            writer.flush()
+        self.installed = False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get queue depth and suppressed record counts."""
+        return {
+            "queued": self.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "sampled": self.filter.suppressed["sampled"],
+            "rate_limited": self.filter.suppressed["rate_limited"],
+        }
+
+
 # Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+log_pipeline = LogPipeline.from_env()
+log_pipeline.install()
 logger = logging.getLogger(__name__)
 
-# Import Pipecat components
+# Import Pipecat core components (provider services are imported by TwilioVoiceAgent._initialize_services)
 try:
-    from pipecat.frames.frames import TranscriptionFrame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame
+    from pipecat.frames.frames import (
+        BotStoppedSpeakingFrame,
+        InputAudioRawFrame,
+        OutputAudioRawFrame,
+        TranscriptionFrame,
+        UserStartedSpeakingFrame,
+        UserStoppedSpeakingFrame,
+    )
     from pipecat.pipeline.pipeline import Pipeline
     from pipecat.processors.frame_processor import FrameProcessor
-    from pipecat.services.deepgram.stt import DeepgramSTTService
-    from pipecat.services.elevenlabs.tts import ElevenLabsTTSService
-    from pipecat.services.openai.llm import OpenAILLMService
 
-    logger.info("✅ All Pipecat components imported successfully")
+    logger.info("✅ Pipecat core components imported successfully")
 except ImportError as e:
     logger.error(f"❌ Pipecat import error: {e}")
-    sys.exit(1)
+    raise
 
 
 class LanguageManager:
@@ -76,6 +341,13 @@ class LanguageManager:
                 "instructions": "Por favor responde sí o no.",
                 "no_response": "No se recibió respuesta. Llamada terminada.",
                 "goodbye": "Entendido. Llamada terminada. ¡Que tengas un buen día!",
+                "busy": "En este momento todas nuestras líneas están ocupadas. Por favor llámanos más tarde.",
+                "hold": "Todas nuestras líneas están ocupadas. Por favor espera en línea, en breve te atendemos.",
+                "filler": "Déjame revisar, un momento...",
+                "backchannels": ["Mm-hmm.", "Claro.", "Un momento."],  # Short cues for a turn expected to be slow
+                "fallback_response": "Perdón, no pude procesar eso a tiempo. ¿Me lo puedes repetir?",
+                "secondary_tts": {"model_id": "eleven_flash_v2_5"},  # Lower-latency model for missed deadlines
+                "deadlines_ms": {"llm_first_token": 900, "llm_response": 3000, "tts_first_byte": 800},
                 "system_prompt": (
                     "Eres un agente de servicio al cliente útil, responde en español "
                     "mexicano, maneja casos como reservas o soporte. Sé amigable, "
@@ -91,6 +363,13 @@ class LanguageManager:
                 "instructions": "Please answer yes or no.",
                 "no_response": "No response received. Call terminated.",
                 "goodbye": "Understood. Call terminated. Have a great day!",
+                "busy": "All of our lines are busy right now. Please call us back later.",
+                "hold": "All of our lines are busy. Please stay on the line and we will be with you shortly.",
+                "filler": "Let me check, one moment...",
+                "backchannels": ["Mm-hmm.", "Sure.", "One moment."],
+                "fallback_response": "Sorry, I couldn't process that in time. Could you say it again?",
+                "secondary_tts": {"model_id": "eleven_flash_v2_5"},
+                "deadlines_ms": {"llm_first_token": 800, "llm_response": 3000, "tts_first_byte": 800},
                 "system_prompt": (
                     "You are a helpful customer service agent, respond in English, "
                     "handle cases like reservations or support. Be friendly, "
@@ -211,6 +490,23 @@ class LanguageManager:
         """Get consent message for current language."""
         return self.get_current_config()["consent"]
 
+    def get_busy_message(self) -> str:
+        """Get the "call back later" message for current language."""
+        return self.get_current_config()["busy"]
+
+    def get_hold_message(self) -> str:
+        """Get the message played before queued callers hear hold music."""
+        return self.get_current_config()["hold"]
+
+    def get_secondary_tts(self, language: str) -> Dict[str, str]:
+        """Get the TTS options used once synthesis misses its first-byte deadline."""
+        options = dict(self.language_configs[language]["secondary_tts"])
+        if os.getenv("TTS_SECONDARY_MODEL"):
+            options["model_id"] = os.getenv("TTS_SECONDARY_MODEL")
+        if os.getenv("TTS_SECONDARY_VOICE"):
+            options["voice_id"] = os.getenv("TTS_SECONDARY_VOICE")
+        return options
+
     def get_instructions(self) -> str:
         """Get instructions for current language."""
         return self.get_current_config()["instructions"]
@@ -238,34 +534,768 @@ class LanguageManager:
         }
 
 
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format a label set for the OpenMetrics text format."""
+    if not labels:
+        return ""
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricFamily:
+    """Base class for a named metric with optional labels."""
+
+    metric_type = "unknown"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), callback=None):
+        """Initialize the metric; a callback makes the value computed at scrape time instead."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.callback = callback
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Get the storage key for a label set."""
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Get (suffix, labels, value) samples for exposition."""
+        if self.callback is not None:
+            value = self.callback()
+            if isinstance(value, (int, float)):
+                return [("", {}, value)]
+            return [("", labels, sample) for labels, sample in value]
+
+        with self.lock:
+            items = list(self.values.items())
+        return [("", dict(zip(self.label_names, key)), value) for key, value in items]
+
+    def render(self) -> List[str]:
+        """Render the metric family in OpenMetrics text format."""
+        lines = [f"# TYPE {self.name} {self.metric_type}", f"# HELP {self.name} {self.documentation}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {value}")
+        return lines
+
+
+class CounterMetric(MetricFamily):
+    """Monotonically increasing counter (exposed with a _total suffix)."""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        """Increment the counter."""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Get samples with the _total suffix."""
+        return [("_total", labels, value) for _, labels, value in super().samples()]
+
+
+class GaugeMetric(MetricFamily):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels: str):
+        """Set the gauge."""
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        """Increment the gauge."""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+
+class HistogramMetric(MetricFamily):
+    """Histogram whose bucket counts are updated when observed, never recomputed from samples."""
+
+    metric_type = "histogram"
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """Initialize the histogram with fixed upper bounds (seconds by default)."""
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self.series: Dict[Tuple[str, ...], List[float]] = {}  # key -> bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels: str):
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Get cumulative bucket, sum and count samples."""
+        with self.lock:
+            items = [(key, list(series)) for key, series in self.series.items()]
+
+        samples = []
+        for key, series in items:
+            labels = dict(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), series):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                samples.append(("_bucket", {**labels, "le": le}, cumulative))
+            samples.append(("_count", labels, series[-1]))
+            samples.append(("_sum", labels, series[-2]))
+        return samples
+
+
+class MetricsRegistry:
+    """Registry of metrics exposed on /metrics in OpenMetrics text format."""
+
+    CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics: Dict[str, MetricFamily] = {}
+        self.lock = threading.Lock()
+
+    def _register(self, metric: MetricFamily) -> MetricFamily:
+        """Register a metric, returning the existing one if the name is already taken."""
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                if metric.callback is not None:
+                    existing.callback = metric.callback
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), callback=None):
+        """Get or create a counter."""
+        return self._register(CounterMetric(name, documentation, label_names, callback))
+
+    def gauge(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), callback=None):
+        """Get or create a gauge."""
+        return self._register(GaugeMetric(name, documentation, label_names, callback))
+
+    def histogram(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), **kwargs):
+        """Get or create a histogram."""
+        return self._register(HistogramMetric(name, documentation, label_names, **kwargs))
+
+    def render(self) -> str:
+        """Render every metric; cost is proportional to the number of series, not samples."""
+        with self.lock:
+            metrics = list(self.metrics.values())
+
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.error(f"❌ Failed to render metric {metric.name}: {e}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()  # Process-wide registry served on /metrics
+metrics_registry.counter(
+    "voice_agent_log_records_suppressed",
+    "Log records not written because they were sampled out, rate limited or the queue was full",
+    ("reason",),
+    callback=lambda: [
+        ({"reason": reason}, value) for reason, value in log_pipeline.get_stats().items() if reason != "queued"
+    ],
+)
+
+
+class LatencySketch:
+    """Fixed-bucket latency histogram that can be merged and queried for percentiles."""
+
+    # Upper bounds in milliseconds; the last bucket catches everything above
+    BOUNDS_MS = (25, 50, 75, 100, 150, 200, 250, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 5000, float("inf"))
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        """Initialize an empty sketch."""
+        self.counts = [0] * len(self.BOUNDS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, latency_ms: float):
+        """Add a single latency sample."""
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total += latency_ms
+        self.min = latency_ms if self.min is None else min(self.min, latency_ms)
+        self.max = latency_ms if self.max is None else max(self.max, latency_ms)
+
+    def merge(self, other: "LatencySketch"):
+        """Merge another sketch into this one."""
+        for i, bucket_count in enumerate(other.counts):
+            self.counts[i] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside the matching bucket."""
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.BOUNDS_MS[i - 1] if i > 0 else 0.0
+                upper = self.BOUNDS_MS[i] if self.BOUNDS_MS[i] != float("inf") else self.max
+                estimate = lower + (upper - lower) * ((rank - seen) / bucket_count)
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+    def fraction_below(self, latency_ms: float) -> float:
+        """Estimate the fraction of samples at or below a latency, interpolating inside its bucket."""
+        if self.count == 0:
+            return 0.0
+        index = bisect.bisect_left(self.BOUNDS_MS, latency_ms)
+        lower = self.BOUNDS_MS[index - 1] if index > 0 else 0.0
+        upper = self.BOUNDS_MS[index] if self.BOUNDS_MS[index] != float("inf") else max(self.max, latency_ms)
+        inside = (latency_ms - lower) / (upper - lower) if upper > lower else 1.0
+        return (sum(self.counts[:index]) + self.counts[index] * inside) / self.count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the sketch for persistence."""
+        return {"counts": list(self.counts), "count": self.count, "total": self.total, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        """Restore a sketch saved with to_dict."""
+        sketch = cls()
+        if len(data.get("counts", [])) == len(cls.BOUNDS_MS):
+            sketch.counts = list(data["counts"])
+            sketch.count = data["count"]
+            sketch.total = data["total"]
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+class RollingLatencySketch:
+    """LatencySketch of roughly the last ``window`` seconds, kept as two halves that rotate."""
+
+    def __init__(self, window: float = 60.0):
+        """Initialize an empty window."""
+        self.window = window
+        self.lock = threading.Lock()
+        self._halves = [LatencySketch(), LatencySketch()]  # The half-window before and the current one
+        self._rotated_at = time.monotonic()
+
+    def add(self, latency_ms: float):
+        """Add a latency sample to the current half-window."""
+        with self.lock:
+            self._rotate()
+            self._halves[1].add(latency_ms)
+
+    def snapshot(self) -> LatencySketch:
+        """Get the samples of the last half to full window merged into one sketch."""
+        merged = LatencySketch()
+        with self.lock:
+            self._rotate()
+            merged.merge(self._halves[0])
+            merged.merge(self._halves[1])
+        return merged
+
+    def _rotate(self):
+        """Start a new half-window when the current one is over (lock held)."""
+        now = time.monotonic()
+        if now - self._rotated_at >= self.window / 2:
+            # After a full window without samples both halves are stale
+            previous = self._halves[1] if now - self._rotated_at < self.window else LatencySketch()
+            self._halves = [previous, LatencySketch()]
+            self._rotated_at = now
+
+
+class StatsBucket:
+    """Call counters for a single minute, hour or day."""
+
+    __slots__ = (
+        "calls",
+        "answered",
+        "positive",
+        "duration_total",
+        "duration_count",
+        "end_reasons",
+        "languages",
+        "latency",
+    )
+
+    def __init__(self):
+        """Initialize an empty bucket."""
+        self.calls = 0
+        self.answered = 0
+        self.positive = 0
+        self.duration_total = 0.0
+        self.duration_count = 0
+        self.end_reasons = Counter()
+        self.languages = Counter()
+        self.latency = LatencySketch()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the bucket for persistence."""
+        return {
+            "calls": self.calls,
+            "answered": self.answered,
+            "positive": self.positive,
+            "duration_total": self.duration_total,
+            "duration_count": self.duration_count,
+            "end_reasons": dict(self.end_reasons),
+            "languages": dict(self.languages),
+            "latency": self.latency.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StatsBucket":
+        """Restore a bucket saved with to_dict."""
+        bucket = cls()
+        bucket.calls = data.get("calls", 0)
+        bucket.answered = data.get("answered", 0)
+        bucket.positive = data.get("positive", 0)
+        bucket.duration_total = data.get("duration_total", 0.0)
+        bucket.duration_count = data.get("duration_count", 0)
+        bucket.end_reasons = Counter(data.get("end_reasons", {}))
+        bucket.languages = Counter(data.get("languages", {}))
+        bucket.latency = LatencySketch.from_dict(data.get("latency", {}))
+        return bucket
+
+
+class CallStatsAggregator:
+    """Incremental call statistics rolled up into minute, hour and day buckets.
+
+    Every event updates one bucket per resolution, so daily stats, peak hour and
+    answer rate are computed from at most 24 hourly buckets instead of scanning
+    call history. Hour and day boundaries follow the configured timezone, and, when
+    a ``persist_path`` is given, the buckets are periodically saved to disk from a
+    background thread so they survive restarts.
+    """
+
+    POSITIVE_END_REASONS = ("completed", "test_completed")
+
+    def __init__(
+        self,
+        timezone: Optional[tzinfo] = None,
+        persist_path: Optional[str] = None,
+        persist_interval: float = 10.0,
+        max_minute_buckets: int = 180,
+        max_hour_buckets: int = 24 * 14,
+        max_day_buckets: int = 400,
+    ):
+        """Initialize the aggregator and load any previously persisted buckets."""
+        self.timezone = timezone or datetime.now().astimezone().tzinfo
+        self.persist_path = persist_path
+        self.persist_interval = persist_interval
+        self.max_buckets = {"minute": max_minute_buckets, "hour": max_hour_buckets, "day": max_day_buckets}
+        self.buckets: Dict[str, Dict[Any, StatsBucket]] = {"minute": {}, "hour": {}, "day": {}}
+        self.lock = threading.Lock()
+        self._write_lock = threading.Lock()  # One save at a time
+        self._last_persist = 0.0
+        self._dirty = False
+
+        if self.persist_path:
+            self.load()
+
+    @classmethod
+    def from_env(cls) -> "CallStatsAggregator":
+        """Create an aggregator configured from CALL_STATS_TIMEZONE and CALL_STATS_PATH (unset: not persisted)."""
+        timezone = None
+        timezone_name = os.getenv("CALL_STATS_TIMEZONE")
+        if timezone_name:
+            try:
+                from zoneinfo import ZoneInfo
+
+                timezone = ZoneInfo(timezone_name)
+            except Exception as e:
+                logger.warning(f"⚠️ Unknown CALL_STATS_TIMEZONE {timezone_name!r}, using local time: {e}")
+
+        return cls(timezone=timezone, persist_path=os.getenv("CALL_STATS_PATH") or None)
+
+    def _bucket_keys(self, timestamp: float) -> Tuple[int, str, str]:
+        """Get the minute, hour and day bucket keys for a timestamp."""
+        local_time = datetime.fromtimestamp(timestamp, self.timezone)
+        return int(timestamp // 60), local_time.strftime("%Y-%m-%dT%H"), local_time.strftime("%Y-%m-%d")
+
+    def _buckets_for(self, timestamp: float) -> List[StatsBucket]:
+        """Get (creating as needed) the minute, hour and day buckets for a timestamp."""
+        result = []
+        for resolution, key in zip(("minute", "hour", "day"), self._bucket_keys(timestamp)):
+            buckets = self.buckets[resolution]
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = StatsBucket()
+                # Buckets are created in time order, so the oldest is always first
+                while len(buckets) > self.max_buckets[resolution]:
+                    del buckets[next(iter(buckets))]
+            result.append(bucket)
+        self._dirty = True
+        return result
+
+    def record_call_started(self, timestamp: Optional[float] = None):
+        """Record a new incoming or outgoing call."""
+        with self.lock:
+            for bucket in self._buckets_for(timestamp or time.time()):
+                bucket.calls += 1
+
+    def record_call_answered(self, timestamp: Optional[float] = None):
+        """Record that a call was answered (caller consented and reached the agent)."""
+        with self.lock:
+            for bucket in self._buckets_for(timestamp or time.time()):
+                bucket.answered += 1
+
+    def record_call_ended(
+        self, duration: float, reason: str, language: str, answered: bool, timestamp: Optional[float] = None
+    ):
+        """Record the outcome of a finished call."""
+        positive = answered and reason in self.POSITIVE_END_REASONS
+        with self.lock:
+            for bucket in self._buckets_for(timestamp or time.time()):
+                bucket.duration_total += duration
+                bucket.duration_count += 1
+                bucket.end_reasons[reason] += 1
+                bucket.languages[language] += 1
+                if positive:
+                    bucket.positive += 1
+
+        self.maybe_persist()
+
+    def record_latency(self, latency_ms: float, timestamp: Optional[float] = None):
+        """Record a roundtrip latency sample."""
+        with self.lock:
+            for bucket in self._buckets_for(timestamp or time.time()):
+                bucket.latency.add(latency_ms)
+
+    def get_calls_today(self) -> int:
+        """Get the number of calls started today in the configured timezone."""
+        with self.lock:
+            bucket = self.buckets["day"].get(self._bucket_keys(time.time())[2])
+            return bucket.calls if bucket else 0
+
+    def get_daily_stats(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """Get call statistics for a day (YYYY-MM-DD, defaults to today)."""
+        now = time.time()
+        day = day or self._bucket_keys(now)[2]
+
+        with self.lock:
+            bucket = self.buckets["day"].get(day) or StatsBucket()
+            hourly = {key: b.calls for key, b in self.buckets["hour"].items() if key.startswith(day)}
+
+            peak_hour = None
+            if hourly:
+                peak_key = max(hourly, key=hourly.get)
+                hour = int(peak_key[-2:])
+                peak_hour = f"{hour:02d}:00-{(hour + 1) % 24:02d}:00"
+
+            avg_duration = bucket.duration_total / bucket.duration_count if bucket.duration_count else 0
+            return {
+                "date": day,
+                "timezone": str(self.timezone),
+                "total_calls": bucket.calls,
+                "answered_calls": bucket.answered,
+                "positive_calls": bucket.positive,
+                "missed_calls": max(bucket.calls - bucket.answered, 0),
+                "avg_call_duration": f"{int(avg_duration // 60)}:{int(avg_duration % 60):02d}",
+                "success_rate": round(bucket.positive / bucket.answered * 100, 1) if bucket.answered else 0.0,
+                "answer_rate": round(bucket.answered / bucket.calls * 100, 1) if bucket.calls else 0.0,
+                "peak_hour": peak_hour,
+                "calls_by_hour": {key[-2:]: calls for key, calls in hourly.items()},
+                "end_reasons": dict(bucket.end_reasons),
+                "languages": dict(bucket.languages),
+                "avg_latency": round(bucket.latency.total / bucket.latency.count, 2) if bucket.latency.count else 0,
+                "p95_latency": round(bucket.latency.quantile(0.95), 2),
+                "last_updated": datetime.fromtimestamp(now, self.timezone).isoformat(),
+            }
+
+    def get_recent_minutes(self, minutes: int = 60) -> List[Dict[str, Any]]:
+        """Get per-minute call and latency counts for the last N minutes."""
+        current_minute = int(time.time() // 60)
+        with self.lock:
+            return [
+                {
+                    "minute": datetime.fromtimestamp(key * 60, self.timezone).isoformat(),
+                    "calls": bucket.calls,
+                    "answered": bucket.answered,
+                    "p95_latency": round(bucket.latency.quantile(0.95), 2),
+                }
+                for key, bucket in self.buckets["minute"].items()
+                if key > current_minute - minutes
+            ]
+
+    def maybe_persist(self):
+        """Persist buckets on a background thread if the persist interval has elapsed since the last save.
+
+        Callers may hold locks and run on the event loop, so the file write never happens here.
+        """
+        if not self.persist_path or time.time() - self._last_persist < self.persist_interval:
+            return
+        self._last_persist = time.time()
+        threading.Thread(target=self.persist, name="call-stats-persist", daemon=True).start()
+
+    def persist(self):
+        """Write all buckets to disk atomically (blocking; see maybe_persist)."""
+        if not self.persist_path:
+            return
+
+        with self._write_lock:  # Also waits for a background save in progress
+            with self.lock:
+                if not self._dirty:
+                    return
+                data = {
+                    resolution: {str(key): bucket.to_dict() for key, bucket in buckets.items()}
+                    for resolution, buckets in self.buckets.items()
+                }
+                self._dirty = False
+                self._last_persist = time.time()
+
+            try:
+                tmp_path = f"{self.persist_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.persist_path)
+            except OSError as e:
+                logger.error(f"❌ Failed to persist call statistics: {e}")
+
+    def load(self):
+        """Load buckets previously written by persist."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+
+        try:
+            with open(self.persist_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Failed to load call statistics from {self.persist_path}: {e}")
+            return
+
+        with self.lock:
+            for resolution in self.buckets:
+                buckets = {
+                    (int(key) if resolution == "minute" else key): StatsBucket.from_dict(bucket)
+                    for key, bucket in data.get(resolution, {}).items()
+                }
+                # Keep buckets in time order so pruning drops the oldest first
+                self.buckets[resolution] = dict(sorted(buckets.items()))
+        logger.info(f"📊 Loaded call statistics from {self.persist_path}")
+
+
+class EventBroadcaster:
+    """Fans out Server-Sent Events from a single producer to many subscribers.
+
+    Each event is serialized once and the same bytes are queued for every
+    subscriber. Subscribers whose bounded queue fills up are dropped instead of
+    slowing down the producer; their EventSource reconnects and gets a fresh
+    snapshot.
+    """
+
+    def __init__(self, max_queue_size: int = 256, max_subscribers: int = 100, tick_interval: float = 1.0):
+        """Initialize the broadcaster with no subscribers."""
+        self.max_queue_size = max_queue_size
+        self.max_subscribers = max_subscribers
+        self.tick_interval = tick_interval
+        self.subscribers: List[queue.Queue] = []
+        self.tickers: List[Callable[[], List[Tuple[str, Dict[str, Any]]]]] = []
+        self.lock = threading.Lock()
+        self.event_id = 0
+        self.dropped_subscribers = 0
+        self._ticker_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def encode(event_type: str, data: Dict[str, Any], event_id: Optional[int] = None) -> bytes:
+        """Encode an event in the text/event-stream wire format."""
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        event_id_line = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{event_id_line}event: {event_type}\ndata: {payload}\n\n".encode("utf-8")
+
+    def add_ticker(self, ticker: Callable[[], List[Tuple[str, Dict[str, Any]]]]):
+        """Register a callback polled every tick_interval for periodic aggregate events."""
+        self.tickers.append(ticker)
+
+    def subscribe(self) -> Optional[queue.Queue]:
+        """Register a new subscriber, or return None if the subscriber limit is reached."""
+        with self.lock:
+            if len(self.subscribers) >= self.max_subscribers:
+                return None
+
+            subscriber = queue.Queue(maxsize=self.max_queue_size)
+            self.subscribers.append(subscriber)
+
+            # Periodic aggregates are only produced while someone is listening
+            if self._ticker_thread is None or not self._ticker_thread.is_alive():
+                self._ticker_thread = threading.Thread(target=self._run_tickers, name="sse-ticker", daemon=True)
+                self._ticker_thread.start()
+
+        logger.info(f"📡 Event subscriber connected ({len(self.subscribers)} total)")
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        """Remove a subscriber."""
+        with self.lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """Publish an event to all subscribers without blocking."""
+        with self.lock:
+            if not self.subscribers:
+                return
+
+            self.event_id += 1
+            message = self.encode(event_type, data, self.event_id)
+
+            for subscriber in list(self.subscribers):
+                try:
+                    subscriber.put_nowait(message)
+                except queue.Full:
+                    self._drop(subscriber)
+
+    def _drop(self, subscriber: queue.Queue):
+        """Drop a slow subscriber, leaving it only an end-of-stream marker."""
+        self.subscribers.remove(subscriber)
+        self.dropped_subscribers += 1
+        try:
+            while True:
+                subscriber.get_nowait()
+        except queue.Empty:
+            pass
+        subscriber.put_nowait(None)
+        logger.warning("⚠️ Dropped slow event subscriber")
+
+    def _run_tickers(self):
+        """Publish periodic aggregate events while there are subscribers."""
+        while True:
+            time.sleep(self.tick_interval)
+            with self.lock:
+                if not self.subscribers:
+                    self._ticker_thread = None
+                    return
+
+            for ticker in self.tickers:
+                try:
+                    for event_type, data in ticker():
+                        self.publish(event_type, data)
+                except Exception as e:
+                    logger.error(f"❌ Event ticker error: {e}")
+
+    def stream(self, subscriber: queue.Queue, snapshot: Dict[str, Any], heartbeat: float = 15.0) -> Iterator[bytes]:
+        """Yield the event stream for one subscriber, starting with a full snapshot."""
+        try:
+            yield b"retry: 2000\n\n"
+            yield self.encode("snapshot", snapshot)
+
+            while True:
+                try:
+                    message = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield b": keepalive\n\n"
+                    continue
+
+                if message is None:
+                    yield self.encode("dropped", {"reason": "slow_consumer"})
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+
 class RealCallManager:
     """Manages real-time call tracking and performance metrics."""
 
-    def __init__(self):
+    # Fields returned by /api/calls/active when no field selection is given
+    SNAPSHOT_DEFAULT_FIELDS = (
+        "call_sid",
+        "phone_number",
+        "direction",
+        "start_time",
+        "status",
+        "language",
+        "answered",
+        "language_switches",
+        "interruptions",
+        "utterances",
+        "version",
+    )
+
+    def __init__(
+        self,
+        stats: Optional[CallStatsAggregator] = None,
+        events: Optional[EventBroadcaster] = None,
+        max_removed_calls: int = 10000,
+    ):
         """Initialize the RealCallManager with empty call tracking."""
         self.active_calls = {}  # Track active calls by call_sid
         self.call_history = []  # Store completed call data
         self.lock = threading.Lock()
-        self.total_calls_today = 0
-        self.reset_daily_stats()
-
-    def reset_daily_stats(self):
-        """Reset daily statistics at midnight."""
-        today = datetime.now().date()
-        if not hasattr(self, "_last_reset_date") or self._last_reset_date != today:
-            self._last_reset_date = today
-            self.total_calls_today = 0
-            logger.info("📊 Daily call statistics reset")
-
-    def start_call(self, call_sid: str, phone_number: str, direction: str = "inbound"):
-        """Start tracking a new call."""
-        with self.lock:
-            self.reset_daily_stats()
 
+        # Change tracking for /api/calls/active: every mutation bumps a global version
+        self.version = 0
+        self._next_seq = 0
+        self._seqs: List[int] = []  # Sorted start sequence numbers of active calls (pagination cursor)
+        self._seq_to_call: Dict[int, str] = {}
+        self._changed: "OrderedDict[str, int]" = OrderedDict()  # call_sid -> version, oldest change first
+        self._removed: deque = deque()  # (version, call_sid) of ended calls
+        self._max_removed_calls = max_removed_calls
+        self._removed_floor = 0  # Oldest version whose removals are still known
+        self._snapshots: Dict[str, MappingProxyType] = {}
+
+        self.stats = stats or CallStatsAggregator.from_env()  # Time-bucketed daily statistics
+        self.events = events or EventBroadcaster()  # Live dashboard events (/events)
+        self.events.add_ticker(self._tick_events)
+
+        # Latency samples since the last tick, published as one aggregate per second
+        self._window_count = 0
+        self._window_total = 0.0
+        self._window_max = 0.0
+        self._stats_changed = False
+
+        # Read without the lock: a scrape must never wait behind the recording path
+        metrics_registry.gauge("voice_agent_active_calls", "Calls in progress", callback=lambda: len(self.active_calls))
+        metrics_registry.gauge(
+            "voice_agent_event_subscribers",
+            "Connected /events subscribers",
+            callback=lambda: len(self.events.subscribers),
+        )
+
+    @property
+    def total_calls_today(self) -> int:
+        """Get the number of calls started today."""
+        return self.stats.get_calls_today()
+
+    def start_call(self, call_sid: str, phone_number: str, direction: str = "inbound", tenant: Optional[str] = None):
+        """Start tracking a new call; ``tenant`` is the number that was dialed."""
+        with self.lock:
             call_data = {
                 "call_sid": call_sid,
                 "phone_number": phone_number,
                 "direction": direction,
+                "tenant": tenant,
                 "start_time": datetime.now(),
                 "status": "active",
                 "language": "es-LA",  # Default language
@@ -276,28 +1306,71 @@ class RealCallManager:
                 "language_switches": 0,
                 "interruptions": 0,
                 "utterances": 0,
+                "answered": False,
+                "seq": self._next_seq,
             }
 
             self.active_calls[call_sid] = call_data
-            self.total_calls_today += 1
+            self._seqs.append(self._next_seq)
+            self._seq_to_call[self._next_seq] = call_sid
+            self._next_seq += 1
+            self._touch(call_sid)
+            self.stats.record_call_started()
+            self._stats_changed = True
+            active_calls = len(self.active_calls)
 
             logger.info(f"📞 Call started: {call_sid} from {phone_number}")
-            logger.info(f"📊 Active calls: {len(self.active_calls)}")
+            logger.info(f"📊 Active calls: {active_calls}")
+
+        self.events.publish(
+            "call_started",
+            {"call_sid": call_sid, "direction": direction, "language": "es-LA", "active_calls": active_calls},
+        )
 
     def end_call(self, call_sid: str, reason: str = "completed"):
         """End tracking a call and move to history."""
         with self.lock:
-            if call_sid in self.active_calls:
-                call_data = self.active_calls.pop(call_sid)
-                call_data["end_time"] = datetime.now()
-                call_data["duration"] = (call_data["end_time"] - call_data["start_time"]).total_seconds()
-                call_data["end_reason"] = reason
-                call_data["status"] = "completed"
+            if call_sid not in self.active_calls:
+                return
+
+            call_data = self.active_calls.pop(call_sid)
+            self._forget(call_sid, call_data["seq"])
+            call_data["end_time"] = datetime.now()
+            call_data["duration"] = (call_data["end_time"] - call_data["start_time"]).total_seconds()
+            call_data["end_reason"] = reason
+            call_data["status"] = "completed"
+
+            self.call_history.append(call_data)
+            self.stats.record_call_ended(call_data["duration"], reason, call_data["language"], call_data["answered"])
+            self._stats_changed = True
+            active_calls = len(self.active_calls)
+
+            logger.info(f"📞 Call ended: {call_sid} - Duration: {call_data['duration']:.1f}s")
+            logger.info(f"📊 Active calls: {active_calls}")
+
+        self.events.publish(
+            "call_ended",
+            {
+                "call_sid": call_sid,
+                "reason": reason,
+                "duration": round(call_data["duration"], 1),
+                "active_calls": active_calls,
+            },
+        )
+
+    def mark_answered(self, call_sid: str):
+        """Mark a call as answered once the caller reaches the agent."""
+        with self.lock:
+            call_data = self.active_calls.get(call_sid)
+            if not call_data or call_data["answered"]:
+                return
 
-                self.call_history.append(call_data)
+            call_data["answered"] = True
+            self._touch(call_sid)
+            self.stats.record_call_answered()
+            self._stats_changed = True
 
-                logger.info(f"📞 Call ended: {call_sid} - Duration: {call_data['duration']:.1f}s")
-                logger.info(f"📊 Active calls: {len(self.active_calls)}")
+        self.events.publish("call_answered", {"call_sid": call_sid})
 
     def update_call_language(self, call_sid: str, language: str):
         """Update the language for a specific call."""
@@ -307,6 +1380,7 @@ class RealCallManager:
                 if old_language != language:
                     self.active_calls[call_sid]["language"] = language
                     self.active_calls[call_sid]["language_switches"] += 1
+                    self._touch(call_sid)
                     logger.info(f"🔄 Call {call_sid}: Language changed from {old_language} to {language}")
 
     def record_performance_metric(self, call_sid: str, metric_type: str, latency_ms: float):
@@ -317,6 +1391,10 @@ class RealCallManager:
                     self.active_calls[call_sid][f"{metric_type}_latency"].append(latency_ms)
                 elif metric_type == "total":
                     self.active_calls[call_sid]["total_latency"].append(latency_ms)
+                    self.stats.record_latency(latency_ms)
+                    self._window_count += 1
+                    self._window_total += latency_ms
+                    self._window_max = max(self._window_max, latency_ms)
 
                 # Keep only last 100 measurements to prevent memory bloat
                 if len(self.active_calls[call_sid][f"{metric_type}_latency"]) > 100:
@@ -324,11 +1402,14 @@ class RealCallManager:
                         f"{metric_type}_latency"
                     ][-100:]
 
+                self._touch(call_sid)
+
     def record_interruption(self, call_sid: str):
         """Record a user interruption during the call."""
         with self.lock:
             if call_sid in self.active_calls:
                 self.active_calls[call_sid]["interruptions"] += 1
+                self._touch(call_sid)
                 logger.info(f"🔄 Call {call_sid}: User interruption recorded")
 
     def record_utterance(self, call_sid: str):
@@ -336,6 +1417,7 @@ class RealCallManager:
         with self.lock:
             if call_sid in self.active_calls:
                 self.active_calls[call_sid]["utterances"] += 1
+                self._touch(call_sid)
 
     def get_active_call_count(self) -> int:
         """Get the number of currently active calls."""
@@ -390,141 +1472,3779 @@ class RealCallManager:
                 "total_language_switches": sum(call.get("language_switches", 0) for call in self.active_calls.values()),
             }
 
-    def get_call_info(self, call_sid: str) -> Optional[Dict[str, Any]]:
-        """Get information about a specific call."""
-        with self.lock:
-            return self.active_calls.get(call_sid)
+    def _tick_events(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Build the per-second aggregate events for /events subscribers."""
+        with self.lock:
+            count, total, peak = self._window_count, self._window_total, self._window_max
+            self._window_count, self._window_total, self._window_max = 0, 0.0, 0.0
+            stats_changed, self._stats_changed = self._stats_changed, False
+            active_calls = len(self.active_calls)
+
+        events = []
+        if count:
+            events.append(
+                (
+                    "latency",
+                    {"n": count, "avg": round(total / count, 2), "max": round(peak, 2), "active_calls": active_calls},
+                )
+            )
+        if stats_changed:
+            events.append(("call_stats", self.stats.get_daily_stats()))
+        return events
+
+    def _touch(self, call_sid: str):
+        """Bump the version of a changed call (caller holds the lock)."""
+        self.version += 1
+        self.active_calls[call_sid]["version"] = self.version
+        self._changed[call_sid] = self.version
+        self._changed.move_to_end(call_sid)
+
+    def _forget(self, call_sid: str, seq: int):
+        """Drop change tracking for an ended call and record its removal (caller holds the lock)."""
+        self.version += 1
+        self._changed.pop(call_sid, None)
+        self._snapshots.pop(call_sid, None)
+        del self._seqs[bisect.bisect_left(self._seqs, seq)]
+        del self._seq_to_call[seq]
+
+        self._removed.append((self.version, call_sid))
+        if len(self._removed) > self._max_removed_calls:
+            self._removed_floor = self._removed.popleft()[0]
+
+    def _snapshot(self, call_sid: str) -> MappingProxyType:
+        """Get an immutable snapshot of an active call, rebuilt only when it changed (caller holds the lock)."""
+        call_data = self.active_calls[call_sid]
+        snapshot = self._snapshots.get(call_sid)
+        if snapshot is None or snapshot["version"] != call_data["version"]:
+            frozen = {key: tuple(value) if isinstance(value, list) else value for key, value in call_data.items()}
+            frozen["start_time"] = call_data["start_time"].isoformat()
+            del frozen["seq"]
+            snapshot = self._snapshots[call_sid] = MappingProxyType(frozen)
+        return snapshot
+
+    def get_active_calls_page(
+        self,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+        since: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Get a page of active call snapshots.
+
+        Without ``since`` calls are listed in start order and ``next_cursor`` pages
+        through them. With ``since`` only calls changed after that version are
+        returned (oldest change first), along with the sids of calls that ended.
+        """
+        fields = fields or list(self.SNAPSHOT_DEFAULT_FIELDS)
+
+        with self.lock:
+            removed: List[str] = []
+            next_cursor = None
+            # Removals older than the retained window are unknown, and a version ahead of ours is from
+            # before a restart, so in both cases the client must resync
+            reset = since is not None and (since < self._removed_floor or since > self.version)
+
+            if since is not None and not reset:
+                changed = []
+                for call_sid, version in reversed(self._changed.items()):
+                    if version <= since:
+                        break
+                    changed.append(call_sid)
+                changed.reverse()
+
+                call_sids = changed[:limit]
+                has_more = len(changed) > limit
+                if has_more:
+                    # Resume from the last change returned on the next poll
+                    version = self._changed[call_sids[-1]]
+                else:
+                    version = self.version
+                    for removed_version, call_sid in reversed(self._removed):
+                        if removed_version <= since:
+                            break
+                        removed.append(call_sid)
+            else:
+                start = bisect.bisect_right(self._seqs, cursor) if cursor is not None else 0
+                page = self._seqs[start : start + limit]
+                call_sids = [self._seq_to_call[seq] for seq in page]
+                has_more = start + limit < len(self._seqs)
+                if has_more:
+                    next_cursor = page[-1]
+                version = self.version
+
+            calls = []
+            for call_sid in call_sids:
+                snapshot = self._snapshot(call_sid)
+                calls.append({field: snapshot[field] for field in fields if field in snapshot})
+
+            return {
+                "version": version,
+                "calls": calls,
+                "removed": removed,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "reset": reset,
+                "total_active": len(self.active_calls),
+            }
+
+    def get_call_info(self, call_sid: str) -> Optional[MappingProxyType]:
+        """Get an immutable snapshot of a specific active call."""
+        with self.lock:
+            if call_sid not in self.active_calls:
+                return None
+            return self._snapshot(call_sid)
+
+    def get_recent_calls(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get recent call history."""
+        with self.lock:
+            return sorted(self.call_history, key=lambda x: x["start_time"], reverse=True)[:limit]
+
+
+class PerformanceMonitor:
+    """Real-time performance monitoring for production calls."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """Initialize the PerformanceMonitor with empty metrics tracking."""
+        self.call_metrics: Dict[str, Dict[str, Any]] = {}
+        self.registry = registry or metrics_registry
+        self.stage_latency = self.registry.histogram(
+            "voice_agent_stage_latency_seconds", "Latency of each pipeline stage per turn", ("stage",)
+        )
+        self.calls_counter = self.registry.counter("voice_agent_calls", "Calls monitored since start")
+        self.interruptions_counter = self.registry.counter("voice_agent_interruptions", "User interruptions")
+        self.slang_counter = self.registry.counter("voice_agent_slang_detections", "Mexican Spanish slang detections")
+        self.low_quality_counter = self.registry.counter(
+            "voice_agent_low_quality_handling", "Low audio quality events handled", ("issue",)
+        )
+        self.language_switch_counter = self.registry.counter(
+            "voice_agent_language_switches", "Language switches", ("from_language", "to_language")
+        )
+        self.latency_target_counter = self.registry.counter(
+            "voice_agent_latency_target", "Turns that met or missed the 500ms roundtrip target", ("result",)
+        )
+        self.global_metrics = {
+            "total_calls": 0,
+            "total_interruptions": 0,
+            "total_slang_detections": 0,
+            "total_low_quality_handling": 0,
+            "total_language_switches": 0,
+            "latency_target_met": 0,
+            "latency_target_missed": 0,
+        }
+
+    def start_call_monitoring(self, call_sid: str):
+        """Start monitoring a new call."""
+        self.call_metrics[call_sid] = {
+            "start_time": time.time(),
+            "stt_latencies": [],
+            "llm_latencies": [],
+            "tts_latencies": [],
+            "roundtrip_latencies": [],
+            "interruptions": 0,
+            "slang_detections": 0,
+            "low_quality_handling": 0,
+            "language_switches": 0,
+            "edge_cases_handled": [],
+        }
+        self.global_metrics["total_calls"] += 1
+        self.calls_counter.inc()
+
+    def record_stt_latency(self, call_sid: str, latency: float):
+        """Record STT latency for a call."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["stt_latencies"].append(latency)
+            self.stage_latency.observe(latency, stage="stt")
+
+    def record_llm_latency(self, call_sid: str, latency: float):
+        """Record LLM latency for a call."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["llm_latencies"].append(latency)
+            self.stage_latency.observe(latency, stage="llm")
+
+    def record_tts_latency(self, call_sid: str, latency: float):
+        """Record TTS latency for a call."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["tts_latencies"].append(latency)
+            self.stage_latency.observe(latency, stage="tts")
+
+    def record_first_audio_latency(self, call_sid: str, latency: float):
+        """Record time from the user finishing speaking to the first synthesized audio."""
+        if call_sid in self.call_metrics:
+            self.stage_latency.observe(latency, stage="first_audio")
+
+    def record_roundtrip_latency(self, call_sid: str, latency: float):
+        """Record complete roundtrip latency for a call."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["roundtrip_latencies"].append(latency)
+            self.stage_latency.observe(latency, stage="roundtrip")
+
+            # Check if latency target was met
+            if latency < 0.5:  # 500ms
+                self.global_metrics["latency_target_met"] += 1
+                self.latency_target_counter.inc(result="met")
+            else:
+                self.global_metrics["latency_target_missed"] += 1
+                self.latency_target_counter.inc(result="missed")
+
+    def record_interruption(self, call_sid: str):
+        """Record user interruption for a call."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["interruptions"] += 1
+            self.global_metrics["total_interruptions"] += 1
+            self.interruptions_counter.inc()
+
+    def record_slang_detection(self, call_sid: str, slang_phrase: str):
+        """Record Mexican Spanish slang detection."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["slang_detections"] += 1
+            self.call_metrics[call_sid]["edge_cases_handled"].append(f"slang: {slang_phrase}")
+            self.global_metrics["total_slang_detections"] += 1
+            self.slang_counter.inc()
+
+    def record_low_quality_handling(self, call_sid: str, issue_type: str):
+        """Record low audio quality handling."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["low_quality_handling"] += 1
+            self.call_metrics[call_sid]["edge_cases_handled"].append(f"audio_quality: {issue_type}")
+            self.global_metrics["total_low_quality_handling"] += 1
+            self.low_quality_counter.inc(issue=issue_type)
+
+    def record_language_switch(self, call_sid: str, from_lang: str, to_lang: str):
+        """Record language switch for a call."""
+        if call_sid in self.call_metrics:
+            self.call_metrics[call_sid]["language_switches"] += 1
+            self.call_metrics[call_sid]["edge_cases_handled"].append(f"language_switch: {from_lang} -> {to_lang}")
+            self.global_metrics["total_language_switches"] += 1
+            self.language_switch_counter.inc(from_language=from_lang, to_language=to_lang)
+
+    def get_call_summary(self, call_sid: str) -> Dict[str, Any]:
+        """Get performance summary for a specific call."""
+        if call_sid not in self.call_metrics:
+            return {}
+
+        metrics = self.call_metrics[call_sid]
+
+        return {
+            "call_duration": time.time() - metrics["start_time"],
+            "total_interactions": len(metrics["roundtrip_latencies"]),
+            "avg_roundtrip_latency": statistics.mean(metrics["roundtrip_latencies"])
+            if metrics["roundtrip_latencies"]
+            else 0,
+            "min_roundtrip_latency": min(metrics["roundtrip_latencies"]) if metrics["roundtrip_latencies"] else 0,
+            "max_roundtrip_latency": max(metrics["roundtrip_latencies"]) if metrics["roundtrip_latencies"] else 0,
+            "interruptions": metrics["interruptions"],
+            "slang_detections": metrics["slang_detections"],
+            "low_quality_handling": metrics["low_quality_handling"],
+            "language_switches": metrics["language_switches"],
+            "edge_cases": metrics["edge_cases_handled"],
+        }
+
+    def get_global_summary(self) -> Dict[str, Any]:
+        """Get global performance summary."""
+        total_calls = self.global_metrics["total_calls"]
+        if total_calls == 0:
+            return self.global_metrics
+
+        # Calculate success rates
+        latency_success_rate = (self.global_metrics["latency_target_met"] / total_calls) * 100
+
+        return {
+            **self.global_metrics,
+            "latency_success_rate": f"{latency_success_rate:.1f}%",
+            "avg_interruptions_per_call": self.global_metrics["total_interruptions"] / total_calls,
+            "avg_slang_detections_per_call": self.global_metrics["total_slang_detections"] / total_calls,
+            "avg_low_quality_handling_per_call": self.global_metrics["total_low_quality_handling"] / total_calls,
+            "avg_language_switches_per_call": self.global_metrics["total_language_switches"] / total_calls,
+        }
+
+
+class TurnTrace:
+    """Spans for one conversational turn, timed with time.monotonic_ns().
+
+    Spans are stored as plain lists ``[name, start_ns, end_ns, attributes]`` so
+    that opening and closing one costs a clock read and an append.
+    """
+
+    __slots__ = ("call_sid", "turn", "trace_id", "start_ns", "end_ns", "spans", "events")
+
+    def __init__(self, call_sid: str, turn: int, start_ns: Optional[int] = None):
+        """Start a turn trace; start_ns lets the turn begin at an earlier frame."""
+        self.call_sid = call_sid
+        self.turn = turn
+        self.trace_id = os.urandom(16).hex()
+        self.start_ns = start_ns if start_ns is not None else time.monotonic_ns()
+        self.end_ns: Optional[int] = None
+        self.spans: List[list] = []
+        self.events: List[Tuple[str, int]] = []
+
+    def start(self, name: str, start_ns: Optional[int] = None) -> list:
+        """Open a span and return it for end()."""
+        span = [name, start_ns if start_ns is not None else time.monotonic_ns(), None, None]
+        self.spans.append(span)
+        return span
+
+    def end(self, span: list, **attributes: Any) -> int:
+        """Close a span and return its duration in nanoseconds."""
+        span[2] = time.monotonic_ns()
+        if attributes:
+            span[3] = attributes
+        return span[2] - span[1]
+
+    def event(self, name: str):
+        """Record a point in time within the turn (first token, first byte, ...)."""
+        self.events.append((name, time.monotonic_ns()))
+
+    def span_ms(self, name: str) -> Optional[float]:
+        """Get the duration of the first closed span with this name in milliseconds."""
+        for span_name, start_ns, end_ns, _ in self.spans:
+            if span_name == name and end_ns is not None:
+                return (end_ns - start_ns) / 1e6
+        return None
+
+    def event_ms(self, name: str) -> Optional[float]:
+        """Get the offset of an event from the start of the turn in milliseconds."""
+        for event_name, at_ns in self.events:
+            if event_name == name:
+                return (at_ns - self.start_ns) / 1e6
+        return None
+
+    def duration_ms(self) -> Optional[float]:
+        """Get the turn duration in milliseconds, or None while it is open."""
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-friendly view with times relative to the start of the turn."""
+        return {
+            "call_sid": self.call_sid,
+            "turn": self.turn,
+            "trace_id": self.trace_id,
+            "duration_ms": self.duration_ms(),
+            "spans": [
+                {
+                    "name": name,
+                    "start_ms": (start_ns - self.start_ns) / 1e6,
+                    "duration_ms": (end_ns - start_ns) / 1e6 if end_ns is not None else None,
+                    "attributes": attributes or {},
+                }
+                for name, start_ns, end_ns, attributes in self.spans
+            ],
+            "events": {name: (at_ns - self.start_ns) / 1e6 for name, at_ns in self.events},
+        }
+
+    def to_otel(self, epoch_offset_ns: int) -> Dict[str, Any]:
+        """Get the turn as OpenTelemetry OTLP/JSON resourceSpans."""
+
+        def attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return [{"key": key, "value": {"stringValue": str(value)}} for key, value in values.items()]
+
+        root_id = os.urandom(8).hex()
+        end_ns = self.end_ns if self.end_ns is not None else time.monotonic_ns()
+        spans = [
+            {
+                "traceId": self.trace_id,
+                "spanId": root_id,
+                "name": "turn",
+                "kind": 1,
+                "startTimeUnixNano": str(self.start_ns + epoch_offset_ns),
+                "endTimeUnixNano": str(end_ns + epoch_offset_ns),
+                "attributes": attributes({"call.sid": self.call_sid, "turn.index": self.turn}),
+                "events": [{"name": name, "timeUnixNano": str(at_ns + epoch_offset_ns)} for name, at_ns in self.events],
+            }
+        ]
+        for name, start_ns, span_end_ns, span_attributes in self.spans:
+            spans.append(
+                {
+                    "traceId": self.trace_id,
+                    "spanId": os.urandom(8).hex(),
+                    "parentSpanId": root_id,
+                    "name": name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(start_ns + epoch_offset_ns),
+                    "endTimeUnixNano": str((span_end_ns or end_ns) + epoch_offset_ns),
+                    "attributes": attributes(span_attributes or {}),
+                }
+            )
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": attributes({"service.name": "twilio-voice-agent"})},
+                    "scopeSpans": [{"scope": {"name": "twilio_voice_agent.flight_recorder"}, "spans": spans}],
+                }
+            ]
+        }
+
+
+class FlightRecorder:
+    """Keeps the last turns of each call in memory and exports slow turns.
+
+    Each call gets a bounded ring buffer of TurnTrace objects. Ended calls are
+    kept until ``max_calls`` is exceeded so a bad call can still be inspected
+    after hang-up. Turns slower than ``slow_turn_ms`` are written to
+    ``export_dir`` as OpenTelemetry JSON when an export directory is set, by a
+    background thread: a slow turn is queued, never written on the event loop,
+    and dropped if ``export_queue_size`` exports are already waiting.
+    """
+
+    def __init__(
+        self,
+        turns_per_call: int = 50,
+        max_calls: int = 1000,
+        slow_turn_ms: float = 1500.0,
+        export_dir: Optional[str] = None,
+        export_queue_size: int = 100,
+    ):
+        """Initialize an empty recorder."""
+        self.turns_per_call = turns_per_call
+        self.max_calls = max_calls
+        self.slow_turn_ms = slow_turn_ms
+        self.export_dir = export_dir
+        self.calls: "OrderedDict[str, deque]" = OrderedDict()
+        self.turn_counts: Dict[str, int] = {}
+        self.exported = 0
+        self.export_dropped = 0
+        self.export_queue: queue.Queue = queue.Queue(maxsize=export_queue_size)
+        self.export_thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.epoch_offset_ns = time.time_ns() - time.monotonic_ns()
+
+    @classmethod
+    def from_env(cls) -> "FlightRecorder":
+        """Create a recorder from TRACE_TURNS_PER_CALL, TRACE_SLOW_TURN_MS and TRACE_EXPORT_DIR."""
+        return cls(
+            turns_per_call=int(os.getenv("TRACE_TURNS_PER_CALL", "50")),
+            slow_turn_ms=float(os.getenv("TRACE_SLOW_TURN_MS", "1500")),
+            export_dir=os.getenv("TRACE_EXPORT_DIR") or None,
+        )
+
+    def start_turn(self, call_sid: str, start_ns: Optional[int] = None) -> TurnTrace:
+        """Start tracing a turn and add it to the call's ring buffer."""
+        with self.lock:
+            turns = self.calls.get(call_sid)
+            if turns is None:
+                turns = self.calls[call_sid] = deque(maxlen=self.turns_per_call)
+                while len(self.calls) > self.max_calls:
+                    evicted, _ = self.calls.popitem(last=False)
+                    self.turn_counts.pop(evicted, None)
+            turn = self.turn_counts.get(call_sid, 0) + 1
+            self.turn_counts[call_sid] = turn
+            trace = TurnTrace(call_sid, turn, start_ns)
+            turns.append(trace)
+            return trace
+
+    def finish_turn(self, trace: TurnTrace) -> bool:
+        """Close a turn; returns True if it was slow enough to export."""
+        if trace.end_ns is not None:
+            return False
+        trace.end_ns = time.monotonic_ns()
+        if trace.duration_ms() < self.slow_turn_ms:
+            return False
+
+        logger.warning(f"🐢 Slow turn {trace.turn} on {trace.call_sid}: {trace.duration_ms():.0f}ms")
+        if self.export_dir:
+            self._queue_export(trace)
+        return True
+
+    def _queue_export(self, trace: TurnTrace):
+        """Hand a slow turn to the export thread, starting it on first use."""
+        with self.lock:
+            if self.export_thread is None:
+                self.export_thread = threading.Thread(target=self._export_forever, name="trace-export", daemon=True)
+                self.export_thread.start()
+        try:
+            self.export_queue.put_nowait(trace)
+        except queue.Full:
+            self.export_dropped += 1
+
+    def _export_forever(self):
+        """Write queued turns (export thread)."""
+        while True:
+            trace = self.export_queue.get()
+            try:
+                self.export(trace)
+            finally:
+                self.export_queue.task_done()
+
+    def flush(self):
+        """Wait until every queued export has been written."""
+        self.export_queue.join()
+
+    def export(self, trace: TurnTrace) -> Optional[str]:
+        """Write a turn as OpenTelemetry JSON and return the file path (blocking; slow turns are queued)."""
+        try:
+            os.makedirs(self.export_dir, exist_ok=True)
+            path = os.path.join(self.export_dir, f"{trace.call_sid}-turn{trace.turn}-{trace.trace_id[:8]}.json")
+            with open(path, "w") as f:
+                json.dump(trace.to_otel(self.epoch_offset_ns), f)
+            self.exported += 1
+            return path
+        except OSError as e:
+            logger.error(f"❌ Failed to export trace for {trace.call_sid}: {e}")
+            return None
+
+    def end_call(self, call_sid: str):
+        """Close any open turn of an ended call and keep its buffer for inspection."""
+        with self.lock:
+            turns = self.calls.get(call_sid)
+            if turns is None:
+                return
+            self.calls.move_to_end(call_sid)
+        if turns and turns[-1].end_ns is None:
+            self.finish_turn(turns[-1])
+
+    def get_turns(self, call_sid: str) -> List[TurnTrace]:
+        """Get the recorded turns of a call, oldest first."""
+        with self.lock:
+            return list(self.calls.get(call_sid, ()))
+
+
+class CallRecorder:
+    """Captures calls as append-only binary logs for deterministic replay.
+
+    Each call is written to ``<directory>/<call_sid>.vcr``: the ``MAGIC``
+    header, then records of a fixed header (kind, nanoseconds since the call's
+    first record, payload length) followed by the payload. Inbound media is
+    stored as raw μ-law and everything else as compact JSON. Records are
+    stamped by the caller and queued; a writer thread appends them through a
+    buffered file, so disk stalls never reach the event loop and a reader can
+    mmap a file while the call is live. Past ``max_pending`` queued records
+    new ones are dropped and counted, and a call whose file cannot be opened
+    is simply not recorded.
+    """
+
+    MAGIC = b"VCREC01\n"
+    HEADER = struct.Struct("<BqI")  # kind, offset_ns, payload length
+    MEDIA_IN, FRAME, LLM, TTS = 1, 2, 3, 4
+    KIND_NAMES = {MEDIA_IN: "media_in", FRAME: "frame", LLM: "llm", TTS: "tts"}
+    ABANDONED = "abandoned at deadline"  # Error recorded for provider requests cancelled by StageDeadlines
+
+    def __init__(self, directory: Optional[str] = None, buffer_size: int = 65536, max_pending: int = 10000):
+        """Initialize the recorder; recording is off when no directory is given."""
+        self.directory = directory
+        self.enabled = bool(directory)
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+        self.starts: Dict[str, int] = {}  # call_sid -> monotonic ns of its first record
+        self.files: Dict[str, Any] = {}  # Writer thread only; None for a call whose file failed to open
+        self.lock = threading.Lock()
+        self.queue: queue.Queue = queue.Queue()  # (call_sid, record bytes, or None to close the file)
+        self.writer: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls) -> "CallRecorder":
+        """Create a recorder from CALL_RECORDING_DIR."""
+        return cls(os.getenv("CALL_RECORDING_DIR") or None)
+
+    def path_for(self, call_sid: str) -> str:
+        """Get the recording path of a call."""
+        safe = "".join(c for c in call_sid if c.isalnum() or c in "-_")
+        return os.path.join(self.directory, f"{safe}.vcr")
+
+    def record(self, call_sid: Optional[str], kind: int, payload: Any):
+        """Append one record; ``payload`` is bytes for media, otherwise JSON-serializable."""
+        if not self.enabled or not call_sid:
+            return
+        if isinstance(payload, (bytes, bytearray)):
+            data = payload
+        else:
+            data = json.dumps(payload, separators=(",", ":")).encode()
+        now_ns = time.monotonic_ns()
+        with self.lock:
+            start_ns = self.starts.setdefault(call_sid, now_ns)
+            if self.writer is None:
+                self.writer = threading.Thread(target=self._write_forever, name="call-recorder", daemon=True)
+                self.writer.start()
+        if self.queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return
+        self.queue.put_nowait((call_sid, self.HEADER.pack(kind, now_ns - start_ns, len(data)) + data))
+
+    def _write_forever(self):
+        """Append queued records to their calls' files, opening and closing them (writer thread)."""
+        while True:
+            call_sid, record = self.queue.get()
+            try:
+                if record is None:
+                    f = self.files.pop(call_sid, None)
+                    if f is not None:
+                        f.close()
+                    continue
+                if call_sid not in self.files:
+                    self.files[call_sid] = self._open(call_sid)
+                f = self.files[call_sid]
+                if f is not None:
+                    f.write(record)
+            except OSError as e:
+                logger.error(f"❌ Failed to write call recording for {call_sid}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def _open(self, call_sid: str) -> Optional[Any]:
+        """Open a call's recording for appending, or None to skip this call (writer thread)."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            f = open(self.path_for(call_sid), "ab", buffering=self.buffer_size)
+            if f.tell() == 0:
+                f.write(self.MAGIC)
+            return f
+        except OSError as e:
+            logger.error(f"❌ Failed to open call recording for {call_sid}, not recording it: {e}")
+            return None
+
+    def end_call(self, call_sid: str):
+        """Have the writer flush and close a call's recording once its queued records are written."""
+        with self.lock:
+            started = self.starts.pop(call_sid, None)
+        if started is not None:
+            self.queue.put_nowait((call_sid, None))
+
+    def flush(self):
+        """Wait until every queued record has been written."""
+        self.queue.join()
+
+    @classmethod
+    def read(cls, path: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (kind, offset_ns, payload) from a recording, stopping at a truncated tail."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= len(cls.MAGIC):
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[: len(cls.MAGIC)] != cls.MAGIC:
+                    raise ValueError(f"{path} is not a call recording")
+                position = len(cls.MAGIC)
+                while position + cls.HEADER.size <= len(data):
+                    kind, offset_ns, length = cls.HEADER.unpack_from(data, position)
+                    position += cls.HEADER.size
+                    if position + length > len(data):
+                        return
+                    payload = data[position : position + length]
+                    position += length
+                    yield kind, offset_ns, payload if kind == cls.MEDIA_IN else json.loads(payload)
+
+
+class ConnectionManager:
+    """Keeps provider connections warm so a call's first turn does not pay for handshakes.
+
+    HTTP providers share one keep-alive ``aiohttp`` session. start() opens
+    ``pool_size`` connections to every registered provider up front (DNS, TCP
+    and TLS), and a maintenance task re-sends a cheap HEAD request every
+    ``ping_interval`` seconds so the connections never sit idle long enough
+    to be closed.
+
+    Streaming providers get a pool of already-open WebSocket sessions. Taking
+    one refills the pool in the background, and the pool is sized from the
+    recent acquire rate times the measured connect time, so a burst of calls
+    still finds open sessions. Idle sessions get the provider's keepalive
+    message every ``ws_keepalive`` seconds.
+    """
+
+    # Cheap endpoints used to open and refresh connections; any response keeps the connection
+    PROVIDER_URLS = {
+        "openai": "https://api.openai.com/v1/models",
+        "elevenlabs": "https://api.elevenlabs.io/v1/models",
+        "deepgram": "https://api.deepgram.com/v1/projects",
+    }
+    RATE_WINDOW = 60.0  # Seconds of acquires used to estimate the arrival rate
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        pool_size: int = 2,
+        ping_interval: float = 15.0,
+        ws_keepalive: float = 5.0,
+        ws_max: int = 20,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the manager; nothing connects until start()."""
+        self.enabled = enabled
+        self.pool_size = pool_size
+        self.ping_interval = ping_interval
+        self.ws_keepalive = ws_keepalive
+        self.ws_max = ws_max
+        self.running = False
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self.http_targets: Dict[str, Dict[str, Any]] = {}
+        self.ws_pools: Dict[str, Dict[str, Any]] = {}
+        self._tasks: set = set()
+
+        registry = registry or metrics_registry
+        self.acquire_counter = registry.counter(
+            "voice_agent_provider_sessions",
+            "Provider sessions taken by calls, warm or opened cold",
+            ("provider", "result"),
+        )
+        registry.gauge(
+            "voice_agent_provider_sessions_ready",
+            "Open provider sessions waiting in the pool",
+            ("provider",),
+            callback=lambda: [({"provider": name}, len(pool["ready"])) for name, pool in self.ws_pools.items()],
+        )
+
+    @classmethod
+    def from_env(cls) -> "ConnectionManager":
+        """Create a manager from PROVIDER_PREWARM and the PROVIDER_* pool settings."""
+        return cls(
+            enabled=os.getenv("PROVIDER_PREWARM", "true").lower() == "true",
+            pool_size=int(os.getenv("PROVIDER_POOL_SIZE", "2")),
+            ping_interval=float(os.getenv("PROVIDER_PING_INTERVAL_S", "15")),
+            ws_keepalive=float(os.getenv("PROVIDER_WS_KEEPALIVE_S", "5")),
+            ws_max=int(os.getenv("PROVIDER_WS_POOL_MAX", "20")),
+        )
+
+    def get_session(self) -> "aiohttp.ClientSession":
+        """Get the shared keep-alive session, creating it on first use (on the running loop)."""
+        import aiohttp
+
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0, ttl_dns_cache=300, keepalive_timeout=max(30.0, self.ping_interval * 4)
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    def register_http(self, name: str, url: str):
+        """Keep ``pool_size`` connections to ``url``'s host open; registering a name again replaces its URL."""
+        self.http_targets[name] = {"url": url, "pings": 0, "failures": 0}
+
+    def register_websocket(
+        self,
+        name: str,
+        connect: Callable[[], Awaitable[Any]],
+        keepalive: Optional[Callable[[Any], Awaitable[None]]] = None,
+        min_size: int = 1,
+    ):
+        """Pool sessions opened by ``connect``; ``keepalive`` defaults to a WebSocket ping."""
+        self.ws_pools[name] = {
+            "connect": connect,
+            "keepalive": keepalive or (lambda ws: ws.ping()),
+            "min": min_size,
+            "ready": deque(),
+            "opening": 0,
+            "acquires": deque(),
+            "connect_s": None,
+            "warm": 0,
+            "cold": 0,
+        }
+        if self.running:
+            self._spawn(self._fill(name))
+
+    async def start(self):
+        """Open the HTTP and WebSocket pools and start keeping them alive."""
+        self.get_session()
+        if not self.enabled or self.running:
+            return
+        self.running = True
+        await asyncio.gather(self._ping_http(), *(self._fill(name) for name in self.ws_pools))
+        self._spawn(self._maintain())
+        logger.info(
+            f"🔥 Provider connections warm: {', '.join([*self.http_targets, *self.ws_pools]) or 'none registered'}"
+        )
+
+    async def close(self):
+        """Stop maintenance and close every pooled session."""
+        self.running = False
+        for task in list(self._tasks):
+            task.cancel()
+        for pool in self.ws_pools.values():
+            while pool["ready"]:
+                await pool["ready"].popleft().close()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def acquire_websocket(self, name: str):
+        """Take an open session from the pool, or open one now when none is ready."""
+        pool = self.ws_pools[name]
+        pool["acquires"].append(time.monotonic())
+        ws = None
+        while pool["ready"] and ws is None:
+            candidate = pool["ready"].popleft()
+            if not candidate.closed:
+                ws = candidate
+        if self.running:
+            self._spawn(self._fill(name))
+        result = "warm" if ws is not None else "cold"
+        pool[result] += 1
+        self.acquire_counter.inc(provider=name, result=result)
+        return ws if ws is not None else await self._open(name)
+
+    def target_size(self, name: str) -> int:
+        """Sessions to keep ready: enough for the calls that arrive while replacements are opening."""
+        pool = self.ws_pools[name]
+        acquires = pool["acquires"]
+        while acquires and time.monotonic() - acquires[0] > self.RATE_WINDOW:
+            acquires.popleft()
+        rate = len(acquires) / self.RATE_WINDOW
+        connect_s = pool["connect_s"] or 1.0
+        # Twice the expected arrivals during one connect covers Poisson bursts
+        return min(self.ws_max, pool["min"] + math.ceil(2 * rate * connect_s))
+
+    async def _open(self, name: str):
+        """Open one session and fold its connect time into the pool's estimate."""
+        pool = self.ws_pools[name]
+        start = time.monotonic()
+        ws = await pool["connect"]()
+        elapsed = time.monotonic() - start
+        pool["connect_s"] = elapsed if pool["connect_s"] is None else 0.8 * pool["connect_s"] + 0.2 * elapsed
+        return ws
+
+    async def _fill(self, name: str):
+        """Open sessions until the pool reaches its target size."""
+        pool = self.ws_pools[name]
+        missing = self.target_size(name) - len(pool["ready"]) - pool["opening"]
+        if missing <= 0:
+            return
+        pool["opening"] += missing
+        try:
+            results = await asyncio.gather(*(self._open(name) for _ in range(missing)), return_exceptions=True)
+        finally:
+            pool["opening"] -= missing
+        for ws in results:
+            if isinstance(ws, BaseException):
+                logger.warning(f"⚠️ Could not pre-open a {name} session: {ws}")
+            elif self.running:
+                pool["ready"].append(ws)
+            else:
+                await ws.close()
+
+    async def _ping_http(self):
+        """Send ``pool_size`` concurrent HEAD requests per provider so that many connections stay open."""
+        import aiohttp
+
+        session = self.get_session()
+        timeout = aiohttp.ClientTimeout(total=10)
+
+        async def ping(target):
+            try:
+                async with session.head(target["url"], allow_redirects=False, timeout=timeout):
+                    target["pings"] += 1
+            except Exception as e:
+                target["failures"] += 1
+                logger.warning(f"⚠️ Provider warm-up request to {target['url']} failed: {e}")
+
+        await asyncio.gather(*(ping(target) for target in self.http_targets.values() for _ in range(self.pool_size)))
+
+    async def _maintain(self):
+        """Send keepalives to idle sessions, resize the pools and refresh HTTP connections."""
+        next_http_ping = time.monotonic() + self.ping_interval
+        while self.running:
+            await asyncio.sleep(self.ws_keepalive)
+            for name, pool in self.ws_pools.items():
+                alive = deque()
+                for ws in pool["ready"]:
+                    try:
+                        if not ws.closed:
+                            await pool["keepalive"](ws)
+                            alive.append(ws)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Dropping a pooled {name} session: {e}")
+                while len(alive) > self.target_size(name):
+                    await alive.popleft().close()
+                pool["ready"] = alive
+                await self._fill(name)
+            if time.monotonic() >= next_http_ping:
+                next_http_ping = time.monotonic() + self.ping_interval
+                await self._ping_http()
+
+    def _spawn(self, coroutine):
+        """Run a background task and keep a reference to it until it finishes."""
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool sizes, warm/cold counts and connect times for /health."""
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "http": {
+                name: {"pings": target["pings"], "failures": target["failures"]}
+                for name, target in self.http_targets.items()
+            },
+            "websockets": {
+                name: {
+                    "ready": len(pool["ready"]),
+                    "opening": pool["opening"],
+                    "target": self.target_size(name),
+                    "warm": pool["warm"],
+                    "cold": pool["cold"],
+                    "connect_ms": round(pool["connect_s"] * 1000, 1) if pool["connect_s"] is not None else None,
+                }
+                for name, pool in self.ws_pools.items()
+            },
+        }
+
+
+class ConcurrencyLimiter:
+    """Adaptive concurrency limit for one provider, with a priority queue in front of it.
+
+    The limit follows AIMD. Each request that finishes under ``slow_s`` adds
+    ``1 / limit``, about one slot per limit's worth of requests. The limit is
+    multiplied by ``backoff`` when the provider pushes back (429 or 503, a
+    timeout) or a request takes ``slow_s`` or longer. It shrinks at most once
+    per round trip: requests that started before the last decrease do not
+    shrink it again. Requests over the limit wait, the first turn of a call
+    ahead of later turns, then in arrival order. Queue wait is exported per
+    provider and priority, so saturation shows there before calls get slow.
+    """
+
+    FIRST_TURN, TURN = 0, 1
+    PRIORITY_NAMES = {FIRST_TURN: "first_turn", TURN: "turn"}
+    # Default (max concurrency, slow latency in ms) per provider
+    DEFAULTS = {"openai": (32, 4000), "elevenlabs": (16, 2000), "deepgram": (64, 1500)}
+    # Providers gated per request in production; Deepgram streams are only opened (and gated) by the load-test bridge
+    PROVIDERS = ("openai", "elevenlabs")
+    OVERLOAD_STATUSES = (429, 503)
+    QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(
+        self,
+        provider: str,
+        max_limit: int = 32,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        slow_s: float = 2.0,
+        backoff: float = 0.7,
+        enabled: bool = True,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the limiter; the limit starts at half of ``max_limit`` unless given."""
+        self.provider = provider
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(initial_limit or max(min_limit, max_limit // 2))
+        self.slow_s = slow_s
+        self.backoff = backoff
+        self.enabled = enabled
+        self.inflight = 0
+        self.waiters: List[list] = []  # Heap of [priority, sequence, future]
+        self.queue_wait = LatencySketch()
+        self.decreases = 0
+        self._sequence = 0
+        self._last_decrease = 0.0
+
+        registry = registry or metrics_registry
+        self.wait_histogram = registry.histogram(
+            "voice_agent_provider_queue_wait_seconds",
+            "Time requests waited for a provider concurrency slot",
+            ("provider", "priority"),
+            buckets=self.QUEUE_WAIT_BUCKETS,
+        )
+        self.limit_gauge = registry.gauge(
+            "voice_agent_provider_concurrency_limit", "Current adaptive concurrency limit", ("provider",)
+        )
+        self.inflight_gauge = registry.gauge(
+            "voice_agent_provider_inflight", "Requests holding a concurrency slot", ("provider",)
+        )
+        self.queued_gauge = registry.gauge(
+            "voice_agent_provider_queued", "Requests waiting for a concurrency slot", ("provider",)
+        )
+        self.decrease_counter = registry.counter(
+            "voice_agent_provider_limit_decreases", "Concurrency limit decreases, by cause", ("provider", "reason")
+        )
+        self._update_gauges()
+
+    @classmethod
+    def from_env(cls, provider: str) -> "ConcurrencyLimiter":
+        """Create a limiter from LIMITER_ENABLED, LIMITER_BACKOFF and LIMITER_<PROVIDER>_MAX/_SLOW_MS."""
+        max_limit, slow_ms = cls.DEFAULTS.get(provider, (32, 2000))
+        prefix = f"LIMITER_{provider.upper()}"
+        return cls(
+            provider,
+            max_limit=int(os.getenv(f"{prefix}_MAX", str(max_limit))),
+            slow_s=float(os.getenv(f"{prefix}_SLOW_MS", str(slow_ms))) / 1000,
+            backoff=float(os.getenv("LIMITER_BACKOFF", "0.7")),
+            enabled=os.getenv("LIMITER_ENABLED", "true").lower() == "true",
+        )
+
+    @staticmethod
+    def is_overload(error: BaseException) -> bool:
+        """Tell whether an error means the provider is pushing back rather than the request being bad."""
+        if isinstance(error, asyncio.TimeoutError):
+            return True
+        status = getattr(error, "status", None) or getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+        return status in ConcurrencyLimiter.OVERLOAD_STATUSES
+
+    async def acquire(self, priority: int = TURN) -> float:
+        """Wait for a slot (on the running loop) and get the seconds spent waiting."""
+        if not self.enabled or (not self.waiters and self.inflight < int(self.limit)):
+            self.inflight += 1
+            self._observe_wait(priority, 0.0)
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        heapq.heappush(self.waiters, [priority, self._sequence, future])
+        self._update_gauges()
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._free_slot()  # The slot was handed over just as the waiter was cancelled
+            raise
+        waited = time.monotonic() - start
+        self._observe_wait(priority, waited)
+        return waited
+
+    def release(self, started: float, latency: float, error: Optional[BaseException] = None):
+        """Give a slot back and adapt the limit to how the request went; ``started`` is time.monotonic()."""
+        overloaded = error is not None and self.is_overload(error)
+        if overloaded or (error is None and latency >= self.slow_s):
+            if started >= self._last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+                self.decreases += 1
+                self.decrease_counter.inc(provider=self.provider, reason="overload" if overloaded else "slow")
+        elif error is None:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self._free_slot()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int = TURN, trace: Optional[TurnTrace] = None):
+        """Hold a slot around one provider request; the wait shows in the turn trace as ``<provider>_queue``."""
+        queued_ns = time.monotonic_ns()
+        waited = await self.acquire(priority)
+        if trace and waited:
+            trace.end(trace.start(f"{self.provider}_queue", queued_ns))
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(started, time.monotonic() - started, e)
+            raise
+        self.release(started, time.monotonic() - started)
+
+    def _free_slot(self):
+        """Hand the freed slot to the next live waiter, or give it back."""
+        self.inflight -= 1
+        while self.waiters and self.inflight < int(self.limit):
+            future = heapq.heappop(self.waiters)[2]
+            if future.done():  # Cancelled while queued
+                continue
+            self.inflight += 1
+            future.set_result(None)
+        self._update_gauges()
+
+    def _observe_wait(self, priority: int, waited: float):
+        """Record a queue wait (runs on the loop)."""
+        self.queue_wait.add(waited * 1000)
+        self.wait_histogram.observe(waited, provider=self.provider, priority=self.PRIORITY_NAMES.get(priority, "turn"))
+        self._update_gauges()
+
+    def _update_gauges(self):
+        """Publish the limit, slots in use and queue length."""
+        self.limit_gauge.set(round(self.limit, 2), provider=self.provider)
+        self.inflight_gauge.set(self.inflight, provider=self.provider)
+        self.queued_gauge.set(len(self.waiters), provider=self.provider)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the limit, slots in use, queue length and queue-wait percentiles for /health."""
+        return {
+            "enabled": self.enabled,
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queued": len(self.waiters),
+            "decreases": self.decreases,
+            "queue_wait_p50_ms": round(self.queue_wait.quantile(0.5), 1),
+            "queue_wait_p95_ms": round(self.queue_wait.quantile(0.95), 1),
+        }
+
+
+class LoopMonitor:
+    """Watches the asyncio loop for blocking calls and piling-up tasks.
+
+    A ``call_later`` heartbeat measures scheduling lag every ``interval``
+    seconds. A watchdog thread notices when the heartbeat is more than
+    ``threshold`` late and captures the stack of the loop thread while it is
+    still blocked, so the offending coroutine is named. Pending tasks are
+    counted and aged per call from inside the loop.
+    """
+
+    LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        threshold: float = 0.1,
+        max_stalls: int = 50,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the monitor; nothing runs until start()."""
+        self.interval = interval
+        self.threshold = threshold
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.running = False
+        self.last_beat = 0.0
+        self.recent_lags: deque = deque(maxlen=max(1, int(10 / interval)))  # ~10 seconds of samples
+        self.lag_ewma = 0.0  # Lag smoothed over about a second
+        self.stalls: deque = deque(maxlen=max_stalls)
+        self.task_stats: Dict[str, Any] = {"total": 0, "oldest_age_s": 0.0, "by_call": {}}
+        self._expected = 0.0
+        self._ticks = 0
+        self._handle = None
+        self._captured_beat = None
+        self._first_seen: "weakref.WeakKeyDictionary[asyncio.Task, float]" = weakref.WeakKeyDictionary()
+        self._stop = threading.Event()
+
+        registry = registry or metrics_registry
+        self.lag_histogram = registry.histogram(
+            "voice_agent_event_loop_lag_seconds", "Event loop scheduling lag", buckets=self.LAG_BUCKETS
+        )
+        self.stall_counter = registry.counter("voice_agent_event_loop_stalls", "Heartbeats later than the threshold")
+        registry.gauge(
+            "voice_agent_event_loop_tasks", "Pending asyncio tasks", callback=lambda: self.task_stats["total"]
+        )
+        registry.gauge(
+            "voice_agent_event_loop_oldest_task_age_seconds",
+            "Age of the oldest pending asyncio task",
+            callback=lambda: self.task_stats["oldest_age_s"],
+        )
+
+    @classmethod
+    def from_env(cls) -> "LoopMonitor":
+        """Create a monitor from LOOP_MONITOR_INTERVAL_MS and LOOP_LAG_THRESHOLD_MS."""
+        return cls(
+            interval=float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "10")) / 1000,
+            threshold=float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100")) / 1000,
+        )
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start monitoring a loop; safe to call from any thread."""
+        if self.running:
+            return
+        self.loop = loop
+        self.running = True
+        self._stop.clear()
+        loop.call_soon_threadsafe(self._begin)
+        threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        """Stop the heartbeat and the watchdog."""
+        self.running = False
+        self._stop.set()
+        if self.loop and self._handle and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._handle.cancel)
+
+    def _begin(self):
+        """Start the heartbeat (runs on the loop)."""
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._expected = self.last_beat + self.interval
+        self._handle = self.loop.call_later(self.interval, self._tick)
+
+    def _tick(self):
+        """Heartbeat: record how late it ran (runs on the loop)."""
+        now = time.monotonic()
+        lag = max(0.0, now - self._expected)
+        self.lag_histogram.observe(lag)
+        self.recent_lags.append(lag)
+        self.lag_ewma += min(1.0, self.interval) * (lag - self.lag_ewma)
+        if lag >= self.threshold:
+            self.stall_counter.inc()
+            if self.stalls and self._captured_beat == self.last_beat:
+                self.stalls[-1]["lag_ms"] = round(lag * 1000, 1)
+            else:
+                self.stalls.append({"at": datetime.now().isoformat(), "lag_ms": round(lag * 1000, 1), "stack": []})
+            logger.warning("🐌 Event loop blocked for %.0fms", lag * 1000)
+
+        self.last_beat = now
+        self._ticks += 1
+        if self._ticks % max(1, int(1 / self.interval)) == 0:  # About once a second
+            self._sample_tasks()
+
+        if self.running:
+            self._expected = now + self.interval
+            self._handle = self.loop.call_later(self.interval, self._tick)
+
+    def _sample_tasks(self):
+        """Count pending tasks and their age per call (runs on the loop)."""
+        now = time.monotonic()
+        by_call: Dict[str, Dict[str, Any]] = {}
+        oldest = 0.0
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            age = now - self._first_seen.setdefault(task, now)
+            oldest = max(oldest, age)
+            entry = by_call.setdefault(call_sid_for_task(task) or "unassigned", {"tasks": 0, "oldest_age_s": 0.0})
+            entry["tasks"] += 1
+            entry["oldest_age_s"] = round(max(entry["oldest_age_s"], age), 1)
+        self.task_stats = {"total": len(tasks), "oldest_age_s": round(oldest, 1), "by_call": by_call}
+
+    def _watchdog(self):
+        """Capture the loop thread's stack while a heartbeat is overdue."""
+        while not self._stop.wait(self.threshold / 2):
+            beat = self.last_beat
+            if not beat or self._captured_beat == beat or time.monotonic() - beat < self.threshold + self.interval:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            task = getattr(asyncio.tasks, "_current_tasks", {}).get(self.loop)
+            self._captured_beat = beat
+            self.stalls.append(
+                {
+                    "at": datetime.now().isoformat(),
+                    "lag_ms": round((time.monotonic() - beat) * 1000, 1),
+                    "task": task.get_name() if task else None,
+                    "stack": [line.rstrip() for line in traceback.format_stack(frame, limit=30)],
+                }
+            )
+            logger.warning("🐌 Event loop blocked in %s", task.get_name() if task else "a callback")
+
+    def current_lag(self) -> float:
+        """Get the smoothed lag, or how overdue the heartbeat is if the loop is blocked right now."""
+        if not self.running or not self._expected:
+            return 0.0
+        return max(self.lag_ewma, time.monotonic() - self._expected)
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Get lag percentiles, task health and recent stalls for /debug/loop."""
+        lags = sorted(self.recent_lags)
+
+        def quantile(q):
+            return round(lags[min(int(len(lags) * q), len(lags) - 1)] * 1000, 2) if lags else 0.0
+
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag_ms": {"p50": quantile(0.5), "p99": quantile(0.99), "max": quantile(1.0), "samples": len(lags)},
+            "tasks": self.task_stats,
+            "stalls": list(self.stalls),
+        }
+
+
+class AdmissionController:
+    """Decides in /webhook whether to take a new call, so overload sheds new calls instead of slowing all of them.
+
+    A call is admitted while active calls, event-loop lag and the rolling p95
+    of first-audio latency are all under their limits. Otherwise the call is
+    turned away as configured by ``overflow``. It can get a "call back later"
+    message, wait in a Twilio queue with hold music, or be redirected to
+    another node. Every input is kept up to date as it changes, so a decision
+    costs a length, a number and a fixed-bucket sketch lookup. The TwiML
+    answers are rendered once.
+    """
+
+    ACCEPT, REJECT, QUEUE, REDIRECT = "accept", "reject", "queue", "redirect"
+    DEFAULT_HOLD_MUSIC_URL = "http://com.twilio.music.classical.s3.amazonaws.com/BusyStrings.mp3"
+
+    def __init__(
+        self,
+        active_calls: Callable[[], int],
+        loop_lag: Callable[[], float],
+        language_manager: "LanguageManager",
+        max_calls: int = 0,
+        max_loop_lag: float = 0.25,
+        max_p95: float = 2.0,
+        min_turns: int = 20,
+        window: float = 60.0,
+        overflow: str = "reject",
+        redirect_url: str = "",
+        queue_name: str = "voice-agent",
+        hold_music_url: str = DEFAULT_HOLD_MUSIC_URL,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the controller; a limit of 0 turns that check off."""
+        self.active_calls = active_calls
+        self.loop_lag = loop_lag
+        self.max_calls = max_calls
+        self.max_loop_lag = max_loop_lag
+        self.max_p95 = max_p95
+        self.min_turns = min_turns
+        self.overflow = overflow if overflow in (self.REJECT, self.QUEUE, self.REDIRECT) else self.REJECT
+        self.redirect_url = redirect_url
+        self.decisions = {self.ACCEPT: 0, self.REJECT: 0, self.QUEUE: 0, self.REDIRECT: 0}
+        self.turns = RollingLatencySketch(window)  # First-audio latency of recent turns
+        self.twiml = self._render(language_manager, queue_name, hold_music_url)
+
+        registry = registry or metrics_registry
+        self.decision_counter = registry.counter(
+            "voice_agent_admission_decisions", "New calls admitted or turned away, by reason", ("decision", "reason")
+        )
+        registry.gauge(
+            "voice_agent_admission_turn_p95_seconds",
+            "Rolling p95 first-audio latency used for admission",
+            callback=lambda: self.turn_p95(),
+        )
+        registry.gauge(
+            "voice_agent_admission_overloaded",
+            "1 while new calls are being turned away",
+            callback=lambda: int(self.overload_reason() is not None),
+        )
+
+    @classmethod
+    def from_env(
+        cls, active_calls: Callable[[], int], loop_lag: Callable[[], float], language_manager: "LanguageManager"
+    ) -> "AdmissionController":
+        """Create a controller from the ADMISSION_* settings."""
+        return cls(
+            active_calls,
+            loop_lag,
+            language_manager,
+            max_calls=int(os.getenv("ADMISSION_MAX_CALLS", "0")),
+            max_loop_lag=float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", "250")) / 1000,
+            max_p95=float(os.getenv("ADMISSION_MAX_P95_MS", "2000")) / 1000,
+            min_turns=int(os.getenv("ADMISSION_MIN_TURNS", "20")),
+            window=float(os.getenv("ADMISSION_WINDOW_S", "60")),
+            overflow=os.getenv("ADMISSION_OVERFLOW", "reject").lower(),
+            redirect_url=os.getenv("ADMISSION_REDIRECT_URL", ""),
+            queue_name=os.getenv("ADMISSION_QUEUE_NAME", "voice-agent"),
+            hold_music_url=os.getenv("ADMISSION_HOLD_MUSIC_URL") or cls.DEFAULT_HOLD_MUSIC_URL,
+        )
+
+    def _render(self, language_manager: "LanguageManager", queue_name: str, hold_music_url: str) -> Dict[str, str]:
+        """Render every answer other than accept once."""
+        reject = ET.Element("Response")
+        ET.SubElement(reject, "Say", language="es-MX").text = language_manager.get_busy_message()
+        ET.SubElement(reject, "Hangup")
+
+        queue = ET.Element("Response")
+        ET.SubElement(queue, "Say", language="es-MX").text = language_manager.get_hold_message()
+        # Leaving the queue (see /queue-wait) brings the caller back to /webhook for admission
+        enqueue = ET.SubElement(queue, "Enqueue", action="/webhook?overflow=queue", waitUrl="/queue-wait")
+        enqueue.text = queue_name
+
+        hold = ET.Element("Response")
+        ET.SubElement(hold, "Play").text = hold_music_url
+        leave = ET.Element("Response")
+        ET.SubElement(leave, "Leave")
+
+        twiml = {
+            self.REJECT: ET.tostring(reject, encoding="unicode"),
+            self.QUEUE: ET.tostring(queue, encoding="unicode"),
+            "hold": ET.tostring(hold, encoding="unicode"),
+            "leave": ET.tostring(leave, encoding="unicode"),
+        }
+        if self.redirect_url:
+            redirect = ET.Element("Response")
+            separator = "&" if "?" in self.redirect_url else "?"
+            redirect_to = f"{self.redirect_url}{separator}overflow=redirect"
+            ET.SubElement(redirect, "Redirect", method="POST").text = redirect_to
+            twiml[self.REDIRECT] = ET.tostring(redirect, encoding="unicode")
+        return twiml
+
+    def record_turn(self, first_audio_latency: float):
+        """Add a turn's first-audio latency (seconds) to the rolling window."""
+        self.turns.add(first_audio_latency * 1000)
+
+    def turn_p95(self) -> float:
+        """Get the rolling p95 first-audio latency in seconds, 0 while there are too few turns."""
+        recent = self.turns.snapshot()
+        return recent.quantile(0.95) / 1000 if recent.count >= self.min_turns else 0.0
+
+    def overload_reason(self) -> Optional[str]:
+        """Get the first limit that is exceeded, or None when a call can be taken."""
+        if self.max_calls and self.active_calls() >= self.max_calls:
+            return "active_calls"
+        if self.max_loop_lag and self.loop_lag() >= self.max_loop_lag:
+            return "loop_lag"
+        if self.max_p95 and self.turn_p95() >= self.max_p95:
+            return "turn_p95"
+        return None
+
+    def admit(self, redirected: bool = False) -> Tuple[str, Optional[str]]:
+        """Decide on a new call; get (decision, reason). A call already redirected here is never redirected again."""
+        reason = self.overload_reason()
+        if reason is None:
+            decision = self.ACCEPT
+        elif self.overflow == self.REDIRECT and (redirected or not self.redirect_url):
+            decision = self.REJECT
+        else:
+            decision = self.overflow
+        self.decisions[decision] += 1
+        self.decision_counter.inc(decision=decision, reason=reason or "none")
+        return decision, reason
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the limits, the current inputs and decision counts for /health."""
+        return {
+            "overflow": self.overflow,
+            "limits": {"max_calls": self.max_calls, "max_loop_lag_s": self.max_loop_lag, "max_p95_s": self.max_p95},
+            "active_calls": self.active_calls(),
+            "loop_lag_s": round(self.loop_lag(), 4),
+            "turn_p95_s": round(self.turn_p95(), 3),
+            "overloaded": self.overload_reason(),
+            "decisions": dict(self.decisions),
+        }
+
+    def wait_twiml(self, queue_position: int) -> str:
+        """TwiML for a queued caller: leave the queue when first in line and a call can be taken, else hold."""
+        if queue_position <= 1 and self.overload_reason() is None:
+            return self.twiml["leave"]
+        return self.twiml["hold"]
+
+
+class SamplingProfiler:
+    """In-process statistical profiler for live traffic.
+
+    Samples the stack of every thread with sys._current_frames() at a fixed
+    interval. Samples taken while the event loop is running a task bound to a
+    call (bind_call_context) are tagged with that call_sid, so a profile can be
+    narrowed to one call. Only one profile runs at a time.
+    """
+
+    MAX_DEPTH = 128
+
+    def __init__(self):
+        """Initialize the profiler."""
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        """Get a flamegraph label for a frame (no ';', which separates collapsed stacks)."""
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+    def _running_call_sids(self) -> Dict[int, Optional[str]]:
+        """Map thread ids to the call they are working for right now."""
+        call_sids = dict(_thread_call_sids)
+        for loop, task in list(getattr(asyncio.tasks, "_current_tasks", {}).items()):
+            thread_id = getattr(loop, "_thread_id", None)
+            if thread_id is not None:
+                call_sids[thread_id] = call_sid_for_task(task)
+        return call_sids
+
+    def profile(self, seconds: float, interval: float = 0.01, call_sid: Optional[str] = None) -> Dict[str, Any]:
+        """Sample all threads for ``seconds`` and return aggregated stacks.
+
+        Raises RuntimeError if another profile is already running.
+        """
+        if not self.lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            me = threading.get_ident()
+            stacks: Counter = Counter()  # (thread name, frames root first) -> samples
+            samples = 0
+            overhead = 0.0
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                # Read the running tasks on both sides of the frame capture so a task switch in between is skipped
+                before = self._running_call_sids() if call_sid else {}
+                current_frames = sys._current_frames()
+                after = self._running_call_sids() if call_sid else {}
+                for thread_id, frame in current_frames.items():
+                    if thread_id == me or (call_sid and not before.get(thread_id) == after.get(thread_id) == call_sid):
+                        continue
+                    frames = []
+                    while frame is not None and len(frames) < self.MAX_DEPTH:
+                        frames.append(self._frame_label(frame))
+                        frame = frame.f_back
+                    stacks[(names.get(thread_id, str(thread_id)), tuple(reversed(frames)))] += 1
+                samples += 1
+                overhead += time.perf_counter() - started
+                time.sleep(interval)
+        finally:
+            self.lock.release()
+
+        return {
+            "seconds": seconds,
+            "interval": interval,
+            "call_sid": call_sid,
+            "samples": samples,
+            "overhead_ms": round(overhead * 1000, 2),
+            "stacks": stacks,
+        }
+
+    @staticmethod
+    def to_collapsed(result: Dict[str, Any]) -> str:
+        """Render a profile as collapsed stacks (flamegraph.pl, speedscope, inferno)."""
+        lines = [f"{';'.join((thread,) + frames)} {count}" for (thread, frames), count in result["stacks"].items()]
+        return "\n".join(sorted(lines)) + "\n"
+
+    @staticmethod
+    def to_speedscope(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Render a profile as a speedscope sampled profile, one per thread."""
+        frame_index: Dict[str, int] = {}
+        profiles: Dict[str, Dict[str, Any]] = {}
+        for (thread, frames), count in result["stacks"].items():
+            profile = profiles.setdefault(
+                thread,
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": result["seconds"],
+                    "samples": [],
+                    "weights": [],
+                },
+            )
+            profile["samples"].append([frame_index.setdefault(label, len(frame_index)) for label in frames])
+            profile["weights"].append(count * result["interval"])
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"voice agent profile ({result['seconds']}s)",
+            "exporter": "twilio_voice_agent",
+            "shared": {"frames": [{"name": label} for label in frame_index]},
+            "profiles": list(profiles.values()),
+        }
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots diffed against a baseline, to find what keeps growing.
+
+    Tracing slows allocations down, so it only runs between start() and stop().
+    """
+
+    def __init__(self, frames: int = 1):
+        """Initialize the profiler; frames is the traceback depth kept per allocation."""
+        self.frames = frames
+        self.baseline = None
+        self.started_at: Optional[str] = None
+
+    def start(self):
+        """Start tracing and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.baseline = tracemalloc.take_snapshot()
+        self.started_at = datetime.now().isoformat()
+
+    def stop(self):
+        """Stop tracing and drop the baseline."""
+        tracemalloc.stop()
+        self.baseline = None
+        self.started_at = None
+
+    def diff(self, limit: int = 25, group_by: str = "lineno") -> Dict[str, Any]:
+        """Get the allocation sites that grew the most since the baseline."""
+        if self.baseline is None:
+            return {"tracing": False}
+
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(self.baseline, group_by)
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": True,
+            "baseline_at": self.started_at,
+            "traced_mb": round(current / 1e6, 2),
+            "peak_mb": round(peak / 1e6, 2),
+            "top": [
+                {
+                    "location": str(stat.traceback[0]) if stat.traceback else "?",
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+
+class ResponseCache:
+    """Single-flight, micro-TTL cache for read-heavy monitoring endpoints.
+
+    Concurrent requests for the same key share one computation, and the
+    serialized result is reused for ``ttl`` seconds. This keeps dashboards, load
+    balancers and uptime checks from repeatedly taking RealCallManager.lock away
+    from the recording path.
+    """
+
+    def __init__(self, ttl: float = 0.25):
+        """Initialize the cache; a ttl of 0 disables memoization but keeps coalescing."""
+        self.ttl = ttl
+        self.entries: Dict[str, Tuple[float, bytes, str]] = {}  # key -> (expires_at, body, etag)
+        self.in_flight: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Create a cache with MONITORING_CACHE_TTL_MS, clamped to 100-1000 ms."""
+        ttl_ms = float(os.getenv("MONITORING_CACHE_TTL_MS", "250"))
+        return cls(ttl=min(max(ttl_ms, 100.0), 1000.0) / 1000)
+
+    def get(self, key: str, compute: Callable[[], Dict[str, Any]], volatile: Tuple[str, ...] = ()) -> Tuple[bytes, str]:
+        """Get the JSON body and ETag for a key, computing it at most once per TTL.
+
+        ``volatile`` fields (a timestamp, live gauges) are served but left out
+        of the ETag, so it only changes when the rest of the payload does.
+        They are dotted paths, where ``*`` stands for any key.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1], entry[2]
+
+            flight = self.in_flight.get(key)
+            if flight is None:
+                flight = self.in_flight[key] = {"done": threading.Event(), "result": None, "error": None}
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"]
+
+        try:
+            payload = compute()
+            body = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+            if volatile:
+                stable = payload
+                for path in volatile:
+                    stable = self._without(stable, path.split("."))
+                digest = hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            else:
+                digest = hashlib.sha1(body).hexdigest()
+            result = (body, digest)
+            flight["result"] = result
+            with self.lock:
+                if self.ttl > 0:
+                    self.entries[key] = (time.monotonic() + self.ttl, body, result[1])
+            return result
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+            flight["done"].set()
+
+    @classmethod
+    def _without(cls, value: Any, path: List[str]) -> Any:
+        """Copy ``value`` without the field at ``path``, copying only the dicts on the way."""
+        if not isinstance(value, dict):
+            return value
+        head, rest = path[0], path[1:]
+        copy = dict(value)
+        for key in list(copy) if head == "*" else [head]:
+            if key not in copy:
+                continue
+            if rest:
+                copy[key] = cls._without(copy[key], rest)
+            else:
+                del copy[key]
+        return copy
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters."""
+        with self.lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "ttl_ms": self.ttl * 1000,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            }
+
+
+class LLMBackend:
+    """One LLM service the router can send a turn to, with its price for cost tracking."""
+
+    def __init__(self, name: str, service: Any, cost_per_1k_tokens: float = 0.0):
+        """Initialize the backend; ``service`` has the ``complete(messages=...)`` interface."""
+        self.name = name
+        self.service = service
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+
+
+class LLMRouter:
+    """Sends each turn to the primary LLM backend, hedging and failing over to the others.
+
+    If the primary has not answered by its rolling ``hedge_quantile`` latency,
+    the request is also sent to the next backend. The first answer wins and
+    the other request is cancelled. An error fails over to the next backend
+    not yet tried. A cancelled request still adds its elapsed time to its
+    backend's window, so the slow requests that get hedged keep counting
+    toward the quantile. Every request is costed from its estimated tokens,
+    so the spend on cancelled requests can be weighed against the latency
+    the hedges saved.
+    """
+
+    def __init__(
+        self,
+        backends: List[LLMBackend],
+        hedge_quantile: float = 0.9,
+        min_hedge_delay: float = 0.1,
+        initial_hedge_delay: float = 1.0,
+        min_samples: int = 20,
+        window: float = 300.0,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the router; the first backend is the primary, hedging needs a second (0 quantile = off)."""
+        self.backends = backends
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_samples = min_samples
+        self.latency = {backend.name: RollingLatencySketch(window) for backend in backends}
+        self.stats = Counter()
+        self.cost = {"answers": 0.0, "overhead": 0.0}
+        self.latency_gained = 0.0
+
+        registry = registry or metrics_registry
+        self.request_counter = registry.counter(
+            "voice_agent_llm_requests", "LLM requests by backend, role and outcome", ("backend", "role", "outcome")
+        )
+        self.cost_counter = registry.counter(
+            "voice_agent_llm_cost_usd", "Estimated LLM spend on answers and on cancelled requests", ("kind",)
+        )
+        self.gained_counter = registry.counter(
+            "voice_agent_llm_hedge_latency_gained_seconds", "Estimated latency saved by hedges that won"
+        )
+        registry.gauge(
+            "voice_agent_llm_hedge_delay_seconds",
+            "Time after which a turn is hedged to the next backend",
+            callback=lambda: self.hedge_delay() or 0.0,
+        )
+
+    @classmethod
+    def from_env(cls, backends: List[LLMBackend]) -> "LLMRouter":
+        """Create a router over ``backends`` from the LLM_HEDGE_* settings."""
+        return cls(
+            backends,
+            hedge_quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.9")),
+            min_hedge_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "100")) / 1000,
+            initial_hedge_delay=float(os.getenv("LLM_HEDGE_INITIAL_DELAY_MS", "1000")) / 1000,
+            min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+            window=float(os.getenv("LLM_HEDGE_WINDOW_S", "300")),
+        )
+
+    @property
+    def system_prompt(self) -> Optional[str]:
+        """Get the primary backend's system prompt."""
+        return getattr(self.backends[0].service, "system_prompt", None)
+
+    @system_prompt.setter
+    def system_prompt(self, prompt: str):
+        """Set the system prompt on every backend that has one."""
+        for backend in self.backends:
+            if hasattr(backend.service, "system_prompt"):
+                backend.service.system_prompt = prompt
+
+    def hedge_delay(self) -> Optional[float]:
+        """Get how long to wait for the primary before hedging, or None if hedging is off."""
+        if len(self.backends) < 2 or not self.hedge_quantile:
+            return None
+        recent = self.latency[self.backends[0].name].snapshot()
+        if recent.count < self.min_samples:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, recent.quantile(self.hedge_quantile) / 1000)
+
+    @staticmethod
+    def _tokens(text_length: int) -> float:
+        """Estimate tokens from characters (about four per token)."""
+        return text_length / 4
+
+    async def complete(self, messages: List[Dict], **kwargs: Any):
+        """Get a completion from the first backend to answer."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        prompt_tokens = self._tokens(sum(len(str(message.get("content", ""))) for message in messages))
+        untried = deque(self.backends)
+        running: Dict[asyncio.Future, Tuple[LLMBackend, str, float]] = {}
+
+        def launch(role: str):
+            backend = untried.popleft()
+            task = asyncio.ensure_future(backend.service.complete(messages=messages, **kwargs))
+            running[task] = (backend, role, loop.time())
+
+        self.stats["turns"] += 1
+        launch("primary")
+        hedge_delay = self.hedge_delay()
+        hedged = False
+        error: Optional[BaseException] = None
+        try:
+            while running:
+                timeout = None
+                if hedge_delay is not None and not hedged and untried:
+                    timeout = max(0.0, start + hedge_delay - loop.time())
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    self.stats["hedged"] += 1
+                    launch("hedge")
+                    continue
+                for task in done:
+                    backend, role, started = running.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        self._count(backend, role, "error")
+                        if untried and not running:
+                            self.stats["failovers"] += 1
+                            launch("failover")
+                        continue
+                    response = task.result()
+                    elapsed = loop.time() - started
+                    self.latency[backend.name].add(elapsed * 1000)
+                    self._count(backend, role, "won")
+                    answer_tokens = prompt_tokens + self._tokens(len(getattr(response, "content", "") or ""))
+                    self._add_cost("answers", backend, answer_tokens)
+                    if role == "hedge":
+                        self.stats["hedge_wins"] += 1
+                        self._credit_hedge(loop.time() - start)
+                    return response
+            raise error
+        finally:
+            for task, (backend, role, started) in running.items():
+                task.cancel()
+                self.latency[backend.name].add((loop.time() - started) * 1000)
+                self._count(backend, role, "cancelled")
+                self._add_cost("overhead", backend, prompt_tokens)
+
+    def _credit_hedge(self, elapsed: float):
+        """Estimate what a winning hedge saved: the primary's expected remaining time, from its own latencies."""
+        recent = self.latency[self.backends[0].name].snapshot()
+        if recent.count < self.min_samples:
+            return
+        elapsed_ms = elapsed * 1000
+        # Median of the primary's latencies that are longer than what it had already taken
+        remaining_ms = recent.quantile((1 + recent.fraction_below(elapsed_ms)) / 2) - elapsed_ms
+        if remaining_ms > 0:
+            self.latency_gained += remaining_ms / 1000
+            self.gained_counter.inc(remaining_ms / 1000)
+
+    def _count(self, backend: LLMBackend, role: str, outcome: str):
+        """Count one finished request."""
+        self.stats[outcome] += 1
+        self.request_counter.inc(backend=backend.name, role=role, outcome=outcome)
+
+    def _add_cost(self, kind: str, backend: LLMBackend, tokens: float):
+        """Add the estimated cost of a request's tokens."""
+        cost = tokens / 1000 * backend.cost_per_1k_tokens
+        self.cost[kind] += cost
+        if cost:
+            self.cost_counter.inc(cost, kind=kind)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request outcomes, hedging, cost overhead and latency gained for /health."""
+        answers = self.cost["answers"]
+        hedge_delay = self.hedge_delay()
+        return {
+            "backends": [backend.name for backend in self.backends],
+            "hedge_delay_ms": round(hedge_delay * 1000, 1) if hedge_delay is not None else None,
+            **{key: self.stats[key] for key in ("turns", "hedged", "hedge_wins", "failovers", "error", "cancelled")},
+            "cost_usd": round(answers, 6),
+            "overhead_cost_usd": round(self.cost["overhead"], 6),
+            "cost_overhead_ratio": round(self.cost["overhead"] / answers, 4) if answers else 0.0,
+            "latency_gained_s": round(self.latency_gained, 3),
+        }
+
+
+class StageDeadlines:
+    """Per-language latency budgets for the stages of a turn, and a count of the budgets missed.
+
+    ``llm_first_token`` is when a filler phrase starts playing while the LLM
+    is still working, ``llm_response`` is when the LLM request is abandoned
+    for the language's fallback response, and ``tts_first_byte`` is when
+    synthesis is restarted on the secondary voice/model. A budget of 0 turns
+    that deadline off.
+    """
+
+    STAGES = ("llm_first_token", "llm_response", "tts_first_byte")
+
+    def __init__(self, budgets: Dict[str, Dict[str, float]], registry: Optional[MetricsRegistry] = None):
+        """Initialize with budgets in seconds per language and stage."""
+        self.budgets = budgets
+        self.hits = Counter()
+        registry = registry or metrics_registry
+        self.hit_counter = registry.counter(
+            "voice_agent_stage_deadline_hits", "Turn stages that missed their latency budget", ("stage", "language")
+        )
+
+    @classmethod
+    def from_env(cls, language_manager: "LanguageManager") -> "StageDeadlines":
+        """Create deadlines from each language's defaults, overridden by DEADLINE_<STAGE>_MS[_<LANGUAGE>]."""
+        budgets = {}
+        for language, config in language_manager.language_configs.items():
+            suffix = language.replace("-", "_").upper()
+            budgets[language] = {}
+            for stage in cls.STAGES:
+                default = os.getenv(f"DEADLINE_{stage.upper()}_MS", str(config["deadlines_ms"][stage]))
+                budgets[language][stage] = float(os.getenv(f"DEADLINE_{stage.upper()}_MS_{suffix}", default)) / 1000
+        return cls(budgets)
+
+    def budget(self, language: str, stage: str) -> float:
+        """Get a stage's budget in seconds for a language (0 = no deadline)."""
+        return self.budgets.get(language, {}).get(stage, 0.0)
+
+    def hit(self, stage: str, language: str):
+        """Record a stage missing its budget."""
+        self.hits[stage] += 1
+        self.hit_counter.inc(stage=stage, language=language)
+        logger.warning("⏰ %s missed its %.0fms budget (%s)", stage, self.budget(language, stage) * 1000, language)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the budgets in milliseconds and hits per stage for /health."""
+        return {
+            "budgets_ms": {
+                language: {stage: round(seconds * 1000) for stage, seconds in stages.items()}
+                for language, stages in self.budgets.items()
+            },
+            "hits": {stage: self.hits[stage] for stage in self.STAGES},
+        }
+
+
+class PhraseCache:
+    """Synthesized audio by language and text, so a turn can play it without waiting on TTS.
+
+    The fixed phrases (the filler, the fallback response and the
+    backchannels) are synthesized once per language at start-up and kept.
+    TTSRouter also stores every utterance it synthesizes, with the backend
+    that made it, in a small LRU, so a repeated answer, or one the local
+    fallback engine had to make, is not synthesized twice.
+    """
+
+    PHRASES = ("filler", "fallback_response", "backchannels")  # "backchannels" is a list of texts
+
+    def __init__(self, language_manager: "LanguageManager", max_entries: int = 256):
+        """Initialize an empty cache; warm() fills in the phrases."""
+        self.language_manager = language_manager
+        self.max_entries = max_entries
+        self.phrases: Dict[Tuple[str, str], Tuple[bytes, str]] = {}  # (language, text) -> (audio, backend)
+        self.recent: "OrderedDict[Tuple[str, str], Tuple[bytes, str]]" = OrderedDict()
+        self.phrase_keys = {
+            (language, text)
+            for language, config in language_manager.language_configs.items()
+            for _, text in self.texts(config)
+        }
+
+    @classmethod
+    def from_env(cls, language_manager: "LanguageManager") -> "PhraseCache":
+        """Create a cache holding up to TTS_CACHE_ENTRIES recent utterances."""
+        return cls(language_manager, max_entries=int(os.getenv("TTS_CACHE_ENTRIES", "256")))
+
+    @classmethod
+    def texts(cls, config: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+        """Get each phrase's name and text from a language's config, one per text of a list."""
+        for phrase in cls.PHRASES:
+            texts = config.get(phrase, ())
+            for text in [texts] if isinstance(texts, str) else texts:
+                yield phrase, text
+
+    async def warm(self, tts_service):
+        """Synthesize every phrase in every language; failures only leave that phrase uncached."""
+        for language, config in self.language_manager.language_configs.items():
+            for phrase, text in self.texts(config):
+                try:
+                    audio = await tts_service.synthesize(text, voice_id=config["tts_voice"])
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not cache {phrase} audio for {language}: {e}")
+                    continue
+                # A TTSRouter has already stored it, with the backend that made it
+                if isinstance(audio, (bytes, bytearray)) and audio and self.lookup(language, text) is None:
+                    self.store(language, text, bytes(audio), "tts")
+        logger.info(f"🗣️ Cached {len(self.phrases)} phrase recordings")
+
+    def store(self, language: str, text: str, audio: bytes, backend: str):
+        """Cache an utterance's audio; phrases are kept, other utterances until ``max_entries`` newer ones."""
+        key = (language, text)
+        if key in self.phrase_keys:
+            self.phrases[key] = (audio, backend)
+            return
+        self.recent[key] = (audio, backend)
+        self.recent.move_to_end(key)
+        while len(self.recent) > self.max_entries:
+            self.recent.popitem(last=False)
+
+    def lookup(self, language: str, text: str) -> Optional[Tuple[bytes, str]]:
+        """Get the audio and backend cached for an utterance, or None."""
+        key = (language, text)
+        entry = self.phrases.get(key)
+        if entry is None:
+            entry = self.recent.get(key)
+            if entry is not None:
+                self.recent.move_to_end(key)
+        return entry
+
+    def get(self, language: str, phrase: str) -> Optional[bytes]:
+        """Get a phrase's audio, or None if it is not cached."""
+        config = self.language_manager.language_configs.get(language)
+        entry = self.phrases.get((language, config[phrase])) if config else None
+        return entry[0] if entry else None
+
+    def phrases_from(self, backends: set) -> int:
+        """Count the cached phrases made by any of ``backends``."""
+        return sum(1 for _, backend in self.phrases.values() if backend in backends)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache sizes for /health."""
+        return {
+            "phrases": len(self.phrases),
+            "recent": len(self.recent),
+            "max_entries": self.max_entries,
+            "bytes": sum(len(audio) for audio, _ in [*self.phrases.values(), *self.recent.values()]),
+        }
+
+
+class LocalTTSEngine:
+    """Offline CPU text-to-speech through espeak-ng, the last resort when no provider can speak.
+
+    ``command`` reads the text on stdin and writes a 16-bit WAV to stdout;
+    ``{voice}`` in it becomes the language's voice. The audio is resampled to
+    8 kHz μ-law for the call. It sounds robotic, but the caller hears the
+    answer instead of silence.
+    """
+
+    VOICES = {"es-LA": "es-419", "en-US": "en-us"}
+    ULAW_SEGMENT_ENDS = (0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF)
+
+    def __init__(
+        self,
+        command: str = "espeak-ng --stdin --stdout -v {voice}",
+        language_getter: Optional[Callable[[], str]] = None,
+        voices: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the engine; ``language_getter`` picks the voice for each utterance."""
+        self.command = command
+        self.language_getter = language_getter or (lambda: "es-LA")
+        self.voices = voices or self.VOICES
+
+    @classmethod
+    def from_env(cls, language_getter: Callable[[], str]) -> Optional["LocalTTSEngine"]:
+        """Create the engine from LOCAL_TTS_COMMAND, or None if it is disabled or not installed."""
+        command = os.getenv("LOCAL_TTS_COMMAND", "espeak-ng --stdin --stdout -v {voice}")
+        engine = cls(command, language_getter) if command else None
+        if engine is not None and not engine.available:
+            logger.warning(f"⚠️ Local TTS fallback disabled: {shlex.split(command)[0]} not found")
+            return None
+        return engine
+
+    @property
+    def available(self) -> bool:
+        """Check that the command is installed."""
+        return shutil.which(shlex.split(self.command)[0]) is not None
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+        first_byte: Optional[asyncio.Future] = None,
+    ) -> bytes:
+        """Synthesize ``text`` as μ-law 8 kHz audio; provider voice and model options do not apply."""
+        voice = self.voices.get(self.language_getter(), next(iter(self.voices.values())))
+        args = [part.format(voice=voice) for part in shlex.split(self.command)]
+        process = await asyncio.create_subprocess_exec(
+            *args, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            wav, _ = await process.communicate(text.encode("utf-8"))
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+        if process.returncode:
+            raise RuntimeError(f"{args[0]} exited with status {process.returncode}")
+        audio = self.wav_to_ulaw(wav)
+        if first_byte is not None and not first_byte.done():
+            first_byte.set_result(None)
+        return audio
+
+    @classmethod
+    def wav_to_ulaw(cls, wav: bytes) -> bytes:
+        """Convert a 16-bit PCM WAV, possibly with the open-ended sizes of a pipe, to 8 kHz mono μ-law."""
+        import numpy as np
+
+        rate, channels, offset = 8000, 1, 12
+        while offset + 8 <= len(wav):
+            chunk, size = wav[offset : offset + 4], struct.unpack_from("<I", wav, offset + 4)[0]
+            if chunk == b"fmt ":
+                channels, rate = struct.unpack_from("<HI", wav, offset + 10)
+            elif chunk == b"data":
+                data = wav[offset + 8 : offset + 8 + size]
+                break
+            offset += 8 + size
+        else:
+            raise ValueError("WAV has no data chunk")
+
+        frame_bytes = 2 * channels
+        samples = np.frombuffer(data[: len(data) // frame_bytes * frame_bytes], dtype="<i2")
+        samples = samples.reshape(-1, channels).mean(axis=1)
+        if rate != 8000 and len(samples):
+            width = max(1, round(rate / 8000))  # Moving average against aliasing, then linear resampling
+            samples = np.convolve(samples, np.ones(width) / width, mode="same")
+            positions = np.arange(int(len(samples) * 8000 / rate)) * (rate / 8000)
+            samples = np.interp(positions, np.arange(len(samples)), samples)
+
+        pcm = samples.astype(np.int32) >> 2  # G.711 μ-law works on 14-bit samples
+        mask = np.where(pcm < 0, 0x7F, 0xFF)
+        magnitude = np.minimum(np.abs(pcm), 8159) + 0x21
+        segment = np.searchsorted(np.array(cls.ULAW_SEGMENT_ENDS), magnitude)
+        code = np.where(segment < 8, (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F), 0x7F)
+        return ((code ^ mask) & 0xFF).astype(np.uint8).tobytes()
+
+
+class TTSBackend:
+    """One TTS service the router can send an utterance to."""
+
+    def __init__(self, name: str, service: Any, last_resort: bool = False, streams: bool = True):
+        """Initialize the backend.
+
+        ``service`` has the ``synthesize(text, voice_id, model_id, first_byte)``
+        interface. A ``last_resort`` backend is only tried after every other
+        one. A backend that does not ``stream`` to the call itself has its audio
+        played through the router.
+        """
+        self.name = name
+        self.service = service
+        self.last_resort = last_resort
+        self.streams = streams
+
+
+class TTSRouter:
+    """Sends each utterance to the fastest healthy TTS backend, failing over down the list.
+
+    Healthy backends are ranked by their rolling median time to first byte;
+    one with fewer than ``min_samples`` recent samples ranks first, so new
+    and recovered backends get measured. An attempt without a first byte in
+    ``first_byte_timeout`` counts as an error. A backend is unhealthy while
+    the moving average of its errors is above ``max_error_rate``. It is then
+    skipped, apart from one probe utterance every ``retry_after`` seconds.
+    Last-resort backends are only used once every other backend has failed.
+    Utterances in the phrase cache are played from it, unless they were made
+    by a last-resort backend and a provider is healthy again.
+    """
+
+    def __init__(
+        self,
+        backends: List[TTSBackend],
+        cache: Optional[PhraseCache] = None,
+        language_getter: Optional[Callable[[], str]] = None,
+        first_byte_timeout: float = 1.5,
+        max_error_rate: float = 0.5,
+        error_alpha: float = 0.3,
+        retry_after: float = 10.0,
+        min_samples: int = 5,
+        window: float = 300.0,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the router."""
+        self.backends = backends
+        self.cache = cache
+        self.language_getter = language_getter or (lambda: "es-LA")
+        self.first_byte_timeout = first_byte_timeout
+        self.max_error_rate = max_error_rate
+        self.error_alpha = error_alpha
+        self.retry_after = retry_after
+        self.min_samples = min_samples
+        self.first_byte = {backend.name: RollingLatencySketch(window) for backend in backends}
+        self.error_rate = {backend.name: 0.0 for backend in backends}
+        self.next_probe = {backend.name: 0.0 for backend in backends}
+        self.last_resort = {backend.name for backend in backends if backend.last_resort}
+        self.stats = Counter()
+        self._refresh: Optional[asyncio.Future] = None
+
+        registry = registry or metrics_registry
+        self.request_counter = registry.counter(
+            "voice_agent_tts_requests", "TTS requests by backend and outcome", ("backend", "outcome")
+        )
+        self.first_byte_histogram = registry.histogram(
+            "voice_agent_tts_first_byte_seconds", "Time to the first audio byte per TTS backend", ("backend",)
+        )
+        self.healthy_gauge = registry.gauge(
+            "voice_agent_tts_backend_healthy", "Whether a TTS backend is taking utterances (1) or not (0)", ("backend",)
+        )
+        for backend in backends:
+            self.healthy_gauge.set(1, backend=backend.name)
+
+    @classmethod
+    def from_env(
+        cls, backends: List[TTSBackend], cache: Optional[PhraseCache], language_getter: Callable[[], str]
+    ) -> "TTSRouter":
+        """Create a router over ``backends`` from the TTS_* settings."""
+        return cls(
+            backends,
+            cache,
+            language_getter,
+            first_byte_timeout=float(os.getenv("TTS_FIRST_BYTE_TIMEOUT_MS", "1500")) / 1000,
+            max_error_rate=float(os.getenv("TTS_MAX_ERROR_RATE", "0.5")),
+            retry_after=float(os.getenv("TTS_RETRY_AFTER_MS", "10000")) / 1000,
+            min_samples=int(os.getenv("TTS_MIN_SAMPLES", "5")),
+            window=float(os.getenv("TTS_WINDOW_S", "300")),
+        )
+
+    @property
+    def voice_id(self) -> Optional[str]:
+        """Get the first backend's voice."""
+        return getattr(self.backends[0].service, "voice_id", None)
+
+    @voice_id.setter
+    def voice_id(self, voice_id: str):
+        """Set the voice on every backend that has one."""
+        for backend in self.backends:
+            if hasattr(backend.service, "voice_id"):
+                backend.service.voice_id = voice_id
+
+    def is_healthy(self, name: str, now: Optional[float] = None) -> bool:
+        """Check whether a backend is taking utterances, or is due a probe."""
+        if self.error_rate[name] <= self.max_error_rate:
+            return True
+        return (now if now is not None else time.monotonic()) >= self.next_probe[name]
+
+    def ranked(self) -> List[TTSBackend]:
+        """Get the healthy backends in the order to try them, or every backend if none is healthy."""
+        now = time.monotonic()
+        candidates = [(i, backend) for i, backend in enumerate(self.backends) if self.is_healthy(backend.name, now)]
+
+        def rank(item):
+            position, backend = item
+            recent = self.first_byte[backend.name].snapshot()
+            median = recent.quantile(0.5) if recent.count >= self.min_samples else 0.0
+            return (backend.last_resort, median, position)
+
+        return [backend for _, backend in sorted(candidates or enumerate(self.backends), key=rank)]
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+        first_byte: Optional[asyncio.Future] = None,
+    ) -> bytes:
+        """Synthesize and play ``text`` from the cache or on the first backend that succeeds."""
+        language = self.language_getter()
+        cached = self.cache.lookup(language, text) if self.cache else None
+        if cached is not None and (cached[1] not in self.last_resort or not self._provider_healthy()):
+            self.stats["cache_hits"] += 1
+            self.request_counter.inc(backend="cache", outcome="hit")
+            if first_byte is not None and not first_byte.done():
+                first_byte.set_result(None)
+            await self.play(cached[0])
+            return cached[0]
+
+        error: Optional[Exception] = None
+        for attempt, backend in enumerate(self.ranked()):
+            if attempt:
+                self.stats["failovers"] += 1
+                logger.warning("⚠️ TTS failing over to %s after: %s", backend.name, error)
+            try:
+                audio = await self._attempt(backend, text, voice_id, model_id, first_byte)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+                continue
+            if self.cache is not None and isinstance(audio, (bytes, bytearray)) and audio:
+                self.cache.store(language, text, bytes(audio), backend.name)
+                if not backend.last_resort:
+                    self._refresh_phrases()
+            return audio
+        raise error or RuntimeError("No TTS backend configured")
+
+    async def _attempt(
+        self,
+        backend: TTSBackend,
+        text: str,
+        voice_id: Optional[str],
+        model_id: Optional[str],
+        first_byte: Optional[asyncio.Future],
+    ):
+        """Synthesize on one backend, measuring its first byte and recording its health."""
+        name = backend.name
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if self.error_rate[name] > self.max_error_rate:
+            self.next_probe[name] = time.monotonic() + self.retry_after  # This utterance is the probe
+
+        attempt_first_byte = loop.create_future()
+
+        def on_first_byte(_):
+            elapsed = loop.time() - start
+            self.first_byte[name].add(elapsed * 1000)
+            self.first_byte_histogram.observe(elapsed, backend=name)
+            if first_byte is not None and not first_byte.done():
+                first_byte.set_result(None)
+
+        attempt_first_byte.add_done_callback(on_first_byte)
+        request = asyncio.ensure_future(
+            backend.service.synthesize(text, voice_id=voice_id, model_id=model_id, first_byte=attempt_first_byte)
+        )
+        try:
+            if self.first_byte_timeout:
+                await asyncio.wait(
+                    {request, attempt_first_byte},
+                    timeout=self.first_byte_timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not request.done() and not attempt_first_byte.done():
+                    raise asyncio.TimeoutError(f"no first byte from {name} in {self.first_byte_timeout}s")
+            audio = await request
+        except asyncio.CancelledError:
+            if not attempt_first_byte.done():  # Abandoned before its first byte: count how long it took so far
+                self.first_byte[name].add((loop.time() - start) * 1000)
+            self._count(name, "cancelled")
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.first_byte[name].add((loop.time() - start) * 1000)
+            self._record_health(name, error=True)
+            self._count(name, "error")
+            raise
+        finally:
+            attempt_first_byte.remove_done_callback(on_first_byte)
+            if not request.done():
+                request.cancel()
+        if not attempt_first_byte.done():  # Services that do not stream: the first byte comes with the audio
+            on_first_byte(attempt_first_byte)
+            attempt_first_byte.set_result(None)
+        self._record_health(name, error=False)
+        self._count(name, "ok")
+        if not backend.streams:
+            await self.play(audio)
+        return audio
+
+    async def play(self, audio: bytes, **kwargs: Any):
+        """Play already synthesized audio through the first backend that can."""
+        for backend in self.backends:
+            if hasattr(backend.service, "play"):
+                await backend.service.play(audio, **kwargs)
+                return
+
+    def _provider_healthy(self) -> bool:
+        """Check whether any backend other than the last resort is healthy."""
+        now = time.monotonic()
+        return any(not backend.last_resort and self.is_healthy(backend.name, now) for backend in self.backends)
+
+    def _refresh_phrases(self):
+        """Re-synthesize cached phrases the last-resort backend made, now that a provider is answering."""
+        if not self.last_resort or not self.cache.phrases_from(self.last_resort):
+            return
+        if self._refresh is None or self._refresh.done():
+            # In an empty context, so a streaming backend does not play the phrases on the current call
+            self._refresh = contextvars.Context().run(asyncio.ensure_future, self.cache.warm(self))
+
+    def _record_health(self, name: str, error: bool):
+        """Update a backend's moving error rate."""
+        was_healthy = self.error_rate[name] <= self.max_error_rate
+        self.error_rate[name] += self.error_alpha * (float(error) - self.error_rate[name])
+        healthy = self.error_rate[name] <= self.max_error_rate
+        if healthy != was_healthy:
+            if healthy:
+                logger.info(f"✅ TTS backend {name} is healthy again")
+            else:
+                self.next_probe[name] = time.monotonic() + self.retry_after
+                logger.warning(f"⚠️ TTS backend {name} marked unhealthy")
+            self.healthy_gauge.set(int(healthy), backend=name)
+
+    def _count(self, name: str, outcome: str):
+        """Count one finished request."""
+        self.stats[outcome] += 1
+        self.request_counter.inc(backend=name, outcome=outcome)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get backend health, first-byte latency and outcomes for /health."""
+        now = time.monotonic()
+        backends = {}
+        for backend in self.backends:
+            recent = self.first_byte[backend.name].snapshot()
+            backends[backend.name] = {
+                "healthy": self.is_healthy(backend.name, now),
+                "error_rate": round(self.error_rate[backend.name], 3),
+                "first_byte_p50_ms": round(recent.quantile(0.5), 1),
+                "first_byte_p95_ms": round(recent.quantile(0.95), 1),
+                "samples": recent.count,
+                "last_resort": backend.last_resort,
+            }
+        return {
+            "order": [backend.name for backend in self.ranked()],
+            "backends": backends,
+            **{key: self.stats[key] for key in ("ok", "error", "cancelled", "failovers", "cache_hits")},
+            "cache": self.cache.get_stats() if self.cache else None,
+        }
+
+
+class SemanticResponseCache:
+    """Answers to the questions callers keep asking, reused across calls when a new question is close enough.
+
+    Entries are partitioned by tenant (the number that was dialed) and
+    language. A transcript is normalized (case, accents, punctuation,
+    greetings) and matched exactly first, then by cosine similarity of
+    TF-IDF weighted character n-grams, over an inverted index of the
+    partition's questions, which also give the IDF. A question is weighed
+    when it is stored, against the IDF of the last refresh, and all of them
+    are reweighed once ``idf_refresh`` questions came or went. A similar
+    question where either side has a content word the other lacks ("what
+    time do you open" and "... close", or "... open on sundays") is a
+    different question, and does not match. Only answers that are safe to
+    reuse are stored: an answer to a call's first turn, which the LLM wrote
+    from the system prompt and the question alone, to a self-contained
+    question (no digits, which carry reservation numbers and dates, no
+    reference to earlier turns, no caller introducing themselves and nothing
+    done on the caller's behalf, like cancelling or paying). Questions like
+    that are the only ones looked up. Entries expire after ``ttl`` seconds, and past
+    ``max_entries`` the least recently used go first.
+    """
+
+    # Words that refer back to earlier turns, after normalization
+    CONTEXT_WORDS = frozenset(
+        "eso esos esa esas ese aquello anterior mismo misma tambien entonces dijiste mencionaste repetir repite "
+        "that those these this it its also then again same said mentioned else repeat".split()
+    )
+    FOLLOW_UP_STARTS = ("y ", "o ", "que tal ", "and ", "or ", "what about ", "how about ")
+    GREETINGS = frozenset(
+        "hola oye buenas buenos dias tardes noches bueno pues este eh em mmm hi hello hey um uh please".split()
+    )
+    # Phrases where callers give their name, padded with spaces
+    INTRODUCTIONS = (" me llamo ", " mi nombre ", " soy ", " my name ", " i am ", " i m ", " im ")
+    # Requests to act on the caller's own booking or bill, whose answers carry their state
+    TRANSACTION_WORDS = frozenset(
+        "cancelar cancelo cancela cancelen reservar reservo reservame apartar cambiar cambio modificar modifico "
+        "reembolso devolucion cancel cancelled canceling cancelling book rebook reschedule change modify refund".split()
+    )
+    TRANSACTION_PHRASES = (" pagar mi ", " pagar la cuenta ", " pay my ", " pay the bill ", " pay for my ")
+    # Words that do not tell one question from another when only one side has them
+    FUNCTION_WORDS = frozenset(
+        "a al el la los las lo un una unos unas de del en con que se me te le les nos mi mis su sus tu y o por para "
+        "es son esta estan hay usted ustedes "
+        "an the of to in on at for with and or is are am be do does did you your we our i me my can could would "
+        "will there any some so guys just well puedo puede pueden tienen tiene quiero quisiera have has want".split()
+    )
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_entries: int = 1000,
+        min_similarity: float = 0.6,
+        ngram_sizes: Tuple[int, ...] = (3, 4, 5),
+        max_words: int = 25,
+        idf_refresh: int = 64,
+        enabled: bool = True,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+        self.ngram_sizes = ngram_sizes
+        self.max_words = max_words
+        self.idf_refresh = idf_refresh
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()  # Oldest use first
+        self.partitions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.lookups = Counter()
+
+        registry = registry or metrics_registry
+        self.lookup_counter = registry.counter(
+            "voice_agent_response_cache_lookups", "Response cache lookups by result", ("result",)
+        )
+        registry.gauge(
+            "voice_agent_response_cache_hit_ratio",
+            "Share of cacheable questions answered from the response cache",
+            callback=self.hit_ratio,
+        )
+        registry.gauge(
+            "voice_agent_response_cache_entries", "Answers in the response cache", callback=lambda: len(self.entries)
+        )
+
+    @classmethod
+    def from_env(cls) -> "SemanticResponseCache":
+        """Create a cache from the RESPONSE_CACHE_* settings."""
+        return cls(
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL_S", "3600")),
+            max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000")),
+            min_similarity=float(os.getenv("RESPONSE_CACHE_MIN_SIMILARITY", "0.6")),
+            enabled=os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true",
+        )
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Lower-case, strip accents and punctuation, and drop greetings and "por favor"."""
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        text = re.sub(r"\bpor favor\b", " ", re.sub(r"[^\w\s]", " ", text))
+        return " ".join(word for word in text.split() if word not in cls.GREETINGS)
+
+    def is_cacheable(self, normalized: str) -> bool:
+        """Check that a normalized question stands on its own and carries no caller data."""
+        words = normalized.split()
+        return (
+            0 < len(words) <= self.max_words
+            and not any(c.isdigit() for c in normalized)
+            and not f"{normalized} ".startswith(self.FOLLOW_UP_STARTS)
+            and not self.CONTEXT_WORDS.intersection(words)
+            and not self.TRANSACTION_WORDS.intersection(words)
+            and not any(phrase in f" {normalized} " for phrase in self.INTRODUCTIONS + self.TRANSACTION_PHRASES)
+        )
+
+    def _ngrams(self, normalized: str) -> Counter:
+        """Count the character n-grams of each word, padded with spaces."""
+        grams = Counter()
+        for word in normalized.split():
+            padded = f" {word} "
+            for n in self.ngram_sizes:
+                grams.update(padded[i : i + n] for i in range(max(1, len(padded) - n + 1)))
+        return grams
+
+    @staticmethod
+    def _weigh(grams: Counter, partition: Dict[str, Any]) -> Tuple[Dict[str, float], float]:
+        """Weigh n-gram counts by sublinear TF and smoothed IDF (as of the last refresh); get the weights and norm."""
+        size, df = partition["idf"]
+        weights = {
+            gram: (1 + math.log(count)) * (math.log((1 + size) / (1 + df.get(gram, 0))) + 1)
+            for gram, count in grams.items()
+        }
+        return weights, math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+
+    def lookup(self, tenant: str, language: str, transcript: str) -> Optional[SimpleNamespace]:
+        """Get the cached answer (text, audio, similarity) for a question, or None."""
+        if not self.enabled:
+            return None
+        normalized = self.normalize(transcript)
+        if not self.is_cacheable(normalized):
+            self._count("uncacheable")
+            return None
+        now = time.monotonic()
+        with self.lock:
+            match, similarity = self._nearest(tenant, language, normalized, now)
+            if match is None:
+                self._count("miss")
+                return None
+            entry = self.entries[(tenant, language, match)]
+            self.entries.move_to_end((tenant, language, match))
+            entry["hits"] += 1
+        self._count("hit")
+        return SimpleNamespace(text=entry["text"], audio=entry["audio"], question=match, similarity=similarity)
+
+    def _nearest(self, tenant: str, language: str, normalized: str, now: float) -> Tuple[Optional[str], float]:
+        """Find the most similar live question at or above ``min_similarity``, evicting expired ones (lock held)."""
+        partition = self.partitions.get((tenant, language))
+        if partition is not None and normalized in partition["questions"]:
+            if not self._expired((tenant, language, normalized), now):
+                return normalized, 1.0
+            partition = self.partitions.get((tenant, language))  # Gone if that was its last question
+        if partition is None:
+            return None, 0.0
+        if partition["vectors"] is None or partition["changes"] >= self.idf_refresh:
+            self._refresh_idf(partition)
+        query, query_norm = self._weigh(self._ngrams(normalized), partition)
+        scores: Dict[str, float] = {}
+        for gram, weight in query.items():
+            for question in partition["postings"].get(gram, ()):
+                scores[question] = scores.get(question, 0.0) + weight * partition["vectors"][question][0][gram]
+        vectors = partition["vectors"]
+        similar = sorted(((score / (query_norm * vectors[q][1]), q) for q, score in scores.items()), reverse=True)
+        for similarity, question in similar:
+            if similarity < self.min_similarity:
+                break
+            if self._unmatched_words(normalized, question) or self._unmatched_words(question, normalized):
+                continue
+            if not self._expired((tenant, language, question), now):  # Else try the next nearest
+                return question, similarity
+        return None, similar[0][0] if similar else 0.0
+
+    def _expired(self, key: Tuple[str, str, str], now: float) -> bool:
+        """Evict an entry past its TTL; tell whether it was (lock held)."""
+        if self.entries[key]["expires_at"] > now:
+            return False
+        self._evict(key)
+        return True
+
+    def _refresh_idf(self, partition: Dict[str, Any]):
+        """Take the IDF from the questions cached now and reweigh all of them (lock held)."""
+        partition["idf"] = (len(partition["questions"]), Counter(partition["df"]))
+        partition["vectors"] = {
+            question: self._weigh(grams, partition) for question, grams in partition["questions"].items()
+        }
+        partition["changes"] = 0
+
+    @classmethod
+    def _unmatched_words(cls, text: str, other: str) -> List[str]:
+        """Get the content words of ``text`` with no word in ``other`` sharing half their character trigrams."""
+
+        def trigrams(word: str) -> set:
+            padded = f" {word} "
+            return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+        others = [trigrams(word) for word in set(other.split())]
+        unmatched = []
+        for word in text.split():
+            if word in cls.FUNCTION_WORDS:
+                continue
+            grams = trigrams(word)  # Matched at a Dice coefficient of 0.5 or more
+            if not any(4 * len(grams & candidate) >= len(grams) + len(candidate) for candidate in others):
+                unmatched.append(word)
+        return unmatched
+
+    def store(self, tenant: str, language: str, transcript: str, text: str, audio: Optional[bytes] = None) -> bool:
+        """Cache the answer to a call's first question; False if the question is not safe to reuse."""
+        normalized = self.normalize(transcript)
+        if not self.enabled or not text or not self.is_cacheable(normalized):
+            return False
+        key = (tenant, language, normalized)
+        with self.lock:
+            if key in self.entries:
+                self._evict(key)
+            partition = self.partitions.setdefault(
+                (tenant, language),
+                {"questions": {}, "postings": {}, "df": Counter(), "idf": None, "vectors": None, "changes": 0},
+            )
+            grams = self._ngrams(normalized)
+            partition["questions"][normalized] = grams
+            for gram in grams:
+                partition["postings"].setdefault(gram, set()).add(normalized)
+            partition["df"].update(grams.keys())
+            if partition["vectors"] is not None:  # Weighed now, against the IDF of the last refresh
+                partition["vectors"][normalized] = self._weigh(grams, partition)
+                partition["changes"] += 1
+            self.entries[key] = {
+                "text": text,
+                "audio": bytes(audio) if isinstance(audio, (bytes, bytearray)) else None,
+                "expires_at": time.monotonic() + self.ttl,
+                "hits": 0,
+            }
+            while len(self.entries) > self.max_entries:
+                self._evict(next(iter(self.entries)))
+        return True
+
+    def _evict(self, key: Tuple[str, str, str]):
+        """Remove an entry and its question from the index (lock held)."""
+        tenant, language, normalized = key
+        self.entries.pop(key, None)
+        partition = self.partitions.get((tenant, language))
+        grams = partition["questions"].pop(normalized, None) if partition else None
+        if grams is None:
+            return
+        for gram in grams:
+            postings = partition["postings"][gram]
+            postings.discard(normalized)
+            if not postings:
+                del partition["postings"][gram]
+        df = partition["df"]
+        for gram in grams:
+            df[gram] -= 1
+            if not df[gram]:  # No question has the n-gram any more
+                del df[gram]
+        if partition["vectors"] is not None:
+            partition["vectors"].pop(normalized, None)
+            partition["changes"] += 1
+        if not partition["questions"]:
+            del self.partitions[(tenant, language)]
+
+    def _count(self, result: str):
+        """Count one lookup."""
+        self.lookups[result] += 1
+        self.lookup_counter.inc(result=result)
+
+    def hit_ratio(self) -> float:
+        """Get the share of cacheable questions answered from the cache."""
+        hits, misses = self.lookups["hit"], self.lookups["miss"]
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lookups, hit ratio and size for /health."""
+        with self.lock:
+            entries = len(self.entries)
+            audio_bytes = sum(len(entry["audio"] or b"") for entry in self.entries.values())
+        return {
+            "enabled": self.enabled,
+            **{result: self.lookups[result] for result in ("hit", "miss", "uncacheable")},
+            "hit_ratio": round(self.hit_ratio(), 4),
+            "entries": entries,
+            "audio_bytes": audio_bytes,
+            "min_similarity": self.min_similarity,
+            "ttl_s": self.ttl,
+        }
+
+
+class TurnTakingController:
+    """Decides how much silence ends a caller's turn, from what they said and how they speak.
+
+    The VAD has already waited ``vad_silence`` seconds of silence when
+    UserStoppedSpeakingFrame arrives. When the final transcript comes in, it
+    is classified as complete (terminal punctuation, or a short answer like
+    "sí" or "okay"), incomplete (a trailing comma, ellipsis, conjunction,
+    preposition or hesitation) or neutral, and each class has its own
+    silence. For neutral and incomplete turns that silence is scaled by how
+    slowly the caller speaks compared to ``reference_rate`` words per second,
+    and raised to cover the pauses they have been seen to make mid-turn. The
+    turn is held for whatever is left of it; if the caller speaks again in
+    the meantime the turn goes on with what they say next.
+    """
+
+    COMPLETE, NEUTRAL, INCOMPLETE = "complete", "neutral", "incomplete"
+    SHORT_ANSWERS = frozenset(
+        "si no ok okay vale claro bueno listo exacto correcto perfecto gracias adios "
+        "yes yeah yep nope sure right correct perfect thanks bye".split()
+    )
+    # Last words (after normalization) that leave a sentence hanging
+    INCOMPLETE_ENDINGS = frozenset(
+        "y e o u pero que de del a al en con sin para por porque pues el la los las un una mi tu su como cuando "
+        "donde si entonces este eh em mmm "
+        "and or but so because the a an to of for with without in on at my your his her our their like if when "
+        "where that um uh er".split()
+    )
+    DELAY_BUCKETS = (0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0, 1.5, 2.0)
+
+    def __init__(
+        self,
+        complete: float = 0.3,
+        neutral: float = 0.7,
+        incomplete: float = 1.2,
+        vad_silence: float = 0.3,
+        min_silence: float = 0.2,
+        max_silence: float = 2.0,
+        reference_rate: float = 2.5,
+        alpha: float = 0.3,
+        enabled: bool = True,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize with the silence in seconds that ends each class of turn."""
+        self.silence = {self.COMPLETE: complete, self.NEUTRAL: neutral, self.INCOMPLETE: incomplete}
+        self.vad_silence = vad_silence
+        self.min_silence = min_silence
+        self.max_silence = max_silence
+        self.reference_rate = reference_rate
+        self.alpha = alpha
+        self.enabled = enabled
+        self.turns = Counter()
+        self.held_seconds = 0.0
+        self.resumed = 0
+
+        registry = registry or metrics_registry
+        self.delay_histogram = registry.histogram(
+            "voice_agent_endpointing_delay_seconds",
+            "Time a turn was held after its final transcript to be sure the caller had finished",
+            ("completeness",),
+            buckets=self.DELAY_BUCKETS,
+        )
+        self.resumed_counter = registry.counter(
+            "voice_agent_endpointing_resumed", "Held turns the caller went on speaking in, instead of being cut off"
+        )
+
+    @classmethod
+    def from_env(cls) -> "TurnTakingController":
+        """Create a controller from the ENDPOINTING_* settings."""
+        return cls(
+            complete=float(os.getenv("ENDPOINTING_COMPLETE_MS", "300")) / 1000,
+            neutral=float(os.getenv("ENDPOINTING_NEUTRAL_MS", "700")) / 1000,
+            incomplete=float(os.getenv("ENDPOINTING_INCOMPLETE_MS", "1200")) / 1000,
+            vad_silence=float(os.getenv("ENDPOINTING_VAD_SILENCE_MS", "300")) / 1000,
+            min_silence=float(os.getenv("ENDPOINTING_MIN_MS", "200")) / 1000,
+            max_silence=float(os.getenv("ENDPOINTING_MAX_MS", "2000")) / 1000,
+            reference_rate=float(os.getenv("ENDPOINTING_REFERENCE_RATE", "2.5")),
+            enabled=os.getenv("ENDPOINTING_ENABLED", "true").lower() == "true",
+        )
 
-    def get_recent_calls(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent call history."""
-        with self.lock:
-            return sorted(self.call_history, key=lambda x: x["start_time"], reverse=True)[:limit]
+    @staticmethod
+    def new_caller() -> Dict[str, Optional[float]]:
+        """Get empty speaking statistics for a new call."""
+        return {"rate": None, "pause": None}
+
+    @classmethod
+    def classify(cls, text: str) -> str:
+        """Classify a transcript as a complete, incomplete or neutral turn."""
+        stripped = text.strip()
+        if stripped.endswith(("...", "…", ",", "-")):
+            return cls.INCOMPLETE
+        folded = unicodedata.normalize("NFKD", stripped.lower())
+        words = re.findall(r"\w+", "".join(c for c in folded if not unicodedata.combining(c)))
+        if not words:
+            return cls.NEUTRAL
+        if len(words) <= 3 and all(word in cls.SHORT_ANSWERS for word in words):
+            return cls.COMPLETE
+        if words[-1] in cls.INCOMPLETE_ENDINGS:
+            return cls.INCOMPLETE
+        return cls.COMPLETE if stripped[-1] in ".?!" else cls.NEUTRAL
+
+    def required_silence(self, text: str, caller: Dict[str, Optional[float]]) -> Tuple[str, float]:
+        """Get a transcript's class and the silence in seconds that ends the turn for this caller."""
+        completeness = self.classify(text)
+        silence = self.silence[completeness]
+        if completeness != self.COMPLETE:
+            if caller["rate"]:
+                silence *= min(max(self.reference_rate / caller["rate"], 0.75), 1.5)
+            if caller["pause"]:
+                silence = max(silence, 1.2 * caller["pause"])
+        return completeness, min(max(silence, self.min_silence), self.max_silence)
+
+    def hold(self, text: str, caller: Dict[str, Optional[float]], since_stopped: float) -> Tuple[str, float]:
+        """Get a transcript's class and how much longer to wait, ``since_stopped`` seconds after the VAD's stop."""
+        completeness, silence = self.required_silence(text, caller)
+        if not self.enabled:
+            return completeness, 0.0
+        return completeness, max(0.0, silence - self.vad_silence - since_stopped)
+
+    def _ewma(self, caller: Dict[str, Optional[float]], key: str, value: float):
+        """Fold a new observation into one of a caller's averages."""
+        previous = caller[key]
+        caller[key] = value if previous is None else (1 - self.alpha) * previous + self.alpha * value
+
+    def observe_speech(self, caller: Dict[str, Optional[float]], text: str, seconds: float):
+        """Update a caller's speaking rate from a turn's words and the seconds they spent saying them."""
+        words = len(text.split())
+        if words >= 3 and seconds >= 0.5:
+            self._ewma(caller, "rate", words / seconds)
+
+    def observe_pause(self, caller: Dict[str, Optional[float]], seconds: float):
+        """Update a caller's mid-turn pause from a held turn they went on speaking in."""
+        self._ewma(caller, "pause", seconds)
+        self.resumed += 1
+        self.resumed_counter.inc()
+
+    def record(self, completeness: str, delay: float):
+        """Record the delay added to a turn that was taken."""
+        self.turns[completeness] += 1
+        self.held_seconds += delay
+        self.delay_histogram.observe(delay, completeness=completeness)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the knobs, turns per class and delays for /health."""
+        turns = sum(self.turns.values())
+        return {
+            "enabled": self.enabled,
+            "silence_ms": {completeness: round(seconds * 1000) for completeness, seconds in self.silence.items()},
+            "vad_silence_ms": round(self.vad_silence * 1000),
+            "reference_rate": self.reference_rate,
+            "turns": {completeness: self.turns[completeness] for completeness in self.silence},
+            "resumed": self.resumed,
+            "mean_delay_ms": round(1000 * self.held_seconds / turns, 1) if turns else 0.0,
+        }
 
 
-class PerformanceMonitor:
-    """Real-time performance monitoring for production calls."""
+class BackchannelScheduler:
+    """Short backchannels ("mm-hmm", "claro", "un momento") that cover the silence while a slow answer is prepared.
+
+    Cues are planned when a turn's LLM request starts. When the rolling median
+    first-audio latency of recent turns is at least ``predicted_threshold``,
+    the turn is expected to be slow and one of the language's backchannels
+    plays ``lead`` seconds in; they take turns, so the same one is not heard
+    twice in a row. Whether or not one was predicted, the language's filler
+    plays once the LLM misses its ``llm_first_token`` deadline. A cue still
+    waiting when the answer is ready is dropped, and a cue never plays over
+    the caller: not while they are speaking, nor within ``quiet`` seconds of
+    them stopping. At most ``max_per_turn`` cues play in a turn, the filler
+    always among them. Disabled, only the deadline filler plays, whenever it
+    is due.
+    """
+
+    PREDICTED, OBSERVED = "predicted", "observed"
+    OUTCOMES = ("played", "suppressed", "unavailable")
+
+    def __init__(
+        self,
+        language_manager: "LanguageManager",
+        predicted_threshold: float = 1.0,
+        lead: float = 0.4,
+        quiet: float = 0.3,
+        max_per_turn: int = 2,
+        min_samples: int = 20,
+        window: float = 60.0,
+        enabled: bool = True,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize with thresholds in seconds."""
+        self.language_manager = language_manager
+        self.predicted_threshold = predicted_threshold
+        self.lead = lead
+        self.quiet = quiet
+        self.max_per_turn = max_per_turn
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self.turns = RollingLatencySketch(window)  # First-audio latency of recent turns (ms)
+        self.rotation = Counter()
+        self.cues = Counter()
+
+        registry = registry or metrics_registry
+        self.cue_counter = registry.counter(
+            "voice_agent_backchannels",
+            "Backchannel and filler cues that came due, by trigger and outcome",
+            ("language", "trigger", "outcome"),
+        )
 
-    def __init__(self):
-        """Initialize the PerformanceMonitor with empty metrics tracking."""
-        self.call_metrics: Dict[str, Dict[str, Any]] = {}
-        self.global_metrics = {
-            "total_calls": 0,
-            "total_interruptions": 0,
-            "total_slang_detections": 0,
-            "total_low_quality_handling": 0,
-            "total_language_switches": 0,
-            "latency_target_met": 0,
-            "latency_target_missed": 0,
-        }
+    @classmethod
+    def from_env(cls, language_manager: "LanguageManager") -> "BackchannelScheduler":
+        """Create a scheduler from the BACKCHANNEL_* settings."""
+        return cls(
+            language_manager,
+            predicted_threshold=float(os.getenv("BACKCHANNEL_PREDICTED_MS", "1000")) / 1000,
+            lead=float(os.getenv("BACKCHANNEL_LEAD_MS", "400")) / 1000,
+            quiet=float(os.getenv("BACKCHANNEL_QUIET_MS", "300")) / 1000,
+            max_per_turn=int(os.getenv("BACKCHANNEL_MAX_PER_TURN", "2")),
+            min_samples=int(os.getenv("BACKCHANNEL_MIN_SAMPLES", "20")),
+            enabled=os.getenv("BACKCHANNEL_ENABLED", "true").lower() == "true",
+        )
 
-    def start_call_monitoring(self, call_sid: str):
-        """Start monitoring a new call."""
-        self.call_metrics[call_sid] = {
-            "start_time": time.time(),
-            "stt_latencies": [],
-            "llm_latencies": [],
-            "tts_latencies": [],
-            "roundtrip_latencies": [],
-            "interruptions": 0,
-            "slang_detections": 0,
-            "low_quality_handling": 0,
-            "language_switches": 0,
-            "edge_cases_handled": [],
+    def observe(self, first_audio_latency: float):
+        """Add a turn's first-audio latency (seconds) to the rolling window."""
+        self.turns.add(first_audio_latency * 1000)
+
+    def predicted(self) -> float:
+        """Get the predicted first-audio latency of the next turn in seconds, 0 while there are too few turns."""
+        recent = self.turns.snapshot()
+        return recent.quantile(0.5) / 1000 if recent.count >= self.min_samples else 0.0
+
+    def plan(self, language: str, filler_after: float) -> List[Tuple[float, str, str]]:
+        """Get a turn's cues as (seconds after the LLM request, text, trigger), in order."""
+        config = self.language_manager.language_configs[language]
+        cues = []
+        if self.enabled and config.get("backchannels") and self.predicted() >= self.predicted_threshold:
+            backchannels = config["backchannels"]
+            cues.append((self.lead, backchannels[self.rotation[language] % len(backchannels)], self.PREDICTED))
+            self.rotation[language] += 1
+        if self.enabled:
+            # Past max_per_turn backchannels go first: the deadline filler is also how a missed deadline is counted
+            cues = cues[: max(0, self.max_per_turn - (1 if filler_after else 0))]
+        if filler_after:
+            cues.append((filler_after, config["filler"], self.OBSERVED))
+        cues.sort(key=lambda cue: cue[0])
+        return cues
+
+    def holds_back(self, caller_speaking: bool, since_caller_stopped: Optional[float]) -> bool:
+        """Whether a cue due now would play over the caller."""
+        if not self.enabled:
+            return False
+        return caller_speaking or (since_caller_stopped is not None and since_caller_stopped < self.quiet)
+
+    def record(self, language: str, trigger: str, outcome: str):
+        """Count a cue that came due."""
+        self.cues[(trigger, outcome)] += 1
+        self.cue_counter.inc(language=language, trigger=trigger, outcome=outcome)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the settings, the prediction and cue outcomes for /health."""
+        return {
+            "enabled": self.enabled,
+            "predicted_ms": round(self.predicted() * 1000, 1),
+            "predicted_threshold_ms": round(self.predicted_threshold * 1000),
+            "lead_ms": round(self.lead * 1000),
+            "quiet_ms": round(self.quiet * 1000),
+            **{
+                trigger: {outcome: self.cues[(trigger, outcome)] for outcome in self.OUTCOMES}
+                for trigger in (self.PREDICTED, self.OBSERVED)
+            },
         }
-        self.global_metrics["total_calls"] += 1
 
-    def record_stt_latency(self, call_sid: str, latency: float):
-        """Record STT latency for a call."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["stt_latencies"].append(latency)
 
-    def record_llm_latency(self, call_sid: str, latency: float):
-        """Record LLM latency for a call."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["llm_latencies"].append(latency)
+class EchoSuppressor:
+    """Tells the agent's own playback echoing back over the phone line from the caller barging in.
+
+    Over phone lines the audio being played often comes back, attenuated and
+    delayed, in the inbound stream, where the VAD takes it for the caller
+    starting to speak. Every outbound chunk is known, so each call keeps what
+    was played, placed on its playback timeline (chunks sent ahead queue
+    behind the ones still playing), and the last ``window`` seconds heard.
+    When the VAD fires while audio has played within ``max_delay`` seconds,
+    the heard window is cross-correlated with the played audio at every lag up
+    to ``max_delay``; a normalized correlation of at least ``threshold`` means
+    the line is only echoing the agent, and the speech start is gated. A
+    caller talking over the echo adds audio the playback does not explain, so
+    the correlation drops: a gated start is checked again every ``recheck``
+    seconds and released as the caller's once it does. Audio is mono 16-bit
+    PCM at ``sample_rate``.
+    """
+
+    OUTCOMES = ("echo", "speech", "released")
+    SILENCE_RMS = 64.0  # Quieter windows are neither echo nor speech
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        window: float = 0.25,
+        max_delay: float = 0.5,
+        recheck: float = 0.1,
+        sample_rate: int = 8000,
+        enabled: bool = True,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize with the correlation threshold and durations in seconds."""
+        self.threshold = threshold
+        self.window = window
+        self.max_delay = max_delay
+        self.recheck = recheck
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self.outcomes = Counter()
+
+        registry = registry or metrics_registry
+        self.outcome_counter = registry.counter(
+            "voice_agent_echo_checks",
+            "Caller speech starts during playback by outcome: echo (gated), speech, or released after echo",
+            ("outcome",),
+        )
 
-    def record_tts_latency(self, call_sid: str, latency: float):
-        """Record TTS latency for a call."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["tts_latencies"].append(latency)
+    @classmethod
+    def from_env(cls) -> "EchoSuppressor":
+        """Create a suppressor from the ECHO_* settings."""
+        return cls(
+            threshold=float(os.getenv("ECHO_THRESHOLD", "0.6")),
+            window=float(os.getenv("ECHO_WINDOW_MS", "250")) / 1000,
+            max_delay=float(os.getenv("ECHO_MAX_DELAY_MS", "500")) / 1000,
+            recheck=float(os.getenv("ECHO_RECHECK_MS", "100")) / 1000,
+            enabled=os.getenv("ECHO_SUPPRESSION_ENABLED", "true").lower() == "true",
+        )
 
-    def record_roundtrip_latency(self, call_sid: str, latency: float):
-        """Record complete roundtrip latency for a call."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["roundtrip_latencies"].append(latency)
+    @staticmethod
+    def new_call() -> Dict[str, Any]:
+        """Get a call's audio state: played audio from the loop time ``played_from``, and recent heard audio."""
+        return {"played": bytearray(), "played_from": None, "heard": bytearray(), "checked_at": None}
+
+    def feed(self, call: Dict[str, Any], frame, now: float):
+        """Keep an inbound (InputAudioRawFrame) or outbound (OutputAudioRawFrame) frame's audio."""
+        if not self.enabled or frame.sample_rate != self.sample_rate or frame.num_channels != 1:
+            return
+        if isinstance(frame, InputAudioRawFrame):
+            heard = call["heard"]
+            heard += frame.audio
+            del heard[: -2 * int(self.window * self.sample_rate)]
+            return
+
+        played = call["played"]
+        if call["played_from"] is not None:
+            idle = now - call["played_from"] - len(played) / 2 / self.sample_rate
+        if call["played_from"] is None or idle > self.window + self.max_delay:
+            played.clear()
+            call["played_from"] = now
+        elif idle > 0:  # Nothing was playing: the chunk plays now, after a silence
+            played += bytes(2 * int(idle * self.sample_rate))
+        played += frame.audio
+        self._trim(call, now)
+
+    def _trim(self, call: Dict[str, Any], now: float):
+        """Drop played audio too old to be echoing now."""
+        drop = int((now - call["played_from"] - self.window - self.max_delay) * self.sample_rate)
+        if drop > 0:
+            del call["played"][: 2 * drop]
+            call["played_from"] += drop / self.sample_rate
+
+    def stop(self, call: Dict[str, Any], now: float):
+        """Drop audio sent ahead that will not play: the playback was stopped or interrupted."""
+        if call["played_from"] is not None:
+            del call["played"][2 * max(0, int((now - call["played_from"]) * self.sample_rate)) :]
+
+    def playing(self, call: Dict[str, Any], now: float) -> bool:
+        """Whether audio played recently enough for its echo to be in the heard window."""
+        if not self.enabled or call["played_from"] is None:
+            return False
+        return now - call["played_from"] - len(call["played"]) / 2 / self.sample_rate <= self.max_delay + self.window
+
+    def score(self, call: Dict[str, Any], now: float) -> Optional[float]:
+        """Get how well the playback explains the heard window (0 without playback), None if it is quiet."""
+        import numpy as np
+
+        call["checked_at"] = now
+        heard = np.frombuffer(bytes(call["heard"]), dtype="<i2").astype(np.float64)
+        if not len(heard) or np.mean(heard * heard) < self.SILENCE_RMS**2:
+            return None
+        if not self.playing(call, now):
+            return 0.0
+        self._trim(call, now)
+        end = int((now - call["played_from"]) * self.sample_rate)
+        start = end - len(heard) - int(self.max_delay * self.sample_rate)
+        played = np.frombuffer(bytes(call["played"][2 * max(0, start) : 2 * end]), dtype="<i2").astype(np.float64)
+        # Silence before the playback started and after it ended
+        played = np.concatenate((np.zeros(max(0, -start)), played, np.zeros(end - max(0, start) - len(played))))
+        return self.correlation(heard, played)
+
+    @classmethod
+    def correlation(cls, heard, played) -> float:
+        """Get the peak normalized cross-correlation of ``heard`` with any window of ``played`` (numpy arrays)."""
+        import numpy as np
+
+        n = len(heard)
+        if len(played) < n:
+            played = np.concatenate((np.zeros(n - len(played)), played))
+        size = 1 << (len(played) + n).bit_length()
+        dots = np.fft.irfft(np.fft.rfft(played, size) * np.conj(np.fft.rfft(heard, size)), size)
+        dots = np.abs(dots[: len(played) - n + 1])  # Every lag at once; the line may invert the signal
+        energy = np.cumsum(np.concatenate(([0.0], played * played)))
+        window_energy = energy[n:] - energy[:-n]
+        audible = window_energy > n * cls.SILENCE_RMS**2
+        if not audible.any():
+            return 0.0
+        return float((dots[audible] / np.sqrt(window_energy[audible] * np.dot(heard, heard))).max())
+
+    def is_echo(self, call: Dict[str, Any], now: float) -> bool:
+        """Whether a speech start is the playback's echo (checked, and counted, only during playback)."""
+        if not self.playing(call, now):
+            return False
+        score = self.score(call, now)
+        echo = score is not None and score >= self.threshold
+        self.record("echo" if echo else "speech")
+        return echo
+
+    def releases(self, call: Dict[str, Any], now: float) -> bool:
+        """Whether a gated speech start is now the caller's: heard audio the playback does not explain."""
+        if not self.enabled or now - call["checked_at"] < self.recheck:
+            return False
+        score = self.score(call, now)
+        if score is None or score >= self.threshold:
+            return False
+        self.record("released")
+        return True
+
+    def record(self, outcome: str):
+        """Count a speech start's outcome."""
+        self.outcomes[outcome] += 1
+        self.outcome_counter.inc(outcome=outcome)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the settings and speech start outcomes for /health."""
+        checked = self.outcomes["echo"] + self.outcomes["speech"]
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "window_ms": round(self.window * 1000),
+            "max_delay_ms": round(self.max_delay * 1000),
+            **{outcome: self.outcomes[outcome] for outcome in self.OUTCOMES},
+            "echo_ratio": round(self.outcomes["echo"] / checked, 3) if checked else 0.0,
+        }
 
-            # Check if latency target was met
-            if latency < 0.5:  # 500ms
-                self.global_metrics["latency_target_met"] += 1
-            else:
-                self.global_metrics["latency_target_missed"] += 1
 
-    def record_interruption(self, call_sid: str):
-        """Record user interruption for a call."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["interruptions"] += 1
-            self.global_metrics["total_interruptions"] += 1
+class ConversationProcessor(FrameProcessor):
+    """Per-call conversation logic: turn taking, language handling and the LLM/TTS round trip."""
 
-    def record_slang_detection(self, call_sid: str, slang_phrase: str):
-        """Record Mexican Spanish slang detection."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["slang_detections"] += 1
-            self.call_metrics[call_sid]["edge_cases_handled"].append(f"slang: {slang_phrase}")
-            self.global_metrics["total_slang_detections"] += 1
+    # Frames kept in call recordings (transcriptions are recorded with their text)
+    RECORDED_FRAMES = {
+        UserStartedSpeakingFrame: "user_started_speaking",
+        UserStoppedSpeakingFrame: "user_stopped_speaking",
+        BotStoppedSpeakingFrame: "bot_stopped_speaking",
+    }
 
-    def record_low_quality_handling(self, call_sid: str, issue_type: str):
-        """Record low audio quality handling."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["low_quality_handling"] += 1
-            self.call_metrics[call_sid]["edge_cases_handled"].append(f"audio_quality: {issue_type}")
-            self.global_metrics["total_low_quality_handling"] += 1
+    def __init__(self, agent: "TwilioVoiceAgent", call_sid: Optional[str] = None, language: Optional[str] = None):
+        """Initialize the processor, optionally bound to a call."""
+        super().__init__()
+        self.agent = agent
+        self.pipeline = None  # Pipeline wrapping this processor when built by PipelinePool
+        self.voicemail_threshold = 3.0  # 3 seconds of silence
+        self.pending_turn: Optional[asyncio.Future] = None
+        self.reset(call_sid, language)
+
+    def reset(self, call_sid: Optional[str] = None, language: Optional[str] = None):
+        """Clear all per-call state and bind the processor to a new call (or to none, while pooled)."""
+        self.conversation_history = []
+        self.is_speaking = False
+        self.answering = False  # From taking a turn until its answer has played
+        self.caller_speaking = False
+        self.last_user_input = ""
+        self.silence_start = None
+        if self.pending_turn and not self.pending_turn.done():
+            self.pending_turn.cancel()
+        self.pending_turn = None  # Held turn, answered once the caller has been silent long enough
+        self.held_text = ""  # Transcript of the turn being held, or continued after a mid-turn pause
+        self.caller_timing = self.agent.turn_taking.new_caller()
+        self.echo = self.agent.echo_suppressor.new_call()  # Audio played and heard on the call
+        self.echo_gated = False  # The caller's last speech start was the playback's echo
+        self.speech_started = None  # Loop times of the caller's last VAD start and stop
+        self.speech_stopped = None
+        self.speech_seconds = 0.0  # Speaking time in the turn so far
+        self.trace = None  # TurnTrace of the turn in progress (flight recorder)
+        self.endpointing_span = None
+        self.stt_span = None
+        self.current_call_sid = call_sid
+        self.language = language or self.agent.language_manager.primary_language  # Language the call started in
+
+    async def process(self, frame):
+        """Handle one frame from the pipeline."""
+        if isinstance(frame, (InputAudioRawFrame, OutputAudioRawFrame)):
+            # Audio is only kept to tell the playback's echo from the caller
+            now = asyncio.get_running_loop().time()
+            self.agent.echo_suppressor.feed(self.echo, frame, now)
+            if self.echo_gated and isinstance(frame, InputAudioRawFrame):
+                if self.agent.echo_suppressor.releases(self.echo, now):
+                    # The caller is talking over the echo: the gated speech start was theirs after all
+                    self.echo_gated = False
+                    logger.info("🎤 User speaking over the echo", extra={"category": "frame"})
+                    self._caller_started()
+            return frame
+
+        current_time = time.time()
+        if self.agent.call_recorder.enabled and self.current_call_sid:
+            self._record_frame(frame)
+
+        if isinstance(frame, UserStartedSpeakingFrame):
+            self.echo_gated = self.agent.echo_suppressor.is_echo(self.echo, asyncio.get_running_loop().time())
+            if self.echo_gated:
+                # The line echoing the agent back: not the caller, so nothing is interrupted yet
+                if self.trace:
+                    self.trace.event("echo_suppressed")
+                logger.info("🔁 Echo of the playback - not an interruption", extra={"category": "frame"})
+                return frame
+            self._caller_started()
+
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            if self.echo_gated:
+                return frame
+            # User stopped speaking - start silence timer
+            self.silence_start = current_time
+            self.caller_speaking = False
+            self.speech_stopped = asyncio.get_running_loop().time()
+            if self.speech_started is not None:
+                self.speech_seconds += self.speech_stopped - self.speech_started
+                self.speech_started = None
+            if self.current_call_sid:
+                self._finish_turn(interrupted=True)
+                self.trace = self.agent.flight_recorder.start_turn(self.current_call_sid)
+                bind_call_context(self.current_call_sid, self.trace.turn)
+                self.endpointing_span = self.trace.start("endpointing", self.trace.start_ns)
+                self.stt_span = self.trace.start("stt_final", self.trace.start_ns)
+            logger.info("🔇 User stopped speaking", extra={"category": "frame"})
+            if self.held_text and self.pending_turn is None:
+                # Resumed, but a final transcript may never come (a cough): hold what was said until the longest wait
+                await self._hold_turn(self.held_text, self.agent.turn_taking.max_silence)
+
+        elif isinstance(frame, BotStoppedSpeakingFrame):
+            # Bot audio finished playing - the turn is complete
+            if self.trace:
+                self.trace.event("playback_complete")
+            self.is_speaking = False
+            self.answering = False
+            self.agent.echo_suppressor.stop(self.echo, asyncio.get_running_loop().time())
+            self._finish_turn()
+
+        elif isinstance(frame, TranscriptionFrame):
+            if self.echo_gated:
+                # The agent's own words, transcribed from the echo
+                self.echo_gated = False
+                logger.info("🔁 Dropped transcript of the echo: %s", frame.text, extra={"category": "transcript"})
+                return frame
+            # Process speech-to-text result
+            user_text = frame.text
+            if self.stt_span and self.stt_span[2] is None:
+                stt_ns = self.trace.end(self.stt_span, text_length=len(user_text or ""))
+                self.agent.performance_monitor.record_stt_latency(self.current_call_sid, stt_ns / 1e9)
+
+            if user_text and user_text != self.last_user_input:
+                self.last_user_input = user_text
+                logger.info("🎯 User said: %s", user_text, extra={"category": "transcript"})
+                if self.held_text:
+                    # More of a held turn: answer it all at once
+                    if self.pending_turn:
+                        self.pending_turn.cancel()
+                        self.pending_turn = None
+                    user_text = f"{self.held_text} {user_text}"
+                await self._hold_turn(user_text)
+
+        # Check for voicemail (prolonged silence)
+        if self.silence_start and current_time - self.silence_start > self.voicemail_threshold and not self.is_speaking:
+            logger.info("📞 Voicemail detected - ending call")
+            await self.agent._end_call_voicemail()
+
+        return frame
+
+    def _caller_started(self):
+        """Handle the caller starting to speak: a held turn goes on, else what is playing or coming is interrupted."""
+        self.speech_started = asyncio.get_running_loop().time()
+        self.caller_speaking = True
+        self.silence_start = None
+        if self.held_text and self.pending_turn and not self.pending_turn.done():
+            # The caller only paused: the held turn goes on with what they say next
+            self.pending_turn.cancel()
+            self.pending_turn = None
+            if self.speech_stopped is not None:
+                pause = self.agent.turn_taking.vad_silence + self.speech_started - self.speech_stopped
+                self.agent.turn_taking.observe_pause(self.caller_timing, pause)
+            if self.trace:
+                self.trace.event("turn_resumed")
+            self._finish_turn()
+            logger.info("🎤 User resumed speaking - turn held", extra={"category": "frame"})
+            return
+
+        # User started speaking - stop TTS if active
+        if self.is_speaking:
+            self._finish_turn(interrupted=True)
+        interrupted = self.is_speaking or self.answering
+        self.is_speaking = False
+        self.answering = False
+        self.agent.echo_suppressor.stop(self.echo, self.speech_started)
+        logger.info("🎤 User started speaking - interrupting TTS", extra={"category": "frame"})
+
+        # Record interruption for performance monitoring: the caller spoke over the answer or the wait for it
+        if self.current_call_sid and interrupted:
+            self.agent.performance_monitor.record_interruption(self.current_call_sid)
+
+    async def _hold_turn(self, user_text: str, minimum: float = 0.0):
+        """Take the turn now if the caller is done, else hold it for the silence the controller asks for."""
+        since_stopped = asyncio.get_running_loop().time() - self.speech_stopped if self.speech_stopped else 0.0
+        completeness, delay = self.agent.turn_taking.hold(user_text, self.caller_timing, since_stopped)
+        delay = max(delay, minimum)
+        if delay <= 0:
+            self.held_text = ""
+            self.agent.turn_taking.record(completeness, 0.0)
+            await self._take_turn(user_text)
+            return
+        self.held_text = user_text
+        if self.trace:
+            self.trace.event("turn_held")
+        self.pending_turn = asyncio.ensure_future(self._take_held_turn(user_text, completeness, delay))
+
+    async def _take_held_turn(self, user_text: str, completeness: str, delay: float):
+        """Take a held turn once its silence has passed without the caller speaking again."""
+        await asyncio.sleep(delay)
+        self.held_text = ""
+        self.agent.turn_taking.record(completeness, delay)
+        await self._take_turn(user_text)
+
+    async def turn_taken(self):
+        """Wait until a held turn is answered or continued (for callers that send frames one at a time)."""
+        if self.pending_turn:
+            await asyncio.wait({self.pending_turn})
+
+    async def _take_turn(self, user_text: str):
+        """Answer the caller's finished turn."""
+        self.agent.turn_taking.observe_speech(self.caller_timing, user_text, self.speech_seconds)
+        self.speech_seconds = 0.0
+
+        # Language detection and switching
+        (
+            detected_lang,
+            confidence,
+        ) = self.agent.language_manager.detect_language_from_text(user_text)
+        language_switched = self.agent.language_manager.update_language(detected_lang, confidence)
+
+        if language_switched and self.current_call_sid:
+            # Record language switch
+            old_lang = self.agent.language_manager.current_language
+            self.agent.performance_monitor.record_language_switch(self.current_call_sid, old_lang, detected_lang)
+
+            # Update services for new language
+            self.agent.update_language_services(detected_lang)
+
+            # Log language switch
+            logger.info("🌍 Language switched to: %s (confidence: %.2f)", detected_lang, confidence)
+
+        # Detect Mexican Spanish slang (only for Spanish)
+        if self.agent.language_manager.current_language == "es-LA":
+            if self.agent.detect_mexican_slang(user_text):
+                logger.info("🇲🇽 Mexican Spanish slang detected")
+                if self.current_call_sid:
+                    self.agent.performance_monitor.record_slang_detection(self.current_call_sid, user_text)
+
+        # Detect audio quality issues
+        audio_issue = self.agent.detect_audio_quality_issues(user_text)
+        if audio_issue:
+            logger.info("🔊 Audio quality issue detected: %s", audio_issue)
+            if self.current_call_sid:
+                self.agent.performance_monitor.record_low_quality_handling(self.current_call_sid, audio_issue)
+
+        # Add to conversation history
+        self.conversation_history.append(
+            {
+                "role": "user",
+                "content": user_text,
+                "timestamp": time.time(),
+                "language": self.agent.language_manager.current_language,
+            }
+        )
 
-    def record_language_switch(self, call_sid: str, from_lang: str, to_lang: str):
-        """Record language switch for a call."""
-        if call_sid in self.call_metrics:
-            self.call_metrics[call_sid]["language_switches"] += 1
-            self.call_metrics[call_sid]["edge_cases_handled"].append(f"language_switch: {from_lang} -> {to_lang}")
-            self.global_metrics["total_language_switches"] += 1
+        # Get AI response
+        self.answering = True
+        await self._get_ai_response(user_text)
 
-    def get_call_summary(self, call_sid: str) -> Dict[str, Any]:
-        """Get performance summary for a specific call."""
-        if call_sid not in self.call_metrics:
-            return {}
+    def _record_frame(self, frame):
+        """Add a caller-side or playback frame to the call recording."""
+        if isinstance(frame, TranscriptionFrame):
+            event = {"type": "transcription", "text": frame.text}
+        elif type(frame) in self.RECORDED_FRAMES:
+            event = {"type": self.RECORDED_FRAMES[type(frame)]}
+        else:
+            return
+        self.agent.call_recorder.record(self.current_call_sid, CallRecorder.FRAME, event)
+
+    def _finish_turn(self, interrupted: bool = False):
+        """Close the current turn trace, exporting it if it was slow."""
+        if self.trace is None:
+            return
+        if interrupted:
+            self.trace.event("interrupted")
+        self.agent.flight_recorder.finish_turn(self.trace)
+        self.trace = None
+        self.endpointing_span = None
+        self.stt_span = None
+
+    async def _get_ai_response(self, user_input: str):
+        """Get AI response and convert to speech, holding each stage to the language's deadlines."""
+        trace = self.trace
+        recorder = self.agent.call_recorder
+        language = self.agent.language_manager.current_language
+        stage = CallRecorder.LLM
+        try:
+            start_time = time.time()
+            if trace and self.endpointing_span[2] is None:
+                trace.end(self.endpointing_span)
+
+            # The caller's first turn goes ahead of later turns when a provider is saturated
+            priority = ConcurrencyLimiter.FIRST_TURN if len(self.conversation_history) <= 1 else ConcurrencyLimiter.TURN
+
+            # Questions callers keep asking are answered from the cache, audio included
+            tenant = self.agent.call_manager.active_calls.get(self.current_call_sid, {}).get("tenant") or ""
+            cached = self.agent.response_cache.lookup(tenant, language, user_input)
+            if cached:
+                if trace:
+                    trace.event("response_cache_hit")
+                response = SimpleNamespace(content=cached.text)
+            else:
+                response = await self._respond(priority, trace, language)
+
+            if response and hasattr(response, "content"):
+                ai_response = response.content
+                current_lang = self.agent.language_manager.current_language
+                logger.info("🤖 AI Response (%s): %s", current_lang, ai_response, extra={"category": "transcript"})
+
+                # Add AI response to history
+                self.conversation_history.append(
+                    {
+                        "role": "assistant",
+                        "content": ai_response,
+                        "timestamp": time.time(),
+                        "language": current_lang,
+                    }
+                )
 
-        metrics = self.call_metrics[call_sid]
+                # Convert to speech
+                stage = CallRecorder.TTS
+                if cached and await self.agent.play_audio(cached.audio, "cached response"):
+                    if trace:
+                        trace.event("first_audio_sent")
+                else:
+                    audio = await self._speak(ai_response, priority, trace, language)
+                    # Only a first turn's answer comes from the system prompt and the question alone
+                    first_turn = priority == ConcurrencyLimiter.FIRST_TURN
+                    if not cached and first_turn and not getattr(response, "fallback", False):
+                        self.agent.response_cache.store(tenant, language, user_input, ai_response, audio)
+
+                if self.current_call_sid and trace:
+                    first_audio_latency = trace.event_ms("first_audio_sent") / 1000
+                    self.agent.performance_monitor.record_first_audio_latency(
+                        self.current_call_sid, first_audio_latency
+                    )
+                    self.agent.admission.record_turn(first_audio_latency)
+                    self.agent.backchannels.observe(first_audio_latency)
+
+                # Mark as speaking
+                self.is_speaking = True
+                self.silence_start = None
+
+                # Calculate total latency
+                total_latency = time.time() - start_time
+
+                # Record roundtrip latency
+                if self.current_call_sid:
+                    self.agent.performance_monitor.record_roundtrip_latency(self.current_call_sid, total_latency)
+
+                logger.info("⚡ Response latency: %.3fs", total_latency, extra={"category": "latency"})
+
+                if total_latency > self.agent.latency_target:
+                    logger.warning("⚠️ Latency %.3fs exceeds target %ss", total_latency, self.agent.latency_target)
+                else:
+                    logger.info(
+                        "✅ Latency target met: %.3fs < %ss",
+                        total_latency,
+                        self.agent.latency_target,
+                        extra={"category": "latency"},
+                    )
 
-        return {
-            "call_duration": time.time() - metrics["start_time"],
-            "total_interactions": len(metrics["roundtrip_latencies"]),
-            "avg_roundtrip_latency": statistics.mean(metrics["roundtrip_latencies"])
-            if metrics["roundtrip_latencies"]
-            else 0,
-            "min_roundtrip_latency": min(metrics["roundtrip_latencies"]) if metrics["roundtrip_latencies"] else 0,
-            "max_roundtrip_latency": max(metrics["roundtrip_latencies"]) if metrics["roundtrip_latencies"] else 0,
-            "interruptions": metrics["interruptions"],
-            "slang_detections": metrics["slang_detections"],
-            "low_quality_handling": metrics["low_quality_handling"],
-            "language_switches": metrics["language_switches"],
-            "edge_cases": metrics["edge_cases_handled"],
-        }
+            else:
+                logger.error("❌ No response from AI")
 
-    def get_global_summary(self) -> Dict[str, Any]:
-        """Get global performance summary."""
-        total_calls = self.global_metrics["total_calls"]
-        if total_calls == 0:
-            return self.global_metrics
+        except Exception as e:
+            logger.error("❌ Error getting AI response: %s", e)
+            recorder.record(self.current_call_sid, stage, {"phase": "error", "error": str(e)})
+            if trace:
+                trace.event("error")
+
+    async def _respond(self, priority: int, trace: Optional[TurnTrace], language: str):
+        """Get the LLM response, covering the wait with backchannels; past the deadline give the fallback response."""
+        deadlines = self.agent.deadlines
+        filler_after = deadlines.budget(language, "llm_first_token")
+        fallback_after = deadlines.budget(language, "llm_response")
+        if fallback_after and filler_after >= fallback_after:
+            filler_after = 0.0
+        llm = asyncio.ensure_future(self._complete(priority, trace))
+        cues = self.agent.backchannels.plan(language, filler_after)
+        cover = asyncio.ensure_future(self._cover(llm, cues, language, trace)) if cues else None
+        try:
+            if fallback_after:
+                done, _ = await asyncio.wait({llm}, timeout=fallback_after)
+                if not done:
+                    deadlines.hit("llm_response", language)
+                    llm.cancel()
+                    if trace:
+                        trace.event("llm_fallback")
+                    response = SimpleNamespace(
+                        content=self.agent.language_manager.language_configs[language]["fallback_response"],
+                        fallback=True,
+                    )
+                    if cover:
+                        await cover
+                    return response
+            response = await llm
+            if cover:
+                await cover  # The answer plays after a cue already playing, not over it
+            return response
+        finally:
+            if not llm.done():
+                llm.cancel()
+            if cover and not cover.done():
+                cover.cancel()
+
+    async def _cover(self, llm: asyncio.Future, cues: List[Tuple[float, str, str]], language: str, trace):
+        """Play the turn's cues that come due before the LLM answers, unless the caller is speaking."""
+        scheduler = self.agent.backchannels
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for at, text, trigger in cues:
+            done, _ = await asyncio.wait({llm}, timeout=max(0.0, start + at - loop.time()))
+            if done:
+                return
+            if trigger == scheduler.OBSERVED:
+                self.agent.deadlines.hit("llm_first_token", language)
+            since_stopped = loop.time() - self.speech_stopped if self.speech_stopped is not None else None
+            if scheduler.holds_back(self.caller_speaking, since_stopped):
+                scheduler.record(language, trigger, "suppressed")
+                continue
+            if trace:
+                trace.event("filler" if trigger == scheduler.OBSERVED else "backchannel")
+            entry = self.agent.phrase_cache.lookup(language, text)
+            played = await self.agent.play_audio(entry[0] if entry else None, trigger)
+            scheduler.record(language, trigger, "played" if played else "unavailable")
+
+    async def _complete(self, priority: int, trace: Optional[TurnTrace]):
+        """Run one LLM request in a limiter slot (not streamed, so the first token arrives with the completion)."""
+        recorder = self.agent.call_recorder
+        stage = CallRecorder.LLM
+        async with self.agent.limiters["openai"].slot(priority, trace):
+            llm_span = trace.start("llm") if trace else None
+            llm_start = time.time()
+            recorder.record(
+                self.current_call_sid, stage, {"phase": "request", "messages": len(self.conversation_history)}
+            )
+            try:
+                response = await self.agent.llm_service.complete(messages=self.conversation_history)
+            except asyncio.CancelledError:
+                recorder.record(self.current_call_sid, stage, {"phase": "error", "error": CallRecorder.ABANDONED})
+                if trace:
+                    trace.end(llm_span, abandoned=True)
+                raise
+            llm_latency = time.time() - llm_start
+        if recorder.enabled:
+            first_token = getattr(response, "first_token_latency", None)
+            recorder.record(
+                self.current_call_sid,
+                stage,
+                {
+                    "phase": "done",
+                    "content": getattr(response, "content", None),
+                    "first_token_ms": round(first_token * 1000, 3) if first_token is not None else None,
+                },
+            )
+        if trace:
+            trace.event("llm_first_token")
+            trace.end(llm_span)
+
+        if self.current_call_sid:
+            self.agent.performance_monitor.record_llm_latency(self.current_call_sid, llm_latency)
+        return response
+
+    async def _speak(self, text: str, priority: int, trace: Optional[TurnTrace], language: str):
+        """Synthesize the response; if the first byte misses its deadline, start over on the secondary voice/model."""
+        budget = self.agent.deadlines.budget(language, "tts_first_byte")
+        first_byte = asyncio.get_running_loop().create_future()
+        primary = asyncio.ensure_future(self._synthesize(text, priority, trace, first_byte=first_byte))
+        try:
+            if budget:
+                await asyncio.wait({primary, first_byte}, timeout=budget, return_when=asyncio.FIRST_COMPLETED)
+                if not primary.done() and not first_byte.done():
+                    self.agent.deadlines.hit("tts_first_byte", language)
+                    primary.cancel()
+                    if trace:
+                        trace.event("tts_secondary")
+                    secondary = self.agent.language_manager.get_secondary_tts(language)
+                    return await self._synthesize(text, priority, trace, "tts_secondary", **secondary)
+            return await primary
+        finally:
+            if not primary.done():
+                primary.cancel()
+
+    async def _synthesize(
+        self, text: str, priority: int, trace: Optional[TurnTrace], span_name: str = "tts", **options: Any
+    ):
+        """Run one TTS request in a limiter slot; ``options`` go to the service (voice_id, model_id, first_byte)."""
+        recorder = self.agent.call_recorder
+        stage = CallRecorder.TTS
+        async with self.agent.limiters["elevenlabs"].slot(priority, trace):
+            tts_span = trace.start(span_name) if trace else None
+            tts_start = time.time()
+            recorder.record(self.current_call_sid, stage, {"phase": "request", "characters": len(text)})
+            try:
+                audio = await self.agent.tts_service.synthesize(text, **options)
+            except asyncio.CancelledError:
+                recorder.record(self.current_call_sid, stage, {"phase": "error", "error": CallRecorder.ABANDONED})
+                if trace:
+                    trace.end(tts_span, abandoned=True)
+                raise
+            tts_latency = time.time() - tts_start
+        if recorder.enabled:
+            size = len(audio) if isinstance(audio, (bytes, bytearray)) else None
+            recorder.record(self.current_call_sid, stage, {"phase": "done", "bytes": size})
+        if trace:
+            trace.event("tts_first_byte")
+            trace.end(tts_span, characters=len(text))
+            trace.event("first_audio_sent")
+
+        if self.current_call_sid:
+            self.agent.performance_monitor.record_tts_latency(self.current_call_sid, tts_latency)
+        return audio
+
+
+class PipelinePool:
+    """Pre-built per-call pipelines, kept ready per language so answering a call is acquire and bind.
+
+    A background thread keeps each language's pool at its target size. The
+    target covers the calls expected in the next ``headroom`` seconds at that
+    language's arrival rate over the last minute, between ``min_size`` and
+    ``max_size``. Released pipelines are reset and reused while the pool is
+    below target. When a pool is empty, acquire() builds a pipeline inline, the
+    same cold path as without a pool.
+    """
+
+    RATE_WINDOW = 60.0  # Seconds of acquires used to estimate each language's arrival rate
+
+    def __init__(
+        self,
+        factory: Callable[[str], "ConversationProcessor"],
+        languages: List[str],
+        min_size: int = 1,
+        max_size: int = 50,
+        headroom: float = 2.0,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize empty pools; nothing is built until start() or the first acquire."""
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.headroom = headroom
+        self.pools: Dict[str, Dict[str, Any]] = {language: self._new_pool() for language in languages}
+        self.lock = threading.Lock()
+        self.running = False
+        self._wake = threading.Event()
+
+        registry = registry or metrics_registry
+        self.acquire_counter = registry.counter(
+            "voice_agent_pipeline_pool_acquired",
+            "Call pipelines handed out, warm or built cold",
+            ("language", "result"),
+        )
+        registry.gauge(
+            "voice_agent_pipeline_pool_ready",
+            "Pre-built call pipelines waiting per language",
+            ("language",),
+            callback=lambda: [({"language": language}, len(pool["ready"])) for language, pool in self.pools.items()],
+        )
 
-        # Calculate success rates
-        latency_success_rate = (self.global_metrics["latency_target_met"] / total_calls) * 100
+    @classmethod
+    def from_env(cls, factory: Callable[[str], "ConversationProcessor"], languages: List[str]) -> "PipelinePool":
+        """Create a pool from PIPELINE_POOL_MIN, PIPELINE_POOL_MAX and PIPELINE_POOL_HEADROOM_S."""
+        return cls(
+            factory,
+            languages,
+            min_size=int(os.getenv("PIPELINE_POOL_MIN", "1")),
+            max_size=int(os.getenv("PIPELINE_POOL_MAX", "50")),
+            headroom=float(os.getenv("PIPELINE_POOL_HEADROOM_S", "2")),
+        )
 
-        return {
-            **self.global_metrics,
-            "latency_success_rate": f"{latency_success_rate:.1f}%",
-            "avg_interruptions_per_call": self.global_metrics["total_interruptions"] / total_calls,
-            "avg_slang_detections_per_call": self.global_metrics["total_slang_detections"] / total_calls,
-            "avg_low_quality_handling_per_call": self.global_metrics["total_low_quality_handling"] / total_calls,
-            "avg_language_switches_per_call": self.global_metrics["total_language_switches"] / total_calls,
-        }
+    @staticmethod
+    def _new_pool() -> Dict[str, Any]:
+        """Get the empty state of one language's pool."""
+        return {"ready": deque(), "acquires": deque(), "warm": 0, "cold": 0, "recycled": 0}
+
+    def start(self):
+        """Fill the pools and keep them filled from a background thread."""
+        if self.running:
+            return
+        self.running = True
+        self._wake.clear()
+        threading.Thread(target=self._replenish_forever, name="pipeline-pool", daemon=True).start()
+
+    def stop(self):
+        """Stop replenishing; pipelines already built stay usable."""
+        self.running = False
+        self._wake.set()
+
+    def acquire(self, call_sid: str, language: str) -> "ConversationProcessor":
+        """Take a ready pipeline for ``language`` (or build one) and bind it to the call."""
+        with self.lock:
+            pool = self.pools.get(language)
+            if pool is None:
+                pool = self.pools[language] = self._new_pool()
+            pool["acquires"].append(time.monotonic())
+            processor = pool["ready"].popleft() if pool["ready"] else None
+            result = "warm" if processor is not None else "cold"
+            pool[result] += 1
+        self.acquire_counter.inc(language=language, result=result)
+        if processor is None:
+            processor = self.factory(language)
+        processor.reset(call_sid, language)
+        self._wake.set()
+        return processor
+
+    def release(self, processor: "ConversationProcessor"):
+        """Return a finished call's pipeline; it is reset and kept if its language's pool is short."""
+        processor.reset(None, processor.language)
+        with self.lock:
+            pool = self.pools.get(processor.language)
+            if pool is not None and len(pool["ready"]) < self._target(pool):
+                pool["ready"].append(processor)
+                pool["recycled"] += 1
+
+    def target_size(self, language: str) -> int:
+        """Pipelines to keep ready for a language."""
+        with self.lock:
+            return self._target(self.pools[language])
+
+    def _target(self, pool: Dict[str, Any]) -> int:
+        """Compute a pool's target from its recent arrival rate (lock held)."""
+        acquires = pool["acquires"]
+        while acquires and time.monotonic() - acquires[0] > self.RATE_WINDOW:
+            acquires.popleft()
+        rate = len(acquires) / self.RATE_WINDOW
+        return min(self.max_size, self.min_size + math.ceil(rate * self.headroom))
+
+    def replenish(self):
+        """Build pipelines until every pool reaches its target, and drop surplus ones."""
+        for language in list(self.pools):
+            while self.running:
+                with self.lock:
+                    pool = self.pools[language]
+                    target = self._target(pool)
+                    while len(pool["ready"]) > target:
+                        pool["ready"].pop()
+                    if len(pool["ready"]) >= target:
+                        break
+                processor = self.factory(language)  # Built outside the lock; acquires never wait on it
+                with self.lock:
+                    pool["ready"].append(processor)
+
+    def _replenish_forever(self):
+        """Replenish after every acquire, and every few seconds so idle pools shrink."""
+        while self.running:
+            try:
+                self.replenish()
+            except Exception as e:
+                logger.error(f"❌ Pipeline pool replenish failed: {e}")
+            self._wake.wait(timeout=5.0)
+            self._wake.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ready, target and warm/cold counts per language for /health."""
+        with self.lock:
+            return {
+                language: {
+                    "ready": len(pool["ready"]),
+                    "target": self._target(pool),
+                    "warm": pool["warm"],
+                    "cold": pool["cold"],
+                    "recycled": pool["recycled"],
+                }
+                for language, pool in self.pools.items()
+            }
 
 
 class TwilioVoiceAgent:
@@ -538,8 +5258,29 @@ class TwilioVoiceAgent:
         self.llm_service = None
         self.pipeline = None
         self.performance_monitor = PerformanceMonitor()
+        self.flight_recorder = FlightRecorder.from_env()  # Per-turn span traces (/traces/<call_sid>)
+        self.call_recorder = CallRecorder.from_env()  # Binary call logs for replay (CALL_RECORDING_DIR)
+        self.connections = ConnectionManager.from_env()  # Warm provider connections, opened in start_pipeline
+        for name, url in ConnectionManager.PROVIDER_URLS.items():
+            self.connections.register_http(name, url)
         self.language_manager = LanguageManager()
         self.call_manager = RealCallManager()  # Add real call management
+        # Latency budgets per turn stage, and the filler audio played when the LLM runs late
+        self.deadlines = StageDeadlines.from_env(self.language_manager)
+        self.phrase_cache = PhraseCache.from_env(self.language_manager)  # Also holds recent and fallback TTS audio
+        self.response_cache = SemanticResponseCache.from_env()  # Answers to repeated questions, with their audio
+        self.turn_taking = TurnTakingController.from_env()  # How long a caller's silence must last to end a turn
+        self.backchannels = BackchannelScheduler.from_env(self.language_manager)  # Cues played while a turn is slow
+        self.echo_suppressor = EchoSuppressor.from_env()  # Keeps the playback's echo from interrupting it
+        self._phrase_warmup: Optional[asyncio.Future] = None
+        # Adaptive concurrency limits in front of each provider, shared by all calls
+        self.limiters = {provider: ConcurrencyLimiter.from_env(provider) for provider in ConcurrencyLimiter.PROVIDERS}
+        self.admission = AdmissionController.from_env(  # Consulted by /webhook before taking a call
+            lambda: len(self.call_manager.active_calls), lambda: loop_monitor.current_lag(), self.language_manager
+        )
+        self.pipeline_pool = PipelinePool.from_env(  # Ready per-call pipelines, filled from start_pipeline
+            self.build_call_pipeline, list(self.language_manager.language_configs)
+        )
 
         # Performance tracking
         self.latency_target = 0.5  # 500ms target
@@ -558,17 +5299,35 @@ class TwilioVoiceAgent:
     def _initialize_services(self):
         """Initialize all AI services."""
         try:
+            # Provider SDKs are most of the import time, so they load here rather than with the module
+            from pipecat.services.deepgram.stt import DeepgramSTTService
+            from pipecat.services.elevenlabs.tts import ElevenLabsTTSService
+            from pipecat.services.openai.llm import OpenAILLMService
+
             # ElevenLabs TTS (Mexican Spanish voice)
             elevenlabs_key = os.getenv("ELEVENLABS_API_KEY")
             if not elevenlabs_key:
                 raise ValueError("ELEVENLABS_API_KEY not found in environment variables")
 
-            self.tts_service = ElevenLabsTTSService(
-                api_key=elevenlabs_key,
-                voice_id=self.language_manager.get_tts_voice(),
-                model_id="eleven_multilingual_v2",
+            backends = [
+                TTSBackend(
+                    "elevenlabs",
+                    ElevenLabsTTSService(
+                        api_key=elevenlabs_key,
+                        voice_id=self.language_manager.get_tts_voice(),
+                        model_id="eleven_multilingual_v2",
+                    ),
+                )
+            ]
+
+            # Offline engine so calls are never silent when ElevenLabs is slow or down
+            local_tts = LocalTTSEngine.from_env(lambda: self.language_manager.current_language)
+            if local_tts:
+                backends.append(TTSBackend("local", local_tts, last_resort=True, streams=False))
+            self.tts_service = TTSRouter.from_env(
+                backends, self.phrase_cache, lambda: self.language_manager.current_language
             )
-            logger.info("✅ ElevenLabs TTS service initialized")
+            logger.info(f"✅ ElevenLabs TTS service initialized ({', '.join(b.name for b in backends)})")
 
             # Deepgram STT (LATAM Spanish + English)
             deepgram_key = os.getenv("DEEPGRAM_API_KEY")
@@ -586,12 +5345,35 @@ class TwilioVoiceAgent:
             if not openai_key:
                 raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-            self.llm_service = OpenAILLMService(
-                api_key=openai_key,
-                model="gpt-4o-mini",
-                system_prompt=self.language_manager.get_system_prompt(),
-            )
-            logger.info("✅ OpenAI LLM service initialized")
+            model = os.getenv("LLM_MODEL", "gpt-4o-mini")
+            backends = [
+                LLMBackend(
+                    f"openai/{model}",
+                    OpenAILLMService(
+                        api_key=openai_key, model=model, system_prompt=self.language_manager.get_system_prompt()
+                    ),
+                    float(os.getenv("LLM_COST_PER_1K_TOKENS", "0.0004")),
+                )
+            ]
+
+            # Second backend (another model or OpenAI-compatible endpoint) for hedging and failover
+            hedge_model = os.getenv("LLM_HEDGE_MODEL")
+            if hedge_model:
+                hedge_url = os.getenv("LLM_HEDGE_BASE_URL") or None
+                backends.append(
+                    LLMBackend(
+                        f"{hedge_url or 'openai'}/{hedge_model}",
+                        OpenAILLMService(
+                            api_key=os.getenv("LLM_HEDGE_API_KEY") or openai_key,
+                            model=hedge_model,
+                            base_url=hedge_url,
+                            system_prompt=self.language_manager.get_system_prompt(),
+                        ),
+                        float(os.getenv("LLM_HEDGE_COST_PER_1K_TOKENS", "0.0004")),
+                    )
+                )
+            self.llm_service = LLMRouter.from_env(backends)
+            logger.info(f"✅ OpenAI LLM service initialized ({', '.join(b.name for b in backends)})")
 
         except Exception as e:
             logger.error(f"❌ Service initialization failed: {e}")
@@ -651,176 +5433,38 @@ class TwilioVoiceAgent:
         except Exception as e:
             logger.error(f"❌ Error updating services for language {new_language}: {e}")
 
+    def create_call_processor(self, call_sid: Optional[str] = None) -> ConversationProcessor:
+        """Create a conversation processor that shares this agent's services, bound to a call."""
+        return ConversationProcessor(self, call_sid)
+
+    def build_call_pipeline(self, language: str) -> ConversationProcessor:
+        """Build an unbound processor for ``language`` wrapped in its own Pipeline (PipelinePool factory)."""
+        processor = ConversationProcessor(self, language=language)
+        processor.pipeline = Pipeline([processor])
+        return processor
+
+    def acquire_call_processor(self, call_sid: str, language: Optional[str] = None) -> ConversationProcessor:
+        """Get a ready per-call pipeline from the pool, bound to ``call_sid``."""
+        return self.pipeline_pool.acquire(call_sid, language or self.language_manager.current_language)
+
+    def release_call_processor(self, processor: ConversationProcessor):
+        """Hand a finished call's pipeline back to the pool."""
+        self.pipeline_pool.release(processor)
+
+    def get_tracked_sizes(self) -> Dict[str, int]:
+        """Get the sizes of per-call structures; ones that only grow are the usual memory suspects."""
+        return {
+            "performance_monitor_calls": len(self.performance_monitor.call_metrics),
+            "active_calls": len(self.call_manager.active_calls),
+            "call_history": len(self.call_manager.call_history),
+            "flight_recorder_calls": len(self.flight_recorder.calls),
+        }
+
     def create_pipeline(self):
         """Create the Pipecat pipeline for voice processing."""
         try:
-            # Create conversation processor
-            class ConversationProcessor(FrameProcessor):
-                def __init__(self, agent):
-                    super().__init__()
-                    self.agent = agent
-                    self.conversation_history = []
-                    self.is_speaking = False
-                    self.last_user_input = ""
-                    self.silence_start = None
-                    self.voicemail_threshold = 3.0  # 3 seconds of silence
-                    self.current_call_sid = None
-
-                async def process(self, frame):
-                    current_time = time.time()
-
-                    if isinstance(frame, UserStartedSpeakingFrame):
-                        # User started speaking - stop TTS if active
-                        self.is_speaking = False
-                        self.silence_start = None
-                        logger.info("🎤 User started speaking - interrupting TTS")
-
-                        # Record interruption for performance monitoring
-                        if self.current_call_sid:
-                            self.agent.performance_monitor.record_interruption(self.current_call_sid)
-
-                    elif isinstance(frame, UserStoppedSpeakingFrame):
-                        # User stopped speaking - start silence timer
-                        self.silence_start = current_time
-                        logger.info("🔇 User stopped speaking")
-
-                    elif isinstance(frame, TranscriptionFrame):
-                        # Process speech-to-text result
-                        user_text = frame.text
-                        if user_text and user_text != self.last_user_input:
-                            self.last_user_input = user_text
-                            logger.info(f"🎯 User said: {user_text}")
-
-                            # Language detection and switching
-                            (
-                                detected_lang,
-                                confidence,
-                            ) = self.agent.language_manager.detect_language_from_text(user_text)
-                            language_switched = self.agent.language_manager.update_language(detected_lang, confidence)
-
-                            if language_switched and self.current_call_sid:
-                                # Record language switch
-                                old_lang = self.agent.language_manager.current_language
-                                self.agent.performance_monitor.record_language_switch(
-                                    self.current_call_sid, old_lang, detected_lang
-                                )
-
-                                # Update services for new language
-                                self.agent.update_language_services(detected_lang)
-
-                                # Log language switch
-                                logger.info(f"🌍 Language switched to: {detected_lang} (confidence: {confidence:.2f})")
-
-                            # Detect Mexican Spanish slang (only for Spanish)
-                            if self.agent.language_manager.current_language == "es-LA":
-                                if self.agent.detect_mexican_slang(user_text):
-                                    logger.info("🇲🇽 Mexican Spanish slang detected")
-                                    if self.current_call_sid:
-                                        self.agent.performance_monitor.record_slang_detection(
-                                            self.current_call_sid, user_text
-                                        )
-
-                            # Detect audio quality issues
-                            audio_issue = self.agent.detect_audio_quality_issues(user_text)
-                            if audio_issue:
-                                logger.info(f"🔊 Audio quality issue detected: {audio_issue}")
-                                if self.current_call_sid:
-                                    self.agent.performance_monitor.record_low_quality_handling(
-                                        self.current_call_sid, audio_issue
-                                    )
-
-                            # Add to conversation history
-                            self.conversation_history.append(
-                                {
-                                    "role": "user",
-                                    "content": user_text,
-                                    "timestamp": current_time,
-                                    "language": self.agent.language_manager.current_language,
-                                }
-                            )
-
-                            # Get AI response
-                            await self._get_ai_response(user_text)
-
-                    # Check for voicemail (prolonged silence)
-                    if (
-                        self.silence_start
-                        and current_time - self.silence_start > self.voicemail_threshold
-                        and not self.is_speaking
-                    ):
-                        logger.info("📞 Voicemail detected - ending call")
-                        await self.agent._end_call_voicemail()
-
-                    return frame
-
-                async def _get_ai_response(self, user_input: str):
-                    """Get AI response and convert to speech."""
-                    try:
-                        start_time = time.time()
-
-                        # Get LLM response
-                        llm_start = time.time()
-                        response = await self.agent.llm_service.complete(messages=self.conversation_history)
-                        llm_latency = time.time() - llm_start
-
-                        if self.current_call_sid:
-                            self.agent.performance_monitor.record_llm_latency(self.current_call_sid, llm_latency)
-
-                        if response and hasattr(response, "content"):
-                            ai_response = response.content
-                            current_lang = self.agent.language_manager.current_language
-                            logger.info(f"🤖 AI Response ({current_lang}): {ai_response}")
-
-                            # Add AI response to history
-                            self.conversation_history.append(
-                                {
-                                    "role": "assistant",
-                                    "content": ai_response,
-                                    "timestamp": time.time(),
-                                    "language": current_lang,
-                                }
-                            )
-
-                            # Convert to speech
-                            tts_start = time.time()
-                            await self.agent.tts_service.synthesize(ai_response)
-                            tts_latency = time.time() - tts_start
-
-                            if self.current_call_sid:
-                                self.agent.performance_monitor.record_tts_latency(self.current_call_sid, tts_latency)
-
-                            # Mark as speaking
-                            self.is_speaking = True
-                            self.silence_start = None
-
-                            # Calculate total latency
-                            total_latency = time.time() - start_time
-
-                            # Record roundtrip latency
-                            if self.current_call_sid:
-                                self.agent.performance_monitor.record_roundtrip_latency(
-                                    self.current_call_sid, total_latency
-                                )
-
-                            logger.info(f"⚡ Response latency: {total_latency:.3f}s")
-
-                            if total_latency > self.agent.latency_target:
-                                logger.warning(
-                                    f"⚠️ Latency {total_latency:.3f}s exceeds target {self.agent.latency_target}s"
-                                )
-                            else:
-                                logger.info(
-                                    f"✅ Latency target met: {total_latency:.3f}s < {self.agent.latency_target}s"
-                                )
-
-                        else:
-                            logger.error("❌ No response from AI")
-
-                    except Exception as e:
-                        logger.error(f"❌ Error getting AI response: {e}")
-
             # Create processor and pipeline
-            processor = ConversationProcessor(self)
+            processor = self.create_call_processor()
             self.pipeline = Pipeline([processor])
             logger.info("✅ Pipeline created successfully")
 
@@ -834,6 +5478,10 @@ class TwilioVoiceAgent:
             if not self.pipeline:
                 self.create_pipeline()
 
+            self.pipeline_pool.start()
+            await self.connections.start()
+            self._phrase_warmup = asyncio.ensure_future(self.phrase_cache.warm(self.tts_service))
+
             # Pipeline is ready, no need for runner in this version
             logger.info("✅ Pipeline started successfully")
 
@@ -844,11 +5492,27 @@ class TwilioVoiceAgent:
     async def stop_pipeline(self):
         """Stop the voice processing pipeline."""
         try:
-            # Pipeline cleanup if needed
+            self.pipeline_pool.stop()
+            await self.connections.close()
             logger.info("✅ Pipeline stopped")
         except Exception as e:
             logger.error(f"⚠️ Error stopping pipeline: {e}")
 
+    async def play_phrase(self, language: str, phrase: str) -> bool:
+        """Play a cached phrase on the current call; False if it is not cached or the TTS service cannot play audio."""
+        return await self.play_audio(self.phrase_cache.get(language, phrase), phrase)
+
+    async def play_audio(self, audio: Optional[bytes], what: str = "audio") -> bool:
+        """Play synthesized audio on the current call; False if there is none or the TTS service cannot play it."""
+        if not audio or not hasattr(self.tts_service, "play"):
+            return False
+        try:
+            await self.tts_service.play(audio)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Could not play %s: %s", what, e)
+            return False
+
     async def _end_call_voicemail(self):
         """End call due to voicemail detection."""
         # This would integrate with Twilio to end the call
@@ -898,14 +5562,73 @@ class TwilioVoiceAgent:
         return ET.tostring(root, encoding="unicode")
 
 
+class StartupState:
+    """Startup progress behind /livez and /readyz, so the server answers while services warm up."""
+
+    PHASES = ("starting", "initializing_services", "starting_pipeline", "ready")
+
+    def __init__(self):
+        """Start timing from process start-up (module import)."""
+        self.started = time.monotonic()
+        self.phase = "starting"
+        self.timings_ms: Dict[str, float] = {"starting": 0.0}
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether services are initialized and the pipeline is started."""
+        return self.phase == "ready"
+
+    def mark(self, phase: str):
+        """Enter a startup phase, recording milliseconds since start-up."""
+        self.phase = phase
+        self.timings_ms[phase] = round((time.monotonic() - self.started) * 1000, 1)
+
+    def fail(self, error: Exception):
+        """Record that start-up failed; liveness then fails so the process gets restarted."""
+        self.phase = "failed"
+        self.error = str(error)
+        self.timings_ms["failed"] = round((time.monotonic() - self.started) * 1000, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the phase, per-phase timings and any start-up error."""
+        return {"phase": self.phase, "ready": self.ready, "timings_ms": dict(self.timings_ms), "error": self.error}
+
+
 # Flask application
 app = Flask(__name__)
 voice_agent = None
+startup = StartupState()  # Phases of main(), served on /livez and /readyz
+response_cache = ResponseCache.from_env()  # Shared by /health, /performance and /language
+loop_monitor = LoopMonitor.from_env()  # Started on the pipeline loop in __main__
+sampling_profiler = SamplingProfiler()  # /debug/profile
+memory_profiler = MemoryProfiler(frames=int(os.getenv("DEBUG_TRACEMALLOC_FRAMES", "1")))  # /debug/memory
+metrics_registry.counter(
+    "voice_agent_monitoring_cache_lookups",
+    "Monitoring response cache lookups",
+    ("result",),
+    callback=lambda: [
+        ({"result": result}, value)
+        for result, value in response_cache.get_stats().items()
+        if result in ("hits", "misses", "coalesced")
+    ],
+)
+metrics_registry.gauge(
+    "voice_agent_monitoring_cache_hit_ratio",
+    "Share of monitoring lookups served without recomputing",
+    callback=lambda: response_cache.get_stats()["hit_ratio"],
+)
 
 # Enable CORS for all routes
 CORS(app, resources={r"/*": {"origins": "*"}})
 
 
+@app.before_request
+def reset_log_context():
+    """Clear call context left on a reused worker thread by a previous request."""
+    bind_call_context(None)
+
+
 # Manual CORS headers as backup
 @app.after_request
 def after_request(response):
@@ -916,20 +5639,60 @@ def after_request(response):
     return response
 
 
+# /health fields that move while the agent is idle (clock, loop lag sampling, keepalive pings, pool refills and
+# per-request gauges), left out of its ETag so pollers get 304s until something that matters changes
+HEALTH_VOLATILE_FIELDS = (
+    "timestamp",
+    "admission.loop_lag_s",
+    "connections.http.*.pings",
+    "connections.websockets.*.ready",
+    "connections.websockets.*.opening",
+    "connections.websockets.*.connect_ms",
+    "limiters.*.inflight",
+    "limiters.*.queued",
+    "limiters.*.queue_wait_p50_ms",
+    "limiters.*.queue_wait_p95_ms",
+)
+
+
+def cached_json_response(key: str, compute: Callable[[], Dict[str, Any]], volatile: Tuple[str, ...] = ()) -> Response:
+    """Serve a monitoring payload through response_cache, honoring If-None-Match (``volatile`` fields aside)."""
+    body, etag = response_cache.get(key, compute, volatile)
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @app.route("/webhook", methods=["POST"])
 def twilio_webhook():
     """Handle incoming Twilio webhook."""
     try:
         # Get call details from Twilio
         call_sid = request.form.get("CallSid")
+        bind_call_context(call_sid)
         from_number = request.form.get("From")
         to_number = request.form.get("To")
 
         logger.info(f"📞 Incoming call from {from_number} to {to_number} (SID: {call_sid})")
 
-        # Store call information using RealCallManager
         if voice_agent:
-            voice_agent.call_manager.start_call(call_sid, from_number, "inbound")
+            admission = voice_agent.admission
+            queue_result = request.form.get("QueueResult")
+            if queue_result and queue_result != "leave":  # Hung up, or the queue failed, while waiting
+                return Response(admission.twiml[AdmissionController.REJECT], mimetype="text/xml")
+            decision, reason = admission.admit(redirected=request.args.get("overflow") == "redirect")
+            if decision != AdmissionController.ACCEPT:
+                logger.warning(f"🚦 Call {call_sid} not admitted ({reason}): {decision}")
+                return Response(admission.twiml[decision], mimetype="text/xml")
+
+            # Store call information using RealCallManager
+            voice_agent.call_manager.start_call(call_sid, from_number, "inbound", tenant=to_number)
 
             # Start performance monitoring for this call
             voice_agent.performance_monitor.start_call_monitoring(call_sid)
@@ -943,11 +5706,24 @@ def twilio_webhook():
         return Response("Error", status=500)
 
 
+@app.route("/queue-wait", methods=["POST"])
+def queue_wait():
+    """Hold music for callers queued by admission control; the first in line leaves once a call can be taken."""
+    if not voice_agent:
+        return Response('<Response><Pause length="5"/></Response>', mimetype="text/xml")
+    try:
+        position = int(request.form.get("QueuePosition", "1") or 1)
+    except ValueError:
+        position = 1  # Treat a malformed position as first in line rather than fail the caller's TwiML
+    return Response(voice_agent.admission.wait_twiml(position), mimetype="text/xml")
+
+
 @app.route("/consent-response", methods=["POST"])
 def consent_response():
     """Handle consent response from user."""
     try:
         call_sid = request.form.get("CallSid")
+        bind_call_context(call_sid)
         speech_result = request.form.get("SpeechResult", "").lower()
 
         logger.info(f"🎤 Consent response: {speech_result} for call {call_sid}")
@@ -967,9 +5743,8 @@ def consent_response():
             logger.info(f"✅ User consented for call {call_sid}")
 
             # Update call status using RealCallManager
-            if voice_agent and voice_agent.call_manager.get_call_info(call_sid):
-                # Call is already being tracked by RealCallManager
-                pass
+            if voice_agent:
+                voice_agent.call_manager.mark_answered(call_sid)
 
             # Return greeting TwiML
             twiml = voice_agent.generate_greeting_twiml() if voice_agent else ""
@@ -977,6 +5752,11 @@ def consent_response():
         else:
             logger.info(f"❌ User declined for call {call_sid}")
 
+            if voice_agent:
+                voice_agent.call_manager.end_call(call_sid, "declined")
+                voice_agent.flight_recorder.end_call(call_sid)
+                voice_agent.call_recorder.end_call(call_sid)
+
             # End call
             root = ET.Element("Response")
             say = ET.SubElement(root, "Say", language="es-MX")
@@ -1006,17 +5786,57 @@ def voice_stream():
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "active_calls": voice_agent.call_manager.get_active_call_count() if voice_agent else 0,
-        "services": {
-            "tts": voice_agent.tts_service is not None if voice_agent else False,
-            "stt": voice_agent.stt_service is not None if voice_agent else False,
-            "llm": voice_agent.llm_service is not None if voice_agent else False,
+    return cached_json_response(
+        "health",
+        lambda: {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "active_calls": voice_agent.call_manager.get_active_call_count() if voice_agent else 0,
+            "services": {
+                "tts": voice_agent.tts_service is not None if voice_agent else False,
+                "stt": voice_agent.stt_service is not None if voice_agent else False,
+                "llm": voice_agent.llm_service is not None if voice_agent else False,
+            },
+            "language": voice_agent.language_manager.get_language_stats() if voice_agent else {},
+            "connections": voice_agent.connections.get_stats() if voice_agent else {},
+            "pipeline_pool": voice_agent.pipeline_pool.get_stats() if voice_agent else {},
+            "admission": voice_agent.admission.get_stats() if voice_agent else {},
+            "deadlines": voice_agent.deadlines.get_stats() if voice_agent else {},
+            "llm_router": (
+                voice_agent.llm_service.get_stats()
+                if voice_agent and isinstance(voice_agent.llm_service, LLMRouter)
+                else {}
+            ),
+            "response_cache": voice_agent.response_cache.get_stats() if voice_agent else {},
+            "turn_taking": voice_agent.turn_taking.get_stats() if voice_agent else {},
+            "backchannels": voice_agent.backchannels.get_stats() if voice_agent else {},
+            "echo": voice_agent.echo_suppressor.get_stats() if voice_agent else {},
+            "tts_router": (
+                voice_agent.tts_service.get_stats()
+                if voice_agent and isinstance(voice_agent.tts_service, TTSRouter)
+                else {}
+            ),
+            "limiters": (
+                {provider: limiter.get_stats() for provider, limiter in voice_agent.limiters.items()}
+                if voice_agent
+                else {}
+            ),
         },
-        "language": voice_agent.language_manager.get_language_stats() if voice_agent else {},
-    }
+        volatile=HEALTH_VOLATILE_FIELDS,
+    )
+
+
+@app.route("/livez", methods=["GET"])
+def liveness_check():
+    """Liveness: the process serves requests and start-up has not failed."""
+    status = 503 if startup.phase == "failed" else 200
+    return {"status": "failed" if status == 503 else "alive", "phase": startup.phase, "error": startup.error}, status
+
+
+@app.route("/readyz", methods=["GET"])
+def readiness_check():
+    """Readiness: services are initialized and the pipeline is started, so calls can be taken."""
+    return startup.snapshot(), 200 if startup.ready else 503
 
 
 @app.route("/performance", methods=["GET"])
@@ -1059,7 +5879,163 @@ def performance_metrics():
             return {"error": "Call not found"}, 404
     else:
         # Return global metrics from RealCallManager
-        return voice_agent.call_manager.get_performance_metrics()
+        return cached_json_response("performance", voice_agent.call_manager.get_performance_metrics)
+
+
+@app.route("/api/calls/active", methods=["GET"])
+def active_calls():
+    """List active calls as immutable snapshots with cursor pagination and change polling.
+
+    Query parameters:
+    - limit: page size (1-500, default 100)
+    - cursor: next_cursor from the previous page
+    - since: version from the previous response; only calls changed after it are returned
+    - fields: comma-separated snapshot fields to include
+    """
+    if not voice_agent:
+        return {"error": "Voice agent not initialized"}, 500
+
+    try:
+        limit = min(max(int(request.args.get("limit", 100)), 1), 500)
+        cursor = request.args.get("cursor")
+        since = request.args.get("since")
+        fields = request.args.get("fields")
+
+        return voice_agent.call_manager.get_active_calls_page(
+            cursor=int(cursor) if cursor else None,
+            limit=limit,
+            since=int(since) if since else None,
+            fields=[field.strip() for field in fields.split(",") if field.strip()] if fields else None,
+        )
+
+    except ValueError:
+        return {"error": "limit, cursor and since must be integers"}, 400
+    except Exception as e:
+        logger.error(f"❌ Error listing active calls: {e}")
+        return {"error": str(e)}, 500
+
+
+@app.route("/events", methods=["GET"])
+def event_stream():
+    """Stream live call and latency events to dashboards (Server-Sent Events)."""
+    if not voice_agent:
+        return {"error": "Voice agent not initialized"}, 500
+
+    call_manager = voice_agent.call_manager
+    subscriber = call_manager.events.subscribe()
+    if subscriber is None:
+        return {"error": "Too many event subscribers"}, 503
+
+    try:
+        snapshot = {
+            "performance": call_manager.get_performance_metrics(),
+            "call_stats": call_manager.stats.get_daily_stats(),
+        }
+        response = Response(
+            stream_with_context(call_manager.events.stream(subscriber, snapshot)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except Exception:
+        call_manager.events.unsubscribe(subscriber)
+        raise
+    # The stream's own cleanup only runs once it has started; a client gone before that is unsubscribed here
+    response.call_on_close(lambda: call_manager.events.unsubscribe(subscriber))
+    return response
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Expose counters and pre-aggregated latency histograms in OpenMetrics text format."""
+    return Response(metrics_registry.render(), content_type=MetricsRegistry.CONTENT_TYPE)
+
+
+@app.route("/traces/<call_sid>", methods=["GET"])
+def call_traces(call_sid):
+    """Get the flight recorder turns of a call (?format=otel for OpenTelemetry JSON)."""
+    if not voice_agent:
+        return {"error": "Voice agent not initialized"}, 500
+
+    recorder = voice_agent.flight_recorder
+    turns = recorder.get_turns(call_sid)
+    if not turns:
+        return {"error": "No traces for this call"}, 404
+
+    if request.args.get("format") == "otel":
+        return {
+            "resourceSpans": [
+                span for turn in turns for span in turn.to_otel(recorder.epoch_offset_ns)["resourceSpans"]
+            ]
+        }
+    return {"call_sid": call_sid, "turns": [turn.to_dict() for turn in turns]}
+
+
+def require_debug_token(view):
+    """Protect a /debug endpoint with DEBUG_API_TOKEN (Authorization: Bearer <token>); disabled when unset."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = os.getenv("DEBUG_API_TOKEN")
+        if not token:
+            return {"error": "Debug endpoints are disabled (set DEBUG_API_TOKEN)"}, 404
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return {"error": "Unauthorized"}, 401
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+@app.route("/debug/loop", methods=["GET"])
+@require_debug_token
+def debug_loop():
+    """Get event loop lag, pending task health and recent stall stacks."""
+    return loop_monitor.get_snapshot()
+
+
+@app.route("/debug/profile", methods=["GET"])
+@require_debug_token
+def debug_profile():
+    """Sample all threads for ?seconds=N (max 60); ?format=collapsed|speedscope, ?call_sid= to filter."""
+    try:
+        seconds = min(max(float(request.args.get("seconds", "10")), 0.1), 60.0)
+        interval = min(max(float(request.args.get("interval_ms", "10")), 1.0), 100.0) / 1000
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    try:
+        result = sampling_profiler.profile(seconds, interval, request.args.get("call_sid"))
+    except RuntimeError as e:
+        return {"error": str(e)}, 409
+
+    logger.info(f"🔬 Profiled {result['samples']} samples in {seconds}s ({result['overhead_ms']}ms sampling)")
+    if request.args.get("format") == "speedscope":
+        return SamplingProfiler.to_speedscope(result)
+    return Response(SamplingProfiler.to_collapsed(result), mimetype="text/plain")
+
+
+@app.route("/debug/memory", methods=["GET"])
+@require_debug_token
+def debug_memory():
+    """Diff tracemalloc against a baseline (?action=start|diff|stop, ?limit=N)."""
+    action = request.args.get("action", "diff")
+    if action == "start":
+        memory_profiler.start()
+    elif action == "stop":
+        memory_profiler.stop()
+        return {"tracing": False}
+    elif action != "diff":
+        return {"error": f"Unknown action {action!r}"}, 400
+
+    try:
+        limit = int(request.args.get("limit", "25"))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    result = memory_profiler.diff(limit=limit)
+    if voice_agent:
+        result["tracked"] = voice_agent.get_tracked_sizes()
+    return result
 
 
 @app.route("/test-call", methods=["POST"])
@@ -1116,6 +6092,8 @@ def end_test_call():
 
         if voice_agent:
             voice_agent.call_manager.end_call(call_sid, "test_completed")
+            voice_agent.flight_recorder.end_call(call_sid)
+            voice_agent.call_recorder.end_call(call_sid)
             logger.info(f"🧪 Test call ended: {call_sid}")
 
             return {
@@ -1267,37 +6245,35 @@ def language_info():
     if not voice_agent:
         return {"error": "Voice agent not initialized"}, 500
 
-    return {
-        "language_manager": voice_agent.language_manager.get_language_stats(),
-        "supported_languages": list(voice_agent.language_manager.language_configs.keys()),
-        "current_config": voice_agent.language_manager.get_current_config(),
-    }
+    return cached_json_response(
+        "language",
+        lambda: {
+            "language_manager": voice_agent.language_manager.get_language_stats(),
+            "supported_languages": list(voice_agent.language_manager.language_configs.keys()),
+            "current_config": voice_agent.language_manager.get_current_config(),
+        },
+    )
 
 
 @app.route("/call-stats", methods=["GET"])
 def call_statistics():
     """Get daily call statistics endpoint."""
+    if not voice_agent:
+        return {"error": "Voice agent not initialized"}, 500
+
     try:
-        # Get current date for daily stats
-        today = datetime.now().date()
-        
-        # Mock daily statistics (in production, these would be stored in a database)
-        mock_stats = {
-            "date": today.isoformat(),
-            "total_calls": 18,
-            "answered_calls": 15,
-            "positive_calls": 12,
-            "missed_calls": 3,
-            "avg_call_duration": "4:32",
-            "success_rate": 85.7,
-            "answer_rate": 88.9,
-            "peak_hour": "14:00-15:00",
-            "last_updated": datetime.now().isoformat(),
-        }
-        
-        logger.info(f"📊 Call statistics requested for {today}")
-        return mock_stats
-        
+        # Optional ?date=YYYY-MM-DD, defaults to today in the configured timezone
+        day = request.args.get("date")
+        if day:
+            datetime.strptime(day, "%Y-%m-%d")
+
+        stats = voice_agent.call_manager.stats.get_daily_stats(day)
+
+        logger.info(f"📊 Call statistics requested for {stats['date']}")
+        return stats
+
+    except ValueError:
+        return {"error": "Invalid date, expected YYYY-MM-DD"}, 400
     except Exception as e:
         logger.error(f"❌ Error getting call statistics: {e}")
         return {"error": "Failed to get call statistics"}, 500
@@ -1310,13 +6286,17 @@ async def main():
     try:
         logger.info("🚀 Starting Multilingual Twilio Voice AI Agent...")
 
-        # Initialize voice agent
-        voice_agent = TwilioVoiceAgent()
+        # Initialize voice agent off the loop; it imports the provider SDKs
+        startup.mark("initializing_services")
+        agent = await asyncio.get_running_loop().run_in_executor(None, TwilioVoiceAgent)
 
         # Start pipeline
-        await voice_agent.start_pipeline()
+        startup.mark("starting_pipeline")
+        await agent.start_pipeline()
+        voice_agent = agent
+        startup.mark("ready")
 
-        logger.info("✅ Multilingual Voice AI Agent ready!")
+        logger.info(f"✅ Multilingual Voice AI Agent ready in {startup.timings_ms['ready']:.0f}ms!")
         logger.info(f"🌍 Primary Language: {voice_agent.language_manager.primary_language}")
         logger.info(f"🌍 Supported Languages: {list(voice_agent.language_manager.language_configs.keys())}")
         logger.info("🌐 Server will start on port 5001")
@@ -1326,15 +6306,22 @@ async def main():
 
     except Exception as e:
         logger.error(f"❌ Failed to start voice agent: {e}")
-        sys.exit(1)
+        startup.fail(e)
+        raise
 
 
 if __name__ == "__main__":
     try:
-        # Run the async main function
+        # Keep the loop running for call pipelines while Flask serves requests
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(main())
+        threading.Thread(target=loop.run_forever, name="event-loop", daemon=True).start()
+        loop_monitor.start(loop)
+
+        # Fast start (default): serve /livez and /readyz at once while services warm up on the loop
+        starting = asyncio.run_coroutine_threadsafe(main(), loop)
+        if os.getenv("STARTUP_MODE", "fast").lower() == "eager":
+            starting.result()
 
         # Start Flask server
         logger.info("🌐 Starting Flask server...")
@@ -1343,7 +6330,9 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("👋 Shutting down...")
         if voice_agent:
-            loop.run_until_complete(voice_agent.stop_pipeline())
+            loop_monitor.stop()
+            asyncio.run_coroutine_threadsafe(voice_agent.stop_pipeline(), loop).result(timeout=5)
+            voice_agent.call_manager.stats.persist()
     except Exception as e:
         logger.error(f"❌ Fatal error: {e}")
         sys.exit(1)